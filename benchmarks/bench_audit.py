@@ -0,0 +1,96 @@
+"""
+Indexed audit queries vs scanning the JSONL.
+
+    python benchmarks/bench_audit.py [executions]
+
+Writes the audit trail of `executions` synthetic executions (6 events each,
+timestamps one millisecond apart) through JsonlAuditLogger, then times:
+
+1. emit cost per event;
+2. lookup of one execution_id and one intent_id;
+3. a one-second time range in the middle of the corpus;
+4. the same queries with the sidecar indexes removed (a line scan that
+   still skips non-matching lines before parsing them, like grep).
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from kivai_sdk.audit import (
+    AuditEvent,
+    AuditQuery,
+    JsonlAuditLogger,
+    parse_ts_us,
+    query_audit,
+    segments,
+)
+
+EVENTS = ("auth.evaluated", "schema.validated", "route.resolved", "adapter.called")
+BASE = datetime(2026, 2, 12, tzinfo=timezone.utc)
+
+
+def _iso(ms: int) -> str:
+    return (BASE + timedelta(milliseconds=ms)).isoformat().replace("+00:00", "Z")
+
+
+def _write(directory: str, n: int) -> float:
+    logger = JsonlAuditLogger(directory)
+    emitted = 0
+    t0 = time.perf_counter()
+    for i in range(n):
+        ex, ts = f"exec-{i:010d}", _iso(i)
+        start = {"strict": False, "intent": "set_temperature", "intent_id": f"i-{i}"}
+        logger.emit(AuditEvent(ts, ex, "execute.start", start))
+        for name in EVENTS:
+            logger.emit(AuditEvent(ts, ex, name, {"ok": True, "device": "t-01"}))
+        end = {"status": "ok"} if i % 50 else {"status": "failed", "error_code": "X"}
+        logger.emit(AuditEvent(ts, ex, "execute.end", end))
+        emitted += 6
+    logger.close()
+    return (time.perf_counter() - t0) / emitted * 1e6
+
+
+def _time(directory: str, query: AuditQuery) -> tuple:
+    t0 = time.perf_counter()
+    found = sum(1 for _ in query_audit(directory, query))
+    return (time.perf_counter() - t0) * 1000, found
+
+
+def main(n: int = 200_000) -> None:
+    directory = tempfile.mkdtemp(prefix="kivai-audit-bench-")
+    try:
+        emit_us = _write(directory, n)
+        size = sum(os.path.getsize(p) for p in segments(directory))
+        print(f"{n * 6:,} audit events, {size / 2**20:.0f} MB JSONL")
+        print(f"  emit {emit_us:.1f} us/event")
+        mid = n // 2
+        queries = {
+            "execution_id": AuditQuery(execution_id=f"exec-{mid:010d}"),
+            "intent_id": AuditQuery(intent_id=f"i-{mid}"),
+            "1 s time range": AuditQuery(
+                since=parse_ts_us(_iso(mid)), until=parse_ts_us(_iso(mid + 1000))
+            ),
+        }
+        indexed = {name: _time(directory, q) for name, q in queries.items()}
+        for path in segments(directory):
+            os.unlink(path[: -len(".jsonl")] + ".idx")
+        for name, q in queries.items():
+            ms, found = indexed[name]
+            scan_ms, scan_found = _time(directory, q)
+            assert found == scan_found, (name, found, scan_found)
+            print(
+                f"  {name:<15} indexed {ms:8.2f} ms   scan {scan_ms:9.1f} ms"
+                f"   ({found} records)"
+            )
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,112 @@
+"""
+Binary audit segments vs JSONL.
+
+    python benchmarks/bench_audit_binary.py [intents]
+
+Collects the real audit trail of `intents` executions (the loadgen mix:
+echo, set_temperature, play_music, unlock_door and schema-invalid intents),
+then writes the same events through JsonlAuditLogger and
+BinaryAuditLogger. Reports bytes per event, write and read throughput, and
+checks that the binary segments decode to exactly the JSONL records.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from kivai_sdk.audit import (
+    AuditLogger,
+    AuditQuery,
+    BinaryAuditLogger,
+    JsonlAuditLogger,
+    query_audit,
+    read_segment,
+)
+from kivai_sdk.devices import set_device_shadow
+from kivai_sdk.loadgen import DEFAULT_MIX, make_payload, parse_mix
+from kivai_sdk.runtime import execute_intent
+
+
+class _Collect(AuditLogger):
+    def __init__(self) -> None:
+        self.events: list = []
+
+    def emit(self, evt) -> None:
+        self.events.append(evt)
+
+
+def _trail(n: int) -> list:
+    rng = random.Random(7)
+    mix = parse_mix(DEFAULT_MIX)
+    kinds, weights = list(mix), list(mix.values())
+    collect = _Collect()
+    for _ in range(n):
+        kind = rng.choices(kinds, weights)[0]
+        execute_intent(make_payload(kind, rng), audit=collect)
+    set_device_shadow(None)
+    return collect.events
+
+
+def _write(logger_cls, directory: str, events: list) -> float:
+    logger = logger_cls(directory)
+    t0 = time.perf_counter()
+    for evt in events:
+        logger.emit(evt)
+    logger.close()
+    return time.perf_counter() - t0
+
+
+def _size(directory: str, suffix: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(directory, n))
+        for n in os.listdir(directory)
+        if n.endswith(suffix)
+    )
+
+
+def main(n: int = 20_000) -> None:
+    events = _trail(n)
+    print(f"{len(events):,} audit events from {n:,} executions")
+    root = tempfile.mkdtemp(prefix="kivai-audit-binary-")
+    try:
+        jdir, bdir = os.path.join(root, "jsonl"), os.path.join(root, "binary")
+        jsonl_s = _write(JsonlAuditLogger, jdir, events)
+        binary_s = _write(BinaryAuditLogger, bdir, events)
+        jsonl_b, idx_b = _size(jdir, ".jsonl"), _size(jdir, ".idx")
+        binary_b = _size(bdir, ".kvau")
+
+        t0 = time.perf_counter()
+        jsonl_records = list(query_audit(jdir, AuditQuery()))
+        jsonl_read = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        binary_records = [
+            r
+            for name in sorted(os.listdir(bdir))
+            for r in read_segment(os.path.join(bdir, name))
+        ]
+        binary_read = time.perf_counter() - t0
+        assert binary_records == jsonl_records, "binary decode differs from JSONL"
+
+        count = len(events)
+        for name, size, extra, write_s, read_s in (
+            ("jsonl", jsonl_b, idx_b, jsonl_s, jsonl_read),
+            ("binary", binary_b, 0, binary_s, binary_read),
+        ):
+            print(
+                f"  {name:<7} {size / count:6.1f} B/event"
+                + (f" (+{extra / count:.1f} index)" if extra else " " * 16)
+                + f"  write {count / write_s:9,.0f} events/s"
+                f"  read {count / read_s:9,.0f} events/s"
+            )
+        print(f"  binary is {jsonl_b / binary_b:.1f}x smaller than JSONL")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,98 @@
+"""
+Cost of a hung device with and without circuit breakers.
+
+    python benchmarks/bench_breakers.py [calls] [hang_ms]
+
+A `toggle` adapter whose device never answers (it sleeps `hang_ms` and then
+reports DEVICE_TIMEOUT) is called sequentially through `execute_intent`.
+Without breakers every call waits out the hang; with breakers the device's
+circuit opens after `min_calls` failures and later calls fail fast with
+DEVICE_UNAVAILABLE. Also reports the breaker overhead on healthy calls.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from kivai_sdk.adapters import AdapterRegistry, AdapterResult, set_adapter_registry
+from kivai_sdk.adapters.capabilities import AdapterCapabilities
+from kivai_sdk.breakers import BreakerConfig, BreakerRegistry, set_breakers
+from kivai_sdk.config import ExecutionConfig
+from kivai_sdk.devices import Device, DeviceRegistry, set_device_registry
+from kivai_sdk.runtime import execute_intent
+
+
+class _Toggle:
+    intent = "toggle"
+
+    def __init__(self, hang_ms: float) -> None:
+        self.hang_ms = hang_ms
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(
+            intent="toggle", required_capabilities=frozenset({"relay"})
+        )
+
+    def execute(self, payload, ctx):
+        if self.hang_ms:
+            time.sleep(self.hang_ms / 1000.0)
+            return AdapterResult.failure("DEVICE_TIMEOUT", "no answer")
+        return {"toggled": True}
+
+
+def _payload(i: int) -> dict:
+    return {
+        "intent_id": f"bench-{i:012d}",
+        "intent": "toggle",
+        "target": {"device_id": "relay-01"},
+        "params": {},
+        "meta": {
+            "timestamp": "2026-02-12T00:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+        },
+    }
+
+
+def _run(n: int, hang_ms: float, breakers: bool) -> tuple[float, dict]:
+    reg = AdapterRegistry.empty()
+    reg.register(_Toggle(hang_ms))
+    set_adapter_registry(reg)
+    set_breakers(BreakerRegistry(BreakerConfig(window=20, min_calls=10)))
+    config = ExecutionConfig(circuit_breakers=breakers)
+    codes: dict = {}
+    payloads = [_payload(i) for i in range(n)]
+    t0 = time.perf_counter()
+    for p in payloads:
+        ack = execute_intent(p, config=config)
+        code = ack["error"]["code"] if ack["status"] == "failed" else "ok"
+        codes[code] = codes.get(code, 0) + 1
+    return time.perf_counter() - t0, codes
+
+
+def main(n: int = 200, hang_ms: float = 50.0) -> None:
+    set_device_registry(
+        DeviceRegistry.from_devices([Device("relay-01", "lab", frozenset({"relay"}))])
+    )
+    print(f"{n} sequential intents to a device that hangs {hang_ms:.0f} ms")
+    for breakers in (False, True):
+        secs, codes = _run(n, hang_ms, breakers)
+        label = "breakers on" if breakers else "breakers off"
+        print(f"  {label:<13} {secs:7.2f} s  {codes}")
+
+    healthy = 20 * n
+    off, _ = _run(healthy, 0, False)
+    on, _ = _run(healthy, 0, True)
+    print(f"healthy device, {healthy} intents")
+    print(f"  breakers off  {off / healthy * 1e6:7.1f} us/intent")
+    print(f"  breakers on   {on / healthy * 1e6:7.1f} us/intent")
+
+    set_breakers(None)
+    set_adapter_registry(None)
+    set_device_registry(None)
+
+
+if __name__ == "__main__":
+    main(*[float(a) if i else int(a) for i, a in enumerate(sys.argv[1:3])])
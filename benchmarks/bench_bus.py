@@ -0,0 +1,97 @@
+"""
+Event bus fan-out cost.
+
+    python benchmarks/bench_bus.py [subscribers]
+
+1. `publish` with 0, 1, 100 and `subscribers` subscribers on the topic, and
+   with `subscribers` subscribers of which only 1% match it: the cost paid
+   by the publisher, and the total per event including the dispatcher's
+   deferred fan-out. Queues are drained between rounds so nothing is
+   dropped.
+2. `execute_intent` (echo) with no subscribers vs `subscribers` subscribers
+   to execution events.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from kivai_sdk.bus import EventBus, set_event_bus
+from kivai_sdk.runtime import execute_intent
+
+ROUND = 200
+
+
+def _publish_us(bus: EventBus, subs: list, n: int) -> tuple:
+    data = {"execution_id": "x", "status": "ok"}
+    publisher = total = 0.0
+    for _ in range(n // ROUND):
+        t0 = time.perf_counter()
+        for _ in range(ROUND):
+            bus.publish("execution.finished", data)
+        publisher += time.perf_counter() - t0
+        bus.flush()
+        total += time.perf_counter() - t0
+        for sub in subs:
+            sub.drain()
+    return publisher / n * 1e6, total / n * 1e6
+
+
+def bench_publish(subscribers: int, n: int = 20_000) -> None:
+    print(f"publish, {n:,} events")
+    for count, matching in (
+        (0, 0),
+        (1, 1),
+        (100, 100),
+        (subscribers, subscribers),
+        (subscribers, subscribers // 100),
+    ):
+        bus = EventBus(max_queue=ROUND)
+        subs = [
+            bus.subscribe(["execution.*"] if i < matching else ["device.*"])
+            for i in range(count)
+        ]
+        publisher, total = _publish_us(bus, subs, n)
+        label = f"{count:,} subscribers, {matching:,} matching"
+        print(
+            f"  {label:<34} publisher {publisher:6.2f} us/event, "
+            f"total {total:7.2f} us/event"
+        )
+
+
+def bench_execute(subscribers: int, n: int = 5000) -> None:
+    payload = {
+        "intent": "echo",
+        "target": {},
+        "params": {"text": "hi"},
+        "meta": {"timestamp": "2026-02-12T00:00:00Z", "language": "en"},
+    }
+    print(f"execute_intent (echo), {n:,} intents")
+    for count in (0, subscribers):
+        bus = EventBus(max_queue=2 * ROUND)
+        set_event_bus(bus)
+        subs = [bus.subscribe(["execution.*"]) for _ in range(count)]
+        elapsed = 0.0
+        for _ in range(n // ROUND):
+            t0 = time.perf_counter()
+            for _ in range(ROUND):
+                execute_intent(dict(payload))
+            bus.flush()
+            elapsed += time.perf_counter() - t0
+            for sub in subs:
+                sub.drain()
+        print(
+            f"  {count:>6,} subscribers  {elapsed / n * 1e6:8.1f} us/intent "
+            "(including delivery)"
+        )
+    set_event_bus(None)
+
+
+def main(subscribers: int = 1000) -> None:
+    bench_publish(subscribers)
+    bench_execute(subscribers)
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,104 @@
+"""
+CLI invocation latency: cold in-process, lazy-import and daemon paths.
+
+    python benchmarks/bench_cli_startup.py [runs]
+
+Every figure is the median wall time of a fresh `python -m kivai_sdk.cli ...`
+process, which is what a shell script calling `kivai` pays per call.
+
+- import only:   `import kivai_sdk.cli` (lazy: no runtime, no jsonschema)
+- list adapters: a command that never touches the runtime
+- cold:          validate/execute with --no-daemon (imports + schema compile)
+- daemon:        validate/execute forwarded to a warm `kivai daemon`
+
+The last line is one request over an already-open daemon connection, the
+floor for callers that keep a DaemonClient around.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PAYLOAD = {
+    "intent_id": "bench-intent-0001",
+    "intent": "set_temperature",
+    "target": {"device_id": "thermostat-living-01"},
+    "params": {"value": 21},
+    "meta": {"timestamp": "2026-02-12T00:00:00Z", "language": "en", "confidence": 1.0},
+}
+
+
+def _median_ms(argv: list[str], env: dict, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run(argv, env=env, stdout=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main(runs: int = 15) -> None:
+    from kivai_sdk.daemon import DaemonClient, DaemonUnavailable
+
+    with tempfile.TemporaryDirectory() as td:
+        payload_path = os.path.join(td, "intent.json")
+        with open(payload_path, "w", encoding="utf-8") as f:
+            json.dump(PAYLOAD, f)
+        sock = os.path.join(td, "kivai.sock")
+        env = dict(os.environ, KIVAI_DAEMON_SOCKET=sock)
+        env.pop("KIVAI_NO_DAEMON", None)
+        cli = [sys.executable, "-m", "kivai_sdk.cli"]
+
+        rows = [
+            ("python startup", [sys.executable, "-c", "pass"]),
+            ("import only", [sys.executable, "-c", "import kivai_sdk.cli"]),
+            ("list adapters", cli + ["list", "adapters"]),
+            ("validate (cold)", cli + ["validate", "--no-daemon", payload_path]),
+            ("execute (cold)", cli + ["execute", "--no-daemon", payload_path]),
+        ]
+        results = [(name, _median_ms(argv, env, runs)) for name, argv in rows]
+
+        daemon = subprocess.Popen(
+            cli + ["daemon", "--socket", sock], stdout=subprocess.DEVNULL
+        )
+        try:
+            deadline = time.monotonic() + 10
+            while True:
+                try:
+                    DaemonClient(sock).close()
+                    break
+                except DaemonUnavailable:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.05)
+
+            for name, argv in (
+                ("validate (daemon)", cli + ["validate", payload_path]),
+                ("execute (daemon)", cli + ["execute", payload_path]),
+            ):
+                results.append((name, _median_ms(argv, env, runs)))
+
+            with DaemonClient(sock) as client:
+                client.call("execute", PAYLOAD)
+                n = 2000
+                t0 = time.perf_counter()
+                for _ in range(n):
+                    client.call("execute", PAYLOAD)
+                per_call_us = (time.perf_counter() - t0) / n * 1e6
+                client.call("shutdown")
+        finally:
+            daemon.wait(timeout=10)
+
+    for name, ms in results:
+        print(f"{name:<22} {ms:8.1f} ms")
+    print(f"{'execute (open conn)':<22} {per_call_us:8.1f} us")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,135 @@
+"""
+Consistent-hash cluster: ring balance, movement, and forwarding cost.
+
+    python benchmarks/bench_cluster.py [requests]
+
+Reports, for 4 nodes and 100k device ids, how evenly each virtual node
+count spreads devices (largest node / mean) and what fraction moves when a
+fifth node joins (ideal: 20%), the cost of one owner lookup, then starts two
+local `kivai serve --cluster-*` nodes and compares intents executed on the
+node that received them with intents forwarded to the other node.
+"""
+
+from __future__ import annotations
+
+import signal
+import socket
+import subprocess
+import sys
+import time
+import timeit
+from collections import Counter
+
+import requests
+
+from kivai_sdk.cluster import HashRing
+
+NODES = [f"http://10.0.0.{i}:8080" for i in range(1, 6)]
+KEYS = [f"device-{i:06d}" for i in range(100_000)]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _music(device_id: str) -> dict:
+    return {
+        "intent_id": f"bench-{device_id}",
+        "intent": "play_music",
+        "target": {"device_id": device_id},
+        "params": {"query": "jazz"},
+        "meta": {
+            "timestamp": "2026-02-12T18:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+            "source": "bench",
+        },
+    }
+
+
+def ring_report() -> None:
+    for vnodes in (1, 16, 64, 128, 256):
+        four = HashRing(NODES[:4], vnodes)
+        five = HashRing(NODES, vnodes)
+        owners = [four.owner(key) for key in KEYS]
+        counts = Counter(owners)
+        moved = sum(five.owner(key) != owner for key, owner in zip(KEYS, owners))
+        print(
+            f"vnodes {vnodes:>3}: max/mean {max(counts.values()) / (len(KEYS) / 4):.2f}, "
+            f"moved on join {moved / len(KEYS):.1%}"
+        )
+    ring = HashRing(NODES)
+    n = 200_000
+    seconds = timeit.timeit(lambda: ring.owner("device-012345"), number=n)
+    print(f"owner lookup: {seconds / n * 1e9:,.0f} ns")
+
+
+def _wait(url: str) -> None:
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            requests.get(f"{url}/health", timeout=1)
+            return
+        except requests.ConnectionError:
+            if time.monotonic() > deadline:
+                raise SystemExit(f"{url} did not start")
+            time.sleep(0.1)
+
+
+def forwarding_report(n: int) -> None:
+    ports = [_free_port(), _free_port()]
+    urls = [f"http://127.0.0.1:{port}" for port in ports]
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "kivai_sdk.cli", "serve", "--port", str(port)]
+            + ["--cluster-self", url, "--cluster-nodes", ",".join(urls)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        for port, url in zip(ports, urls)
+    ]
+    try:
+        for url in urls:
+            _wait(url)
+        ring = HashRing(urls)
+        devices = {"local": [], "forwarded": []}
+        i = 0
+        while min(len(v) for v in devices.values()) < 8:
+            device_id = f"speaker-{i:03d}"
+            kind = "local" if ring.owner(device_id) == urls[0] else "forwarded"
+            devices[kind].append(device_id)
+            for url in urls:
+                requests.put(
+                    f"{url}/v1/devices/{device_id}",
+                    json={"zone": "attic", "capabilities": ["speaker"]},
+                ).raise_for_status()
+            i += 1
+        session = requests.Session()
+        for kind, ids in devices.items():
+            for device_id in ids:  # warm both nodes and the pools
+                session.post(f"{urls[0]}/v1/execute", json=_music(device_id))
+            started = time.perf_counter()
+            for j in range(n):
+                ack = session.post(
+                    f"{urls[0]}/v1/execute", json=_music(ids[j % len(ids)])
+                ).json()
+                assert ack["status"] == "ok", ack
+            elapsed = (time.perf_counter() - started) / n
+            print(f"{kind:>9}: {elapsed * 1e6:,.0f} us per intent")
+    finally:
+        for proc in procs:
+            proc.send_signal(signal.SIGTERM)
+        for proc in procs:
+            proc.wait(timeout=20)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    ring_report()
+    forwarding_report(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Context store lookup cost and follow-up execution overhead.
+
+    python benchmarks/bench_context.py [users]
+
+1. `get` over `users` user entries (all hits), and `put` with LRU eviction
+   once the store is at its memory cap.
+2. `execute_intent` for a complete target with context off vs on, and for a
+   follow-up whose empty target is filled from the user's context.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from kivai_sdk.config import ExecutionConfig
+from kivai_sdk.context import USER, ContextStore, set_context_store
+from kivai_sdk.runtime import execute_intent
+
+
+def _music(target: dict) -> dict:
+    return {
+        "intent_id": "bench-context-0001",
+        "intent": "play_music",
+        "target": target,
+        "params": {"query": "jazz"},
+        "meta": {
+            "timestamp": "2026-02-12T00:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+            "user_id": "bench-user",
+        },
+    }
+
+
+def bench_store(users: int) -> None:
+    target = {"device_id": "speaker-living-02", "zone": "living_room"}
+    store = ContextStore()
+    keys = [f"user-{i:08d}" for i in range(users)]
+    for key in keys:
+        store.put(USER, key, target)
+    t0 = time.perf_counter()
+    for key in keys:
+        store.get(USER, key)
+    get_ns = (time.perf_counter() - t0) / users * 1e9
+
+    capped = ContextStore(max_bytes=users * 100)  # holds ~a third of them
+    t0 = time.perf_counter()
+    for key in keys:
+        capped.put(USER, key, target)
+    put_ns = (time.perf_counter() - t0) / users * 1e9
+    stats = capped.stats()
+    print(f"context store, {users:,} users")
+    print(f"  get (hit)          {get_ns:6.0f} ns")
+    print(
+        f"  put at memory cap  {put_ns:6.0f} ns  "
+        f"({stats['entries']:,} kept, {stats['evictions']:,} evicted)"
+    )
+
+
+def bench_execute(n: int = 5000) -> None:
+    complete = {"capability": "speaker", "zone": "living_room"}
+    rows = []
+    for label, target, config in (
+        ("complete, context off", complete, ExecutionConfig(context=False)),
+        ("complete, context on", complete, ExecutionConfig()),
+        ("follow-up (filled)", {}, ExecutionConfig()),
+    ):
+        set_context_store(ContextStore())
+        execute_intent(_music(dict(complete)))  # seed the user's context
+        payloads = [_music(dict(target)) for _ in range(n)]
+        t0 = time.perf_counter()
+        for p in payloads:
+            ack = execute_intent(p, config=config)
+        assert ack["status"] == "ok", ack
+        rows.append((label, (time.perf_counter() - t0) / n * 1e6))
+    set_context_store(None)
+    print(f"execute_intent, {n:,} intents")
+    for label, us in rows:
+        print(f"  {label:<22} {us:6.1f} us/intent")
+
+
+def main(users: int = 200_000) -> None:
+    bench_store(users)
+    bench_execute()
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,111 @@
+"""
+Device registry persistence at fleet scale.
+
+    python benchmarks/bench_device_store.py [devices]
+
+Reports bulk import rate (JSONL -> SQLite), snapshot write time, and cold
+start for each way of bringing a registry up: re-registering in memory,
+hydrating from SQLite, and mapping the binary snapshot.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from kivai_sdk.devices import (
+    DeviceRegistry,
+    MappedDeviceSnapshot,
+    SQLiteDeviceStore,
+    write_snapshot,
+)
+from kivai_sdk.devices.io import (
+    iter_devices_file,
+    iter_devices_jsonl,
+    write_devices_jsonl,
+)
+from kivai_sdk.devices.models import Device
+
+CAPABILITIES = ["light", "thermostat", "speaker", "lock", "sensor", "blind", "plug"]
+
+
+def _fleet(n: int):
+    rnd = random.Random(7)
+    for i in range(n):
+        yield Device(
+            device_id=f"dev-{i:07d}",
+            zone=f"site-{i % 500:03d}/zone-{rnd.randrange(12):02d}",
+            capabilities=frozenset(rnd.sample(CAPABILITIES, rnd.randint(1, 3))),
+        )
+
+
+def _timed(label: str, fn):
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    print(f"{label:<34} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def main(n: int = 100_000) -> None:
+    with tempfile.TemporaryDirectory() as td:
+        src = os.path.join(td, "fleet.jsonl")
+        db_path = os.path.join(td, "devices.db")
+        snap_path = os.path.join(td, "devices.kvds")
+
+        with open(src, "w", encoding="utf-8") as f:
+            write_devices_jsonl(_fleet(n), f)
+
+        print(f"devices: {n:,}")
+
+        def _import():
+            with SQLiteDeviceStore(db_path) as store:
+                return store.upsert_many(iter_devices_file(src))
+
+        count, elapsed = _timed("import jsonl -> sqlite", _import)
+        print(f"{'  import rate':<34} {count / elapsed:10,.0f} devices/s")
+
+        with SQLiteDeviceStore(db_path) as store:
+            _timed(
+                "write snapshot",
+                lambda: write_snapshot(store.iter_devices(), snap_path),
+            )
+        print(
+            f"{'  snapshot size':<34} {os.path.getsize(snap_path) / n:10.1f} bytes/device"
+        )
+
+        def _reregister():
+            with open(src, encoding="utf-8") as f:
+                return DeviceRegistry.from_devices(iter_devices_jsonl(f))
+
+        _timed("cold start: re-register (jsonl)", _reregister)
+
+        def _hydrate():
+            with SQLiteDeviceStore(db_path) as store:
+                return store.load_registry()
+
+        _timed("cold start: sqlite -> memory", _hydrate)
+
+        snap, _ = _timed(
+            "cold start: map snapshot", lambda: MappedDeviceSnapshot(snap_path)
+        )
+
+        ids = [f"dev-{random.randrange(n):07d}" for _ in range(10_000)]
+        _, elapsed = _timed("snapshot get x10k", lambda: [snap.get(i) for i in ids])
+        print(f"{'  per lookup':<34} {elapsed / len(ids) * 1e6:10.1f} us")
+        _, elapsed = _timed(
+            "snapshot resolve zone+cap x10k",
+            lambda: [
+                snap.resolve(zone=f"site-{i % 500:03d}/zone-03", capability="lock")
+                for i in range(10_000)
+            ],
+        )
+        print(f"{'  per resolve':<34} {elapsed / 10_000 * 1e6:10.1f} us")
+        snap.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,59 @@
+"""
+Fan-out wall time against device latency.
+
+    python benchmarks/bench_fanout.py [devices] [latency_ms]
+
+Each simulated device answers after `latency_ms`. Sequential execution costs
+devices x latency; fan-out should stay close to one latency per
+`fanout_concurrency` wave.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from kivai_sdk.adapters.capabilities import AdapterCapabilities
+from kivai_sdk.config import ExecutionConfig
+from kivai_sdk.devices import Device, DeviceMatch
+from kivai_sdk.fanout import run_fan_out
+from kivai_sdk.request import IntentRequest
+
+
+class _SleepAdapter:
+    intent = "bench"
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def execute(self, payload: dict, ctx) -> dict:
+        time.sleep(self.latency)
+        return {"ok": True}
+
+
+def main(n: int = 24, latency_ms: int = 50) -> None:
+    adapter = _SleepAdapter(latency_ms / 1000.0)
+    caps = AdapterCapabilities(
+        intent="bench", required_capabilities=frozenset(), timeout_ms=60_000
+    )
+    req = IntentRequest.from_payload({"intent": "bench"})
+    matches = [
+        DeviceMatch(
+            Device(f"light-{i:03d}", "living_room", frozenset({"light"})), "zone"
+        )
+        for i in range(n)
+    ]
+
+    print(f"devices: {n}, device latency: {latency_ms} ms")
+    for concurrency in (1, 4, 8, 32):
+        config = ExecutionConfig(fanout_concurrency=concurrency)
+        t0 = time.perf_counter()
+        results = run_fan_out(adapter, {}, req, matches, caps, config)
+        elapsed = (time.perf_counter() - t0) * 1000
+        assert all(r["status"] == "ok" for r in results)
+        print(f"  concurrency {concurrency:>3}: {elapsed:8.1f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
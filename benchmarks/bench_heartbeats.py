@@ -0,0 +1,75 @@
+"""
+Heartbeat ingestion throughput for a large fleet.
+
+    python benchmarks/bench_heartbeats.py [devices] [rounds]
+
+Every device heartbeats once per round; a simulated clock advances between
+rounds so wheel expiry runs as it would in production. A slice of the fleet
+stops heartbeating halfway through to exercise degraded/offline transitions.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from kivai_sdk.devices.health import DEGRADED, OFFLINE, ONLINE, HealthTracker
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def main(n: int = 100_000, rounds: int = 10) -> None:
+    clock = _Clock()
+    tracker = HealthTracker(degraded_after=30, offline_after=90, clock=clock)
+    ids = [f"dev-{i:07d}" for i in range(n)]
+    silent = set(ids[: n // 20])
+
+    single = 0.0
+    batched = 0.0
+    for r in range(rounds):
+        active = ids if r < rounds // 2 else [i for i in ids if i not in silent]
+        half = len(active) // 2
+
+        t0 = time.perf_counter()
+        for device_id in active[:half]:
+            tracker.heartbeat(device_id)
+        single += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for start in range(half, len(active), 1000):
+            tracker.heartbeat_many(active[start : start + 1000])
+        batched += time.perf_counter() - t0
+
+        clock.now += 20
+
+    total_single = sum(
+        (len(ids) if r < rounds // 2 else len(ids) - len(silent)) // 2
+        for r in range(rounds)
+    )
+    total_batched = (
+        sum(
+            (len(ids) if r < rounds // 2 else len(ids) - len(silent))
+            for r in range(rounds)
+        )
+        - total_single
+    )
+
+    counts = tracker.counts()
+    print(f"devices:                {n:,}")
+    print(f"heartbeat():            {total_single / single:12,.0f} /s")
+    print(f"heartbeat_many(1000):   {total_batched / batched:12,.0f} /s")
+    print(
+        f"final status:           online={counts[ONLINE]:,} "
+        f"degraded={counts[DEGRADED]:,} offline={counts[OFFLINE]:,}"
+    )
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
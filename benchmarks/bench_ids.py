@@ -0,0 +1,121 @@
+"""
+Time-ordered ids and cached timestamps vs uuid4/datetime.
+
+    python benchmarks/bench_ids.py [intents]
+
+Times each primitive against what it replaced (str(uuid.uuid4()) and
+datetime.now(timezone.utc).isoformat()), then
+counts how often one `execute_intent` with a JSONL audit log calls them to
+estimate the saving per request, and reports the end-to-end time per
+request.
+"""
+
+from __future__ import annotations
+
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+import uuid
+from datetime import datetime, timezone
+
+from kivai_sdk.audit import JsonlAuditLogger
+from kivai_sdk.clock import utc_now_iso
+from kivai_sdk.ids import new_id
+from kivai_sdk.runtime import execute_intent
+
+PAYLOAD = {
+    "intent": "echo",
+    "target": {"capability": "speaker", "zone": "living_room"},
+    "params": {"text": "hi"},
+    "meta": {
+        "timestamp": "2026-02-12T18:00:00Z",
+        "language": "en",
+        "confidence": 1.0,
+        "source": "bench",
+    },
+}
+
+
+def _uuid4() -> str:
+    return str(uuid.uuid4())
+
+
+def _isoformat() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _ns(fn, *args) -> float:
+    n = 200_000
+    return min(timeit.repeat(lambda: fn(*args), number=n, repeat=3)) / n * 1e9
+
+
+class _Count:
+    def __init__(self, module, name: str) -> None:
+        self.module, self.name, self.calls = module, name, 0
+        self.fn = getattr(module, name)
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.fn(*args)
+
+
+def _calls_per_request(audit_dir: str) -> dict:
+    """
+    Calls of each primitive in one audited execute_intent.
+    """
+    import kivai_sdk.audit.base as audit_base
+    import kivai_sdk.runtime as runtime
+
+    patches = {
+        "ids": [_Count(runtime, "new_id")],
+        "timestamps": [
+            _Count(runtime, "utc_now_iso"),
+            _Count(audit_base, "utc_now_iso"),
+        ],
+    }
+    for counters in patches.values():
+        for c in counters:
+            setattr(c.module, c.name, c)
+    logger = JsonlAuditLogger(audit_dir)
+    try:
+        execute_intent(dict(PAYLOAD), audit=logger)
+    finally:
+        logger.close()
+        for counters in patches.values():
+            for c in counters:
+                setattr(c.module, c.name, c.fn)
+    return {k: sum(c.calls for c in v) for k, v in patches.items()}
+
+
+def main(n: int = 20_000) -> None:
+    rows = (
+        ("ids", _ns(_uuid4), _ns(new_id), "uuid4", "new_id"),
+        ("timestamps", _ns(_isoformat), _ns(utc_now_iso), "isoformat", "utc_now_iso"),
+    )
+    root = tempfile.mkdtemp(prefix="kivai-ids-")
+    try:
+        calls = _calls_per_request(root + "/count")
+        saved = 0.0
+        for key, old_ns, new_ns, old_name, new_name in rows:
+            saved += calls[key] * (old_ns - new_ns)
+            print(
+                f"  {old_name:<14} {old_ns:7.0f} ns   {new_name:<15} {new_ns:7.0f} ns"
+                f"   x{calls[key]} per request"
+            )
+        print(f"  saved per audited request: {saved / 1000:.1f} us")
+
+        logger = JsonlAuditLogger(root + "/run")
+        t0 = time.perf_counter()
+        for _ in range(n):
+            execute_intent(dict(PAYLOAD), audit=logger)
+        elapsed = time.perf_counter() - t0
+        logger.close()
+        print(f"  execute_intent + JSONL audit: {elapsed / n * 1e6:.1f} us/request")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,71 @@
+"""
+Cost of process-isolated adapter calls.
+
+    python benchmarks/bench_isolation.py [calls]
+
+Runs the echo adapter in-process and through an isolated pool (one worker,
+sequential calls) and reports per-call latency, i.e. the IPC round trip
+(pickle of payload + parsed request, pipe, unpickle of the result).
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from kivai_sdk.adapters import (
+    AdapterContext,
+    BUILTIN_ADAPTER_SPECS,
+    IsolatedAdapter,
+    IsolationLimits,
+)
+from kivai_sdk.request import IntentRequest
+
+
+def _payload(i: int) -> dict:
+    return {
+        "intent_id": f"bench-{i:012d}",
+        "intent": "echo",
+        "target": {"capability": "speaker", "zone": "living_room"},
+        "params": {"message": "hola"},
+        "meta": {
+            "timestamp": "2026-02-12T00:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+            "source": "bench",
+        },
+    }
+
+
+def _per_call_us(adapter, n: int) -> float:
+    calls = [_payload(i) for i in range(n)]
+    ctxs = [AdapterContext(request=IntentRequest.from_payload(p)) for p in calls]
+    t0 = time.perf_counter()
+    for payload, ctx in zip(calls, ctxs):
+        adapter.execute(payload, ctx)
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main(n: int = 20000) -> None:
+    spec = next(s for s in BUILTIN_ADAPTER_SPECS if s.intent == "echo")
+    local = spec.load()
+    isolated = IsolatedAdapter(spec, IsolationLimits(pool_size=1, max_calls=10**9))
+    t0 = time.perf_counter()
+    isolated.pool.start()
+    warm_ms = (time.perf_counter() - t0) * 1000
+    try:
+        _per_call_us(isolated, 200)
+        rows = [
+            ("in-process", _per_call_us(local, n)),
+            ("isolated (1 worker)", _per_call_us(isolated, n)),
+        ]
+    finally:
+        isolated.pool.close()
+
+    print(f"echo adapter, {n} sequential calls (pool warm-up {warm_ms:.0f} ms)")
+    for name, us in rows:
+        print(f"  {name:<20} {us:8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
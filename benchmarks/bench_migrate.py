@@ -0,0 +1,73 @@
+"""
+Bulk legacy migration throughput and memory.
+
+    python benchmarks/bench_migrate.py [records]
+
+Writes an archive of `records` mock-device commands (thermostat, light and
+motion; 5% without a location, which are rejected), migrates it with one
+and with CPU-count workers, and reports records/s. Peak Python heap of the
+in-process migration is measured for the archive and for a tenth of it, to
+show memory does not grow with the archive.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+from kivai_sdk.migrate import migrate_file
+
+COMMANDS = (
+    {"command": "set temperature", "object": "thermostat", "temperature": 21},
+    {"command": "turn on", "object": "light"},
+    {"command": "turn off", "object": "light"},
+    {"command": "set", "object": "thermostat", "value": 19},
+)
+LOCATIONS = ("living room", "kitchen", "bedroom", "office")
+
+
+def _archive(path: str, n: int) -> None:
+    rng = random.Random(11)
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(n):
+            cmd = dict(rng.choice(COMMANDS), trigger="Kivai")
+            if rng.random() >= 0.05:
+                cmd["location"] = rng.choice(LOCATIONS)
+            f.write(json.dumps(cmd) + "\n")
+
+
+def _peak_heap(src: str, out: str) -> int:
+    tracemalloc.start()
+    migrate_file(src, out, workers=1)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main(n: int = 200_000) -> None:
+    root = tempfile.mkdtemp(prefix="kivai-migrate-")
+    try:
+        src, small = os.path.join(root, "in.jsonl"), os.path.join(root, "small.jsonl")
+        out, rejects = os.path.join(root, "out.jsonl"), os.path.join(root, "rej.jsonl")
+        _archive(src, n)
+        _archive(small, n // 10)
+        size_mb = os.path.getsize(src) / 1e6
+        print(f"{n:,} legacy records ({size_mb:.1f} MB)")
+        for workers in sorted({1, os.cpu_count() or 1}):
+            report = migrate_file(src, out, rejects, workers=workers)
+            print(f"  workers={workers:<3} {report.format_text()}")
+        print(
+            f"  peak heap: {_peak_heap(small, out) / 1e6:.2f} MB for {n // 10:,} records,"
+            f" {_peak_heap(src, out) / 1e6:.2f} MB for {n:,}"
+        )
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
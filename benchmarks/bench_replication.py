@@ -0,0 +1,139 @@
+"""
+Registry replication: delta catch-up vs snapshot reload.
+
+    python benchmarks/bench_replication.py [devices] [changes]
+
+Fills a primary registry with `devices` devices, brings a replica up to
+date from a snapshot, then applies `changes` upserts/deletes on the primary
+and measures what the replica transfers (JSON bytes, as on the wire) and
+how long it takes to catch up from deltas, against reloading a snapshot
+(the full-reload approach replication replaces).
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import sys
+import time
+
+from kivai_sdk.devices import (
+    Device,
+    DeviceRegistry,
+    RegistryLog,
+    RegistryReplica,
+    record_change,
+    set_device_registry,
+    set_registry_log,
+)
+from kivai_sdk.devices.replication import DEFAULT_BATCH
+
+CAPABILITIES = ("thermostat", "light", "lock", "speaker", "sensor")
+
+
+class WireCounter:
+    """
+    Serves replication requests from `log` in-process, counting the JSON
+    bytes an HTTP transport would carry.
+    """
+
+    def __init__(self, log: RegistryLog) -> None:
+        self.log = log
+        self.bytes = 0
+
+    def __call__(self, path: str):
+        from urllib.parse import parse_qs, urlsplit
+
+        parts = urlsplit(path)
+        if parts.path.endswith("/snapshot"):
+            body = self.log.snapshot()
+            status = 200
+        else:
+            q = {k: v[0] for k, v in parse_qs(parts.query).items()}
+            changes = self.log.since(
+                int(q["since"]), q.get("epoch"), int(q.get("limit", DEFAULT_BATCH))
+            )
+            status = 410 if changes is None else 200
+            body = {"epoch": self.log.epoch, "seq": self.log.seq, "changes": changes}
+        data = json.dumps(body, separators=(",", ":"))
+        self.bytes += len(data)
+        return status, json.loads(data)
+
+
+def _apply_to(registry: DeviceRegistry):
+    def apply(change: dict) -> None:
+        if change["op"] == "upsert":
+            d = change["device"]
+            registry.upsert(
+                Device(d["device_id"], d["zone"], frozenset(d["capabilities"]))
+            )
+        else:
+            registry.delete(change["device_id"])
+
+    return apply
+
+
+def main() -> None:
+    devices = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rng = random.Random(7)
+    primary = DeviceRegistry.empty()
+    log = RegistryLog()
+    set_device_registry(primary)
+    set_registry_log(log)
+    for i in range(devices):
+        primary.upsert(
+            Device(f"dev-{i:07d}", f"room-{i % 50}", frozenset({CAPABILITIES[i % 5]}))
+        )
+
+    copy = DeviceRegistry.empty()
+    wire = WireCounter(log)
+    replica = RegistryReplica(wire, apply=_apply_to(copy), registry=copy)
+    started = time.perf_counter()
+    replica.catch_up()
+    initial = time.perf_counter() - started
+    print(
+        f"{devices:,} devices, initial snapshot: {wire.bytes / 1e6:.1f} MB, "
+        f"{initial * 1e3:,.0f} ms"
+    )
+
+    for _ in range(changes):
+        device_id = f"dev-{rng.randrange(devices):07d}"
+        if rng.random() < 0.2:
+            record_change({"op": "delete", "device_id": device_id})
+        else:
+            record_change(
+                {
+                    "op": "upsert",
+                    "device": {
+                        "device_id": device_id,
+                        "zone": f"room-{rng.randrange(50)}",
+                        "capabilities": [rng.choice(CAPABILITIES)],
+                    },
+                }
+            )
+
+    wire.bytes = 0
+    started = time.perf_counter()
+    applied = replica.catch_up()
+    delta = time.perf_counter() - started
+    delta_bytes = wire.bytes
+    assert applied == changes
+
+    reload_copy = DeviceRegistry.empty()
+    wire.bytes = 0
+    started = time.perf_counter()
+    RegistryReplica(wire, apply=_apply_to(reload_copy), registry=reload_copy).sync()
+    reload = time.perf_counter() - started
+    assert {d.device_id for d in copy.all()} == {d.device_id for d in primary.all()}
+    print(
+        f"{changes} changes: deltas {delta_bytes / 1e3:,.0f} KB in "
+        f"{delta * 1e3:,.1f} ms; snapshot reload {wire.bytes / 1e6:.1f} MB in "
+        f"{reload * 1e3:,.0f} ms"
+    )
+    set_device_registry(None)
+    set_registry_log(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Rules engine matching and event throughput.
+
+    python benchmarks/bench_rules.py [rules]
+
+1. `match` against `rules` rules spread over event types, zones and devices,
+   compared with a linear scan over the same rules.
+2. `handle` end to end (match + cooldown + payload build) with a no-op
+   executor, and through the runtime with the default mock devices.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from kivai_sdk.rules import DeviceEvent, Rule, RulesEngine
+
+TYPES = ("motion", "door_open", "door_close", "temperature", "humidity", "button")
+
+
+def _rules(n: int, zones: int, devices: int) -> list:
+    rng = random.Random(40)
+    out = []
+    for i in range(n):
+        raw = {
+            "rule_id": f"rule-{i:06d}",
+            "event": rng.choice(TYPES),
+            "intent": {"intent": "echo", "target": {}, "params": {"z": "{zone}"}},
+        }
+        shape = rng.random()
+        if shape < 0.6:
+            raw["zone"] = f"zone-{rng.randrange(zones)}"
+        elif shape < 0.999:  # a handful of catch-all rules per type
+            raw["device_id"] = f"dev-{rng.randrange(devices)}"
+        if rng.random() < 0.3:
+            raw["window"] = ["18:00", "06:00"]
+        out.append(Rule.from_dict(raw))
+    return out
+
+
+def _events(n: int, zones: int, devices: int) -> list:
+    rng = random.Random(41)
+    return [
+        DeviceEvent.from_dict(
+            {
+                "type": rng.choice(TYPES),
+                "zone": f"zone-{rng.randrange(zones)}",
+                "device_id": f"dev-{rng.randrange(devices)}",
+                "timestamp": "2026-02-12T21:00:00",
+            }
+        )
+        for _ in range(n)
+    ]
+
+
+def _linear(rules: list, event: DeviceEvent) -> list:
+    now = event.time_of_day()
+    return [
+        r
+        for r in rules
+        if r.event == event.type
+        and r.zone in (None, event.zone)
+        and r.device_id in (None, event.device_id)
+        and r.in_window(now)
+    ]
+
+
+def bench_match(n_rules: int, n_events: int = 20_000) -> None:
+    zones, devices = max(1, n_rules // 20), max(1, n_rules // 4)
+    rules = _rules(n_rules, zones, devices)
+    events = _events(n_events, zones, devices)
+    engine = RulesEngine(rules, execute=lambda p: {"status": "ok"})
+
+    t0 = time.perf_counter()
+    matched = sum(len(engine.match(e)) for e in events)
+    indexed = time.perf_counter() - t0
+
+    sample = events[:50]
+    t0 = time.perf_counter()
+    expected = sum(len(_linear(rules, e)) for e in sample)
+    scan = (time.perf_counter() - t0) / len(sample)
+    assert expected == sum(len(engine.match(e)) for e in sample)
+
+    print(f"match, {n_rules:,} rules, {n_events:,} events")
+    print(
+        f"  indexed      {n_events / indexed:>10,.0f} events/s "
+        f"({matched / n_events:.2f} matches/event)"
+    )
+    print(f"  linear scan  {1 / scan:>10,.0f} events/s")
+
+
+def bench_handle(n_rules: int, n_events: int = 20_000) -> None:
+    zones, devices = max(1, n_rules // 20), max(1, n_rules // 4)
+    events = _events(n_events, zones, devices)
+    engine = RulesEngine(
+        _rules(n_rules, zones, devices), execute=lambda p: {"status": "ok"}
+    )
+    t0 = time.perf_counter()
+    for e in events:
+        engine.handle(e)
+    elapsed = time.perf_counter() - t0
+    stats = engine.stats()
+    print(f"handle, no-op executor, {n_rules:,} rules")
+    print(
+        f"  {n_events / elapsed:>10,.0f} events/s "
+        f"({stats['emitted'] / elapsed:,.0f} intents/s)"
+    )
+
+    living = Rule.from_dict(
+        {
+            "rule_id": "living-motion",
+            "event": "motion",
+            "zone": "living_room",
+            "intent": {
+                "intent": "play_music",
+                "target": {"capability": "speaker", "zone": "{zone}"},
+                "params": {"query": "ambient"},
+            },
+        }
+    )
+    engine = RulesEngine([living, *_rules(n_rules, zones, devices)])
+    event = DeviceEvent("motion", "pir-1", "living_room")
+    n = 2000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fired = engine.handle(event)
+    assert all(f["ack"]["status"] == "ok" for f in fired), fired
+    elapsed = time.perf_counter() - t0
+    print(
+        f"handle, runtime executor: {n / elapsed:,.0f} events/s "
+        f"({len(fired)} intents/event)"
+    )
+
+
+def main(n_rules: int = 50_000) -> None:
+    bench_match(n_rules)
+    bench_handle(n_rules)
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,140 @@
+"""
+Scheduler throughput and firing lateness.
+
+    python benchmarks/bench_scheduler.py [entries]
+
+1. Timing wheel: insert `entries` ids due over the next 24 h, cancel 10% of
+   them, then advance through the whole day in one-second steps.
+2. SQLite store: bulk-schedule 100k intents, reopen and reload the wheel.
+3. Firing: 2,000 echo intents due over 2 s, fired through the runtime while
+   another thread executes intents back to back; reports late_ms.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+from kivai_sdk.runtime import execute_intent
+from kivai_sdk.scheduler import (
+    HierarchicalTimingWheel,
+    ScheduledIntent,
+    Scheduler,
+    SQLiteScheduleStore,
+)
+
+
+def _echo(i: int) -> dict:
+    return {
+        "intent_id": f"bench-{i:012d}",
+        "intent": "echo",
+        "target": {"capability": "speaker", "zone": "living_room"},
+        "params": {"message": "hola"},
+        "meta": {
+            "timestamp": "2026-02-12T00:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+        },
+    }
+
+
+def _rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench_wheel(n: int) -> None:
+    rng = random.Random(7)
+    keys = [f"sch-{i:016x}" for i in range(n)]
+    deadlines = [rng.uniform(0, 86400) for _ in range(n)]
+    rss0 = _rss_mb()
+    wheel = HierarchicalTimingWheel(now=0.0)
+    t0 = time.perf_counter()
+    for key, at in zip(keys, deadlines):
+        wheel.schedule(key, at)
+    insert = time.perf_counter() - t0
+    rss = _rss_mb() - rss0
+
+    t0 = time.perf_counter()
+    for key in keys[::10]:
+        wheel.cancel(key)
+    cancel = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fired = 0
+    for second in range(1, 86401):
+        fired += len(wheel.advance(second))
+    drain = time.perf_counter() - t0
+
+    print(f"timing wheel, {n:,} entries due over 24 h")
+    print(f"  insert   {insert / n * 1e9:7.0f} ns/entry   (+{rss:.0f} MB RSS)")
+    print(f"  cancel   {cancel / len(keys[::10]) * 1e9:7.0f} ns/entry")
+    print(f"  advance  {drain:7.2f} s for 86,400 steps, {fired:,} fired")
+
+
+def bench_store(n: int = 100_000) -> None:
+    with tempfile.TemporaryDirectory() as td:
+        path = os.path.join(td, "schedules.db")
+        now = time.time()
+        entries = [
+            ScheduledIntent(f"sch-{i:016x}", now + 3600 + i, _echo(i), now)
+            for i in range(n)
+        ]
+        scheduler = Scheduler(SQLiteScheduleStore(path), workers=0)
+        t0 = time.perf_counter()
+        scheduler.schedule_many(entries)
+        write = time.perf_counter() - t0
+        scheduler.close()
+
+        t0 = time.perf_counter()
+        scheduler = Scheduler(SQLiteScheduleStore(path), workers=0)
+        load = time.perf_counter() - t0
+        assert len(scheduler) == n
+        scheduler.close()
+    print(f"SQLite store, {n:,} intents")
+    print(f"  schedule_many  {n / write:9,.0f} intents/s")
+    print(f"  restart load   {load * 1000:9.0f} ms")
+
+
+def bench_firing(n: int = 2000, spread: float = 2.0) -> None:
+    stop = threading.Event()
+    background = [0]
+
+    def load() -> None:
+        i = 0
+        while not stop.is_set():
+            execute_intent(_echo(i))
+            i += 1
+        background[0] = i
+
+    scheduler = Scheduler().start()
+    noise = threading.Thread(target=load)
+    noise.start()
+    start = time.time() + 0.2
+    for i in range(n):
+        scheduler.schedule(_echo(i), execute_at=start + spread * i / n)
+    while scheduler.stats()["fired"] < n:
+        time.sleep(0.05)
+    stop.set()
+    noise.join()
+    scheduler.stop()
+    late = scheduler.stats()["late_ms"]
+    print(f"firing {n:,} intents over {spread:.0f} s under load")
+    print(
+        f"  late_ms p50 {late['p50']:.2f}  p99 {late['p99']:.2f}  max {late['max']:.2f}"
+    )
+    print(f"  background intents executed meanwhile: {background[0]:,}")
+
+
+def main(n: int = 1_000_000) -> None:
+    bench_wheel(n)
+    bench_store()
+    bench_firing()
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
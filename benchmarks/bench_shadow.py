@@ -0,0 +1,112 @@
+"""
+Repeated identical state through the device state shadow.
+
+    python benchmarks/bench_shadow.py [intents] [device_ms]
+
+A routine re-sends `set_level` with the same level to one dimmer whose
+adapter takes `device_ms` per call (the round trip to a real device). With
+`shadow_no_op` only the first call reaches the adapter; the rest are
+answered `no_op` from the shadow. Also reports the shadow's read cost.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from kivai_sdk.adapters import AdapterRegistry, set_adapter_registry
+from kivai_sdk.adapters.capabilities import AdapterCapabilities
+from kivai_sdk.config import ExecutionConfig
+from kivai_sdk.devices import (
+    Device,
+    DeviceRegistry,
+    DeviceShadow,
+    set_device_registry,
+    set_device_shadow,
+)
+from kivai_sdk.runtime import execute_intent
+
+
+class _SetLevel:
+    intent = "set_level"
+
+    def __init__(self, device_ms: float) -> None:
+        self.device_ms = device_ms
+        self.calls = 0
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(
+            intent="set_level", required_capabilities=frozenset({"dimmer"})
+        )
+
+    def desired_state(self, payload, ctx):
+        return {"level": payload["params"]["level"]}
+
+    def execute(self, payload, ctx):
+        self.calls += 1
+        time.sleep(self.device_ms / 1000.0)
+        return {"level": payload["params"]["level"]}
+
+
+def _payload(i: int) -> dict:
+    return {
+        "intent_id": f"bench-{i:012d}",
+        "intent": "set_level",
+        "target": {"device_id": "dimmer-01"},
+        "params": {"level": 40},
+        "meta": {"timestamp": "2026-02-12T00:00:00Z", "language": "en"},
+    }
+
+
+def bench_no_op(n: int, device_ms: float) -> None:
+    print(f"{n} identical set_level intents, device round trip {device_ms:.0f} ms")
+    for no_op in (False, True):
+        adapter = _SetLevel(device_ms)
+        reg = AdapterRegistry.empty()
+        reg.register(adapter)
+        set_adapter_registry(reg)
+        set_device_shadow(DeviceShadow())
+        config = ExecutionConfig(shadow_no_op=no_op)
+        payloads = [_payload(i) for i in range(n)]
+        t0 = time.perf_counter()
+        for p in payloads:
+            execute_intent(p, config=config)
+        elapsed = time.perf_counter() - t0
+        print(
+            f"  shadow_no_op={str(no_op):<5}  {elapsed:7.3f} s  "
+            f"{elapsed / n * 1e6:9.1f} us/intent  adapter calls {adapter.calls}"
+        )
+    set_adapter_registry(None)
+    set_device_shadow(None)
+
+
+def bench_read(devices: int = 100_000) -> None:
+    shadow = DeviceShadow()
+    ids = [f"dev-{i:08d}" for i in range(devices)]
+    for device_id in ids:
+        shadow.update(device_id, {"level": 40, "on": True})
+    t0 = time.perf_counter()
+    for device_id in ids:
+        shadow.describe(device_id)
+    describe_ns = (time.perf_counter() - t0) / devices * 1e9
+    t0 = time.perf_counter()
+    for device_id in ids:
+        shadow.matches(device_id, {"level": 40}, 300.0)
+    match_ns = (time.perf_counter() - t0) / devices * 1e9
+    print(f"shadow of {devices:,} devices")
+    print(f"  describe (GET state body)  {describe_ns:6.0f} ns")
+    print(f"  matches (no-op check)      {match_ns:6.0f} ns")
+
+
+def main(n: int = 200, device_ms: float = 20.0) -> None:
+    set_device_registry(
+        DeviceRegistry.from_devices([Device("dimmer-01", "lab", frozenset({"dimmer"}))])
+    )
+    bench_no_op(n, device_ms)
+    set_device_registry(None)
+    bench_read()
+
+
+if __name__ == "__main__":
+    main(*[float(a) if i else int(a) for i, a in enumerate(sys.argv[1:3])])
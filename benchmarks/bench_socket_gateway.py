@@ -0,0 +1,143 @@
+"""
+Gateway throughput: HTTP vs framed Unix socket.
+
+    python benchmarks/bench_socket_gateway.py [requests]
+
+Starts `kivai serve --uds` (one process, both listeners, shared runtime) and
+drives the same echo intent through:
+
+- HTTP keep-alive, one request at a time (requests.Session)
+- Unix socket, one request at a time, JSON and msgpack frames
+- Unix socket, pipelined (64 in flight), JSON and msgpack frames
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from kivai_sdk.socket_gateway import (
+    CODEC_JSON,
+    CODEC_MSGPACK,
+    FramedClient,
+    msgpack,
+)
+
+
+def _payload(i: int) -> dict:
+    return {
+        "intent_id": f"bench-{i:012d}",
+        "intent": "echo",
+        "target": {"capability": "speaker", "zone": "living_room"},
+        "params": {"message": "hola"},
+        "meta": {
+            "timestamp": "2026-02-12T00:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+            "source": "bench",
+        },
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rate(n: int, fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - t0)
+
+
+def main(n: int = 5000) -> None:
+    with tempfile.TemporaryDirectory() as td:
+        sock = os.path.join(td, "gw.sock")
+        port = _free_port()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "kivai_sdk.cli", "serve"]
+            + ["--port", str(port), "--uds", sock],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            url = f"http://127.0.0.1:{port}"
+            deadline = time.monotonic() + 20
+            while True:
+                try:
+                    requests.get(f"{url}/health", timeout=1)
+                    if os.path.exists(sock):
+                        break
+                except requests.ConnectionError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("gateway did not start")
+                time.sleep(0.1)
+
+            rows = []
+            with requests.Session() as http:
+                http.post(f"{url}/v1/execute", json=_payload(0))
+                rows.append(
+                    (
+                        "HTTP keep-alive",
+                        _rate(
+                            n,
+                            lambda: [
+                                http.post(f"{url}/v1/execute", json=_payload(i))
+                                for i in range(n)
+                            ],
+                        ),
+                    )
+                )
+
+            codecs = [("json", CODEC_JSON)]
+            if msgpack is not None:
+                codecs.append(("msgpack", CODEC_MSGPACK))
+            for name, codec in codecs:
+                with FramedClient(sock, codec=codec) as client:
+                    client.execute(_payload(0))
+                    rows.append(
+                        (
+                            f"UDS {name}, sequential",
+                            _rate(
+                                n,
+                                lambda: [client.execute(_payload(i)) for i in range(n)],
+                            ),
+                        )
+                    )
+                    acks: dict = {}
+                    rows.append(
+                        (
+                            f"UDS {name}, pipelined",
+                            _rate(
+                                n,
+                                lambda: acks.update(
+                                    client.execute_many(
+                                        (_payload(i) for i in range(n)), window=64
+                                    )
+                                ),
+                            ),
+                        )
+                    )
+                    assert len(acks) == n and all(
+                        a["status"] == "ok" for a in acks.values()
+                    )
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    base = rows[0][1]
+    print(f"echo intents: {n}")
+    for name, rate in rows:
+        print(f"  {name:<26} {rate:10,.0f} req/s  ({rate / base:4.1f}x HTTP)")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
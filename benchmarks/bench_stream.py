@@ -0,0 +1,120 @@
+"""
+Sustained intents/s on one connection: HTTP keep-alive vs /v1/stream.
+
+    python benchmarks/bench_stream.py [requests]
+
+Starts `kivai serve` and drives the same echo intent through:
+
+- HTTP keep-alive, one request at a time (requests.Session)
+- /v1/stream, one intent at a time (send, wait for its ACK)
+- /v1/stream, pipelined up to the server's max_in_flight window
+
+Needs the `websockets` package (client here, and for uvicorn to serve
+WebSockets at all).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+
+import requests
+import websockets
+
+
+def _payload(i: int) -> dict:
+    return {
+        "intent_id": f"bench-{i:012d}",
+        "intent": "echo",
+        "target": {"capability": "speaker", "zone": "living_room"},
+        "params": {"message": "hola"},
+        "meta": {
+            "timestamp": "2026-02-12T00:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+            "source": "bench",
+        },
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _stream_sequential(uri: str, n: int) -> float:
+    async with websockets.connect(uri) as ws:
+        await ws.recv()  # hello
+        t0 = time.perf_counter()
+        for i in range(n):
+            await ws.send(json.dumps(_payload(i)))
+            await ws.recv()
+        return n / (time.perf_counter() - t0)
+
+
+async def _stream_pipelined(uri: str, n: int) -> float:
+    async with websockets.connect(uri) as ws:
+        window = json.loads(await ws.recv())["max_in_flight"]
+        t0 = time.perf_counter()
+        sent = received = 0
+        seen = set()
+        while received < n:
+            while sent < n and sent - received < window:
+                await ws.send(json.dumps(_payload(sent)))
+                sent += 1
+            ack = json.loads(await ws.recv())
+            assert ack["status"] == "ok", ack
+            seen.add(ack["intent_id"])
+            received += 1
+        rate = n / (time.perf_counter() - t0)
+    assert len(seen) == n
+    return rate
+
+
+def main(n: int = 5000) -> None:
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "kivai_sdk.cli", "serve", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 20
+        while True:
+            try:
+                requests.get(f"{url}/health", timeout=1)
+                break
+            except requests.ConnectionError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("gateway did not start")
+                time.sleep(0.1)
+
+        rows = []
+        with requests.Session() as http:
+            http.post(f"{url}/v1/execute", json=_payload(0))
+            t0 = time.perf_counter()
+            for i in range(n):
+                http.post(f"{url}/v1/execute", json=_payload(i))
+            rows.append(("HTTP keep-alive", n / (time.perf_counter() - t0)))
+
+        uri = f"ws://127.0.0.1:{port}/v1/stream"
+        rows.append(("stream, sequential", asyncio.run(_stream_sequential(uri, n))))
+        rows.append(("stream, pipelined", asyncio.run(_stream_pipelined(uri, n))))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    base = rows[0][1]
+    print(f"echo intents: {n}")
+    for name, rate in rows:
+        print(f"  {name:<22} {rate:10,.0f} intents/s  ({rate / base:4.1f}x HTTP)")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
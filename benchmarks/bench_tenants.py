@@ -0,0 +1,135 @@
+"""
+Multi-tenant state: resident size per tenant, cold vs warm executions.
+
+    python benchmarks/bench_tenants.py [tenants] [devices_per_tenant]
+
+Builds `tenants` homes of `devices_per_tenant` SQLite-backed devices,
+measures with tracemalloc what one loaded tenant holds (to check
+TENANT_BYTES / DEVICE_BYTES in kivai_sdk/tenants.py), then times the first
+execution for each tenant (a cold load from its store) against repeated
+ones (warm), and cycles every tenant through a budget that holds a tenth of
+them.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from kivai_sdk.devices import Device, SQLiteDeviceStore
+from kivai_sdk.runtime import execute_intent
+from kivai_sdk.tenants import (
+    DEVICE_BYTES,
+    TENANT_BYTES,
+    TenantDirectory,
+    load_tenant,
+    set_tenant_directory,
+)
+
+CAPABILITIES = ("thermostat", "light", "lock", "speaker", "sensor")
+
+
+def _payload(tenant_id: str) -> dict:
+    return {
+        "intent": "set_temperature",
+        "target": {"device_id": f"{tenant_id}-d0"},
+        "params": {"value": 21},
+        "meta": {
+            "timestamp": "2026-02-12T18:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+            "source": "bench",
+            "tenant_id": tenant_id,
+        },
+    }
+
+
+def _build(root: str, tenants: int, devices: int, prefix: str = "home") -> list[str]:
+    ids = []
+    for t in range(tenants):
+        tenant_id = f"{prefix}-{t:05d}"
+        os.makedirs(os.path.join(root, tenant_id))
+        with SQLiteDeviceStore(os.path.join(root, tenant_id, "devices.db")) as store:
+            store.upsert_many(
+                Device(
+                    f"{tenant_id}-d{i}",
+                    f"room-{i % 8}",
+                    frozenset({"thermostat" if i == 0 else CAPABILITIES[i % 5]}),
+                )
+                for i in range(devices)
+            )
+        ids.append(tenant_id)
+    return ids
+
+
+def _resident_bytes(root: str, tenant_id: str) -> int:
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    tenant = load_tenant(root, tenant_id)
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del tenant
+    return size
+
+
+def main() -> None:
+    tenants = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    devices = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    root = tempfile.mkdtemp(prefix="kivai-bench-tenants-")
+    try:
+        ids = _build(root, tenants, devices)
+        one = _resident_bytes(root, _build(root, 1, 1, "one")[0])
+        many = _resident_bytes(root, _build(root, 1, 501, "many")[0])
+        per_device = (many - one) / 500
+        print(
+            f"resident: {one - per_device:,.0f} B/tenant + {per_device:,.0f} B/device "
+            f"(estimates: {TENANT_BYTES:,} + {DEVICE_BYTES:,})"
+        )
+
+        directory = TenantDirectory(root)
+        set_tenant_directory(directory)
+        execute_intent(_payload(ids[0]))  # warm imports and validator
+        directory.evict(ids[0])
+
+        started = time.perf_counter()
+        for tenant_id in ids:
+            ack = execute_intent(_payload(tenant_id))
+            assert ack["status"] == "ok", ack
+        cold = (time.perf_counter() - started) / len(ids)
+        started = time.perf_counter()
+        rounds = 5
+        for _ in range(rounds):
+            for tenant_id in ids:
+                execute_intent(_payload(tenant_id))
+        warm = (time.perf_counter() - started) / (len(ids) * rounds)
+        print(
+            f"{tenants} tenants x {devices} devices: cold {cold * 1e6:,.0f} us, "
+            f"warm {warm * 1e6:,.0f} us per execution"
+        )
+        stats = directory.stats()
+        print(f"all loaded: {stats['bytes'] / 1024:,.0f} KiB estimated")
+
+        budget = stats["bytes"] // 10
+        directory = TenantDirectory(root, memory_budget=budget)
+        set_tenant_directory(directory)
+        started = time.perf_counter()
+        for _ in range(2):
+            for tenant_id in ids:
+                execute_intent(_payload(tenant_id))
+        churn = (time.perf_counter() - started) / (len(ids) * 2)
+        stats = directory.stats()
+        print(
+            f"budget {budget / 1024:,.0f} KiB: {stats['loaded']} loaded, "
+            f"{stats['evictions']} evictions, {churn * 1e6:,.0f} us per execution"
+        )
+    finally:
+        set_tenant_directory(None)
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
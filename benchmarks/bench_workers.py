@@ -0,0 +1,101 @@
+"""
+Gateway throughput vs `kivai serve --workers N` on CPU-bound validation.
+
+    python benchmarks/bench_workers.py [requests] [max_workers]
+
+For N = 1, 2, 4, ... up to max_workers (default: CPU count), starts
+`kivai serve --workers N` and posts the same payload to /v1/validate from
+2*N concurrent client processes (keep-alive sessions). Scaling is bounded by
+the cores left over for the load generator; run it on the hub itself.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import requests
+
+PAYLOAD = {
+    "intent_id": "bench-000000000000",
+    "intent": "set_temperature",
+    "target": {"capability": "thermostat", "zone": "living_room"},
+    "params": {"value": 21, "unit": "celsius"},
+    "meta": {
+        "timestamp": "2026-02-12T00:00:00Z",
+        "language": "en",
+        "confidence": 1.0,
+        "source": "bench",
+    },
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _client(args: tuple[str, int]) -> int:
+    url, n = args
+    with requests.Session() as http:
+        for _ in range(n):
+            http.post(f"{url}/v1/validate", json=PAYLOAD).raise_for_status()
+    return n
+
+
+def _run(workers: int, n: int) -> float:
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "kivai_sdk.cli", "serve"]
+        + ["--port", str(port), "--workers", str(workers)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                requests.get(f"{url}/health", timeout=1)
+                break
+            except requests.ConnectionError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("gateway did not start")
+                time.sleep(0.1)
+
+        clients = 2 * workers
+        per_client = n // clients
+        with multiprocessing.Pool(clients) as pool:
+            pool.map(_client, [(url, 20)] * clients)  # warm connections
+            t0 = time.perf_counter()
+            done = sum(pool.map(_client, [(url, per_client)] * clients))
+            rate = done / (time.perf_counter() - t0)
+        assert requests.get(f"{url}/metrics").json()["workers"] == workers
+        return rate
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=20)
+
+
+def main(n: int = 4000, max_workers: int = 0) -> None:
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+
+    print(f"/v1/validate, {n} requests, {os.cpu_count()} CPUs")
+    base = None
+    for workers in counts:
+        rate = _run(workers, n)
+        base = base or rate
+        print(f"  workers={workers:<3} {rate:10,.0f} req/s  ({rate / base:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:3]])
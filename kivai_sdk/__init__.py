@@ -1,5 +1,12 @@
 __version__ = "0.1.3"
 
-from .validator import validate_command as validate_command
-
 __all__ = ["validate_command", "__version__"]
+
+
+def __getattr__(name: str):
+    # Deferred so `import kivai_sdk.<module>` does not load jsonschema (v0.17).
+    if name == "validate_command":
+        from .validator import validate_command
+
+        return validate_command
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,31 @@
-from .base import AdapterContext, KivaiAdapter
-from .registry import AdapterRegistry, default_registry
+from .base import AdapterContext, KivaiAdapter, request_of
+from .registry import (
+    AdapterRegistry,
+    active_adapter_registry,
+    default_registry,
+    process_adapter_registry,
+    set_adapter_registry,
+)
+from .isolation import IsolatedAdapter, IsolationLimits, ProcessAdapterPool
+from .spec import BUILTIN_ADAPTER_SPECS, AdapterSpec, discover_adapter_specs
 from .contracts import AdapterError, AdapterResult, normalize_adapter_output
 from .capabilities import AdapterCapabilities
 
 __all__ = [
     "AdapterContext",
     "KivaiAdapter",
+    "request_of",
     "AdapterRegistry",
     "default_registry",
+    "active_adapter_registry",
+    "process_adapter_registry",
+    "set_adapter_registry",
+    "IsolatedAdapter",
+    "IsolationLimits",
+    "ProcessAdapterPool",
+    "AdapterSpec",
+    "BUILTIN_ADAPTER_SPECS",
+    "discover_adapter_specs",
     "AdapterError",
     "AdapterResult",
     "normalize_adapter_output",
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Protocol, runtime_checkable
+from typing import TYPE_CHECKING, Optional, Protocol, runtime_checkable
+
+from kivai_sdk.request import IntentRequest
+
+if TYPE_CHECKING:  # importing kivai_sdk.devices loads every registry backend
+    from kivai_sdk.devices.models import Device
 
 from .capabilities import AdapterCapabilities
 
@@ -11,9 +16,24 @@ class AdapterContext:
     """
     Execution context passed to adapters.
     Extend over time (gateway_id, correlation IDs, device session, etc.)
+
+    `request` is the pre-parsed IntentRequest for this execution (v0.12).
+    It is None when an adapter is called directly with a bare payload; use
+    `request_of(payload, ctx)` to get one either way.
+
+    `device` is the routed device, when routing resolved one (v0.15). Under
+    fan-out each invocation gets its own context for its own device.
     """
 
     gateway_id: str = "local"
+    request: Optional[IntentRequest] = None
+    device: Optional[Device] = None
+
+
+def request_of(payload: dict, ctx: AdapterContext) -> IntentRequest:
+    return (
+        ctx.request if ctx.request is not None else IntentRequest.from_payload(payload)
+    )
 
 
 @runtime_checkable
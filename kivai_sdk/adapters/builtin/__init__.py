@@ -1,5 +1,22 @@
-from .thermostat import SetTemperatureAdapter
-from .speaker import PlayMusicAdapter
-from .lock import UnlockDoorAdapter
+"""
+Reference adapters. Modules are imported on first attribute access so that
+importing this package (or resolving one intent) does not load the others.
+"""
 
-__all__ = ["SetTemperatureAdapter", "PlayMusicAdapter", "UnlockDoorAdapter"]
+from importlib import import_module
+
+_EXPORTS = {
+    "EchoAdapter": ".echo",
+    "SetTemperatureAdapter": ".thermostat",
+    "PlayMusicAdapter": ".speaker",
+    "UnlockDoorAdapter": ".lock",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from kivai_sdk.adapters.base import AdapterContext, request_of
+from kivai_sdk.adapters.capabilities import AdapterCapabilities
+
+
+class EchoAdapter:
+    """
+    Reference adapter: echo (local, deterministic).
+    Kept outside schema by design, but still must declare capabilities in v0.9 strict.
+    """
+
+    intent = "echo"
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(
+            intent="echo",
+            required_capabilities=frozenset(),
+            requires_auth=False,
+            required_role=None,
+            timeout_ms=1000,
+        )
+
+    def execute(self, payload: dict, ctx: AdapterContext) -> dict:
+        params = request_of(payload, ctx).params
+        msg = params.get("message", "")
+        return {"echo": msg, "gateway_id": ctx.gateway_id}
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from kivai_sdk.adapters.base import AdapterContext
+from kivai_sdk.adapters.base import AdapterContext, request_of
 from kivai_sdk.adapters.capabilities import AdapterCapabilities
 
 
@@ -26,9 +26,7 @@ class PlayMusicAdapter:
         )
 
     def execute(self, payload: dict, ctx: AdapterContext) -> dict:
-        params = (
-            payload.get("params") if isinstance(payload.get("params"), dict) else {}
-        )
+        params = request_of(payload, ctx).params
         query = params.get("query") or "default_playlist"
 
         if not isinstance(query, str):
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from kivai_sdk.adapters.base import AdapterContext
+from kivai_sdk.adapters.base import AdapterContext, request_of
 from kivai_sdk.adapters.capabilities import AdapterCapabilities
 
 
@@ -26,10 +26,27 @@ class SetTemperatureAdapter:
             timeout_ms=5000,
         )
 
+    def desired_state(self, payload: dict, ctx: AdapterContext) -> dict | None:
+        """
+        Opts in to no-op short-circuiting (v0.27): setting the temperature
+        the thermostat already has is skipped.
+        """
+        params = request_of(payload, ctx).params
+        value = params.get("value")
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        return {"target_temperature": float(value), "unit": params.get("unit") or "C"}
+
+    def no_op_result(self, payload: dict, ctx: AdapterContext) -> dict:
+        """
+        The result of a call skipped because the thermostat is already set:
+        the same shape `execute` returns.
+        """
+        params = request_of(payload, ctx).params
+        return _result(float(params["value"]), params.get("unit") or "C", ctx)
+
     def execute(self, payload: dict, ctx: AdapterContext) -> dict:
-        params = (
-            payload.get("params") if isinstance(payload.get("params"), dict) else {}
-        )
+        params = request_of(payload, ctx).params
         value = params.get("value")
         unit = params.get("unit") or "C"
 
@@ -42,10 +59,14 @@ class SetTemperatureAdapter:
                 },
             }
 
-        return {
-            "ok": True,
-            "action": "set_temperature",
-            "value": float(value),
-            "unit": unit,
-            "gateway_id": ctx.gateway_id,
-        }
+        return _result(float(value), unit, ctx)
+
+
+def _result(value: float, unit: str, ctx: AdapterContext) -> dict:
+    return {
+        "ok": True,
+        "action": "set_temperature",
+        "value": value,
+        "unit": unit,
+        "gateway_id": ctx.gateway_id,
+    }
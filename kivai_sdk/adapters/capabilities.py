@@ -26,7 +26,8 @@ class AdapterCapabilities:
     # If requires_auth, role required (e.g., "owner")
     required_role: Optional[str] = None
 
-    # Placeholder for operational control; enforced later in runtime/gateway
+    # Deadline per call: bounds fan-out (v0.15); isolated adapters are killed
+    # and replaced when they exceed it (v0.21)
     timeout_ms: int = 5000
 
     def __post_init__(self) -> None:
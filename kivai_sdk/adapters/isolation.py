@@ -0,0 +1,358 @@
+"""
+Process-isolated adapter execution (v0.21)
+
+Opt-in mode for adapters we do not trust. An isolated adapter runs in a small
+pool of worker processes that import it once and then serve calls over a
+pipe. The gateway process never imports the adapter module.
+
+- `timeout_ms` is enforced: a worker that has not answered in time is killed
+  and replaced, and the call fails with ADAPTER_TIMEOUT.
+- A worker that dies mid-call fails that call with ADAPTER_CRASHED.
+- Workers retire after `max_calls` calls or once their resident memory
+  exceeds `max_rss_mb`; a replacement is started in the background.
+
+Each call sends `(payload, AdapterContext)` in one pickle. The context
+carries the already-parsed IntentRequest, whose `raw` is the payload itself,
+so the payload is serialized once and nothing is re-parsed in the worker.
+
+Isolation is selected per spec (`AdapterSpec(isolated=True)`) or by the
+operator with $KIVAI_ISOLATED_ADAPTERS: a comma-separated list of intents,
+or "plugins" for every adapter not shipped with the SDK.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .base import AdapterContext
+from .capabilities import AdapterCapabilities
+from .contracts import AdapterResult
+from .spec import AdapterSpec
+
+ISOLATION_ENV = "KIVAI_ISOLATED_ADAPTERS"
+
+# Worker -> pool messages: ("ready", pid) | ("load_failed", message) once at
+# startup, then per call (kind, value, retire) with kind "ok" | "raised".
+
+
+@dataclass(frozen=True)
+class IsolationLimits:
+    """
+    - pool_size: worker processes per isolated adapter
+    - max_calls: calls served before a worker is replaced
+    - max_rss_mb: resident memory ceiling checked after every call (0: off)
+    - start_timeout: seconds a new worker may take to import its adapter
+    """
+
+    pool_size: int = 2
+    max_calls: int = 1000
+    max_rss_mb: int = 256
+    start_timeout: float = 10.0
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        import sys
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _worker_main(conn: Any, spec: AdapterSpec, limits: IsolationLimits) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent decides when we stop
+    try:
+        adapter = spec.load()
+    except Exception as exc:
+        conn.send(("load_failed", f"{type(exc).__name__}: {exc}"))
+        return
+    conn.send(("ready", os.getpid()))
+
+    max_rss = limits.max_rss_mb * 1024 * 1024
+    calls = 0
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        payload, ctx = message
+        try:
+            reply = ("ok", adapter.execute(payload, ctx))
+        except Exception as exc:
+            reply = ("raised", str(exc) or type(exc).__name__)
+        calls += 1
+        retire = calls >= limits.max_calls or (max_rss and _rss_bytes() > max_rss)
+        try:
+            conn.send((*reply, bool(retire)))
+        except Exception as exc:  # e.g. an unpicklable result
+            conn.send(("raised", f"Unsendable adapter result: {exc}", bool(retire)))
+        if retire:
+            return
+
+
+class _Worker:
+    def __init__(self, mp: Any, spec: AdapterSpec, limits: IsolationLimits) -> None:
+        self.conn, child_conn = mp.Pipe()
+        self.process = mp.Process(
+            target=_worker_main,
+            args=(child_conn, spec, limits),
+            name=f"kivai-adapter-{spec.intent}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        if not self.conn.poll(limits.start_timeout):
+            self.kill()
+            raise RuntimeError(
+                f"{spec.target} did not start within {limits.start_timeout}s"
+            )
+        try:
+            kind, value = self.conn.recv()
+        except (EOFError, OSError) as exc:
+            self.kill()
+            raise RuntimeError(f"{spec.target} worker died at startup") from exc
+        if kind != "ready":
+            self.kill()
+            raise RuntimeError(value)
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+
+class ProcessAdapterPool:
+    """
+    Worker processes for one isolated adapter spec.
+
+    Started by `start()` (at gateway boot, via
+    `AdapterRegistry.start_isolated`) or else on first call, and restarted
+    from scratch in a forked child, which must not share its parent's
+    workers. Workers whose replacement failed to start are re-spawned on
+    the next call. Thread-safe: concurrent calls use different workers and
+    wait for one when all are busy.
+    """
+
+    def __init__(
+        self,
+        spec: AdapterSpec,
+        limits: IsolationLimits = IsolationLimits(),
+        start_method: Optional[str] = None,
+    ) -> None:
+        if limits.pool_size < 1:
+            raise ValueError("IsolationLimits.pool_size must be >= 1")
+        self.spec = spec
+        self.limits = limits
+        import multiprocessing  # deferred: registries import this module
+
+        if start_method is None:
+            methods = multiprocessing.get_all_start_methods()
+            # Forking a threaded gateway is unsafe; the fork server is cheap.
+            start_method = "forkserver" if "forkserver" in methods else "spawn"
+        self._mp = multiprocessing.get_context(start_method)
+        self._cond = threading.Condition()
+        self._start_lock = threading.Lock()
+        self._idle: List[_Worker] = []
+        self._live = 0
+        self._pid: Optional[int] = None
+        self._closed = False
+        self._stats = {
+            "calls": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "crashes": 0,
+            "recycled": 0,
+            "started": 0,
+        }
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {**self._stats, "workers": self._live}
+
+    def _count(self, key: str) -> None:
+        with self._cond:
+            self._stats[key] += 1
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._mp, self.spec, self.limits)
+        self._count("started")
+        return worker
+
+    def _replenish(self) -> None:
+        """
+        Start one worker in place of a retired or killed one.
+        """
+        try:
+            worker = self._spawn()
+        except Exception:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            if self._closed:
+                worker.stop()
+                self._live -= 1
+            else:
+                self._idle.append(worker)
+            self._cond.notify()
+
+    def _retire(self, worker: _Worker, kill: bool) -> None:
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+        threading.Thread(
+            target=self._replenish, name="kivai-adapter-replenish", daemon=True
+        ).start()
+
+    def start(self) -> None:
+        """
+        Pre-warm `pool_size` workers, or top the pool back up when
+        replacements failed to start. Raises RuntimeError if the adapter
+        cannot be loaded.
+        """
+        if self._pid == os.getpid() and self._live >= self.limits.pool_size:
+            return
+        with self._start_lock:
+            pid = os.getpid()
+            with self._cond:
+                forked = self._pid != pid
+                missing = self.limits.pool_size - (0 if forked else self._live)
+            if missing <= 0:
+                return
+            workers: List[_Worker] = []
+            try:
+                for _ in range(missing):
+                    workers.append(self._spawn())
+            except Exception:
+                for worker in workers:
+                    worker.kill()
+                raise
+            with self._cond:
+                if forked:
+                    self._idle, self._live = workers, len(workers)
+                else:
+                    self._idle.extend(workers)
+                    self._live += len(workers)
+                self._closed = False
+                self._pid = pid
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+        for worker in idle:
+            worker.stop()
+
+    def _acquire(self, deadline: float) -> Optional[_Worker]:
+        with self._cond:
+            while not self._idle:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    return None
+            return self._idle.pop()
+
+    def _release(self, worker: _Worker) -> None:
+        with self._cond:
+            self._idle.append(worker)
+            self._cond.notify()
+
+    def execute(self, payload: dict, ctx: AdapterContext) -> Any:
+        """
+        Run one call in a worker. Returns the adapter's output, or an
+        AdapterResult failure for timeouts, crashes and adapter exceptions.
+        """
+        try:
+            self.start()
+        except RuntimeError as exc:
+            self._count("errors")
+            return AdapterResult.failure("ADAPTER_ERROR", str(exc))
+        timeout_ms = self.spec.timeout_ms
+        deadline = time.monotonic() + timeout_ms / 1000.0
+
+        self._count("calls")
+        worker = self._acquire(deadline)
+        if worker is None:
+            self._count("timeouts")
+            return AdapterResult.failure(
+                "ADAPTER_TIMEOUT", f"No isolated worker free within {timeout_ms} ms"
+            )
+
+        try:
+            worker.conn.send((payload, ctx))
+            if not worker.conn.poll(max(0.0, deadline - time.monotonic())):
+                self._count("timeouts")
+                self._retire(worker, kill=True)
+                return AdapterResult.failure(
+                    "ADAPTER_TIMEOUT", f"No result within {timeout_ms} ms"
+                )
+            kind, value, retire = worker.conn.recv()
+        except (EOFError, OSError):
+            self._count("crashes")
+            worker.process.join(timeout=1)
+            code = worker.process.exitcode
+            self._retire(worker, kill=True)
+            return AdapterResult.failure(
+                "ADAPTER_CRASHED", f"Adapter worker exited (code {code})"
+            )
+
+        if retire:
+            self._count("recycled")
+            self._retire(worker, kill=False)
+        else:
+            self._release(worker)
+        if kind == "raised":
+            self._count("errors")
+            return AdapterResult.failure("ADAPTER_ERROR", value)
+        return value
+
+
+class IsolatedAdapter:
+    """
+    Stand-in registered for an isolated spec. Exposes the spec's declaration
+    and forwards `execute` to the process pool.
+    """
+
+    def __init__(
+        self, spec: AdapterSpec, limits: IsolationLimits = IsolationLimits()
+    ) -> None:
+        self.spec = spec
+        self.pool = ProcessAdapterPool(spec, limits)
+
+    @property
+    def intent(self) -> str:
+        return self.spec.intent
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return self.spec.capabilities()
+
+    def execute(self, payload: dict, ctx: AdapterContext) -> Any:
+        return self.pool.execute(payload, ctx)
+
+
+def isolated_intents_from_env() -> tuple[str, ...]:
+    raw = os.environ.get(ISOLATION_ENV, "")
+    return tuple(item.strip() for item in raw.split(",") if item.strip())
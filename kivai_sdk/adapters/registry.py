@@ -1,16 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Iterable
+import threading
+from dataclasses import dataclass, field
+from dataclasses import replace as _replace
+from typing import Any, Dict, Iterable, List, Optional
 
-from kivai_sdk.adapters.builtin import (
-    PlayMusicAdapter,
-    SetTemperatureAdapter,
-    UnlockDoorAdapter,
-)
+from kivai_sdk.scope import current_tenant
 
-from .base import AdapterContext, KivaiAdapter
-from .capabilities import AdapterCapabilities
+from .base import KivaiAdapter
+from .isolation import IsolatedAdapter, IsolationLimits, isolated_intents_from_env
+from .spec import BUILTIN_ADAPTER_SPECS, AdapterSpec, discover_adapter_specs
 
 
 @dataclass
@@ -18,10 +17,21 @@ class AdapterRegistry:
     """
     Simple in-process registry.
 
-    Future: dynamic discovery, versioning, capability matching, remote adapters.
+    v0.16: intents can be registered as AdapterSpecs, whose implementation is
+    imported on first `resolve`. A spec that fails to import is dropped and
+    the failure recorded in `errors`; its intent then resolves to None.
+
+    v0.21: isolated specs resolve to an IsolatedAdapter that runs the
+    implementation in worker processes (`isolation` sets the pool limits).
+
+    Future: versioning, capability matching, remote adapters.
     """
 
     _by_intent: Dict[str, KivaiAdapter]
+    _specs: Dict[str, AdapterSpec] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    isolation: IsolationLimits = field(default_factory=IsolationLimits)
 
     @classmethod
     def empty(cls) -> "AdapterRegistry":
@@ -34,42 +44,178 @@ class AdapterRegistry:
         for a in adapters:
             self.register(a)
 
+    def register_spec(self, spec: AdapterSpec, replace: bool = False) -> bool:
+        """
+        Register a lazily imported adapter. Without `replace`, an intent that
+        is already registered keeps its adapter and the conflict is recorded.
+        """
+        existing = self._specs.get(spec.intent)
+        if not replace and (existing is not None or spec.intent in self._by_intent):
+            owner = existing.source if existing is not None else "registered adapter"
+            self.errors.append(
+                f"{spec.target} ({spec.source}): intent {spec.intent!r} "
+                f"already provided by {owner}"
+            )
+            return False
+        self._by_intent.pop(spec.intent, None)
+        self._specs[spec.intent] = spec
+        return True
+
     def resolve(self, intent: str | None) -> KivaiAdapter | None:
         if not intent:
             return None
-        return self._by_intent.get(intent)
+        adapter = self._by_intent.get(intent)
+        if adapter is not None or intent not in self._specs:
+            return adapter
+
+        with self._lock:
+            adapter = self._by_intent.get(intent)
+            if adapter is not None:
+                return adapter
+            spec = self._specs.get(intent)
+            if spec is None:
+                return None
+            if spec.isolated:
+                adapter = IsolatedAdapter(spec, self.isolation)
+                self._by_intent[intent] = adapter
+                return adapter
+            try:
+                adapter = spec.load()
+            except Exception as exc:
+                del self._specs[intent]
+                self.errors.append(f"{spec.target} ({spec.source}): {exc}")
+                return None
+            self._by_intent[intent] = adapter
+            return adapter
+
+    def is_loaded(self, intent: str) -> bool:
+        return intent in self._by_intent
+
+    def isolate(self, intents: Iterable[str]) -> None:
+        """
+        Switch registered specs to isolated execution. "plugins" selects every
+        spec not shipped with the SDK. Adapters already resolved are unchanged.
+        """
+        wanted = set(intents)
+        for intent, spec in list(self._specs.items()):
+            if spec.isolated or intent in self._by_intent:
+                continue
+            if intent in wanted or ("plugins" in wanted and spec.source != "builtin"):
+                self._specs[intent] = _replace(spec, isolated=True)
+
+    def start_isolated(self) -> None:
+        """
+        Resolve every isolated spec and start its worker pool now, so the
+        first calls do not pay for process startup. An adapter that cannot
+        be loaded is recorded in `errors`; its calls fail with ADAPTER_ERROR.
+        """
+        for intent, spec in list(self._specs.items()):
+            if not spec.isolated:
+                continue
+            adapter = self.resolve(intent)
+            if not isinstance(adapter, IsolatedAdapter):
+                continue
+            try:
+                adapter.pool.start()
+            except RuntimeError as exc:
+                self.errors.append(f"{spec.target} ({spec.source}): {exc}")
+
+    def isolation_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Per-intent call, error, timeout, crash and recycle counts for isolated
+        adapters that have been resolved.
+        """
+        return {
+            intent: adapter.pool.stats()
+            for intent, adapter in sorted(self._by_intent.items())
+            if isinstance(adapter, IsolatedAdapter)
+        }
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """
+        Adapter metadata sorted by intent, without importing lazy adapters.
+        """
+        items = []
+        for intent in sorted(set(self._specs) | set(self._by_intent)):
+            spec = self._specs.get(intent)
+            adapter = self._by_intent.get(intent)
+            if spec is not None:
+                caps = spec.capabilities()
+                name, source = spec.class_name, spec.source
+            else:
+                caps = getattr(adapter, "capabilities", None)
+                name, source = adapter.__class__.__name__, "registered"
+            item: Dict[str, Any] = {
+                "intent": intent,
+                "adapter": name,
+                "source": source,
+                "loaded": adapter is not None,
+                "requires_auth": bool(getattr(caps, "requires_auth", False)),
+                "required_role": getattr(caps, "required_role", None),
+                "required_capabilities": sorted(
+                    getattr(caps, "required_capabilities", frozenset())
+                ),
+            }
+            if spec is not None and spec.isolated:
+                item["isolated"] = True
+                if isinstance(adapter, IsolatedAdapter):
+                    item["isolation"] = adapter.pool.stats()
+            items.append(item)
+        return items
+
+
+def default_registry(
+    discover: bool = True, isolate: Optional[Iterable[str]] = None
+) -> AdapterRegistry:
+    """
+    Builtin adapters plus (v0.16) plugins published under the `kivai.adapters`
+    entry-point group. Nothing is imported until an intent is resolved.
+    Plugins cannot replace builtin intents.
+
+    `isolate` (default: $KIVAI_ISOLATED_ADAPTERS) lists intents, or
+    "plugins", to run in isolated worker processes (v0.21).
+    """
+    reg = AdapterRegistry.empty()
+    for spec in BUILTIN_ADAPTER_SPECS:
+        reg.register_spec(spec)
+    if discover:
+        specs, errors = discover_adapter_specs()
+        reg.errors.extend(errors)
+        for spec in specs:
+            reg.register_spec(spec)
+    reg.isolate(isolated_intents_from_env() if isolate is None else isolate)
+    return reg
+
 
+_ACTIVE_ADAPTERS: AdapterRegistry | None = None
 
-class EchoAdapter:
+
+def active_adapter_registry() -> AdapterRegistry:
     """
-    Reference adapter: echo (local, deterministic).
-    Kept outside schema by design, but still must declare capabilities in v0.9 strict.
+    Registry used by the runtime. Built (and plugins discovered) once per
+    process; adapters load on first use and stay loaded. Within the
+    execution of a tenant with an adapter allowlist (v0.33), a view of it
+    restricted to that list.
     """
+    tenant = current_tenant()
+    if tenant is not None and tenant.adapters is not None:
+        return tenant.adapters
+    return process_adapter_registry()
 
-    intent = "echo"
-
-    @property
-    def capabilities(self) -> AdapterCapabilities:
-        return AdapterCapabilities(
-            intent="echo",
-            required_capabilities=frozenset(),
-            requires_auth=False,
-            required_role=None,
-            timeout_ms=1000,
-        )
 
-    def execute(self, payload: dict, ctx: AdapterContext) -> dict:
-        params = (
-            payload.get("params") if isinstance(payload.get("params"), dict) else {}
-        )
-        msg = params.get("message", "")
-        return {"echo": msg, "gateway_id": ctx.gateway_id}
+def process_adapter_registry() -> AdapterRegistry:
+    """
+    The process-wide registry, regardless of tenant.
+    """
+    global _ACTIVE_ADAPTERS
+    if _ACTIVE_ADAPTERS is None:
+        _ACTIVE_ADAPTERS = default_registry()
+    return _ACTIVE_ADAPTERS
 
 
-def default_registry() -> AdapterRegistry:
-    reg = AdapterRegistry.empty()
-    reg.register(EchoAdapter())
-    reg.register(SetTemperatureAdapter())
-    reg.register(PlayMusicAdapter())
-    reg.register(UnlockDoorAdapter())
-    return reg
+def set_adapter_registry(registry: AdapterRegistry | None) -> None:
+    """
+    Replace the runtime adapter registry (None restores the default).
+    """
+    global _ACTIVE_ADAPTERS
+    _ACTIVE_ADAPTERS = registry
@@ -0,0 +1,167 @@
+"""
+Adapter specs (v0.16)
+
+An AdapterSpec is an adapter's declaration (intent, capability requirements,
+auth baseline) plus the import path of its implementation. Registries hold
+specs and import the implementation only on first `resolve` of its intent,
+so listing or routing metadata never pays for adapter imports.
+
+Third-party packages publish specs under the `kivai.adapters` entry-point
+group. The entry point should reference a spec (or a list of specs) in a
+lightweight module that does not import the adapter itself:
+
+    # setup.py
+    entry_points={"kivai.adapters": ["acme = acme_kivai.specs:SPECS"]}
+
+    # acme_kivai/specs.py
+    SPECS = [
+        AdapterSpec(
+            intent="set_color",
+            target="acme_kivai.light:SetColorAdapter",
+            required_capabilities=frozenset({"light"}),
+        ),
+    ]
+"""
+
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass, replace
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+from .base import KivaiAdapter
+from .capabilities import AdapterCapabilities
+
+ENTRY_POINT_GROUP = "kivai.adapters"
+
+
+@dataclass(frozen=True)
+class AdapterSpec:
+    """
+    Import-free adapter declaration.
+
+    - target: "package.module:ClassName"; the class is instantiated with no
+      arguments on first use
+    - source: "builtin" or the distribution that published the spec
+    - isolated: run in worker processes, never imported by the gateway
+      (v0.21, adapters/isolation.py)
+    """
+
+    intent: str
+    target: str
+    required_capabilities: FrozenSet[str] = frozenset()
+    requires_auth: bool = False
+    required_role: Optional[str] = None
+    timeout_ms: int = 5000
+    source: str = "builtin"
+    isolated: bool = False
+
+    def __post_init__(self) -> None:
+        module, sep, attr = self.target.partition(":")
+        if not (module and sep and attr):
+            raise ValueError(
+                f"AdapterSpec.target must be 'module:ClassName', got {self.target!r}"
+            )
+        # Same validation rules as the adapter's own declaration.
+        self.capabilities()
+
+    @property
+    def class_name(self) -> str:
+        return self.target.rpartition(":")[2]
+
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(
+            intent=self.intent,
+            required_capabilities=self.required_capabilities,
+            requires_auth=self.requires_auth,
+            required_role=self.required_role,
+            timeout_ms=self.timeout_ms,
+        )
+
+    def load(self) -> KivaiAdapter:
+        """
+        Import and instantiate the implementation. Raises ValueError if it
+        declares a different intent or different capabilities than the
+        spec: listings show the spec's, the runtime enforces the adapter's.
+        """
+        module_name, _, attr = self.target.partition(":")
+        obj = importlib.import_module(module_name)
+        for part in attr.split("."):
+            obj = getattr(obj, part)
+        adapter = obj()
+        if getattr(adapter, "intent", None) != self.intent:
+            raise ValueError(
+                f"{self.target} implements {getattr(adapter, 'intent', None)!r}, "
+                f"spec declares {self.intent!r}"
+            )
+        declared = getattr(adapter, "capabilities", None)
+        if callable(declared):
+            declared = declared()
+        expected = self.capabilities()
+        # An adapter with no declaration is rejected by the runtime instead
+        # (ADAPTER_CAPABILITIES_MISSING).
+        if declared is not None and declared != expected:
+            fields = [
+                name
+                for name in AdapterCapabilities.__dataclass_fields__
+                if getattr(declared, name, None) != getattr(expected, name)
+            ]
+            raise ValueError(
+                f"{self.target} capabilities differ from its spec: {', '.join(fields)}"
+            )
+        return adapter
+
+
+BUILTIN_ADAPTER_SPECS: Tuple[AdapterSpec, ...] = (
+    AdapterSpec(
+        intent="echo",
+        target="kivai_sdk.adapters.builtin.echo:EchoAdapter",
+        timeout_ms=1000,
+    ),
+    AdapterSpec(
+        intent="set_temperature",
+        target="kivai_sdk.adapters.builtin.thermostat:SetTemperatureAdapter",
+        required_capabilities=frozenset({"thermostat"}),
+    ),
+    AdapterSpec(
+        intent="play_music",
+        target="kivai_sdk.adapters.builtin.speaker:PlayMusicAdapter",
+        required_capabilities=frozenset({"speaker"}),
+    ),
+    AdapterSpec(
+        intent="unlock_door",
+        target="kivai_sdk.adapters.builtin.lock:UnlockDoorAdapter",
+        required_capabilities=frozenset({"lock"}),
+        requires_auth=True,
+        required_role="owner",
+    ),
+)
+
+
+def discover_adapter_specs() -> Tuple[List[AdapterSpec], List[str]]:
+    """
+    Specs published under the `kivai.adapters` entry-point group.
+
+    Returns (specs, errors). A broken plugin is reported in `errors` and
+    skipped; it never prevents the others from loading.
+    """
+    from importlib.metadata import entry_points  # deferred: costly import
+
+    specs: List[AdapterSpec] = []
+    errors: List[str] = []
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        dist = ep.dist.name if ep.dist is not None else ep.name
+        try:
+            loaded = ep.load()
+            items: Iterable[object] = (
+                (loaded,) if isinstance(loaded, AdapterSpec) else tuple(loaded)
+            )
+            for item in items:
+                if not isinstance(item, AdapterSpec):
+                    raise TypeError(f"expected AdapterSpec, got {type(item).__name__}")
+                specs.append(
+                    replace(item, source=dist) if item.source == "builtin" else item
+                )
+        except Exception as exc:
+            errors.append(f"{ENTRY_POINT_GROUP}:{ep.name} ({dist}): {exc}")
+    return specs, errors
@@ -0,0 +1,34 @@
+from .base import (
+    DEFAULT_AUDIT_LOGGER,
+    AuditEvent,
+    AuditLogger,
+    NullAuditLogger,
+    active_audit_logger,
+    make_event,
+    set_audit_logger,
+)
+from .binary import BinaryAuditLogger, export_jsonl, read_segment
+from .index import AuditQuery, build_index, parse_ts_us, query_audit, segments
+from .jsonl import JsonlAuditLogger, configure_audit
+from .segmented import SegmentedAuditLogger
+
+__all__ = [
+    "DEFAULT_AUDIT_LOGGER",
+    "AuditEvent",
+    "AuditLogger",
+    "NullAuditLogger",
+    "active_audit_logger",
+    "make_event",
+    "set_audit_logger",
+    "BinaryAuditLogger",
+    "export_jsonl",
+    "read_segment",
+    "AuditQuery",
+    "build_index",
+    "parse_ts_us",
+    "query_audit",
+    "segments",
+    "JsonlAuditLogger",
+    "configure_audit",
+    "SegmentedAuditLogger",
+]
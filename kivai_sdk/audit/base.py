@@ -10,12 +10,9 @@ Goal:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from typing import Any
 
-
-def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+from kivai_sdk.clock import utc_now_iso
 
 
 @dataclass(frozen=True)
@@ -35,6 +32,9 @@ class AuditLogger:
     def emit(self, evt: AuditEvent) -> None:  # pragma: no cover
         return
 
+    def close(self) -> None:
+        return
+
 
 class NullAuditLogger(AuditLogger):
     def emit(self, evt: AuditEvent) -> None:
@@ -45,7 +45,7 @@ def make_event(
     execution_id: str, event: str, data: dict[str, Any] | None = None
 ) -> AuditEvent:
     return AuditEvent(
-        timestamp=_utc_now_iso(),
+        timestamp=utc_now_iso(),
         execution_id=execution_id,
         event=event,
         data=data or {},
@@ -53,3 +53,22 @@ def make_event(
 
 
 DEFAULT_AUDIT_LOGGER = NullAuditLogger()
+
+
+_ACTIVE_AUDIT_LOGGER: AuditLogger | None = None
+
+
+def active_audit_logger() -> AuditLogger:
+    """
+    Logger execute_intent uses when none is passed (v0.29).
+    """
+    return _ACTIVE_AUDIT_LOGGER or DEFAULT_AUDIT_LOGGER
+
+
+def set_audit_logger(logger: AuditLogger | None) -> None:
+    """
+    Replace the active audit logger (None restores the no-op default).
+    The previous logger is not closed.
+    """
+    global _ACTIVE_AUDIT_LOGGER
+    _ACTIVE_AUDIT_LOGGER = logger
@@ -0,0 +1,379 @@
+"""
+Compact binary audit segments (v0.30)
+
+`kivai serve --audit-dir DIR --audit-format binary` writes `audit-*.kvau`
+segments instead of JSONL. A segment is the magic `KVAUDB1\\n` followed by
+one raw-deflate stream for the whole segment. The stream is sync-flushed at
+the end of every execution, so everything up to the last finished execution
+can be decoded after a crash. Inside the stream:
+
+    op 0  string definition: varint length, UTF-8 bytes (next string id)
+    op 1  record: zigzag varint timestamp delta (us, from the previous
+          record), execution_id, string id of the event, intent_id,
+          string id + 1 of the intent (0 = none), data value
+
+Ids are 16 raw bytes when they are canonical UUIDs, a string id otherwise.
+Strings are defined once per segment, including event names, intents,
+dict keys and short values such as device ids and error codes. Repeats cost
+a varint. Values are tagged: none, false, true, int (zigzag varint),
+float (8 bytes), string id, inline string (longer than 64 bytes), list,
+dict.
+
+`read_segment` decodes lazily, one chunk of the file at a time, and yields
+the same records as the JSONL format; `export_jsonl` converts a directory.
+"""
+
+from __future__ import annotations
+
+import struct
+import uuid
+import zlib
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+from kivai_sdk.audit.base import AuditEvent
+from kivai_sdk.audit.index import parse_ts_us
+from kivai_sdk.audit.segmented import DEFAULT_SEGMENT_BYTES, SegmentedAuditLogger
+from kivai_sdk.clock import format_epoch_us
+
+MAGIC = b"KVAUDB1\n"
+SUFFIX = ".kvau"
+READ_CHUNK = 64 * 1024
+MAX_DICT_STRING = 64
+ID_CACHE = 4096
+
+OP_STRING = 0
+OP_RECORD = 1
+
+ID_NONE, ID_UUID, ID_STRING = 0, 1, 2
+(
+    T_NONE,
+    T_FALSE,
+    T_TRUE,
+    T_INT,
+    T_FLOAT,
+    T_STRING,
+    T_INLINE,
+    T_LIST,
+    T_DICT,
+) = range(9)
+
+_DOUBLE = struct.Struct("<d")
+
+
+def _varint(out: bytearray, n: int) -> None:
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _zigzag(n: int) -> int:
+    return n * 2 if n >= 0 else -n * 2 - 1
+
+
+def _unzigzag(n: int) -> int:
+    return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+
+def format_ts(ts_us: int) -> str:
+    """
+    Epoch microseconds -> the ISO form make_event writes ("...Z").
+    """
+    return format_epoch_us(ts_us)
+
+
+class _Encoder:
+    def __init__(self) -> None:
+        self.strings: Dict[str, int] = {}
+        # Each id recurs in every event of its execution; parse it once.
+        self.uuids: Dict[str, Optional[bytes]] = {}
+        self.last_ts = 0
+
+    def sid(self, out: bytearray, value: str) -> int:
+        """
+        String id of `value`, defined in `out` first if it is new.
+        """
+        sid = self.strings.get(value)
+        if sid is None:
+            sid = self.strings[value] = len(self.strings)
+            raw = value.encode("utf-8")
+            out.append(OP_STRING)
+            _varint(out, len(raw))
+            out += raw
+        return sid
+
+    def string(self, out: bytearray, rec: bytearray, value: str) -> None:
+        _varint(rec, self.sid(out, value))
+
+    def ident(self, out: bytearray, rec: bytearray, value: Optional[str]) -> None:
+        if value is None:
+            rec.append(ID_NONE)
+            return
+        raw = self.uuids.get(value, b"")
+        if raw == b"":
+            raw = None
+            if len(value) == 36:
+                try:
+                    parsed = uuid.UUID(value)
+                except ValueError:
+                    parsed = None
+                if parsed is not None and str(parsed) == value:
+                    raw = parsed.bytes
+            if len(self.uuids) >= ID_CACHE:
+                self.uuids.clear()
+            self.uuids[value] = raw
+        if raw is not None:
+            rec.append(ID_UUID)
+            rec += raw
+        else:
+            rec.append(ID_STRING)
+            self.string(out, rec, value)
+
+    def value(self, out: bytearray, rec: bytearray, value: Any) -> None:
+        if value is None:
+            rec.append(T_NONE)
+        elif value is True:
+            rec.append(T_TRUE)
+        elif value is False:
+            rec.append(T_FALSE)
+        elif isinstance(value, int):
+            rec.append(T_INT)
+            _varint(rec, _zigzag(value))
+        elif isinstance(value, float):
+            rec.append(T_FLOAT)
+            rec += _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            if len(value) > MAX_DICT_STRING:
+                raw = value.encode("utf-8")
+                rec.append(T_INLINE)
+                _varint(rec, len(raw))
+                rec += raw
+            else:
+                rec.append(T_STRING)
+                self.string(out, rec, value)
+        elif isinstance(value, dict):
+            rec.append(T_DICT)
+            _varint(rec, len(value))
+            for key, item in value.items():
+                self.string(out, rec, str(key))
+                self.value(out, rec, item)
+        elif isinstance(value, (list, tuple)):
+            rec.append(T_LIST)
+            _varint(rec, len(value))
+            for item in value:
+                self.value(out, rec, item)
+        else:
+            self.value(out, rec, str(value))
+
+    def record(
+        self,
+        evt: AuditEvent,
+        intent_id: Optional[str],
+        intent: Optional[str],
+    ) -> bytearray:
+        out = bytearray()
+        rec = bytearray([OP_RECORD])
+        ts = parse_ts_us(evt.timestamp)
+        _varint(rec, _zigzag(ts - self.last_ts))
+        self.last_ts = ts
+        self.ident(out, rec, evt.execution_id)
+        self.string(out, rec, evt.event)
+        self.ident(out, rec, intent_id)
+        _varint(rec, 0 if intent is None else self.sid(out, intent) + 1)
+        self.value(out, rec, evt.data)
+        out += rec
+        return out
+
+
+class BinaryAuditLogger(SegmentedAuditLogger):
+    """
+    `max_segment_bytes` applies to the compressed size on disk.
+    """
+
+    SUFFIX = SUFFIX
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        level: int = 6,
+    ) -> None:
+        super().__init__(directory, max_segment_bytes)
+        self.level = level
+        self._encoder = _Encoder()
+        self._deflate: Any = None
+        self._size = 0
+
+    def _begin(self) -> None:
+        self._encoder = _Encoder()
+        self._deflate = zlib.compressobj(self.level, zlib.DEFLATED, -15)
+        self._file.write(MAGIC)
+        self._size = len(MAGIC)
+
+    def _write(self, data: bytes) -> None:
+        if data:
+            self._file.write(data)
+            self._size += len(data)
+
+    def _append(
+        self,
+        evt: AuditEvent,
+        intent_id: Optional[str],
+        intent: Optional[str],
+        end: bool,
+    ) -> int:
+        self._write(
+            self._deflate.compress(self._encoder.record(evt, intent_id, intent))
+        )
+        if end:
+            self._write(self._deflate.flush(zlib.Z_SYNC_FLUSH))
+            self._file.flush()
+        return self._size
+
+    def _finish(self) -> None:
+        self._write(self._deflate.flush(zlib.Z_FINISH))
+        self._deflate = None
+
+
+class _Short(Exception):
+    """
+    The buffered bytes end inside an op; read more and retry.
+    """
+
+
+class _Decoder:
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self.last_ts = 0
+        self.buf = b""
+        self.pos = 0
+
+    def byte(self) -> int:
+        if self.pos >= len(self.buf):
+            raise _Short
+        b = self.buf[self.pos]
+        self.pos += 1
+        return b
+
+    def take(self, n: int) -> bytes:
+        end = self.pos + n
+        if end > len(self.buf):
+            raise _Short
+        data = self.buf[self.pos : end]
+        self.pos = end
+        return data
+
+    def varint(self) -> int:
+        shift = result = 0
+        while True:
+            b = self.byte()
+            result |= (b & 0x7F) << shift
+            if b < 0x80:
+                return result
+            shift += 7
+
+    def ident(self) -> Optional[str]:
+        kind = self.byte()
+        if kind == ID_NONE:
+            return None
+        if kind == ID_UUID:
+            return str(uuid.UUID(bytes=self.take(16)))
+        return self.strings[self.varint()]
+
+    def value(self) -> Any:
+        tag = self.byte()
+        if tag == T_NONE:
+            return None
+        if tag == T_TRUE:
+            return True
+        if tag == T_FALSE:
+            return False
+        if tag == T_INT:
+            return _unzigzag(self.varint())
+        if tag == T_FLOAT:
+            return _DOUBLE.unpack(self.take(8))[0]
+        if tag == T_STRING:
+            return self.strings[self.varint()]
+        if tag == T_INLINE:
+            return self.take(self.varint()).decode("utf-8")
+        if tag == T_LIST:
+            return [self.value() for _ in range(self.varint())]
+        if tag == T_DICT:
+            out = {}
+            for _ in range(self.varint()):
+                key = self.strings[self.varint()]
+                out[key] = self.value()
+            return out
+        raise ValueError(f"Corrupt audit segment (value tag {tag})")
+
+    def ops(self) -> Iterator[dict]:
+        """
+        Decode complete ops from the buffer; stops at the first partial one.
+        """
+        while self.pos < len(self.buf):
+            start = self.pos
+            try:
+                op = self.byte()
+                if op == OP_STRING:
+                    self.strings.append(self.take(self.varint()).decode("utf-8"))
+                    continue
+                if op != OP_RECORD:
+                    raise ValueError(f"Corrupt audit segment (op {op})")
+                ts = self.last_ts + _unzigzag(self.varint())
+                execution_id = self.ident()
+                event = self.strings[self.varint()]
+                intent_id = self.ident()
+                intent_ref = self.varint()
+                data = self.value()
+            except _Short:
+                self.pos = start
+                return
+            self.last_ts = ts
+            yield {
+                "ts": format_ts(ts),
+                "execution_id": execution_id,
+                "intent_id": intent_id,
+                "intent": self.strings[intent_ref - 1] if intent_ref else None,
+                "event": event,
+                "data": data,
+            }
+
+
+def read_segment(path: str) -> Iterator[dict]:
+    """
+    Records of one binary segment, decoded as the file is read. A segment
+    still being written (or cut short by a crash) yields what is complete.
+    """
+    with open(path, "rb") as f:
+        yield from _read_stream(f, path)
+
+
+def _read_stream(f: IO[bytes], path: str) -> Iterator[dict]:
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"Not a binary audit segment: {path}")
+    inflate = zlib.decompressobj(-15)
+    decoder = _Decoder()
+    while True:
+        chunk = f.read(READ_CHUNK)
+        data = inflate.decompress(chunk) if chunk else inflate.flush()
+        if data:
+            decoder.buf = decoder.buf[decoder.pos :] + data
+            decoder.pos = 0
+            yield from decoder.ops()
+        if not chunk or inflate.eof:
+            return
+
+
+def export_jsonl(paths: List[str], out: IO[bytes]) -> int:
+    """
+    Write the records of binary segments to `out` as JSONL (the format of
+    kivai_sdk/audit/jsonl.py). Returns the number of records.
+    """
+    from kivai_sdk.audit.jsonl import encode_record
+
+    count = 0
+    for path in paths:
+        for record in read_segment(path):
+            out.write(encode_record(record))
+            count += 1
+    return count
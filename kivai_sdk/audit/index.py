@@ -0,0 +1,335 @@
+"""
+Sidecar indexes for JSONL audit segments (v0.29)
+
+Each segment `audit-*.jsonl` gets an `audit-*.idx` next to it:
+
+    header  magic, block count, id count, min/max timestamp (us), bytes covered
+    blocks  one per BLOCK_RECORDS records: min_ts, max_ts, start, end offset
+    ids     (blake2b-64 of an execution_id or intent_id, block number),
+            sorted by hash
+
+A time range reads only the blocks that overlap it, and an id lookup binary
+searches the id table through mmap and reads the blocks it points to.
+Neither loads a segment or its index into memory. Bytes past the covered
+length (a segment still being written, or indexed by `kivai audit index`
+while it was) are scanned line by line, as are segments with no index.
+
+Execution ids are time-ordered (v0.32), so a lookup by execution id also
+skips indexed segments that end before the execution started.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from kivai_sdk.ids import id_time_us
+
+MAGIC = b"KVAUDIX1"
+HEADER = struct.Struct("<8sIIqqQ")
+BLOCK = struct.Struct("<qqQQ")
+ID_ENTRY = struct.Struct("<QQ")
+BLOCK_RECORDS = 256
+# How far event timestamps may trail the time in their execution id (clock
+# steps, ids borrowing the next millisecond under bursts).
+ID_CLOCK_SLACK_US = 60_000_000
+
+
+def id_hash(value: str) -> int:
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def parse_ts_us(timestamp: str) -> int:
+    """
+    ISO-8601 timestamp ("...Z" or with offset) -> epoch microseconds.
+    """
+    return round(datetime.fromisoformat(timestamp).timestamp() * 1_000_000)
+
+
+def index_path(segment: str) -> str:
+    return segment[: -len(".jsonl")] + ".idx"
+
+
+class IndexBuilder:
+    """
+    Index of one segment, built as records are appended.
+    """
+
+    def __init__(self, block_records: int = BLOCK_RECORDS) -> None:
+        self.block_records = block_records
+        self.blocks: List[tuple] = []
+        self.hashes = array("Q")
+        self.block_ids = array("Q")
+        self._block_hashes: set = set()
+        self._current: Optional[list] = None  # [min_ts, max_ts, start, end, n]
+
+    def add(self, offset: int, length: int, ts_us: int, ids: Sequence[str]) -> None:
+        cur = self._current
+        if cur is None:
+            cur = self._current = [ts_us, ts_us, offset, offset, 0]
+        cur[0] = min(cur[0], ts_us)
+        cur[1] = max(cur[1], ts_us)
+        cur[3] = offset + length
+        cur[4] += 1
+        block = len(self.blocks)
+        for value in ids:
+            if value:
+                h = id_hash(value)
+                if h not in self._block_hashes:
+                    self._block_hashes.add(h)
+                    self.hashes.append(h)
+                    self.block_ids.append(block)
+        if cur[4] >= self.block_records:
+            self._seal()
+
+    def _seal(self) -> None:
+        if self._current is not None:
+            self.blocks.append(tuple(self._current[:4]))
+            self._current = None
+            self._block_hashes = set()
+
+    def write(self, path: str, covered: int) -> None:
+        self._seal()
+        order = sorted(range(len(self.hashes)), key=self.hashes.__getitem__)
+        min_ts = min((b[0] for b in self.blocks), default=0)
+        max_ts = max((b[1] for b in self.blocks), default=0)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(
+                HEADER.pack(
+                    MAGIC, len(self.blocks), len(order), min_ts, max_ts, covered
+                )
+            )
+            for block in self.blocks:
+                f.write(BLOCK.pack(*block))
+            for i in order:
+                f.write(ID_ENTRY.pack(self.hashes[i], self.block_ids[i]))
+        os.replace(tmp, path)
+
+
+class SegmentIndex:
+    """
+    Read-only view of a sidecar index, mmapped.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.block_count, self.id_count, self.min_ts, self.max_ts, covered = (
+            HEADER.unpack_from(self._mm, 0)
+        )
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not an audit index: {path}")
+        self.covered = covered
+        self._ids_at = HEADER.size + self.block_count * BLOCK.size
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def block(self, i: int) -> tuple:
+        return BLOCK.unpack_from(self._mm, HEADER.size + i * BLOCK.size)
+
+    def blocks_in_range(self, since: Optional[int], until: Optional[int]) -> List[int]:
+        out = []
+        for i in range(self.block_count):
+            lo, hi, _, _ = self.block(i)
+            if (since is None or hi >= since) and (until is None or lo < until):
+                out.append(i)
+        return out
+
+    def blocks_for_id(self, value: str) -> List[int]:
+        target = id_hash(value)
+        lo, hi = 0, self.id_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            h, _ = ID_ENTRY.unpack_from(self._mm, self._ids_at + mid * ID_ENTRY.size)
+            if h < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        blocks = set()
+        while lo < self.id_count:
+            h, block = ID_ENTRY.unpack_from(self._mm, self._ids_at + lo * ID_ENTRY.size)
+            if h != target:
+                break
+            blocks.add(block)
+            lo += 1
+        return sorted(blocks)
+
+
+@dataclass(frozen=True)
+class AuditQuery:
+    """
+    Filters for `query_audit`; every field that is set must match.
+    `since` is inclusive and `until` exclusive (epoch microseconds).
+    """
+
+    execution_id: Optional[str] = None
+    intent_id: Optional[str] = None
+    since: Optional[int] = None
+    until: Optional[int] = None
+    intent: Optional[str] = None
+    event: Optional[str] = None
+    error_code: Optional[str] = None
+
+    def earliest(self) -> Optional[int]:
+        """
+        Lower time bound for index pruning: `since`, raised to shortly
+        before the creation time of a time-ordered execution id (v0.32).
+        No event of an execution is older than its id.
+        """
+        started = id_time_us(self.execution_id) if self.execution_id else None
+        if started is None:
+            return self.since
+        started -= ID_CLOCK_SLACK_US
+        return started if self.since is None else max(self.since, started)
+
+    def needles(self) -> List[bytes]:
+        """
+        Byte strings every matching line contains (checked before parsing).
+        """
+        out = []
+        for key in ("execution_id", "intent_id", "intent", "event", "error_code"):
+            value = getattr(self, key)
+            if value is not None:
+                out.append(f'"{key}":{json.dumps(value, ensure_ascii=False)}'.encode())
+        return out
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        for key in ("execution_id", "intent_id", "intent", "event"):
+            value = getattr(self, key)
+            if value is not None and record.get(key) != value:
+                return False
+        if (
+            self.error_code is not None
+            and (record.get("data") or {}).get("error_code") != self.error_code
+        ):
+            return False
+        if self.since is not None or self.until is not None:
+            ts = parse_ts_us(record["ts"])
+            if self.since is not None and ts < self.since:
+                return False
+            if self.until is not None and ts >= self.until:
+                return False
+        return True
+
+
+def _filter_lines(lines: Iterator[bytes], query: AuditQuery) -> Iterator[dict]:
+    needles = query.needles()
+    for line in lines:
+        if not all(n in line for n in needles):
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue  # torn last line of a crashed writer
+        if query.matches(record):
+            yield record
+
+
+def _read_blocks(f: Any, index: SegmentIndex, blocks: List[int]) -> Iterator[bytes]:
+    for i in blocks:
+        _, _, start, end = index.block(i)
+        f.seek(start)
+        yield from f.read(end - start).splitlines()
+
+
+def _query_segment(path: str, query: AuditQuery) -> Iterator[dict]:
+    sidecar = index_path(path)
+    index = SegmentIndex(sidecar) if os.path.exists(sidecar) else None
+    try:
+        with open(path, "rb") as f:
+            covered = 0
+            if index is not None:
+                covered = index.covered
+                since = query.earliest()
+                outside = index.block_count and (
+                    (since is not None and index.max_ts < since)
+                    or (query.until is not None and index.min_ts >= query.until)
+                )
+                if not outside:
+                    wanted = query.execution_id or query.intent_id
+                    if wanted is not None:
+                        blocks = index.blocks_for_id(wanted)
+                        if since is not None or query.until is not None:
+                            in_range = set(index.blocks_in_range(since, query.until))
+                            blocks = [b for b in blocks if b in in_range]
+                    else:
+                        blocks = index.blocks_in_range(since, query.until)
+                    yield from _filter_lines(_read_blocks(f, index, blocks), query)
+            f.seek(covered)
+            yield from _filter_lines(iter(f), query)
+    finally:
+        if index is not None:
+            index.close()
+
+
+def segments(directory: str, suffixes: Sequence[str] = (".jsonl",)) -> List[str]:
+    """
+    Audit segments in `directory`, oldest first.
+    """
+    names = sorted(
+        n
+        for n in os.listdir(directory)
+        if n.startswith("audit-") and n.endswith(tuple(suffixes))
+    )
+    return [os.path.join(directory, n) for n in names]
+
+
+def query_audit(
+    directory: str, query: AuditQuery, limit: Optional[int] = None
+) -> Iterator[dict]:
+    """
+    Records in `directory` matching `query`, segment by segment. Binary
+    segments (v0.30) have no index and are decoded in full.
+    """
+    from kivai_sdk.audit.binary import SUFFIX, read_segment
+
+    found = 0
+    for path in segments(directory, (".jsonl", SUFFIX)):
+        if path.endswith(SUFFIX):
+            records = (r for r in read_segment(path) if query.matches(r))
+        else:
+            records = _query_segment(path, query)
+        for record in records:
+            yield record
+            found += 1
+            if limit is not None and found >= limit:
+                return
+
+
+def build_index(path: str, block_records: int = BLOCK_RECORDS) -> int:
+    """
+    Write the sidecar index of an existing segment. Returns records indexed.
+    """
+    builder = IndexBuilder(block_records)
+    offset = count = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # incomplete last record; leave it to the tail scan
+            try:
+                record = json.loads(line)
+                ts_us = parse_ts_us(record["ts"])
+            except (ValueError, KeyError):
+                offset += len(line)
+                continue
+            builder.add(
+                offset,
+                len(line),
+                ts_us,
+                (record.get("execution_id"), record.get("intent_id")),
+            )
+            offset += len(line)
+            count += 1
+    builder.write(index_path(path), offset)
+    return count
@@ -0,0 +1,105 @@
+"""
+JSONL audit files (v0.29)
+
+`JsonlAuditLogger` appends one JSON object per audit event to segment files
+in a directory (see kivai_sdk/audit/segmented.py):
+
+    {"ts": "2026-02-12T18:00:00.123456Z", "execution_id": "...",
+     "intent_id": "...", "intent": "set_temperature", "event": "execute.end",
+     "data": {"status": "failed", "error_code": "DEVICE_OFFLINE"}}
+
+A segment is closed at `max_segment_bytes` or on `close()`, and its sidecar
+index is written then (kivai_sdk/audit/index.py).
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+from typing import Optional
+
+from kivai_sdk.audit.base import AuditEvent, set_audit_logger
+from kivai_sdk.audit.index import BLOCK_RECORDS, IndexBuilder, index_path, parse_ts_us
+from kivai_sdk.audit.segmented import DEFAULT_SEGMENT_BYTES, SegmentedAuditLogger
+
+
+def record_of(evt: AuditEvent, intent_id: Optional[str], intent: Optional[str]) -> dict:
+    return {
+        "ts": evt.timestamp,
+        "execution_id": evt.execution_id,
+        "intent_id": intent_id,
+        "intent": intent,
+        "event": evt.event,
+        "data": evt.data,
+    }
+
+
+def encode_record(record: dict) -> bytes:
+    return (
+        json.dumps(record, separators=(",", ":"), ensure_ascii=False, default=str)
+        + "\n"
+    ).encode("utf-8")
+
+
+class JsonlAuditLogger(SegmentedAuditLogger):
+    SUFFIX = ".jsonl"
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        block_records: int = BLOCK_RECORDS,
+    ) -> None:
+        super().__init__(directory, max_segment_bytes)
+        self.block_records = block_records
+        self._index: Optional[IndexBuilder] = None
+        self._offset = 0
+
+    def _begin(self) -> None:
+        self._offset = 0
+        self._index = IndexBuilder(self.block_records)
+
+    def _append(
+        self,
+        evt: AuditEvent,
+        intent_id: Optional[str],
+        intent: Optional[str],
+        end: bool,
+    ) -> int:
+        line = encode_record(record_of(evt, intent_id, intent))
+        self._file.write(line)
+        self._index.add(
+            self._offset,
+            len(line),
+            parse_ts_us(evt.timestamp),
+            (evt.execution_id, intent_id),
+        )
+        self._offset += len(line)
+        if end:
+            self._file.flush()
+        return self._offset
+
+    def _finish(self) -> None:
+        self._file.flush()
+        self._index.write(index_path(self._path), self._offset)
+        self._index = None
+
+
+def configure_audit(
+    directory: str, format: str = "jsonl", **kwargs: int
+) -> SegmentedAuditLogger:
+    """
+    Write the audit trail of every execution to segments in `directory`
+    ("jsonl" or "binary"); the last segment is closed when the process exits.
+    """
+    if format == "jsonl":
+        logger: SegmentedAuditLogger = JsonlAuditLogger(directory, **kwargs)
+    elif format == "binary":
+        from kivai_sdk.audit.binary import BinaryAuditLogger
+
+        logger = BinaryAuditLogger(directory, **kwargs)
+    else:
+        raise ValueError(f"Unknown audit format: {format!r}")
+    set_audit_logger(logger)
+    atexit.register(logger.close)
+    return logger
@@ -0,0 +1,130 @@
+"""
+Segmented audit files (v0.30)
+
+Base of the on-disk audit loggers: JSONL (kivai_sdk/audit/jsonl.py) and the
+compact binary format (kivai_sdk/audit/binary.py). It names and rotates
+segment files and tags each event with its execution's `intent_id` and
+`intent`, copied from `execute.start`. Segment names carry the start time
+and pid, so pre-forked workers can share one directory, and a segment is
+flushed at the end of every execution.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+
+from kivai_sdk.audit.base import AuditEvent, AuditLogger
+
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+# Executions whose execute.end never came (the adapter raised) are forgotten
+# oldest first beyond this many.
+MAX_OPEN_EXECUTIONS = 10_000
+
+
+class SegmentedAuditLogger(AuditLogger, ABC):
+    """
+    Subclasses set SUFFIX and implement _begin, _append and _finish; all
+    three run under the logger's lock. A subclass missing one cannot be
+    instantiated.
+    """
+
+    SUFFIX = ""
+
+    def __init__(
+        self, directory: str, max_segment_bytes: int = DEFAULT_SEGMENT_BYTES
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._seq = 0
+        self._path: Optional[str] = None
+        self._file: Any = None
+        self._executions: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+    @property
+    def path(self) -> Optional[str]:
+        """
+        Segment currently being written, if any.
+        """
+        return self._path
+
+    @abstractmethod
+    def _begin(self) -> None: ...
+
+    @abstractmethod
+    def _append(
+        self,
+        evt: AuditEvent,
+        intent_id: Optional[str],
+        intent: Optional[str],
+        end: bool,
+    ) -> int:
+        """
+        Write one event; returns the segment's size so far.
+        """
+
+    @abstractmethod
+    def _finish(self) -> None: ...
+
+    def _open_segment(self) -> None:
+        pid = os.getpid()
+        if pid != self._pid:
+            # Forked: the parent's segment (and its handle) stay the parent's.
+            self._pid, self._seq, self._file = pid, 0, None
+            self._executions = {}
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        while True:
+            self._seq += 1
+            path = os.path.join(
+                self.directory, f"audit-{stamp}-{pid}-{self._seq:04d}{self.SUFFIX}"
+            )
+            try:
+                self._file = open(path, "xb")
+                break
+            except FileExistsError:
+                continue  # another logger in this process, same second
+        self._path = path
+        self._begin()
+
+    def _close_segment(self) -> None:
+        if self._file is None:
+            return
+        self._finish()
+        self._file.close()
+        self._file = self._path = None
+
+    def emit(self, evt: AuditEvent) -> None:
+        with self._lock:
+            if self._file is None or self._pid != os.getpid():
+                self._open_segment()
+            ids = self._executions.get(evt.execution_id)
+            end = evt.event == "execute.end"
+            if evt.event == "execute.start":
+                ids = (evt.data.get("intent_id"), evt.data.get("intent"))
+                self._executions[evt.execution_id] = ids
+                if len(self._executions) > MAX_OPEN_EXECUTIONS:
+                    del self._executions[next(iter(self._executions))]
+            elif end:
+                self._executions.pop(evt.execution_id, None)
+            intent_id, intent = ids or (None, None)
+            if self._append(evt, intent_id, intent, end) >= self.max_segment_bytes:
+                self._close_segment()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._file is not None and self._pid == os.getpid():
+                self._file.flush()
+
+    def close(self) -> None:
+        """
+        Close the current segment.
+        """
+        with self._lock:
+            if self._pid == os.getpid():
+                self._close_segment()
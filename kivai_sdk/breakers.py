@@ -0,0 +1,329 @@
+"""
+Circuit breakers (v0.22)
+
+One breaker per adapter intent and one per routed device. A breaker watches
+the outcomes of its last `window` calls:
+
+- closed:    calls pass. Once `min_calls` outcomes are in the window and the
+             failure rate reaches `failure_rate` (or the share of calls slower
+             than `slow_call_ms` reaches `slow_call_rate`), the breaker opens.
+- open:      calls fail fast with DEVICE_UNAVAILABLE for `open_seconds`.
+- half-open: up to `half_open_probes` calls are let through. One success
+             closes the breaker with a fresh window; a failure reopens it.
+
+Only infrastructure failures count (`failure_codes` and adapter exceptions);
+an adapter rejecting bad params is the caller's fault, not the device's.
+When a call has a routed device, the device breaker judges it and the
+adapter breaker only counts failures of the adapter itself
+(`adapter_failure_codes`), so one dead device cannot cut off the others.
+
+v0.33: inside a tenant's execution, device breakers are keyed
+"<tenant_id>/<device_id>", since homes reuse device ids.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, FrozenSet, Optional, Tuple
+
+from kivai_sdk.scope import current_tenant
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+ADAPTER = "adapter"
+DEVICE = "device"
+
+DEFAULT_FAILURE_CODES: FrozenSet[str] = frozenset(
+    {
+        "ADAPTER_ERROR",
+        "ADAPTER_TIMEOUT",
+        "ADAPTER_CRASHED",
+        "DEVICE_TIMEOUT",
+        "DEVICE_ERROR",
+        "DEVICE_UNREACHABLE",
+    }
+)
+
+
+@dataclass(frozen=True)
+class BreakerConfig:
+    window: int = 20
+    min_calls: int = 10
+    failure_rate: float = 0.5
+    slow_call_ms: Optional[float] = None
+    slow_call_rate: float = 1.0
+    open_seconds: float = 30.0
+    half_open_probes: int = 1
+    failure_codes: FrozenSet[str] = DEFAULT_FAILURE_CODES
+    adapter_failure_codes: FrozenSet[str] = frozenset(
+        {"ADAPTER_ERROR", "ADAPTER_CRASHED"}
+    )
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.min_calls <= self.window:
+            raise ValueError("BreakerConfig requires 1 <= min_calls <= window")
+        if not 0 < self.failure_rate <= 1 or not 0 < self.slow_call_rate <= 1:
+            raise ValueError("BreakerConfig rates must be in (0, 1]")
+        if self.half_open_probes < 1:
+            raise ValueError("BreakerConfig.half_open_probes must be >= 1")
+
+
+class CircuitBreaker:
+    """
+    Breaker for one adapter or device. Call `acquire()` before the call;
+    when it returns True, follow up with exactly one `record()` or `cancel()`.
+    """
+
+    def __init__(
+        self, config: BreakerConfig, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.config = config
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=config.window)
+        self._failures = 0
+        self._slow = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    def _transition(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.config.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._transition(self._clock())
+            return self._state
+
+    def retry_in(self) -> float:
+        """
+        Seconds until an open breaker admits a probe (0 if not open).
+        """
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.config.open_seconds - self._clock())
+
+    def acquire(self) -> bool:
+        with self._lock:
+            self._transition(self._clock())
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.config.half_open_probes:
+                self._probes += 1
+                return True
+            return False
+
+    def cancel(self) -> None:
+        """
+        Give back an acquired call that never ran.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self._failures = self._slow = 0
+
+    def record(self, ok: bool, elapsed_ms: Optional[float]) -> None:
+        """
+        Report an admitted call. `elapsed_ms=None` leaves latency unjudged.
+        """
+        cfg = self.config
+        slow = (
+            cfg.slow_call_ms is not None
+            and elapsed_ms is not None
+            and elapsed_ms >= cfg.slow_call_ms
+        )
+        failed = not ok
+        with self._lock:
+            now = self._clock()
+            if self._state == HALF_OPEN:
+                if failed or slow:
+                    self._open(now)
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    self._failures = self._slow = 0
+                return
+            if self._state == OPEN:
+                return  # a call admitted before the breaker opened
+
+            outcomes = self._outcomes
+            if len(outcomes) == outcomes.maxlen:
+                old_failed, old_slow = outcomes[0]
+                self._failures -= old_failed
+                self._slow -= old_slow
+            outcomes.append((failed, slow))
+            self._failures += failed
+            self._slow += slow
+
+            n = len(outcomes)
+            if n >= cfg.min_calls and (
+                self._failures / n >= cfg.failure_rate
+                or (
+                    cfg.slow_call_ms is not None
+                    and self._slow / n >= cfg.slow_call_rate
+                )
+            ):
+                self._open(now)
+
+    def describe(self) -> Dict[str, object]:
+        with self._lock:
+            self._transition(self._clock())
+            n = len(self._outcomes)
+            return {
+                "state": self._state,
+                "calls": n,
+                "failure_rate": round(self._failures / n, 3) if n else 0.0,
+                "slow_rate": round(self._slow / n, 3) if n else 0.0,
+            }
+
+
+class Permit:
+    """
+    One admitted call. Call `finish` exactly once when it completes.
+    """
+
+    __slots__ = ("config", "adapter", "device", "started")
+
+    def __init__(
+        self,
+        config: BreakerConfig,
+        adapter: CircuitBreaker,
+        device: Optional[CircuitBreaker],
+    ) -> None:
+        self.config = config
+        self.adapter = adapter
+        self.device = device
+        self.started = time.perf_counter()
+
+    def finish(self, code: Optional[str] = None, failed: bool = False) -> None:
+        """
+        `code`: error code of a failed result (None on success).
+        `failed`: the call raised or overran its deadline.
+        """
+        elapsed_ms = (time.perf_counter() - self.started) * 1000.0
+        cfg = self.config
+        infra_failed = failed or (code is not None and code in cfg.failure_codes)
+        if self.device is None:
+            self.adapter.record(not infra_failed, elapsed_ms)
+            return
+        self.device.record(not infra_failed, elapsed_ms)
+        adapter_failed = failed or (
+            code is not None and code in cfg.adapter_failure_codes
+        )
+        self.adapter.record(not adapter_failed, None)
+
+
+class BreakerRegistry:
+    """
+    Breakers keyed by (ADAPTER, intent) and (DEVICE, device_id), created on
+    first use with the registry's config. Device keys are tenant-qualified
+    within a tenant's execution.
+    """
+
+    def __init__(
+        self,
+        config: BreakerConfig = BreakerConfig(),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.config = config
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+    def get(self, kind: str, key: str) -> CircuitBreaker:
+        key = _scoped(kind, key)
+        breaker = self._breakers.get((kind, key))
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    (kind, key), CircuitBreaker(self.config, self._clock)
+                )
+        return breaker
+
+    def state(self, kind: str, key: str) -> str:
+        breaker = self._breakers.get((kind, _scoped(kind, key)))
+        return breaker.state if breaker is not None else CLOSED
+
+    def acquire(
+        self, intent: str, device_id: Optional[str]
+    ) -> Tuple[Optional["Permit"], Optional[Tuple[str, str, float]]]:
+        """
+        Admit one call to `intent` on `device_id`. Returns (permit, None), or
+        (None, (kind, key, retry_in)) naming the breaker that refused it.
+        """
+        device = self.get(DEVICE, device_id) if device_id else None
+        if device is not None and not device.acquire():
+            return None, (DEVICE, device_id or "", device.retry_in())
+        adapter = self.get(ADAPTER, intent)
+        if not adapter.acquire():
+            if device is not None:
+                device.cancel()
+            return None, (ADAPTER, intent, adapter.retry_in())
+        return Permit(self.config, adapter, device), None
+
+    def counts(self) -> Dict[str, int]:
+        out = {OPEN: 0, HALF_OPEN: 0}
+        for breaker in list(self._breakers.values()):
+            state = breaker.state
+            if state in out:
+                out[state] += 1
+        return out
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Counts plus details of every breaker that is not closed.
+        """
+        tripped = []
+        for (kind, key), breaker in sorted(self._breakers.items()):
+            info = breaker.describe()
+            if info["state"] != CLOSED:
+                tripped.append(
+                    {
+                        "kind": kind,
+                        "key": key,
+                        **info,
+                        "retry_in": round(breaker.retry_in(), 3),
+                    }
+                )
+        return {"tracked": len(self._breakers), **self.counts(), "tripped": tripped}
+
+
+def _scoped(kind: str, key: str) -> str:
+    tenant = current_tenant() if kind == DEVICE else None
+    return key if tenant is None else f"{tenant.tenant_id}/{key}"
+
+
+def unavailable_message(kind: str, key: str, retry_in: float) -> str:
+    return f"Circuit open for {kind} {key!r}; retry in {retry_in:.1f}s"
+
+
+_ACTIVE_BREAKERS: Optional[BreakerRegistry] = None
+
+
+def active_breakers() -> BreakerRegistry:
+    global _ACTIVE_BREAKERS
+    if _ACTIVE_BREAKERS is None:
+        _ACTIVE_BREAKERS = BreakerRegistry()
+    return _ACTIVE_BREAKERS
+
+
+def set_breakers(breakers: BreakerRegistry | None) -> None:
+    """
+    Replace the runtime breakers (None restores fresh defaults).
+    """
+    global _ACTIVE_BREAKERS
+    _ACTIVE_BREAKERS = breakers
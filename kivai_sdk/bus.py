@@ -0,0 +1,350 @@
+"""
+In-process event bus (v0.26)
+
+The runtime publishes what happens to topics; dashboards subscribe instead
+of polling. Topics are dotted names:
+
+    execution.started   {"execution_id", "intent_id", "intent"}
+    execution.finished  {"execution_id", "intent_id", "intent", "status",
+                         "device_id", "error_code"}
+    device.upserted     {"device": {"device_id", "zone", "capabilities"}}
+    device.deleted      {"device_id"}
+    device.status       {"device_id", "old", "new"}   (heartbeat health)
+    device.state        {"device_id", "state", "source"}   (state shadow, v0.27)
+    device.event        a device event posted to POST /v1/events
+
+A subscription filters on exact topics, prefixes ("device.*") or "*", and
+owns a bounded queue. Publishing never waits on a subscriber: when a queue
+is full the subscription's policy either drops its oldest event (`drop`,
+counted so the consumer can report the gap) or closes it (`disconnect`).
+The subscribers of a topic are resolved once and cached until the
+subscription set changes. Fan-out is one deque append per subscriber, done
+inline for small audiences; an event with more than `inline_fanout`
+subscribers is handed to a dispatcher thread instead, so the publisher (the
+execute path) pays one append whatever the number of subscribers.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+DROP = "drop"
+DISCONNECT = "disconnect"
+POLICIES = (DROP, DISCONNECT)
+
+EXECUTION_STARTED = "execution.started"
+EXECUTION_FINISHED = "execution.finished"
+DEVICE_UPSERTED = "device.upserted"
+DEVICE_DELETED = "device.deleted"
+DEVICE_STATUS = "device.status"
+DEVICE_STATE = "device.state"
+DEVICE_EVENT = "device.event"
+
+
+@dataclass(frozen=True)
+class BusEvent:
+    seq: int
+    topic: str
+    at: float
+    data: Dict[str, Any]
+
+    def describe(self) -> Dict[str, Any]:
+        return {"seq": self.seq, "topic": self.topic, "at": self.at, **self.data}
+
+
+def _parse_filter(pattern: str) -> str:
+    pattern = pattern.strip()
+    if not pattern:
+        raise ValueError("Empty topic filter")
+    if "*" in pattern and pattern != "*" and not pattern.endswith(".*"):
+        raise ValueError(f"Invalid topic filter: {pattern!r} (use 'a.b', 'a.*' or '*')")
+    if pattern.count("*") > 1:
+        raise ValueError(f"Invalid topic filter: {pattern!r}")
+    return pattern
+
+
+def _filter_matches(pattern: str, topic: str) -> bool:
+    if pattern == "*":
+        return True
+    if pattern.endswith(".*"):
+        return topic.startswith(pattern[:-1])
+    return pattern == topic
+
+
+class Subscription:
+    """
+    One consumer's bounded queue.
+
+    `notify` is called (from the publishing thread) when an event arrives
+    while the consumer is waiting; async consumers pass something that
+    hops onto their loop. Without it, `wait()` blocks the calling thread.
+    """
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        topics: Tuple[str, ...],
+        max_queue: int,
+        policy: str,
+        notify: Optional[Callable[[], None]] = None,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown slow-consumer policy: {policy!r}")
+        if max_queue < 1:
+            raise ValueError("max_queue must be >= 1")
+        self.topics = topics
+        self.max_queue = max_queue
+        self.policy = policy
+        self.dropped = 0
+        self.delivered = 0
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        self._bus = bus
+        self._queue: Deque[BusEvent] = deque()
+        self._wake = threading.Event()
+        self._notify = notify or self._wake.set
+        self._waiting = False
+
+    def matches(self, topic: str) -> bool:
+        return any(_filter_matches(p, topic) for p in self.topics)
+
+    def _offer(self, event: BusEvent) -> bool:
+        """
+        Publisher side. Never blocks; False when the subscription had to go.
+        """
+        queue = self._queue
+        if len(queue) >= self.max_queue:
+            if self.policy == DISCONNECT:
+                self._bus._evict(self, "slow consumer")
+                return False
+            try:
+                queue.popleft()
+            except IndexError:  # pragma: no cover - drained concurrently
+                pass
+            self.dropped += 1
+        queue.append(event)
+        self.delivered += 1
+        if self._waiting:
+            self._waiting = False
+            self._notify()
+        return True
+
+    def drain(self, limit: Optional[int] = None) -> List[BusEvent]:
+        """
+        Take up to `limit` queued events (all of them by default).
+        """
+        queue = self._queue
+        n = len(queue) if limit is None else min(limit, len(queue))
+        return [queue.popleft() for _ in range(n)]
+
+    def arm(self) -> bool:
+        """
+        Ask to be notified on the next event. Returns False (and stays
+        unarmed) if events are already queued or the subscription is closed,
+        so a consumer that arms and then finds nothing can sleep safely.
+        """
+        self._wake.clear()
+        self._waiting = True
+        if self._queue or self.closed:
+            self._waiting = False
+            return False
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> List[BusEvent]:
+        """
+        Blocking consumer: queued events, waiting up to `timeout` for one.
+        """
+        if self.arm():
+            self._wake.wait(timeout)
+            self._waiting = False
+        return self.drain()
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+
+class EventBus:
+    """
+    Topic-filtered fan-out to bounded subscriber queues.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 1024,
+        policy: str = DROP,
+        inline_fanout: int = 32,
+        max_backlog: int = 65536,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown slow-consumer policy: {policy!r}")
+        self.max_queue = max_queue
+        self.policy = policy
+        self.inline_fanout = inline_fanout
+        self.max_backlog = max_backlog
+        self._lock = threading.Lock()
+        self._subscriptions: Tuple[Subscription, ...] = ()
+        self._routes: Dict[str, Tuple[Subscription, ...]] = {}
+        self._seq = itertools.count(1)
+        self._counts = {
+            "published": 0,
+            "deferred": 0,
+            "overflowed": 0,
+            "disconnected": 0,
+        }
+        # Events waiting for the dispatcher thread, with their subscribers.
+        self._backlog: Deque[Tuple[BusEvent, Tuple[Subscription, ...]]] = deque()
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._dispatcher: Optional[threading.Thread] = None
+
+    @property
+    def active(self) -> bool:
+        """
+        True when anyone is subscribed; lets publishers skip building events.
+        """
+        return bool(self._subscriptions)
+
+    def subscribe(
+        self,
+        topics: Iterable[str] = ("*",),
+        max_queue: Optional[int] = None,
+        policy: Optional[str] = None,
+        notify: Optional[Callable[[], None]] = None,
+    ) -> Subscription:
+        filters = tuple(_parse_filter(t) for t in topics) or ("*",)
+        sub = Subscription(
+            self,
+            filters,
+            self.max_queue if max_queue is None else max_queue,
+            self.policy if policy is None else policy,
+            notify,
+        )
+        with self._lock:
+            self._subscriptions = (*self._subscriptions, sub)
+            self._routes = {}
+        return sub
+
+    def unsubscribe(self, sub: Subscription, reason: str = "closed") -> bool:
+        with self._lock:
+            if sub not in self._subscriptions:
+                return False
+            self._subscriptions = tuple(s for s in self._subscriptions if s is not sub)
+            self._routes = {}
+        sub.closed = True
+        sub.close_reason = reason
+        if sub._waiting:
+            sub._waiting = False
+            sub._notify()
+        return True
+
+    def _evict(self, sub: Subscription, reason: str) -> None:
+        if self.unsubscribe(sub, reason):
+            with self._lock:
+                self._counts["disconnected"] += 1
+
+    def _route(self, topic: str) -> Tuple[Subscription, ...]:
+        routes = self._routes
+        subs = routes.get(topic)
+        if subs is None:
+            subs = tuple(s for s in self._subscriptions if s.matches(topic))
+            routes[topic] = subs
+        return subs
+
+    def publish(self, topic: str, data: Dict[str, Any]) -> int:
+        """
+        Queue `data` for every subscriber of `topic`. Returns how many
+        subscribers it was routed to.
+        """
+        if not self._subscriptions:
+            return 0
+        subs = self._route(topic)
+        if not subs:
+            return 0
+        self._counts["published"] += 1
+        event = BusEvent(next(self._seq), topic, time.time(), data)
+        # Once anything is deferred, later events follow it so each
+        # subscriber still sees events in publish order.
+        if len(subs) <= self.inline_fanout and not self._pending:
+            return self._fan_out(event, subs)
+        return self._defer(event, subs)
+
+    @staticmethod
+    def _fan_out(event: BusEvent, subs: Tuple[Subscription, ...]) -> int:
+        delivered = 0
+        for sub in subs:
+            delivered += sub._offer(event)
+        return delivered
+
+    def _defer(self, event: BusEvent, subs: Tuple[Subscription, ...]) -> int:
+        with self._cond:
+            if self._pending >= self.max_backlog:
+                self._counts["overflowed"] += 1
+                return 0
+            self._backlog.append((event, subs))
+            self._pending += 1
+            self._counts["deferred"] += 1
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(
+                    target=self._dispatch, name="kivai-event-bus", daemon=True
+                )
+                self._dispatcher.start()
+            self._cond.notify_all()
+        return len(subs)
+
+    def _dispatch(self) -> None:
+        backlog = self._backlog
+        while True:
+            with self._cond:
+                if not backlog and not self._cond.wait_for(lambda: backlog, 5.0):
+                    self._dispatcher = None  # idle: exit, restarted on demand
+                    return
+                event, subs = backlog.popleft()
+            self._fan_out(event, subs)
+            with self._cond:
+                self._pending -= 1
+                if not self._pending:
+                    self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the dispatcher has delivered every deferred event.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending, timeout)
+
+    def stats(self) -> Dict[str, int]:
+        subs = self._subscriptions
+        return {
+            "subscribers": len(subs),
+            **self._counts,
+            "queued": sum(len(s._queue) for s in subs),
+            "dropped": sum(s.dropped for s in subs),
+        }
+
+
+_ACTIVE_BUS: Optional[EventBus] = None
+
+
+def active_event_bus() -> EventBus:
+    global _ACTIVE_BUS
+    if _ACTIVE_BUS is None:
+        _ACTIVE_BUS = EventBus()
+    return _ACTIVE_BUS
+
+
+def set_event_bus(bus: EventBus | None) -> None:
+    """
+    Replace the runtime event bus (None restores a fresh one). Existing
+    subscriptions stay attached to the old bus.
+    """
+    global _ACTIVE_BUS
+    _ACTIVE_BUS = bus
+
+
+def publish(topic: str, data: Dict[str, Any]) -> int:
+    return active_event_bus().publish(topic, data)
@@ -1,16 +1,15 @@
 import argparse
 import json
+import os
 import sys
-import uuid
-from datetime import datetime, timezone
 from pathlib import Path
 
-from kivai_sdk.runtime import execute_intent, pretty_json
-from kivai_sdk.validator import validate_command
+from kivai_sdk.clock import utc_now_iso
+from kivai_sdk.ids import new_id
 
-
-def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+# v0.17: runtime, validator (jsonschema) and gateway imports are deferred into
+# the commands that need them, and validate/execute forward to a running
+# `kivai daemon` when there is one.
 
 
 def _make_canonical_payload(
@@ -24,12 +23,12 @@ def _make_canonical_payload(
     source: str = "cli",
 ) -> dict:
     payload = {
-        "intent_id": str(uuid.uuid4()),
+        "intent_id": new_id(),
         "intent": intent,
         "target": target,
         "params": params or {},
         "meta": {
-            "timestamp": _utc_now_iso(),
+            "timestamp": utc_now_iso(),
             "language": language,
             "confidence": float(confidence),
             "source": source,
@@ -40,6 +39,20 @@ def _make_canonical_payload(
     return payload
 
 
+def _print_json(data: object) -> None:
+    # Same formatting as runtime.pretty_json, without importing the runtime.
+    print(json.dumps(data, indent=2, ensure_ascii=False, sort_keys=False))
+
+
+def _forward(op: str, payload: dict):
+    """
+    Run `op` on the local daemon; None if no daemon is running.
+    """
+    from kivai_sdk.daemon import try_daemon
+
+    return try_daemon(op, payload)
+
+
 def _read_json_file(path: str) -> dict:
     payload_path = Path(path)
     if not payload_path.exists():
@@ -58,7 +71,13 @@ def _cmd_validate(args: argparse.Namespace) -> int:
         print(f"❌ {e}", file=sys.stderr)
         return 2
 
-    ok, message = validate_command(payload)
+    result = None if args.no_daemon else _forward("validate", payload)
+    if result is not None:
+        ok, message = result
+    else:
+        from kivai_sdk.validator import validate_command
+
+        ok, message = validate_command(payload)
     print(message)
     return 0 if ok else 1
 
@@ -74,8 +93,17 @@ def _cmd_execute(args: argparse.Namespace) -> int:
         print(f"❌ {e}", file=sys.stderr)
         return 2
 
-    ack = execute_intent(payload)
-    print(pretty_json(ack))
+    # An explicit --devices store always runs in-process; the daemon routes
+    # against the store it was started with.
+    ack = None
+    if not (args.no_daemon or args.devices):
+        ack = _forward("execute", payload)
+    if ack is None:
+        from kivai_sdk.runtime import execute_intent
+
+        _configure_devices(args)
+        ack = execute_intent(payload)
+    _print_json(ack)
     return 0 if ack.get("status") == "ok" else 1
 
 
@@ -88,59 +116,82 @@ def _cmd_run_echo(args: argparse.Namespace) -> int:
         language="en",
         confidence=1.0,
     )
+    from kivai_sdk.runtime import execute_intent
+
     ack = execute_intent(payload)
-    print(pretty_json(ack))
+    _print_json(ack)
     return 0 if ack.get("status") == "ok" else 1
 
 
 def _cmd_list_adapters(args: argparse.Namespace) -> int:
-    # Introspection is intentional for CLI output in v0.10
-    from kivai_sdk.adapters import default_registry
-
-    reg = default_registry()
-
-    items: list[dict] = []
-    by_intent = getattr(reg, "_by_intent", {})
-    if isinstance(by_intent, dict):
-        for intent, adapter in sorted(by_intent.items()):
-            cap_obj = None
-            try:
-                cap_obj = getattr(adapter, "capabilities", None)
-            except Exception:
-                cap_obj = None
-
-            required_caps = []
-            requires_auth = False
-            required_role = None
-
-            if cap_obj is not None:
-                try:
-                    # property -> object, callable -> call
-                    c = cap_obj() if callable(cap_obj) else cap_obj
-                    requires_auth = bool(getattr(c, "requires_auth", False))
-                    required_role = getattr(c, "required_role", None)
-                    req = getattr(c, "required_capabilities", frozenset())
-                    if isinstance(req, (set, frozenset, list, tuple)):
-                        required_caps = sorted([x for x in req if isinstance(x, str)])
-                except Exception:
-                    pass
-
-            items.append(
-                {
-                    "intent": intent,
-                    "adapter": adapter.__class__.__name__,
-                    "requires_auth": requires_auth,
-                    "required_role": required_role,
-                    "required_capabilities": required_caps,
-                }
+    # v0.16: metadata comes from adapter specs; no adapter module is imported.
+    from kivai_sdk.adapters import active_adapter_registry
+
+    reg = active_adapter_registry()
+    out: dict = {"adapters": reg.describe()}
+    if reg.errors:
+        out["errors"] = list(reg.errors)
+    print(json.dumps(out, indent=2, ensure_ascii=False, sort_keys=False))
+    return 0
+
+
+def _configure_devices(args: argparse.Namespace) -> None:
+    if getattr(args, "devices", None):
+        from kivai_sdk.devices import configure_devices
+
+        configure_devices(args.devices)
+
+
+def _cmd_devices_import(args: argparse.Namespace) -> int:
+    import time
+
+    from kivai_sdk.devices import SQLiteDeviceStore, write_snapshot
+    from kivai_sdk.devices.io import iter_devices_file
+
+    t0 = time.perf_counter()
+    with SQLiteDeviceStore(args.db) as store:
+        count = store.upsert_many(iter_devices_file(args.file))
+        elapsed = time.perf_counter() - t0
+        result = {
+            "imported": count,
+            "db": args.db,
+            "seconds": round(elapsed, 3),
+            "devices_per_second": round(count / elapsed) if elapsed else None,
+        }
+        if args.snapshot:
+            result["snapshot"] = args.snapshot
+            result["snapshot_devices"] = write_snapshot(
+                store.iter_devices(), args.snapshot
             )
 
+    print(json.dumps(result, indent=2, ensure_ascii=False, sort_keys=False))
+    return 0
+
+
+def _cmd_devices_snapshot(args: argparse.Namespace) -> int:
+    from kivai_sdk.devices import SQLiteDeviceStore, write_snapshot
+
+    with SQLiteDeviceStore(args.db) as store:
+        count = write_snapshot(store.iter_devices(), args.out)
+
     print(
-        json.dumps({"adapters": items}, indent=2, ensure_ascii=False, sort_keys=False)
+        json.dumps(
+            {"snapshot": args.out, "devices": count},
+            indent=2,
+            ensure_ascii=False,
+            sort_keys=False,
+        )
     )
     return 0
 
 
+def _tenant_options(args: argparse.Namespace) -> dict:
+    return {
+        "memory_budget": args.tenant_memory_mb * 1024 * 1024,
+        "max_tenants": args.max_tenants,
+    }
+
+
 def _cmd_serve(args: argparse.Namespace) -> int:
     # Gateway HTTP (FastAPI). Import inside command to avoid dependency when not used.
     try:
@@ -158,10 +209,265 @@ def _cmd_serve(args: argparse.Namespace) -> int:
         print(f"❌ Failed to import gateway: {e}", file=sys.stderr)
         return 2
 
-    uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+    if args.tenants_dir and not os.path.isdir(args.tenants_dir):
+        print(f"❌ Tenants directory not found: {args.tenants_dir}", file=sys.stderr)
+        return 2
+
+    if args.replicate_from and args.devices:
+        from kivai_sdk.devices.store import SNAPSHOT_SUFFIXES
+
+        # v0.35: a replica writes every change into its own registry.
+        if args.devices.lower().endswith(SNAPSHOT_SUFFIXES):
+            print(
+                "❌ --replicate-from needs a writable registry; "
+                "use a .db store instead of a .kvds snapshot",
+                file=sys.stderr,
+            )
+            return 2
+
+    cluster = None
+    if args.cluster_self:
+        # v0.34: devices are sharded across the listed gateway nodes.
+        from kivai_sdk.cluster import normalize_node
+
+        try:
+            cluster = {
+                "self_node": normalize_node(args.cluster_self),
+                "nodes": [
+                    normalize_node(n)
+                    for n in (args.cluster_nodes or "").split(",")
+                    if n.strip()
+                ],
+                "vnodes": args.cluster_vnodes,
+            }
+        except ValueError as exc:
+            print(f"❌ {exc}", file=sys.stderr)
+            return 2
+
+    if args.workers > 1:
+        # v0.20: pre-forked workers sharing warm state (kivai_sdk/workers.py).
+        if args.uds or args.schedule_db:
+            flag = "--uds" if args.uds else "--schedule-db"
+            print(f"❌ {flag} cannot be combined with --workers", file=sys.stderr)
+            return 2
+        from kivai_sdk.workers import serve_workers
+
+        return serve_workers(
+            args.host,
+            args.port,
+            args.workers,
+            devices=args.devices,
+            rules=args.rules,
+            log_level="info",
+            audit_dir=args.audit_dir,
+            audit_format=args.audit_format,
+            tenants_dir=args.tenants_dir,
+            tenant_options=_tenant_options(args),
+            cluster=cluster,
+            replicate_from=args.replicate_from,
+        )
+
+    _configure_devices(args)
+    if args.tenants_dir:
+        from kivai_sdk.tenants import configure_tenants
+
+        configure_tenants(args.tenants_dir, **_tenant_options(args))
+    if cluster:
+        from kivai_sdk.cluster import configure_cluster
+
+        configure_cluster(**cluster)
+    if args.replicate_from:
+        from kivai_sdk.devices import configure_replica
+
+        configure_replica(args.replicate_from).start()
+    if args.audit_dir:
+        from kivai_sdk.audit import configure_audit
+
+        configure_audit(args.audit_dir, args.audit_format)
+    if args.rules:
+        from kivai_sdk.rules import configure_rules
+
+        configure_rules(args.rules)
+    if args.schedule_db:
+        from kivai_sdk.scheduler import configure_scheduler
+
+        configure_scheduler(args.schedule_db)
+    from kivai_sdk.adapters import active_adapter_registry
+
+    # v0.21: isolated adapter pools start now, not inside the first call.
+    active_adapter_registry().start_isolated()
+    if not args.uds:
+        uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+        return 0
+
+    # v0.18: framed Unix-socket listener in the same process and event loop,
+    # sharing the runtime (registries, policy, health) with HTTP.
+    import asyncio
+
+    from kivai_sdk.socket_gateway import start_socket_gateway
+
+    async def serve_both() -> None:
+        listener = await start_socket_gateway(args.uds)
+        server = uvicorn.Server(
+            uvicorn.Config(app, host=args.host, port=args.port, log_level="info")
+        )
+        try:
+            await server.serve()
+        finally:
+            listener.close()
+            await listener.wait_closed()
+
+    try:
+        asyncio.run(serve_both())
+    finally:
+        if os.path.exists(args.uds):
+            os.unlink(args.uds)
+    return 0
+
+
+def _cmd_daemon(args: argparse.Namespace) -> int:
+    from kivai_sdk.daemon import DaemonClient, DaemonUnavailable, serve_daemon
+
+    if args.stop or args.status:
+        try:
+            with DaemonClient(args.socket) as client:
+                result = client.call("shutdown" if args.stop else "ping")
+        except DaemonUnavailable:
+            print("kivai daemon is not running", file=sys.stderr)
+            return 1
+        if args.status:
+            _print_json({"running": True, **result})
+            return 0
+
+        import time
+
+        # The daemon removes its socket once it has stopped serving.
+        deadline = time.monotonic() + 5.0
+        while os.path.exists(client.path) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return 0
+
+    serve_daemon(args.socket, devices=args.devices)
+    return 0
+
+
+def _cmd_loadgen(args: argparse.Namespace) -> int:
+    try:
+        import httpx  # noqa: F401
+    except Exception:
+        print(
+            "❌ Missing dependency: httpx. Install dependencies and try again.",
+            file=sys.stderr,
+        )
+        return 2
+
+    import asyncio
+
+    from kivai_sdk.loadgen import (
+        DEFAULT_MIX,
+        LoadConfig,
+        compare_reports,
+        parse_mix,
+        run_load,
+    )
+
+    config = LoadConfig(
+        url=args.url,
+        rate=args.rate,
+        duration=args.duration,
+        mix=parse_mix(args.mix or DEFAULT_MIX),
+        connections=args.connections,
+        max_in_flight=args.max_in_flight,
+        interval=args.interval,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+    report = asyncio.run(run_load(config))
+    print(report.format_text())
+    data = report.to_dict()
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+    if args.baseline:
+        print(compare_reports(_read_json_file(args.baseline), data))
+    return 0
+
+
+def _parse_time_us(value: str | None) -> int | None:
+    if value is None:
+        return None
+    from kivai_sdk.audit import parse_ts_us
+
+    try:
+        return parse_ts_us(value)
+    except ValueError:
+        raise ValueError(f"Invalid timestamp (ISO 8601 expected): {value}") from None
+
+
+def _cmd_audit_query(args: argparse.Namespace) -> int:
+    from kivai_sdk.audit import AuditQuery, query_audit
+
+    query = AuditQuery(
+        execution_id=args.execution_id,
+        intent_id=args.intent_id,
+        since=_parse_time_us(args.since),
+        until=_parse_time_us(args.until),
+        intent=args.intent,
+        event=args.event,
+        error_code=args.error_code,
+    )
+    found = 0
+    for record in query_audit(args.dir, query, limit=args.limit):
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        found += 1
+    return 0 if found else 1
+
+
+def _cmd_audit_index(args: argparse.Namespace) -> int:
+    from kivai_sdk.audit import build_index, segments
+    from kivai_sdk.audit.index import index_path
+
+    for path in segments(args.dir):
+        sidecar = index_path(path)
+        if os.path.exists(sidecar) and not args.force:
+            continue
+        count = build_index(path)
+        print(f"✅ Indexed {count} records: {sidecar}")
+    return 0
+
+
+def _cmd_audit_export(args: argparse.Namespace) -> int:
+    from kivai_sdk.audit import export_jsonl, segments
+    from kivai_sdk.audit.binary import SUFFIX
+
+    paths = segments(args.dir, (SUFFIX,))
+    if args.out:
+        with open(args.out, "wb") as f:
+            count = export_jsonl(paths, f)
+        print(f"✅ Exported {count} records from {len(paths)} segments: {args.out}")
+    else:
+        export_jsonl(paths, sys.stdout.buffer)
+        sys.stdout.flush()
     return 0
 
 
+def _cmd_migrate(args: argparse.Namespace) -> int:
+    from kivai_sdk.migrate import migrate_file
+
+    report = migrate_file(
+        args.input,
+        args.out,
+        rejects_path=args.rejects,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+    print(f"✅ {report.format_text()}")
+    if report.rejected and args.rejects:
+        print(f"Rejected records: {args.rejects}")
+    return 1 if report.rejected else 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="kivai",
@@ -173,12 +479,21 @@ def build_parser() -> argparse.ArgumentParser:
         "validate", help="Validate a JSON payload against the canonical Kivai schema"
     )
     p_validate.add_argument("payload", help="Path to JSON file")
+    p_validate.add_argument(
+        "--no-daemon", action="store_true", help="Do not forward to a running daemon"
+    )
     p_validate.set_defaults(func=_cmd_validate)
 
     p_execute = sub.add_parser(
         "execute", help="Execute a JSON payload and print ACK (local runtime)"
     )
     p_execute.add_argument("payload", help="Path to JSON file")
+    p_execute.add_argument(
+        "--devices", help="Device store to route against (.db or .kvds snapshot)"
+    )
+    p_execute.add_argument(
+        "--no-daemon", action="store_true", help="Do not forward to a running daemon"
+    )
     p_execute.set_defaults(func=_cmd_execute)
 
     p_list = sub.add_parser("list", help="List local registry items")
@@ -201,8 +516,216 @@ def build_parser() -> argparse.ArgumentParser:
     p_serve.add_argument(
         "--port", type=int, default=8080, help="Bind port (default: 8080)"
     )
+    p_serve.add_argument(
+        "--devices", help="Device store to route against (.db or .kvds snapshot)"
+    )
+    p_serve.add_argument(
+        "--uds",
+        help="Also accept framed intents on this Unix socket path "
+        "(see kivai_sdk/socket_gateway.py)",
+    )
+    p_serve.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Pre-fork this many worker processes sharing warm state (default: 1)",
+    )
+    p_serve.add_argument(
+        "--rules", help="Automation rules (JSON) applied to POST /v1/events"
+    )
+    p_serve.add_argument(
+        "--schedule-db",
+        help="Persist scheduled intents (POST /v1/schedules) in this SQLite file",
+    )
+    p_serve.add_argument(
+        "--audit-dir",
+        help="Write indexed JSONL audit segments to this directory "
+        "(query with `kivai audit query`)",
+    )
+    p_serve.add_argument(
+        "--audit-format",
+        choices=("jsonl", "binary"),
+        default="jsonl",
+        help="jsonl (indexed) or binary (compact, see kivai_sdk/audit/binary.py)",
+    )
+    p_serve.add_argument(
+        "--tenants-dir",
+        help="Serve one tenant per subdirectory (devices, policy, adapter "
+        "allowlist), selected by X-Kivai-Tenant or meta.tenant_id",
+    )
+    p_serve.add_argument(
+        "--tenant-memory-mb",
+        type=int,
+        default=256,
+        help="Estimated memory for loaded tenants before the least recently "
+        "used are evicted, per worker (default: 256)",
+    )
+    p_serve.add_argument(
+        "--max-tenants",
+        type=int,
+        help="Also evict beyond this many loaded tenants per worker",
+    )
+    p_serve.add_argument(
+        "--cluster-self",
+        help="Run as a cluster node reachable at this URL "
+        "(e.g. http://10.0.0.5:8080; see kivai_sdk/cluster.py)",
+    )
+    p_serve.add_argument(
+        "--cluster-nodes",
+        help="Comma-separated URLs of every cluster node, this one included",
+    )
+    p_serve.add_argument(
+        "--cluster-vnodes",
+        type=int,
+        default=128,
+        help="Virtual nodes per cluster node on the hash ring (default: 128)",
+    )
+    p_serve.add_argument(
+        "--replicate-from",
+        help="Keep the device registry in sync with the gateway at this URL "
+        "(see kivai_sdk/devices/replication.py)",
+    )
     p_serve.set_defaults(func=_cmd_serve)
 
+    p_daemon = sub.add_parser(
+        "daemon", help="Run a resident runtime that validate/execute forward to"
+    )
+    p_daemon.add_argument(
+        "--socket",
+        help="Unix socket path (default: $KIVAI_DAEMON_SOCKET, "
+        "$XDG_RUNTIME_DIR/kivai.sock or a per-user temp path)",
+    )
+    p_daemon.add_argument(
+        "--devices", help="Device store to route against (.db or .kvds snapshot)"
+    )
+    p_daemon_action = p_daemon.add_mutually_exclusive_group()
+    p_daemon_action.add_argument(
+        "--stop", action="store_true", help="Stop the running daemon"
+    )
+    p_daemon_action.add_argument(
+        "--status", action="store_true", help="Report whether a daemon is running"
+    )
+    p_daemon.set_defaults(func=_cmd_daemon)
+
+    p_devices = sub.add_parser("devices", help="Manage the persistent device registry")
+    devices_sub = p_devices.add_subparsers(dest="devices_what", required=True)
+
+    p_dev_import = devices_sub.add_parser(
+        "import", help="Bulk import devices from a .jsonl or .csv file"
+    )
+    p_dev_import.add_argument("file", help="Path to .jsonl or .csv device file")
+    p_dev_import.add_argument("--db", required=True, help="SQLite device store path")
+    p_dev_import.add_argument(
+        "--snapshot", help="Also write a binary snapshot (.kvds) after import"
+    )
+    p_dev_import.set_defaults(func=_cmd_devices_import)
+
+    p_dev_snapshot = devices_sub.add_parser(
+        "snapshot", help="Write a memory-mappable snapshot of a device store"
+    )
+    p_dev_snapshot.add_argument("--db", required=True, help="SQLite device store path")
+    p_dev_snapshot.add_argument("--out", required=True, help="Snapshot path (.kvds)")
+    p_dev_snapshot.set_defaults(func=_cmd_devices_snapshot)
+
+    p_audit = sub.add_parser("audit", help="Query audit segments (--audit-dir)")
+    audit_sub = p_audit.add_subparsers(dest="audit_what", required=True)
+
+    p_audit_query = audit_sub.add_parser(
+        "query", help="Print matching audit records as JSON lines"
+    )
+    p_audit_query.add_argument("dir", help="Audit directory")
+    p_audit_query.add_argument("--execution-id", help="Only this execution")
+    p_audit_query.add_argument("--intent-id", help="Only this intent_id")
+    p_audit_query.add_argument("--since", help="From this time (ISO 8601, inclusive)")
+    p_audit_query.add_argument("--until", help="Before this time (ISO 8601)")
+    p_audit_query.add_argument("--intent", help="Only this intent (e.g. unlock_door)")
+    p_audit_query.add_argument("--event", help="Only this event (e.g. execute.end)")
+    p_audit_query.add_argument("--error-code", help="Only failures with this code")
+    p_audit_query.add_argument("--limit", type=int, help="Stop after this many")
+    p_audit_query.set_defaults(func=_cmd_audit_query)
+
+    p_audit_index = audit_sub.add_parser(
+        "index", help="Write missing sidecar indexes (e.g. after a crash)"
+    )
+    p_audit_index.add_argument("dir", help="Audit directory")
+    p_audit_index.add_argument(
+        "--force", action="store_true", help="Rebuild existing indexes too"
+    )
+    p_audit_index.set_defaults(func=_cmd_audit_index)
+
+    p_audit_export = audit_sub.add_parser(
+        "export", help="Convert binary audit segments to JSONL"
+    )
+    p_audit_export.add_argument("dir", help="Audit directory")
+    p_audit_export.add_argument("--out", help="JSONL file (default: stdout)")
+    p_audit_export.set_defaults(func=_cmd_audit_export)
+
+    p_loadgen = sub.add_parser(
+        "loadgen", help="Open-loop load test against a running gateway"
+    )
+    p_loadgen.add_argument(
+        "--url",
+        default="http://127.0.0.1:8080",
+        help="Gateway base URL (default: http://127.0.0.1:8080)",
+    )
+    p_loadgen.add_argument(
+        "--rate", type=float, default=100.0, help="Intents per second (default: 100)"
+    )
+    p_loadgen.add_argument(
+        "--duration", type=float, default=10.0, help="Seconds to run (default: 10)"
+    )
+    p_loadgen.add_argument(
+        "--mix",
+        help="Intent mix as kind=weight pairs of echo, set_temperature, play_music, "
+        "unlock_door and invalid (default: 40/30/20/5/5 in that order)",
+    )
+    p_loadgen.add_argument(
+        "--connections",
+        type=int,
+        default=64,
+        help="Keep-alive connection pool size (default: 64)",
+    )
+    p_loadgen.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=4096,
+        help="Count arrivals beyond this many outstanding requests as skipped "
+        "(default: 4096)",
+    )
+    p_loadgen.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds per reporting interval (default: 1)",
+    )
+    p_loadgen.add_argument(
+        "--timeout", type=float, default=10.0, help="Request timeout in seconds"
+    )
+    p_loadgen.add_argument("--seed", type=int, help="Seed for arrivals and payloads")
+    p_loadgen.add_argument("--out", help="Write the JSON report to this path")
+    p_loadgen.add_argument("--baseline", help="Compare against an earlier --out report")
+    p_loadgen.set_defaults(func=_cmd_loadgen)
+
+    p_migrate = sub.add_parser(
+        "migrate", help="Upgrade a JSONL archive of legacy commands to Intent v1"
+    )
+    p_migrate.add_argument("input", help="JSONL archive (legacy and/or v1 records)")
+    p_migrate.add_argument("--out", required=True, help="JSONL file of v1 intents")
+    p_migrate.add_argument("--rejects", help="JSONL file of records that failed")
+    p_migrate.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Translator processes (default: CPU count)",
+    )
+    p_migrate.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="Lines per work unit (default: 1000)",
+    )
+    p_migrate.set_defaults(func=_cmd_migrate)
+
     return parser
 
 
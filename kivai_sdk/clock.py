@@ -0,0 +1,36 @@
+"""
+UTC timestamp strings (v0.32)
+
+Every ACK and audit event carries an ISO-8601 UTC timestamp, written the
+way `datetime.isoformat()` writes it with "Z" for "+00:00" (no fraction
+when the microseconds are zero):
+
+    2026-02-12T18:00:00.123456Z
+
+A request formats several of these within the same second, so the
+"YYYY-MM-DDTHH:MM:SS" part is cached for the last second seen and only the
+microseconds are formatted per call.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Tuple
+
+# (epoch second, its "YYYY-MM-DDTHH:MM:SS"); replaced whole, so threads
+# never see a torn pair.
+_formatted: Tuple[int, str] = (0, "1970-01-01T00:00:00")
+
+
+def format_epoch_us(ts_us: int) -> str:
+    global _formatted
+    second, us = divmod(ts_us, 1_000_000)
+    cached = _formatted
+    if cached[0] != second:
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        cached = _formatted = (second, stamp)
+    return f"{cached[1]}.{us:06d}Z" if us else f"{cached[1]}Z"
+
+
+def utc_now_iso() -> str:
+    return format_epoch_us(time.time_ns() // 1000)
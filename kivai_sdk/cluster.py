@@ -0,0 +1,367 @@
+"""
+Gateway clusters (v0.34)
+
+`kivai serve --cluster-self URL --cluster-nodes URL,URL,...` runs the
+gateway as one node of a cluster. Devices are assigned to nodes by
+consistent hashing: each node is placed at `vnodes` points on a 64-bit ring
+(blake2b of "<node>#<i>"), and a device belongs to the first node point at
+or after the hash of its id. Adding or removing one of N nodes moves only
+the devices between the affected points, about 1/N of them; the rest keep
+their owner.
+
+Any node accepts an intent. The routing key is the tenant, when the
+execution has one (a tenant's home stays on one node), otherwise the
+target device: `target.device_id`, or the unique device the local registry
+resolves for zone/capability. Intents for another node's device are
+forwarded over pooled keep-alive connections (stdlib http.client, which
+costs less per call than an httpx client) and the owner's ACK is returned
+with `"forwarded_to": <node>`. Forwarded requests carry `X-Kivai-Forwarded`
+and always run where they arrive, so nodes that briefly disagree on
+membership never bounce an intent back and forth.
+Fan-outs, legacy commands and targets the local registry cannot resolve to
+one device run locally.
+
+The owner keeps the device's health, breakers, shadow and follow-up
+context; every node routes against the same device registry (for example,
+the same `--devices` store). Heartbeats and state reports, and health and
+state reads, are relayed to the owner the same way, so devices can talk to
+any node. Membership is replaced with `PUT /v1/cluster/members`;
+`GET /v1/cluster/owner/{key}` names the owner of a device or tenant.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+from bisect import bisect_left
+from hashlib import blake2b
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_VNODES = 128
+FORWARD_TIMEOUT_S = 10.0
+FORWARD_MAX_CONNECTIONS = 32
+FORWARDED_HEADER = "X-Kivai-Forwarded"
+TENANT_HEADER = "X-Kivai-Tenant"
+
+_RING_SIZE = 1 << 64
+# Errors on a reused connection that mean the request was never processed.
+_STALE = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+def normalize_node(node: str) -> str:
+    node = node.strip().rstrip("/")
+    if not node.startswith(("http://", "https://")):
+        raise ValueError(f"Cluster nodes must be http(s) URLs: {node!r}")
+    return node
+
+
+class HashRing:
+    """
+    Immutable consistent-hash ring over node names with virtual nodes.
+    """
+
+    def __init__(self, nodes: Iterable[str], vnodes: int = DEFAULT_VNODES) -> None:
+        if vnodes < 1:
+            raise ValueError("vnodes must be >= 1")
+        self.nodes: Tuple[str, ...] = tuple(sorted(set(nodes)))
+        if not self.nodes:
+            raise ValueError("A hash ring needs at least one node")
+        self.vnodes = vnodes
+        points = sorted(
+            (_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes)
+        )
+        self._hashes = [h for h, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key: str) -> str:
+        i = bisect_left(self._hashes, _hash(key))
+        return self._owners[i if i < len(self._owners) else 0]
+
+    def shares(self) -> Dict[str, float]:
+        """
+        Fraction of the hash space each node owns.
+        """
+        shares = dict.fromkeys(self.nodes, 0)
+        previous = self._hashes[-1] - _RING_SIZE
+        for h, node in zip(self._hashes, self._owners):
+            shares[node] += h - previous
+            previous = h
+        return {node: span / _RING_SIZE for node, span in shares.items()}
+
+
+def routing_key(payload: dict, tenant: Optional[str] = None) -> Optional[str]:
+    """
+    What an execution is placed by: its tenant, else its single target
+    device. None means it runs on the node that received it.
+    """
+    from kivai_sdk.tenants import TenantError, tenant_of
+
+    try:
+        tenant = tenant_of(payload, tenant)
+    except TenantError:
+        return None  # reported by the runtime
+    if tenant is not None:
+        return tenant
+    target = payload.get("target")
+    if not isinstance(target, dict) or target.get("select") == "all":
+        return None
+    device_id = target.get("device_id")
+    if isinstance(device_id, str) and device_id:
+        return device_id
+    zone, capability = target.get("zone"), target.get("capability")
+    if not zone and not capability:
+        return None
+
+    from kivai_sdk.devices import active_device_registry
+
+    match = active_device_registry().resolve(zone=zone, capability=capability)
+    return match.device.device_id if match is not None else None
+
+
+class PeerPool:
+    """
+    Idle keep-alive connections to one node, reused most recent first. At
+    most `max_idle` are kept; callers beyond that open extra connections
+    rather than wait.
+    """
+
+    def __init__(self, node: str, timeout: float, max_idle: int) -> None:
+        parts = urlsplit(node)
+        self._factory = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._host = parts.hostname or "localhost"
+        self._port = parts.port
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+    ) -> Tuple[int, Any]:
+        """
+        One request on a pooled connection: (HTTP status, decoded JSON).
+        """
+        headers = {"Content-Type": "application/json", **headers}
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        reused = conn is not None
+        while True:
+            if conn is None:
+                conn = self._factory(self._host, self._port, timeout=self.timeout)
+            try:
+                conn.request(method, path, body, headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError) as exc:
+                conn.close()
+                if not (reused and isinstance(exc, _STALE)):
+                    raise
+                # The peer had closed this idle connection before reading the
+                # request: retry once on a new one.
+                conn, reused = None, False
+                continue
+            break
+        with self._lock:
+            if not response.will_close and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                conn = None
+        if conn is not None:
+            conn.close()
+        return response.status, json.loads(data) if data else None
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class Cluster:
+    """
+    This node's view of the cluster: the ring, and a connection pool per
+    other node. Pools open connections on first forward, so a pre-forking
+    supervisor never shares them with its workers.
+    """
+
+    def __init__(
+        self,
+        self_node: str,
+        nodes: Iterable[str],
+        vnodes: int = DEFAULT_VNODES,
+        timeout: float = FORWARD_TIMEOUT_S,
+        max_connections: int = FORWARD_MAX_CONNECTIONS,
+    ) -> None:
+        self.self_node = normalize_node(self_node)
+        self.vnodes = vnodes
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.ring = self._ring(nodes)
+        self._pools: Dict[str, PeerPool] = {}
+        self._lock = threading.Lock()
+        self._counts = {
+            "forwarded": 0,
+            "forward_errors": 0,
+            "received": 0,
+            "relayed": 0,
+        }
+
+    def _ring(self, nodes: Iterable[str]) -> HashRing:
+        members = {normalize_node(node) for node in nodes}
+        members.add(self.self_node)
+        return HashRing(members, self.vnodes)
+
+    def set_members(self, nodes: Iterable[str]) -> HashRing:
+        """
+        Replace the membership. In-flight routing keeps the ring it started
+        with; the swap itself is a single assignment.
+        """
+        self.ring = self._ring(nodes)
+        return self.ring
+
+    def owner(self, key: str) -> str:
+        return self.ring.owner(key)
+
+    def _pool(self, node: str) -> PeerPool:
+        pool = self._pools.get(node)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.setdefault(
+                    node, PeerPool(node, self.timeout, self.max_connections)
+                )
+        return pool
+
+    def forward(self, node: str, payload: dict, tenant: Optional[str] = None) -> dict:
+        """
+        Execute `payload` on `node` and return its ACK. Transport failures
+        return a NODE_UNAVAILABLE ACK.
+        """
+        headers = {FORWARDED_HEADER: self.self_node}
+        if tenant is not None:
+            headers[TENANT_HEADER] = tenant
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        try:
+            _, ack = self._pool(node).request("POST", "/v1/execute", body, headers)
+        except Exception as exc:
+            self._count("forward_errors")
+            from kivai_sdk.socket_gateway import frame_error
+
+            intent_id = payload.get("intent_id")
+            return frame_error(
+                "NODE_UNAVAILABLE",
+                f"Owner node {node} unreachable: {type(exc).__name__}",
+                intent_id if isinstance(intent_id, str) else None,
+            )
+        self._count("forwarded")
+        if isinstance(ack, dict):
+            ack["forwarded_to"] = node
+        return ack
+
+    def route(self, payload: dict, tenant: Optional[str] = None) -> Optional[dict]:
+        """
+        The owner's ACK when `payload` belongs to another node; None when
+        it should run here.
+        """
+        key = routing_key(payload, tenant)
+        if key is None:
+            return None
+        node = self.ring.owner(key)
+        if node == self.self_node:
+            return None
+        return self.forward(node, payload, tenant)
+
+    def owner_elsewhere(
+        self, device_id: str, tenant: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        The node owning a device (or its tenant) when that is not this one.
+        """
+        node = self.ring.owner(tenant or device_id)
+        return None if node == self.self_node else node
+
+    def relay(
+        self,
+        node: str,
+        method: str,
+        path: str,
+        body: Any = None,
+        tenant: Optional[str] = None,
+    ) -> Tuple[int, Any]:
+        """
+        Send a device request (heartbeat, state report, health or state
+        read) to the node that owns the device. Raises on transport
+        failures.
+        """
+        headers = {FORWARDED_HEADER: self.self_node}
+        if tenant is not None:
+            headers[TENANT_HEADER] = tenant
+        data = None if body is None else json.dumps(body, ensure_ascii=False).encode()
+        try:
+            reply = self._pool(node).request(method, path, data, headers)
+        except Exception:
+            self._count("forward_errors")
+            raise
+        self._count("relayed")
+        return reply
+
+    def received(self) -> None:
+        self._count("received")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def describe(self) -> Dict[str, Any]:
+        ring = self.ring
+        return {
+            "self": self.self_node,
+            "nodes": list(ring.nodes),
+            "vnodes": ring.vnodes,
+            "shares": ring.shares(),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"nodes": len(self.ring.nodes), **self._counts}
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.close()
+
+
+_ACTIVE_CLUSTER: Optional[Cluster] = None
+
+
+def active_cluster() -> Optional[Cluster]:
+    """
+    This node's cluster, or None for a standalone gateway.
+    """
+    return _ACTIVE_CLUSTER
+
+
+def set_cluster(cluster: Cluster | None) -> None:
+    global _ACTIVE_CLUSTER
+    if _ACTIVE_CLUSTER is not None and _ACTIVE_CLUSTER is not cluster:
+        _ACTIVE_CLUSTER.close()
+    _ACTIVE_CLUSTER = cluster
+
+
+def configure_cluster(self_node: str, nodes: List[str], **kwargs: Any) -> Cluster:
+    cluster = Cluster(self_node, nodes, **kwargs)
+    set_cluster(cluster)
+    return cluster
@@ -9,6 +9,20 @@ from dataclasses import dataclass
 @dataclass(frozen=True)
 class ExecutionConfig:
     strict: bool = False
+    # Fan-out (target.select == "all"): adapters run concurrently, at most
+    # `fanout_concurrency` at a time, across at most `fanout_max_targets` devices.
+    fanout_concurrency: int = 8
+    fanout_max_targets: int = 256
+    # Per-adapter and per-device circuit breakers (v0.22, kivai_sdk/breakers.py).
+    circuit_breakers: bool = True
+    # Fill incomplete targets from recent user/zone context (v0.24,
+    # kivai_sdk/context.py) and remember targets of successful intents.
+    context: bool = True
+    # Answer `no_op` without calling the adapter when an opted-in adapter's
+    # desired state matches a device state shadow younger than
+    # `shadow_max_age_s` (v0.27, kivai_sdk/devices/shadow.py).
+    shadow_no_op: bool = True
+    shadow_max_age_s: float = 300.0
 
 
 # Default configuration (development mode)
@@ -0,0 +1,250 @@
+"""
+Conversation context for follow-up intents (v0.24)
+
+After an intent executes on a single device, the runtime remembers its
+target (device_id, zone, capability) twice: under the user (`meta.user_id`)
+and under the device's zone. A later intent whose target is incomplete
+("turn it up", or "lights off" with only a capability) is completed from
+that context before validation and routing:
+
+1. the user's last target, then the last target used in the given zone;
+   the first one that agrees with every field the intent did give, and
+   whose device (looked up in the registry) covers the adapter's
+   required_capabilities, fills in the missing ones;
+2. failing that, a capability-only intent borrows the zone from the
+   user's context (the user is still in the same room).
+
+Filled fields are reported in the ACK as `context`. Entries expire after a
+per-entry TTL and the least recently used are evicted once the store's
+estimated size exceeds `max_bytes`. Lookups and updates are O(1)
+(an OrderedDict doubles as the LRU list). Context lives in the process
+that executed the intent; each `--workers` worker keeps its own.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
+from kivai_sdk.devices.registry import active_device_registry
+from kivai_sdk.scope import current_tenant
+
+USER = "user"
+ZONE = "zone"
+
+TARGET_FIELDS = ("device_id", "zone", "capability")
+
+# Rough cost of one entry besides its strings: the OrderedDict node, the
+# key tuple and the entry object.
+_ENTRY_OVERHEAD = 240
+
+ContextKey = Tuple[str, str]
+
+
+class ContextEntry:
+    __slots__ = ("target", "intent", "expires_at", "size")
+
+    def __init__(
+        self, target: Dict[str, str], intent: Optional[str], expires_at: float
+    ) -> None:
+        self.target = target
+        self.intent = intent
+        self.expires_at = expires_at
+        self.size = _ENTRY_OVERHEAD + sum(len(v) for v in target.values())
+
+
+def _capabilities(known: Dict[str, str]) -> FrozenSet[str]:
+    """
+    What a remembered target offers: its device's full capability set from
+    the active registry, or its single capability when it names no device.
+    A device that has since left the registry offers nothing.
+    """
+    device_id = known.get("device_id")
+    if device_id:
+        device = active_device_registry().get(device_id)
+        return device.capabilities if device is not None else frozenset()
+    capability = known.get("capability")
+    return frozenset({capability}) if capability else frozenset()
+
+
+class ContextStore:
+    """
+    TTL + LRU store of recent targets keyed by (USER, user_id) or
+    (ZONE, zone). Thread-safe; `clock` is injectable for tests.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_bytes: int = 8 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl <= 0 or max_bytes <= 0:
+            raise ValueError("ContextStore requires ttl > 0 and max_bytes > 0")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[ContextKey, ContextEntry]" = OrderedDict()
+        self._bytes = 0
+        self._counts = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def bytes(self) -> int:
+        """
+        Estimated size of the live entries.
+        """
+        return self._bytes
+
+    def _drop(self, key: ContextKey) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+    def put(
+        self,
+        scope: str,
+        key: str,
+        target: Dict[str, str],
+        intent: Optional[str] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        entry = ContextEntry(
+            {f: target[f] for f in TARGET_FIELDS if target.get(f)},
+            intent,
+            self._clock() + (self.ttl if ttl is None else ttl),
+        )
+        entry.size += len(key)
+        with self._lock:
+            ckey = (scope, key)
+            if ckey in self._entries:
+                self._drop(ckey)
+            self._entries[ckey] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._bytes -= self._entries.popitem(last=False)[1].size
+                self._counts["evictions"] += 1
+
+    def get(self, scope: str, key: str) -> Optional[ContextEntry]:
+        with self._lock:
+            ckey = (scope, key)
+            entry = self._entries.get(ckey)
+            if entry is not None and entry.expires_at <= self._clock():
+                self._drop(ckey)
+                self._counts["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._counts["misses"] += 1
+                return None
+            self._entries.move_to_end(ckey)
+            self._counts["hits"] += 1
+            return entry
+
+    def forget(self, scope: str, key: str) -> bool:
+        with self._lock:
+            if (scope, key) not in self._entries:
+                return False
+            self._drop((scope, key))
+            return True
+
+    def remember(
+        self,
+        target: Dict[str, str],
+        intent: Optional[str],
+        user_id: Optional[str],
+    ) -> None:
+        """
+        Record the target an intent was executed against.
+        """
+        if user_id:
+            self.put(USER, user_id, target, intent)
+        zone = target.get("zone")
+        if zone:
+            self.put(ZONE, zone, target, intent)
+
+    def fill_target(
+        self, payload: dict, required: Optional[FrozenSet[str]] = None
+    ) -> Optional[Dict[str, object]]:
+        """
+        Complete `payload["target"]` in place when it can neither route
+        directly nor by capability + zone. `required` is the adapter's
+        required_capabilities: a remembered target is only borrowed when
+        its device's capabilities (or, without a device, its capability)
+        cover them. Returns {"source",
+        "filled"} or None when nothing was filled.
+        """
+        target = payload.get("target")
+        if not isinstance(target, dict):
+            return None
+        if target.get("device_id") or (target.get("capability") and target.get("zone")):
+            return None
+        meta = payload.get("meta")
+        user_id = meta.get("user_id") if isinstance(meta, dict) else None
+
+        user_entry = self.get(USER, user_id) if user_id else None
+        candidates = [(USER, user_entry)]
+        if target.get("zone"):
+            candidates.append((ZONE, self.get(ZONE, target["zone"])))
+
+        for source, entry in candidates:
+            if entry is None:
+                continue
+            known = entry.target
+            if required and not required <= _capabilities(known):
+                continue
+            if all(
+                known.get(f) == target[f]
+                for f in ("zone", "capability")
+                if target.get(f)
+            ):
+                filled = [f for f in TARGET_FIELDS if f in known and not target.get(f)]
+                if not filled:
+                    continue
+                for f in filled:
+                    target[f] = known[f]
+                return {"source": source, "filled": filled}
+
+        if (
+            user_entry is not None
+            and target.get("capability")
+            and "zone" in user_entry.target
+        ):
+            target["zone"] = user_entry.target["zone"]
+            return {"source": USER, "filled": ["zone"]}
+        return None
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            counts = dict(self._counts)
+            out: Dict[str, object] = {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                **counts,
+            }
+        lookups = counts["hits"] + counts["misses"]
+        out["hit_rate"] = round(counts["hits"] / lookups, 4) if lookups else None
+        return out
+
+
+_ACTIVE_CONTEXT: Optional[ContextStore] = None
+
+
+def active_context_store() -> ContextStore:
+    global _ACTIVE_CONTEXT
+    tenant = current_tenant()
+    if tenant is not None:
+        return tenant.context
+    if _ACTIVE_CONTEXT is None:
+        _ACTIVE_CONTEXT = ContextStore()
+    return _ACTIVE_CONTEXT
+
+
+def set_context_store(store: ContextStore | None) -> None:
+    """
+    Replace the runtime context store (None restores a fresh default).
+    """
+    global _ACTIVE_CONTEXT
+    _ACTIVE_CONTEXT = store
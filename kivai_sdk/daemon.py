@@ -0,0 +1,232 @@
+"""
+Resident local daemon (v0.17)
+
+`kivai daemon` keeps a warm runtime (schema validator compiled, adapter
+registry built, builtin adapters imported, device store open) behind a Unix
+domain socket. CLI commands forward to it when it is running and fall back
+to in-process execution when it is not.
+
+Wire protocol: one JSON object per line in each direction.
+
+    request   {"op": "execute" | "validate" | "ping" | "shutdown", "payload": {...}}
+    response  {"ok": true, "result": ...} | {"ok": false, "error": "..."}
+
+A connection may carry any number of requests. The socket is created with
+owner-only permissions; anyone who can connect can execute intents.
+
+This module stays import-light (no runtime, no jsonschema) because the CLI
+imports it on every invocation to probe for the daemon.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+from typing import Any, Dict, Optional
+
+SOCKET_ENV = "KIVAI_DAEMON_SOCKET"
+DISABLE_ENV = "KIVAI_NO_DAEMON"
+
+
+def default_socket_path() -> str:
+    """
+    $KIVAI_DAEMON_SOCKET, else $XDG_RUNTIME_DIR/kivai.sock, else a per-user
+    path in the temp directory.
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "kivai.sock")
+    import tempfile
+
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return os.path.join(tempfile.gettempdir(), f"kivai-{uid}.sock")
+
+
+def daemon_disabled() -> bool:
+    return os.environ.get(DISABLE_ENV, "") not in ("", "0")
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening on the socket."""
+
+
+class DaemonClient:
+    """
+    Persistent connection to a running daemon.
+    Raises DaemonUnavailable on connect if nothing is listening.
+    """
+
+    def __init__(self, path: Optional[str] = None, timeout: float = 30.0) -> None:
+        if not hasattr(socket, "AF_UNIX"):
+            raise DaemonUnavailable("Unix domain sockets are not supported here")
+        self.path = path or default_socket_path()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        try:
+            self._sock.connect(self.path)
+        except (FileNotFoundError, ConnectionRefusedError) as exc:
+            self._sock.close()
+            raise DaemonUnavailable(str(exc)) from exc
+        self._reader = self._sock.makefile("rb")
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def call(self, op: str, payload: Any = None) -> Any:
+        """
+        Send one request; return its result or raise RuntimeError.
+        """
+        request = json.dumps({"op": op, "payload": payload}, ensure_ascii=False)
+        self._sock.sendall(request.encode("utf-8") + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise RuntimeError("Daemon closed the connection")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error") or "Daemon request failed")
+        return response.get("result")
+
+
+def try_daemon(op: str, payload: Any = None, path: Optional[str] = None) -> Any:
+    """
+    One-shot request. Returns None if no daemon is running (or forwarding is
+    disabled via $KIVAI_NO_DAEMON), so callers can fall back to in-process.
+    Every op except "shutdown" has a non-None result.
+    """
+    if daemon_disabled():
+        return None
+    try:
+        client = DaemonClient(path)
+    except DaemonUnavailable:
+        return None
+    with client:
+        return client.call(op, payload)
+
+
+def _handle(op: str, payload: Any) -> Any:
+    if op == "execute":
+        from kivai_sdk.runtime import execute_intent
+
+        if not isinstance(payload, dict):
+            raise ValueError("Payload JSON must be an object")
+        return execute_intent(payload)
+    if op == "validate":
+        from kivai_sdk.validator import validate_command
+
+        if not isinstance(payload, dict):
+            raise ValueError("Payload JSON must be an object")
+        return list(validate_command(payload))
+    if op == "ping":
+        return {"pid": os.getpid()}
+    raise ValueError(f"Unknown op: {op!r}")
+
+
+def warm_up(start_isolated: bool = True) -> None:
+    """
+    Pay every one-time cost up front: imports, schema compilation, adapter
+    registry construction, builtin adapter imports and policy load, and
+    (unless `start_isolated` is False, e.g. before forking) the isolated
+    adapter pools.
+    """
+    from kivai_sdk.adapters import active_adapter_registry
+    from kivai_sdk.devices import active_device_registry
+    from kivai_sdk.runtime import execute_intent  # noqa: F401
+    from kivai_sdk.security import default_policy_store
+    from kivai_sdk.validator import compiled_validator
+
+    compiled_validator()
+    default_policy_store()
+    registry = active_adapter_registry()
+    for item in registry.describe():
+        registry.resolve(item["intent"])
+    if start_isolated:
+        registry.start_isolated()
+    active_device_registry()
+
+
+def serve_daemon(
+    path: Optional[str] = None,
+    devices: Optional[str] = None,
+    ready: Optional[threading.Event] = None,
+) -> None:
+    """
+    Serve until a "shutdown" request or KeyboardInterrupt. Refuses to start
+    if another daemon is already answering on `path`; a stale socket file
+    left by a crashed daemon is replaced.
+    """
+    import socketserver
+
+    path = path or default_socket_path()
+    if os.path.exists(path):
+        try:
+            DaemonClient(path, timeout=1.0).close()
+        except (DaemonUnavailable, OSError):
+            os.unlink(path)
+        else:
+            raise RuntimeError(f"A daemon is already listening on {path}")
+
+    if devices:
+        from kivai_sdk.devices import configure_devices
+
+        configure_devices(devices)
+    warm_up()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for line in self.rfile:
+                op = None
+                try:
+                    request = json.loads(line)
+                    op = request.get("op")
+                    response: Dict[str, Any] = {
+                        "ok": True,
+                        "result": (
+                            None
+                            if op == "shutdown"
+                            else _handle(op, request.get("payload"))
+                        ),
+                    }
+                except Exception as exc:
+                    response = {"ok": False, "error": str(exc)}
+                self.wfile.write(
+                    json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n"
+                )
+                self.wfile.flush()
+                if op == "shutdown":
+                    # Reply first: the process exits as soon as serving stops.
+                    threading.Thread(target=server.shutdown, daemon=True).start()
+                    return
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+    old_umask = os.umask(0o177)
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(old_umask)
+
+    try:
+        if ready is not None:
+            ready.set()
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -1,4 +1,61 @@
+from .feed import (
+    ChangeFeed,
+    active_change_feed,
+    record_change,
+    set_change_feed,
+    sync_changes,
+)
+from .replication import (
+    RegistryLog,
+    RegistryReplica,
+    active_registry_log,
+    active_replica,
+    configure_replica,
+    set_registry_log,
+    set_replica,
+)
+from .health import HealthTracker, active_health_tracker, set_health_tracker
 from .models import Device, DeviceMatch
-from .registry import DeviceRegistry, default_device_registry
+from .registry import (
+    DeviceLookup,
+    DeviceRegistry,
+    active_device_registry,
+    default_device_registry,
+    set_device_registry,
+)
+from .shadow import DeviceShadow, active_device_shadow, set_device_shadow
+from .snapshot import MappedDeviceSnapshot, write_snapshot
+from .store import SQLiteDeviceStore, configure_devices, open_device_store
 
-__all__ = ["Device", "DeviceMatch", "DeviceRegistry", "default_device_registry"]
+__all__ = [
+    "ChangeFeed",
+    "active_change_feed",
+    "record_change",
+    "set_change_feed",
+    "sync_changes",
+    "RegistryLog",
+    "RegistryReplica",
+    "active_registry_log",
+    "active_replica",
+    "configure_replica",
+    "set_registry_log",
+    "set_replica",
+    "HealthTracker",
+    "active_health_tracker",
+    "set_health_tracker",
+    "Device",
+    "DeviceMatch",
+    "DeviceLookup",
+    "DeviceRegistry",
+    "active_device_registry",
+    "default_device_registry",
+    "set_device_registry",
+    "DeviceShadow",
+    "active_device_shadow",
+    "set_device_shadow",
+    "MappedDeviceSnapshot",
+    "write_snapshot",
+    "SQLiteDeviceStore",
+    "configure_devices",
+    "open_device_store",
+]
@@ -0,0 +1,242 @@
+"""
+Cross-worker registry change feed (v0.20)
+
+With `kivai serve --workers N` every worker holds its own copy of the device
+registry and health tracker. Updates received by one worker (device upserts
+and deletes, heartbeats, cluster membership) are appended to a shared feed
+file and replayed by the others, so all workers route against the same state.
+
+The feed is an append-only file of JSON lines plus an 8-byte shared memory
+word holding the published end offset. Checking for news is one memory read;
+the file is only read when another worker has published. Writers serialize
+on an flock of the file, replay anything they have not seen yet, then append
+and apply their own change, so every worker applies changes in feed order.
+
+Without a configured feed (single-process gateway) `record_change` applies
+the change locally and `sync_changes` does nothing.
+
+Upserts and deletes are also numbered in the registry change log that
+other gateways replicate from (v0.35, devices/replication.py).
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import mmap
+import os
+import struct
+import threading
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict, Optional
+
+from kivai_sdk.bus import DEVICE_DELETED, DEVICE_STATE, DEVICE_UPSERTED, publish
+from kivai_sdk.scope import current_tenant, use_tenant
+
+from .health import active_health_tracker
+from .models import Device
+from .registry import active_device_registry
+from .replication import active_registry_log
+from .shadow import active_device_shadow
+
+Change = Dict[str, Any]
+ChangeApplier = Callable[[Change, bool], None]
+
+_U64 = struct.Struct("<Q")
+
+
+def _shared_storage(registry: object) -> bool:
+    # Workers open the same SQLite file: a change written by one is already
+    # visible to the others.
+    from .store import SQLiteDeviceStore
+
+    return isinstance(registry, SQLiteDeviceStore)
+
+
+def apply_change(change: Change, remote: bool = False) -> None:
+    """
+    Apply one change to the active registry, health tracker or state
+    shadow, and publish it on this process's event bus.
+
+    - {"op": "upsert", "device": {"device_id", "zone", "capabilities"}}
+    - {"op": "delete", "device_id": ...}
+    - {"op": "heartbeat", "device_ids": [...]}
+    - {"op": "state", "device_id": ..., "state": {...}, "source": ..., "at": ...}
+    - {"op": "members", "nodes": [...]} (cluster membership, v0.34)
+
+    `remote` changes were published by another worker. A change tagged with
+    a tenant (v0.33) applies to that tenant's state where it is loaded, and
+    is dropped where it is not: the tenant reloads from its store.
+    """
+    tenant = None
+    tenant_id = change.get("tenant")
+    if tenant_id is not None:
+        from kivai_sdk.tenants import active_tenant_directory
+
+        tenants = active_tenant_directory()
+        tenant = tenants.peek(tenant_id) if tenants is not None else None
+        if tenant is None:
+            return
+    # Replayed changes carry their own scope, not the caller's.
+    with use_tenant(tenant):
+        _apply(change, remote)
+
+
+def _logged(change: Change) -> ContextManager[None]:
+    # v0.35: registry writes get a sequence number in the replication log;
+    # tenant registries are not replicated.
+    if current_tenant() is not None:
+        return nullcontext()
+    return active_registry_log().commit(change)
+
+
+def _apply(change: Change, remote: bool) -> None:
+    op = change.get("op")
+    if op == "heartbeat":
+        active_health_tracker().heartbeat_many(change["device_ids"])
+    elif op == "upsert":
+        registry = active_device_registry()
+        data = change["device"]
+        with _logged(change):
+            if not (remote and _shared_storage(registry)):
+                registry.upsert(
+                    Device(
+                        device_id=data["device_id"],
+                        zone=data["zone"],
+                        capabilities=frozenset(data.get("capabilities") or ()),
+                    )
+                )
+        publish(DEVICE_UPSERTED, {"device": data})
+    elif op == "delete":
+        device_id = change["device_id"]
+        registry = active_device_registry()
+        with _logged(change):
+            if not (remote and _shared_storage(registry)):
+                registry.delete(device_id)
+        active_health_tracker().forget(device_id)
+        active_device_shadow().forget(device_id)
+        publish(DEVICE_DELETED, {"device_id": device_id})
+    elif op == "state":
+        device_id = change["device_id"]
+        entry = active_device_shadow().update(
+            device_id, change["state"], change.get("source", "report"), change.get("at")
+        )
+        publish(
+            DEVICE_STATE,
+            {"device_id": device_id, "state": entry.state, "source": entry.source},
+        )
+    elif op == "members":
+        from kivai_sdk.cluster import active_cluster
+
+        cluster = active_cluster()
+        if cluster is not None:
+            cluster.set_members(change["nodes"])
+    else:
+        raise ValueError(f"Unknown change op: {op!r}")
+
+
+class ChangeFeed:
+    """
+    Append-only change feed shared by forked workers.
+
+    Create it before forking; call `reopen()` in each child so flock and
+    file offsets are per-process.
+    """
+
+    def __init__(self, path: str, apply: ChangeApplier = apply_change) -> None:
+        self.path = path
+        self._apply = apply
+        self._end = mmap.mmap(-1, _U64.size)  # MAP_SHARED | MAP_ANONYMOUS
+        self._lock = threading.Lock()
+        self._fd = -1
+        self.reopen()
+        self._offset = os.fstat(self._fd).st_size
+        _U64.pack_into(self._end, 0, self._offset)
+
+    def reopen(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o600)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    @property
+    def published(self) -> int:
+        return _U64.unpack_from(self._end, 0)[0]
+
+    def _catch_up(self) -> int:
+        end = self.published
+        if end <= self._offset:
+            return 0
+        data = os.pread(self._fd, end - self._offset, self._offset)
+        self._offset = end
+        count = 0
+        for line in data.splitlines():
+            self._apply(json.loads(line), True)
+            count += 1
+        return count
+
+    def poll(self) -> int:
+        """
+        Apply changes published by other workers. Returns how many.
+        """
+        if self.published == self._offset:
+            return 0
+        with self._lock:
+            return self._catch_up()
+
+    def publish(self, change: Change) -> None:
+        """
+        Append `change` and apply it locally, after any earlier changes.
+        """
+        line = json.dumps(change, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                self._catch_up()
+                os.write(self._fd, line)
+                self._offset += len(line)
+                _U64.pack_into(self._end, 0, self._offset)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._apply(change, False)
+
+
+_ACTIVE_FEED: Optional[ChangeFeed] = None
+
+
+def active_change_feed() -> Optional[ChangeFeed]:
+    return _ACTIVE_FEED
+
+
+def set_change_feed(feed: ChangeFeed | None) -> None:
+    global _ACTIVE_FEED
+    _ACTIVE_FEED = feed
+
+
+def record_change(change: Change) -> None:
+    """
+    Apply a registry change in this process and, with workers, in all others.
+    Changes made during a tenant's execution (v0.33) are tagged with it.
+    """
+    tenant = current_tenant()
+    if tenant is not None:
+        change = {**change, "tenant": tenant.tenant_id}
+    feed = _ACTIVE_FEED
+    if feed is None:
+        apply_change(change)
+    else:
+        feed.publish(change)
+
+
+def sync_changes() -> None:
+    """
+    Catch up on changes from other workers (no-op without a feed).
+    """
+    feed = _ACTIVE_FEED
+    if feed is not None:
+        feed.poll()
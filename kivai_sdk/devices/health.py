@@ -0,0 +1,260 @@
+"""
+Device heartbeat tracking (v0.14)
+
+Each tracked device is online, degraded (missed `degraded_after` seconds of
+heartbeats) or offline (missed `offline_after`). Heartbeats are O(1): they
+stamp `last_seen` and, only when no check is pending, schedule one on a
+hashed timing wheel. Expiry is driven by advancing the wheel, which touches
+only the slots whose time has come, so nothing ever scans the fleet.
+
+Devices that never sent a heartbeat are untracked and treated as routable,
+so fleets without heartbeats keep the pre-v0.14 behavior.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from kivai_sdk.bus import DEVICE_STATUS, active_event_bus
+from kivai_sdk.scope import current_tenant
+
+ONLINE = "online"
+DEGRADED = "degraded"
+OFFLINE = "offline"
+UNKNOWN = "unknown"
+
+StatusListener = Callable[[str, str, str], None]
+
+
+class TimingWheel:
+    """
+    Hashed timing wheel: `n_slots` buckets of `tick` seconds each.
+
+    Entries further out than one revolution stay in their bucket and are
+    re-checked when the wheel comes round again.
+    """
+
+    def __init__(self, tick: float, n_slots: int, now: float) -> None:
+        self.tick = tick
+        self.n_slots = n_slots
+        self._slots: List[List[Tuple[str, float]]] = [[] for _ in range(n_slots)]
+        self._cursor = int(now / tick)
+
+    def schedule(self, key: str, deadline: float) -> None:
+        tick_index = max(math.ceil(deadline / self.tick), self._cursor + 1)
+        self._slots[tick_index % self.n_slots].append((key, deadline))
+
+    def advance(self, now: float) -> List[Tuple[str, float]]:
+        """
+        Move the cursor to `now`; return entries whose deadline has passed.
+        """
+        target = int(now / self.tick)
+        if target <= self._cursor:
+            return []
+
+        steps = min(target - self._cursor, self.n_slots)
+        expired: List[Tuple[str, float]] = []
+        for t in range(target - steps + 1, target + 1):
+            slot = self._slots[t % self.n_slots]
+            if not slot:
+                continue
+            keep = []
+            for entry in slot:
+                (expired if entry[1] <= now else keep).append(entry)
+            self._slots[t % self.n_slots] = keep
+        self._cursor = target
+        return expired
+
+
+class HealthTracker:
+    """
+    Heartbeat ingestion and online/degraded/offline status per device.
+
+    `clock` is injectable for tests. Status changes are reported to listeners
+    as (device_id, old_status, new_status) after the tracker lock is released.
+    """
+
+    def __init__(
+        self,
+        degraded_after: float = 30.0,
+        offline_after: float = 90.0,
+        tick: float = 0.25,
+        n_slots: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < degraded_after <= offline_after:
+            raise ValueError(
+                "HealthTracker requires 0 < degraded_after <= offline_after"
+            )
+        self.degraded_after = degraded_after
+        self.offline_after = offline_after
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_seen: Dict[str, float] = {}
+        self._status: Dict[str, str] = {}
+        self._due: Dict[str, float] = {}
+        self._offline = 0
+        self._wheel = TimingWheel(tick, n_slots, clock())
+        self._listeners: List[StatusListener] = []
+
+    def __len__(self) -> int:
+        return len(self._last_seen)
+
+    def add_listener(self, listener: StatusListener) -> None:
+        self._listeners.append(listener)
+
+    def _schedule(self, device_id: str, deadline: float) -> None:
+        self._due[device_id] = deadline
+        self._wheel.schedule(device_id, deadline)
+
+    def _set_status(
+        self, device_id: str, status: str, changes: List[Tuple[str, str, str]]
+    ) -> None:
+        old = self._status.get(device_id)
+        if old == status:
+            return
+        self._status[device_id] = status
+        if old == OFFLINE:
+            self._offline -= 1
+        if status == OFFLINE:
+            self._offline += 1
+        changes.append((device_id, old or UNKNOWN, status))
+
+    def _advance(self, now: float, changes: List[Tuple[str, str, str]]) -> None:
+        for device_id, deadline in self._wheel.advance(now):
+            if self._due.get(device_id) != deadline:
+                continue  # superseded by a later schedule
+            del self._due[device_id]
+            idle = now - self._last_seen[device_id]
+            if idle >= self.offline_after:
+                self._set_status(device_id, OFFLINE, changes)
+            elif idle >= self.degraded_after:
+                self._set_status(device_id, DEGRADED, changes)
+                self._schedule(
+                    device_id, self._last_seen[device_id] + self.offline_after
+                )
+            else:
+                # Heartbeats arrived since this check was scheduled.
+                self._schedule(
+                    device_id, self._last_seen[device_id] + self.degraded_after
+                )
+
+    def _notify(self, changes: List[Tuple[str, str, str]]) -> None:
+        bus = active_event_bus()
+        for change in changes:
+            for listener in self._listeners:
+                listener(*change)
+            if bus.active:
+                device_id, old, new = change
+                bus.publish(
+                    DEVICE_STATUS, {"device_id": device_id, "old": old, "new": new}
+                )
+
+    def heartbeat(self, device_id: str, now: Optional[float] = None) -> str:
+        changes: List[Tuple[str, str, str]] = []
+        with self._lock:
+            now = self._clock() if now is None else now
+            self._advance(now, changes)
+            self._last_seen[device_id] = now
+            if self._status.get(device_id) != ONLINE:
+                self._set_status(device_id, ONLINE, changes)
+                self._schedule(device_id, now + self.degraded_after)
+            elif device_id not in self._due:  # pragma: no cover - defensive
+                self._schedule(device_id, now + self.degraded_after)
+        if changes:
+            self._notify(changes)
+        return ONLINE
+
+    def heartbeat_many(self, device_ids: Iterable[str]) -> int:
+        """
+        Batch ingestion: one lock acquisition and one clock read per batch.
+        """
+        changes: List[Tuple[str, str, str]] = []
+        count = 0
+        with self._lock:
+            now = self._clock()
+            self._advance(now, changes)
+            last_seen = self._last_seen
+            status = self._status
+            for device_id in device_ids:
+                last_seen[device_id] = now
+                if status.get(device_id) != ONLINE:
+                    self._set_status(device_id, ONLINE, changes)
+                    self._schedule(device_id, now + self.degraded_after)
+                count += 1
+        if changes:
+            self._notify(changes)
+        return count
+
+    def tick(self) -> None:
+        """
+        Process expiries up to now (call periodically when heartbeats are sparse).
+        """
+        changes: List[Tuple[str, str, str]] = []
+        with self._lock:
+            self._advance(self._clock(), changes)
+        if changes:
+            self._notify(changes)
+
+    def status(self, device_id: str) -> Optional[str]:
+        """
+        Current status, or None if the device never sent a heartbeat.
+        """
+        self.tick()
+        return self._status.get(device_id)
+
+    def is_offline(self, device_id: str) -> bool:
+        return self._status.get(device_id) == OFFLINE
+
+    @property
+    def offline_count(self) -> int:
+        return self._offline
+
+    def forget(self, device_id: str) -> None:
+        with self._lock:
+            if self._status.pop(device_id, None) == OFFLINE:
+                self._offline -= 1
+            self._last_seen.pop(device_id, None)
+            self._due.pop(device_id, None)
+
+    def counts(self) -> Dict[str, int]:
+        self.tick()
+        out = {ONLINE: 0, DEGRADED: 0, OFFLINE: 0}
+        for s in list(self._status.values()):
+            out[s] += 1
+        return out
+
+    def describe(self, device_id: str) -> Dict[str, object]:
+        status = self.status(device_id)
+        last_seen = self._last_seen.get(device_id)
+        return {
+            "device_id": device_id,
+            "status": status or UNKNOWN,
+            "seconds_since_heartbeat": (
+                round(self._clock() - last_seen, 3) if last_seen is not None else None
+            ),
+        }
+
+
+_ACTIVE_TRACKER: HealthTracker | None = None
+
+
+def active_health_tracker() -> HealthTracker:
+    global _ACTIVE_TRACKER
+    tenant = current_tenant()
+    if tenant is not None:
+        return tenant.health
+    if _ACTIVE_TRACKER is None:
+        _ACTIVE_TRACKER = HealthTracker()
+    return _ACTIVE_TRACKER
+
+
+def set_health_tracker(tracker: HealthTracker | None) -> None:
+    """
+    Replace the routing health tracker (None restores a fresh default).
+    """
+    global _ACTIVE_TRACKER
+    _ACTIVE_TRACKER = tracker
@@ -0,0 +1,102 @@
+"""
+Bulk device import/export (v0.13)
+
+Streaming readers for fleet files, so imports never hold the whole file:
+
+- JSONL: one object per line: {"device_id": ..., "zone": ..., "capabilities": [...]}
+- CSV:   header with device_id, zone, capabilities; capabilities separated by ";"
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from typing import Any, Iterable, Iterator, TextIO
+
+from .models import Device
+
+CSV_CAPABILITY_SEPARATOR = ";"
+
+
+def device_from_dict(data: Any) -> Device:
+    """
+    Build a Device from a plain mapping. Raises ValueError on bad shapes.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Device record must be an object")
+
+    device_id = data.get("device_id")
+    zone = data.get("zone")
+    caps = data.get("capabilities", [])
+
+    if not isinstance(device_id, str) or not device_id.strip():
+        raise ValueError("Device record requires a non-empty 'device_id'")
+    if not isinstance(zone, str) or not zone.strip():
+        raise ValueError(f"Device '{device_id}' requires a non-empty 'zone'")
+    if not isinstance(caps, list) or not all(
+        isinstance(c, str) and c.strip() for c in caps
+    ):
+        raise ValueError(
+            f"Device '{device_id}' 'capabilities' must be a list of strings"
+        )
+
+    return Device(device_id=device_id, zone=zone, capabilities=frozenset(caps))
+
+
+def device_to_dict(device: Device) -> dict:
+    return {
+        "device_id": device.device_id,
+        "zone": device.zone,
+        "capabilities": sorted(device.capabilities),
+    }
+
+
+def iter_devices_jsonl(stream: TextIO) -> Iterator[Device]:
+    for lineno, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield device_from_dict(json.loads(line))
+        except ValueError as e:
+            raise ValueError(f"line {lineno}: {e}") from None
+
+
+def iter_devices_csv(stream: TextIO) -> Iterator[Device]:
+    reader = csv.DictReader(stream)
+    for lineno, row in enumerate(reader, start=2):
+        raw_caps = row.get("capabilities") or ""
+        record = {
+            "device_id": row.get("device_id"),
+            "zone": row.get("zone"),
+            "capabilities": [
+                c.strip() for c in raw_caps.split(CSV_CAPABILITY_SEPARATOR) if c.strip()
+            ],
+        }
+        try:
+            yield device_from_dict(record)
+        except ValueError as e:
+            raise ValueError(f"line {lineno}: {e}") from None
+
+
+def iter_devices_file(path: str) -> Iterator[Device]:
+    """
+    Stream devices from a .jsonl/.ndjson or .csv file.
+    """
+    lower = path.lower()
+    if lower.endswith(".csv"):
+        reader = iter_devices_csv
+    elif lower.endswith((".jsonl", ".ndjson")):
+        reader = iter_devices_jsonl
+    else:
+        raise ValueError(f"Unsupported device file type: {path} (use .jsonl or .csv)")
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        yield from reader(f)
+
+
+def write_devices_jsonl(devices: Iterable[Device], stream: TextIO) -> int:
+    count = 0
+    for d in devices:
+        stream.write(json.dumps(device_to_dict(d), separators=(",", ":")) + "\n")
+        count += 1
+    return count
@@ -1,27 +1,125 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Protocol, Set
+
+from kivai_sdk.scope import current_tenant
 
 from .models import Device, DeviceMatch
 
 
+# Predicate over device ids; excluded devices are skipped during resolution.
+DeviceFilter = Callable[[str], bool]
+
+
+class DeviceLookup(Protocol):
+    """
+    Read interface shared by every registry backend (in-memory, SQLite,
+    mapped snapshot). Routing only depends on this.
+    """
+
+    def get(self, device_id: str) -> Optional[Device]: ...
+
+    def resolve(
+        self,
+        device_id: str | None = None,
+        zone: str | None = None,
+        capability: str | None = None,
+        exclude: DeviceFilter | None = None,
+    ) -> DeviceMatch | None: ...
+
+    def resolve_all(
+        self,
+        zone: str | None = None,
+        capability: str | None = None,
+        exclude: DeviceFilter | None = None,
+    ) -> List[DeviceMatch]: ...
+
+
+def unique_id(ids: Iterable[str], exclude: DeviceFilter | None) -> str | None:
+    """
+    The single id in `ids` not rejected by `exclude`, or None if zero or many.
+    """
+    found = None
+    for device_id in ids:
+        if exclude is not None and exclude(device_id):
+            continue
+        if found is not None:
+            return None
+        found = device_id
+    return found
+
+
+def match_reason(zone: str | None, capability: str | None) -> str:
+    return (
+        "zone+capability" if zone and capability else ("zone" if zone else "capability")
+    )
+
+
 @dataclass
 class DeviceRegistry:
     """
     In-memory device registry (v0.3).
 
-    Future: persistence, discovery, pairing/binding, trust posture, heartbeat/health.
+    v0.13: zone and capability indexes keep `resolve` proportional to the
+    number of candidates rather than the fleet size. Durable backends live in
+    devices/store.py (SQLite) and devices/snapshot.py (mapped binary snapshot).
+
+    Health-aware routing (v0.14) lives in devices/health.py.
+
+    Future: discovery, pairing/binding, trust posture.
     """
 
     _by_id: Dict[str, Device]
+    _by_zone: Dict[str, Set[str]] = field(default_factory=dict)
+    _by_capability: Dict[str, Set[str]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        for device in self._by_id.values():
+            self._index(device)
 
     @classmethod
     def empty(cls) -> "DeviceRegistry":
         return cls(_by_id={})
 
+    @classmethod
+    def from_devices(cls, devices: Iterable[Device]) -> "DeviceRegistry":
+        reg = cls.empty()
+        for d in devices:
+            reg.upsert(d)
+        return reg
+
+    def _index(self, device: Device) -> None:
+        self._by_zone.setdefault(device.zone, set()).add(device.device_id)
+        for cap in device.capabilities:
+            self._by_capability.setdefault(cap, set()).add(device.device_id)
+
+    def _unindex(self, device: Device) -> None:
+        ids = self._by_zone.get(device.zone)
+        if ids is not None:
+            ids.discard(device.device_id)
+            if not ids:
+                del self._by_zone[device.zone]
+        for cap in device.capabilities:
+            ids = self._by_capability.get(cap)
+            if ids is not None:
+                ids.discard(device.device_id)
+                if not ids:
+                    del self._by_capability[cap]
+
     def upsert(self, device: Device) -> None:
+        previous = self._by_id.get(device.device_id)
+        if previous is not None:
+            self._unindex(previous)
         self._by_id[device.device_id] = device
+        self._index(device)
+
+    def delete(self, device_id: str) -> bool:
+        previous = self._by_id.pop(device_id, None)
+        if previous is None:
+            return False
+        self._unindex(previous)
+        return True
 
     def get(self, device_id: str) -> Optional[Device]:
         return self._by_id.get(device_id)
@@ -29,17 +127,40 @@ class DeviceRegistry:
     def all(self) -> List[Device]:
         return list(self._by_id.values())
 
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _candidate_ids(
+        self, zone: str | None, capability: str | None
+    ) -> Set[str] | None:
+        """
+        Ids matching zone/capability filters; None means "no filter" (all).
+        """
+        if zone and capability:
+            by_zone = self._by_zone.get(zone, set())
+            by_cap = self._by_capability.get(capability, set())
+            return by_zone & by_cap if len(by_zone) <= len(by_cap) else by_cap & by_zone
+        if zone:
+            return self._by_zone.get(zone, set())
+        if capability:
+            return self._by_capability.get(capability, set())
+        return None
+
     def resolve(
         self,
         device_id: str | None = None,
         zone: str | None = None,
         capability: str | None = None,
+        exclude: DeviceFilter | None = None,
     ) -> DeviceMatch | None:
         """
         Routing resolution rules (hub default):
           1) If device_id provided -> direct match
           2) Else match by zone + capability
           3) Else match by capability only (if unique)
+
+        v0.14: devices rejected by `exclude` (e.g. offline) are skipped when
+        resolving by zone/capability; direct device_id lookups ignore it.
         """
         if device_id:
             d = self.get(device_id)
@@ -47,22 +168,40 @@ class DeviceRegistry:
                 return DeviceMatch(device=d, reason="device_id")
             return None
 
-        candidates = self.all()
+        ids = self._candidate_ids(zone, capability)
+        if ids is None:
+            ids = self._by_id.keys()
 
-        if zone:
-            candidates = [d for d in candidates if d.zone == zone]
-        if capability:
-            candidates = [d for d in candidates if d.has_capability(capability)]
+        if exclude is None and len(ids) != 1:
+            return None
 
-        if len(candidates) == 1:
-            reason = (
-                "zone+capability"
-                if zone and capability
-                else ("zone" if zone else "capability")
-            )
-            return DeviceMatch(device=candidates[0], reason=reason)
+        only_id = unique_id(ids, exclude)
+        if only_id is None:
+            return None
+        return DeviceMatch(
+            device=self._by_id[only_id], reason=match_reason(zone, capability)
+        )
 
-        return None
+    def resolve_all(
+        self,
+        zone: str | None = None,
+        capability: str | None = None,
+        exclude: DeviceFilter | None = None,
+    ) -> List[DeviceMatch]:
+        """
+        Every device matching zone/capability, ordered by device_id (v0.15
+        fan-out). At least one filter is required; an unfiltered call matches
+        nothing rather than the whole fleet.
+        """
+        ids = self._candidate_ids(zone, capability)
+        if not ids:
+            return []
+        reason = match_reason(zone, capability)
+        return [
+            DeviceMatch(device=self._by_id[device_id], reason=reason)
+            for device_id in sorted(ids)
+            if exclude is None or not exclude(device_id)
+        ]
 
 
 def default_device_registry() -> DeviceRegistry:
@@ -94,3 +233,29 @@ def default_device_registry() -> DeviceRegistry:
         )
     )
     return reg
+
+
+_ACTIVE_REGISTRY: DeviceLookup | None = None
+
+
+def active_device_registry() -> DeviceLookup:
+    """
+    Registry used for routing. Defaults to the demo registry until a durable
+    one is configured with `set_device_registry` / `configure_devices`.
+    Within a tenant's execution (v0.33), that tenant's registry.
+    """
+    global _ACTIVE_REGISTRY
+    tenant = current_tenant()
+    if tenant is not None:
+        return tenant.devices
+    if _ACTIVE_REGISTRY is None:
+        _ACTIVE_REGISTRY = default_device_registry()
+    return _ACTIVE_REGISTRY
+
+
+def set_device_registry(registry: DeviceLookup | None) -> None:
+    """
+    Replace the routing registry (None restores the demo defaults).
+    """
+    global _ACTIVE_REGISTRY
+    _ACTIVE_REGISTRY = registry
@@ -0,0 +1,363 @@
+"""
+Registry delta replication between gateways (v0.35)
+
+Every gateway keeps a versioned log of the device upserts and deletes it
+applies to its registry: each change gets the next sequence number, and the
+last `capacity` changes are retained in memory. The log is identified by an
+`epoch` (a fresh id per process, shared by pre-forked workers, which apply
+the same changes in the same feed order), so a peer can tell a restarted
+primary from one it is following.
+
+A peer started with `kivai serve --replicate-from URL` follows another
+gateway:
+
+    GET /v1/replication/changes?since=S&epoch=E&wait=W
+        changes after S, waiting up to W seconds for one to arrive
+        (410 when S is no longer retained or E is not the current epoch)
+    GET /v1/replication/snapshot
+        every device, with the epoch and sequence it reflects
+
+It pulls deltas and applies them through `record_change`, so its own
+workers, event bus and log see them like local writes. It falls back to a
+snapshot only when it first starts, when it fell further behind than the
+primary retains, or when the primary restarted. The snapshot is diffed
+against the local registry, so only devices that differ are rewritten.
+Bandwidth and apply cost therefore follow the change rate, not the fleet
+size. Writes should go to the primary; a replica's local writes are
+overwritten when the primary next changes the same device.
+
+Tenant registries (v0.33) are not replicated.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from kivai_sdk.ids import new_id
+
+from .models import Device
+from .registry import active_device_registry
+
+Change = Dict[str, Any]
+# GET path -> (HTTP status, decoded JSON body)
+Fetch = Callable[[str], Tuple[int, Any]]
+
+DEFAULT_LOG_CAPACITY = 10_000
+DEFAULT_BATCH = 1000
+MAX_WAIT_S = 30.0
+# How often a waiting long-poll checks the worker change feed.
+POLL_INTERVAL_S = 0.05
+
+
+class RegistryLog:
+    """
+    Sequence-numbered upserts and deletes, newest `capacity` retained.
+
+    Registry writes happen inside `commit`, under the log's lock, so a
+    snapshot taken under the same lock matches its sequence number exactly.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_LOG_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.epoch = new_id()
+        self.capacity = capacity
+        self._seq = 0
+        self._changes: deque = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    @contextmanager
+    def commit(self, change: Change) -> Iterator[None]:
+        """
+        Apply a change inside the `with` body; it is logged if the body
+        does not raise.
+        """
+        with self._cond:
+            yield
+            self._seq += 1
+            self._changes.append({"seq": self._seq, **change})
+            self._cond.notify_all()
+
+    def since(
+        self,
+        seq: int,
+        epoch: Optional[str] = None,
+        limit: int = DEFAULT_BATCH,
+        wait: float = 0.0,
+        poll: Optional[Callable[[], Any]] = None,
+    ) -> Optional[List[Change]]:
+        """
+        Up to `limit` changes after `seq`, oldest first, waiting up to
+        `wait` seconds for one if there are none yet (`poll` is called
+        meanwhile to pick up other workers' changes). None means the caller
+        must start over from a snapshot.
+        """
+        deadline = time.monotonic() + min(max(wait, 0.0), MAX_WAIT_S)
+        while True:
+            if poll is not None:
+                poll()
+            with self._cond:
+                if epoch is not None and epoch != self.epoch:
+                    return None
+                if seq > self._seq:
+                    return None
+                first = self._changes[0]["seq"] if self._changes else self._seq + 1
+                if seq < first - 1:
+                    return None
+                if seq < self._seq:
+                    start = seq - first + 1
+                    return list(islice(self._changes, start, start + limit))
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._cond.wait(min(remaining, POLL_INTERVAL_S) if poll else remaining)
+
+    def snapshot(self, registry: Any = None) -> Dict[str, Any]:
+        registry = registry if registry is not None else active_device_registry()
+        with self._cond:
+            devices = [_device_dict(d) for d in _all_devices(registry)]
+            return {"epoch": self.epoch, "seq": self._seq, "devices": devices}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            first = self._changes[0]["seq"] if self._changes else self._seq + 1
+            return {
+                "epoch": self.epoch,
+                "seq": self._seq,
+                "retained_from": first,
+            }
+
+
+def _all_devices(registry: Any) -> List[Device]:
+    if hasattr(registry, "iter_devices"):
+        return list(registry.iter_devices())
+    return registry.all()
+
+
+def _device_dict(device: Device) -> Dict[str, Any]:
+    return {
+        "device_id": device.device_id,
+        "zone": device.zone,
+        "capabilities": sorted(device.capabilities),
+    }
+
+
+_ACTIVE_LOG: Optional[RegistryLog] = None
+
+
+def active_registry_log() -> RegistryLog:
+    global _ACTIVE_LOG
+    if _ACTIVE_LOG is None:
+        _ACTIVE_LOG = RegistryLog()
+    return _ACTIVE_LOG
+
+
+def set_registry_log(log: RegistryLog | None) -> None:
+    """
+    Replace the registry change log (None starts a new default one).
+    """
+    global _ACTIVE_LOG
+    _ACTIVE_LOG = log
+
+
+def http_fetch(base_url: str, timeout: float = MAX_WAIT_S + 10) -> Fetch:
+    """
+    GETs against `base_url` over one keep-alive connection.
+    """
+    parts = urlsplit(base_url.rstrip("/"))
+    factory = (
+        http.client.HTTPSConnection
+        if parts.scheme == "https"
+        else http.client.HTTPConnection
+    )
+    prefix = parts.path
+    conn: List[Optional[http.client.HTTPConnection]] = [None]
+
+    def fetch(path: str) -> Tuple[int, Any]:
+        if conn[0] is None:
+            conn[0] = factory(
+                parts.hostname or "localhost", parts.port, timeout=timeout
+            )
+        try:
+            conn[0].request("GET", prefix + path)
+            response = conn[0].getresponse()
+            body = response.read()
+        except Exception:
+            conn[0].close()
+            conn[0] = None
+            raise
+        return response.status, json.loads(body) if body else None
+
+    return fetch
+
+
+def _default_apply(change: Change) -> None:
+    from .feed import record_change
+
+    record_change(change)
+
+
+class RegistryReplica:
+    """
+    Follows another gateway's registry log. `fetch` performs GETs against
+    the primary (`http_fetch(url)`); `apply` writes one change locally
+    (default: `record_change`) and `registry` is read to diff snapshots.
+    """
+
+    def __init__(
+        self,
+        fetch: Fetch,
+        apply: Callable[[Change], None] = _default_apply,
+        registry: Any = None,
+        wait: float = 10.0,
+        batch: int = DEFAULT_BATCH,
+        retry_s: float = 1.0,
+    ) -> None:
+        self.fetch = fetch
+        self.apply = apply
+        self.registry = registry
+        self.wait = wait
+        self.batch = batch
+        self.retry_s = retry_s
+        self.epoch: Optional[str] = None
+        self.seq = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._counts = {"changes": 0, "snapshots": 0, "errors": 0}
+        self._last_error: Optional[str] = None
+
+    def _registry(self) -> Any:
+        return self.registry if self.registry is not None else active_device_registry()
+
+    def sync(self, wait: float = 0.0) -> int:
+        """
+        One pull: apply the next batch of changes (or a snapshot). Returns
+        how many changes were applied locally.
+        """
+        if self.epoch is None:
+            return self._reset()
+        query = urlencode(
+            {"since": self.seq, "epoch": self.epoch, "limit": self.batch, "wait": wait}
+        )
+        status, body = self.fetch(f"/v1/replication/changes?{query}")
+        if status == 410:
+            return self._reset()
+        if status != 200:
+            raise RuntimeError(f"Replication source answered HTTP {status}")
+        for change in body["changes"]:
+            change = dict(change)
+            seq = change.pop("seq")
+            self.apply(change)
+            self.seq = seq
+        self._counts["changes"] += len(body["changes"])
+        return len(body["changes"])
+
+    def _reset(self) -> int:
+        status, body = self.fetch("/v1/replication/snapshot")
+        if status != 200:
+            raise RuntimeError(f"Replication source answered HTTP {status}")
+        wanted = {d["device_id"]: d for d in body["devices"]}
+        applied = 0
+        for device in _all_devices(self._registry()):
+            if device.device_id not in wanted:
+                self.apply({"op": "delete", "device_id": device.device_id})
+                applied += 1
+            elif _device_dict(device) == wanted[device.device_id]:
+                del wanted[device.device_id]
+        for data in wanted.values():
+            self.apply({"op": "upsert", "device": data})
+            applied += 1
+        self.epoch, self.seq = body["epoch"], body["seq"]
+        self._counts["snapshots"] += 1
+        return applied
+
+    def catch_up(self) -> int:
+        """
+        Pull until no changes are pending. Returns how many were applied.
+        """
+        total = 0
+        while True:
+            before = (self.epoch, self.seq)
+            total += self.sync()
+            if (self.epoch, self.seq) == before:
+                return total
+
+    def run(self) -> None:
+        """
+        Pull until stopped, retrying every `retry_s` after a failure. The
+        first failure of a run and any different one after it are reported
+        on stderr, as is the recovery; repeats are only counted.
+        """
+        last_error: Optional[str] = None
+        while not self._stop.is_set():
+            try:
+                self.sync(self.wait)
+            except Exception as exc:
+                self._counts["errors"] += 1
+                error = f"{type(exc).__name__}: {exc}"
+                if error != last_error:
+                    print(f"kivai: replication sync failed: {error}", file=sys.stderr)
+                    last_error = self._last_error = error
+                self._stop.wait(self.retry_s)
+                continue
+            if last_error is not None:
+                print("kivai: replication sync recovered", file=sys.stderr)
+                last_error = self._last_error = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.run, name="kivai-replica", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "epoch": self.epoch,
+            "seq": self.seq,
+            **self._counts,
+            "last_error": self._last_error,
+        }
+
+
+_ACTIVE_REPLICA: Optional[RegistryReplica] = None
+
+
+def active_replica() -> Optional[RegistryReplica]:
+    """
+    The replica following another gateway, or None.
+    """
+    return _ACTIVE_REPLICA
+
+
+def set_replica(replica: RegistryReplica | None) -> None:
+    global _ACTIVE_REPLICA
+    if _ACTIVE_REPLICA is not None and _ACTIVE_REPLICA is not replica:
+        _ACTIVE_REPLICA.stop()
+    _ACTIVE_REPLICA = replica
+
+
+def configure_replica(url: str, **kwargs: Any) -> RegistryReplica:
+    """
+    Follow the registry of the gateway at `url`. Call `start()` on the
+    returned replica in the process that should pull.
+    """
+    replica = RegistryReplica(http_fetch(url), **kwargs)
+    set_replica(replica)
+    return replica
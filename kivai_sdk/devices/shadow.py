@@ -0,0 +1,142 @@
+"""
+Device state shadow (v0.27)
+
+The gateway's last known state of each device: a flat dict per device,
+merged from successful adapter results and from state the device reports
+itself. Reads are a dict lookup, so clients can ask the gateway instead of
+the device.
+
+Adapters opt in to no-op short-circuiting by implementing
+
+    def desired_state(self, payload: dict, ctx: AdapterContext) -> dict | None
+
+returning the device state the intent asks for (the reference thermostat
+adapter returns {"target_temperature": 21.0, "unit": "C"}). When every key
+of it already matches a shadow entry younger than
+`ExecutionConfig.shadow_max_age_s`, the runtime answers with an ACK marked
+`no_op` instead of calling the adapter. Its result comes from the adapter's
+optional `no_op_result(payload, ctx)` hook (the result `execute` would have
+returned), else {"no_op": True, "state": desired}. After a successful
+call, the desired state (plus any `state` dict in the adapter's result) is
+written back to the shadow.
+
+Updates travel through the registry change feed (`{"op": "state"}`), so
+every `kivai serve --workers` worker short-circuits against the same state.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from kivai_sdk.scope import current_tenant
+
+ADAPTER = "adapter"
+REPORT = "report"
+
+
+@dataclass(frozen=True)
+class ShadowEntry:
+    state: Dict[str, Any]
+    updated_at: float
+    source: str
+
+    def describe(self, device_id: str, now: float) -> Dict[str, Any]:
+        return {
+            "device_id": device_id,
+            "state": dict(self.state),
+            "source": self.source,
+            "updated_at": datetime.fromtimestamp(self.updated_at, timezone.utc)
+            .isoformat()
+            .replace("+00:00", "Z"),
+            "age_s": round(max(0.0, now - self.updated_at), 3),
+        }
+
+
+class DeviceShadow:
+    """
+    Last known state per device. Entries are replaced, never mutated, so
+    readers need no lock.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, ShadowEntry] = {}
+        self._counts = {"updates": 0, "no_ops": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(
+        self,
+        device_id: str,
+        state: Dict[str, Any],
+        source: str = ADAPTER,
+        at: Optional[float] = None,
+    ) -> ShadowEntry:
+        """
+        Merge `state` into the device's shadow.
+        """
+        with self._lock:
+            old = self._entries.get(device_id)
+            merged = {**old.state, **state} if old is not None else dict(state)
+            entry = ShadowEntry(merged, self._clock() if at is None else at, source)
+            self._entries[device_id] = entry
+            self._counts["updates"] += 1
+        return entry
+
+    def get(self, device_id: str) -> Optional[ShadowEntry]:
+        return self._entries.get(device_id)
+
+    def describe(self, device_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(device_id)
+        return entry.describe(device_id, self._clock()) if entry is not None else None
+
+    def matches(self, device_id: str, desired: Dict[str, Any], max_age: float) -> bool:
+        """
+        True when the shadow is younger than `max_age` seconds and holds
+        every key of `desired` with an equal value. Counts as a no-op.
+        """
+        entry = self._entries.get(device_id)
+        if entry is None or self._clock() - entry.updated_at > max_age:
+            return False
+        state = entry.state
+        for key, value in desired.items():
+            if key not in state or state[key] != value:
+                return False
+        with self._lock:
+            self._counts["no_ops"] += 1
+        return True
+
+    def forget(self, device_id: str) -> bool:
+        with self._lock:
+            return self._entries.pop(device_id, None) is not None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"devices": len(self._entries), **self._counts}
+
+
+_ACTIVE_SHADOW: Optional[DeviceShadow] = None
+
+
+def active_device_shadow() -> DeviceShadow:
+    global _ACTIVE_SHADOW
+    tenant = current_tenant()
+    if tenant is not None:
+        return tenant.shadow
+    if _ACTIVE_SHADOW is None:
+        _ACTIVE_SHADOW = DeviceShadow()
+    return _ACTIVE_SHADOW
+
+
+def set_device_shadow(shadow: DeviceShadow | None) -> None:
+    """
+    Replace the device state shadow (None restores an empty one).
+    """
+    global _ACTIVE_SHADOW
+    _ACTIVE_SHADOW = shadow
@@ -0,0 +1,347 @@
+"""
+Binary device snapshot (v0.13)
+
+A compact, read-only registry image that is memory-mapped on open, so cold
+start costs a header read instead of re-registering every device. Lookups
+binary-search the mapped index; zone/capability routing uses per-symbol
+posting lists stored in the file.
+
+Layout (little-endian):
+
+    header     magic "KVDS", u16 version, u16 flags, u32 n_devices,
+               u32 n_symbols, u32 offsets of: symbols, index, ids, caps, postings
+    symbols    n_symbols x (u16 length + utf-8 bytes)   zones and capabilities
+    index      n_devices x 16 bytes, sorted by device_id bytes:
+               u32 id_offset, u16 id_length, u16 zone_symbol,
+               u32 caps_start, u16 caps_count, u16 reserved
+    ids        concatenated utf-8 device ids
+    caps       u16 symbol ids
+    postings   n_symbols x (u32 zone_start, u32 zone_count,
+                            u32 cap_start, u32 cap_count)
+               followed by u32 record numbers
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, Optional
+
+from .models import Device, DeviceMatch
+from .registry import DeviceFilter, DeviceRegistry, match_reason
+
+MAGIC = b"KVDS"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIIIIII")
+_ENTRY = struct.Struct("<IHHIHH")
+_POSTING = struct.Struct("<IIII")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_MAX_U16 = 0xFFFF
+
+
+def write_snapshot(devices: Iterable[Device], path: str) -> int:
+    """
+    Write devices to `path` atomically. Returns the number of devices written.
+    Raises ValueError if ids or symbol counts exceed the format limits.
+    """
+    entries = sorted(
+        ((d.device_id.encode("utf-8"), d) for d in devices), key=lambda e: e[0]
+    )
+
+    symbols: dict[str, int] = {}
+
+    def sym(value: str) -> int:
+        idx = symbols.get(value)
+        if idx is None:
+            idx = symbols[value] = len(symbols)
+            if idx > _MAX_U16:
+                raise ValueError("Snapshot supports at most 65536 zones+capabilities")
+        return idx
+
+    index = bytearray()
+    ids = bytearray()
+    caps = bytearray()
+    caps_count = 0
+    zone_postings: dict[int, list[int]] = {}
+    cap_postings: dict[int, list[int]] = {}
+
+    for record, (raw_id, device) in enumerate(entries):
+        if len(raw_id) > _MAX_U16:
+            raise ValueError(f"Device id too long for snapshot: {device.device_id}")
+        zone = sym(device.zone)
+        zone_postings.setdefault(zone, []).append(record)
+        device_caps = sorted(sym(c) for c in device.capabilities)
+        index += _ENTRY.pack(
+            len(ids), len(raw_id), zone, caps_count, len(device_caps), 0
+        )
+        ids += raw_id
+        for c in device_caps:
+            caps += _U16.pack(c)
+            cap_postings.setdefault(c, []).append(record)
+        caps_count += len(device_caps)
+
+    sym_blob = bytearray()
+    for value in symbols:
+        raw = value.encode("utf-8")
+        sym_blob += _U16.pack(len(raw)) + raw
+
+    table = bytearray()
+    postings = bytearray()
+    start = 0
+    for idx in range(len(symbols)):
+        zp = zone_postings.get(idx, [])
+        cp = cap_postings.get(idx, [])
+        table += _POSTING.pack(start, len(zp), start + len(zp), len(cp))
+        for record in zp:
+            postings += _U32.pack(record)
+        for record in cp:
+            postings += _U32.pack(record)
+        start += len(zp) + len(cp)
+
+    symbols_off = _HEADER.size
+    index_off = symbols_off + len(sym_blob)
+    ids_off = index_off + len(index)
+    caps_off = ids_off + len(ids)
+    postings_off = caps_off + len(caps)
+
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        len(entries),
+        len(symbols),
+        symbols_off,
+        index_off,
+        ids_off,
+        caps_off,
+        postings_off,
+    )
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        for chunk in (header, sym_blob, index, ids, caps, table, postings):
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return len(entries)
+
+
+class MappedDeviceSnapshot:
+    """
+    Read-only registry over a memory-mapped snapshot file.
+
+    Implements the same `get` / `resolve` semantics as DeviceRegistry without
+    materializing devices; `load_registry()` builds a mutable copy if needed.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (
+                magic,
+                version,
+                _flags,
+                self._n,
+                n_symbols,
+                symbols_off,
+                self._index_off,
+                self._ids_off,
+                self._caps_off,
+                self._postings_off,
+            ) = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a v{VERSION} device snapshot: {path}")
+
+            self._symbols: list[str] = []
+            pos = symbols_off
+            for _ in range(n_symbols):
+                (length,) = _U16.unpack_from(self._mm, pos)
+                pos += 2
+                self._symbols.append(self._mm[pos : pos + length].decode("utf-8"))
+                pos += length
+        except Exception:
+            self._mm.close()
+            raise
+
+        self._symbol_ids = {s: i for i, s in enumerate(self._symbols)}
+        self._postings_data = self._postings_off + n_symbols * _POSTING.size
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "MappedDeviceSnapshot":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _entry(self, record: int) -> tuple[int, int, int, int, int, int]:
+        return _ENTRY.unpack_from(self._mm, self._index_off + record * _ENTRY.size)
+
+    def _id_bytes(self, record: int) -> bytes:
+        id_off, id_len = _ENTRY.unpack_from(
+            self._mm, self._index_off + record * _ENTRY.size
+        )[:2]
+        start = self._ids_off + id_off
+        return self._mm[start : start + id_len]
+
+    def _device_id(self, record: int) -> str:
+        return self._id_bytes(record).decode("utf-8")
+
+    def _cap_symbols(self, caps_start: int, caps_count: int) -> tuple[int, ...]:
+        return struct.unpack_from(
+            f"<{caps_count}H", self._mm, self._caps_off + caps_start * 2
+        )
+
+    def _device(self, record: int) -> Device:
+        id_off, id_len, zone, caps_start, caps_count, _ = self._entry(record)
+        start = self._ids_off + id_off
+        symbols = self._symbols
+        return Device(
+            device_id=self._mm[start : start + id_len].decode("utf-8"),
+            zone=symbols[zone],
+            capabilities=frozenset(
+                symbols[c] for c in self._cap_symbols(caps_start, caps_count)
+            ),
+        )
+
+    def _find(self, device_id: str) -> int:
+        key = device_id.encode("utf-8")
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._id_bytes(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n and self._id_bytes(lo) == key:
+            return lo
+        return -1
+
+    def _posting_span(self, symbol: int, capability: bool) -> tuple[int, int]:
+        zone_start, zone_count, cap_start, cap_count = _POSTING.unpack_from(
+            self._mm, self._postings_off + symbol * _POSTING.size
+        )
+        return (cap_start, cap_count) if capability else (zone_start, zone_count)
+
+    def _records(self, span: tuple[int, int]) -> tuple[int, ...]:
+        start, count = span
+        return struct.unpack_from(
+            f"<{count}I", self._mm, self._postings_data + start * 4
+        )
+
+    def _intersect(self, zone_sym: int, cap_sym: int) -> Iterator[int]:
+        """
+        Records in both posting lists: walk the shorter one, check the other
+        field per record.
+        """
+        by_zone = self._posting_span(zone_sym, capability=False)
+        by_cap = self._posting_span(cap_sym, capability=True)
+        if by_zone[1] <= by_cap[1]:
+            return (
+                r
+                for r in self._records(by_zone)
+                if cap_sym in self._cap_symbols(*self._entry(r)[3:5])
+            )
+        return (r for r in self._records(by_cap) if self._entry(r)[2] == zone_sym)
+
+    def get(self, device_id: str) -> Optional[Device]:
+        record = self._find(device_id)
+        return self._device(record) if record >= 0 else None
+
+    def iter_devices(self) -> Iterator[Device]:
+        for record in range(self._n):
+            yield self._device(record)
+
+    def all(self) -> list[Device]:
+        return list(self.iter_devices())
+
+    def load_registry(self) -> DeviceRegistry:
+        return DeviceRegistry.from_devices(self.iter_devices())
+
+    def resolve(
+        self,
+        device_id: str | None = None,
+        zone: str | None = None,
+        capability: str | None = None,
+        exclude: DeviceFilter | None = None,
+    ) -> DeviceMatch | None:
+        """
+        Same rules as DeviceRegistry.resolve.
+        """
+        if device_id:
+            d = self.get(device_id)
+            return DeviceMatch(device=d, reason="device_id") if d else None
+
+        reason = match_reason(zone, capability)
+
+        if not zone and not capability:
+            records: Iterable[int] = range(self._n)
+        else:
+            zone_sym = self._symbol_ids.get(zone) if zone else None
+            cap_sym = self._symbol_ids.get(capability) if capability else None
+            if (zone and zone_sym is None) or (capability and cap_sym is None):
+                return None
+
+            if zone_sym is not None and cap_sym is not None:
+                records = self._intersect(zone_sym, cap_sym)
+            else:
+                span = (
+                    self._posting_span(zone_sym, capability=False)
+                    if zone_sym is not None
+                    else self._posting_span(cap_sym, capability=True)
+                )
+                if exclude is None and span[1] != 1:
+                    return None
+                records = self._records(span)
+
+        found = -1
+        for record in records:
+            if exclude is not None and exclude(self._device_id(record)):
+                continue
+            if found >= 0:
+                return None
+            found = record
+        if found < 0:
+            return None
+        return DeviceMatch(device=self._device(found), reason=reason)
+
+    def resolve_all(
+        self,
+        zone: str | None = None,
+        capability: str | None = None,
+        exclude: DeviceFilter | None = None,
+    ) -> list[DeviceMatch]:
+        """
+        Same rules as DeviceRegistry.resolve_all. Records are stored in
+        device_id order, so posting lists already come out sorted.
+        """
+        zone_sym = self._symbol_ids.get(zone) if zone else None
+        cap_sym = self._symbol_ids.get(capability) if capability else None
+        if (zone and zone_sym is None) or (capability and cap_sym is None):
+            return []
+
+        if zone_sym is not None and cap_sym is not None:
+            records: Iterable[int] = self._intersect(zone_sym, cap_sym)
+        elif zone_sym is not None:
+            records = self._records(self._posting_span(zone_sym, capability=False))
+        elif cap_sym is not None:
+            records = self._records(self._posting_span(cap_sym, capability=True))
+        else:
+            return []
+
+        reason = match_reason(zone, capability)
+        return [
+            DeviceMatch(device=self._device(r), reason=reason)
+            for r in records
+            if exclude is None or not exclude(self._device_id(r))
+        ]
@@ -0,0 +1,285 @@
+"""
+Durable device registry backend (v0.13)
+
+SQLite store indexed by zone and capability. It can serve routing directly
+(`resolve` follows DeviceRegistry semantics) or hydrate an in-memory
+DeviceRegistry at startup, and it is the source for binary snapshots
+(devices/snapshot.py).
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from typing import Iterable, Iterator, Optional
+
+from .models import Device, DeviceMatch
+from .registry import (
+    DeviceFilter,
+    DeviceLookup,
+    DeviceRegistry,
+    match_reason,
+    set_device_registry,
+    unique_id,
+)
+from .snapshot import MappedDeviceSnapshot
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    device_id TEXT PRIMARY KEY,
+    zone TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS device_capabilities (
+    device_id TEXT NOT NULL,
+    capability TEXT NOT NULL,
+    PRIMARY KEY (device_id, capability)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_devices_zone ON devices (zone);
+CREATE INDEX IF NOT EXISTS idx_device_capabilities_capability
+    ON device_capabilities (capability, device_id);
+"""
+
+_DEVICES_ORDERED = "SELECT device_id, zone FROM devices ORDER BY device_id"
+_CAPABILITIES_ORDERED = (
+    "SELECT device_id, capability FROM device_capabilities ORDER BY device_id"
+)
+
+
+def _merge_capabilities(
+    rows: Iterator[tuple], caps: Iterator[tuple]
+) -> Iterator[Device]:
+    """
+    Join `(device_id, zone)` rows with `(device_id, capability)` rows, both
+    ordered by device_id, in a single forward pass over each.
+    """
+    cap = next(caps, None)
+    for device_id, zone in rows:
+        device_caps = []
+        while cap is not None and cap[0] < device_id:
+            cap = next(caps, None)
+        while cap is not None and cap[0] == device_id:
+            device_caps.append(cap[1])
+            cap = next(caps, None)
+        yield Device(
+            device_id=device_id, zone=zone, capabilities=frozenset(device_caps)
+        )
+
+
+class SQLiteDeviceStore:
+    """
+    Persistent device registry.
+
+    Writes are batched in a single transaction per call (`upsert_many` is the
+    bulk-import path). The connection is shared across threads behind a lock.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "SQLiteDeviceStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def upsert(self, device: Device) -> None:
+        self.upsert_many((device,))
+
+    def upsert_many(self, devices: Iterable[Device], batch_size: int = 5000) -> int:
+        """
+        Insert or replace devices. Returns the number written.
+        """
+        count = 0
+        batch: list[Device] = []
+        with self._lock, self._conn:
+            for device in devices:
+                batch.append(device)
+                if len(batch) >= batch_size:
+                    self._write_batch(batch)
+                    count += len(batch)
+                    batch.clear()
+            if batch:
+                self._write_batch(batch)
+                count += len(batch)
+        return count
+
+    def _write_batch(self, batch: list[Device]) -> None:
+        self._conn.executemany(
+            "DELETE FROM device_capabilities WHERE device_id = ?",
+            ((d.device_id,) for d in batch),
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO devices (device_id, zone) VALUES (?, ?)",
+            ((d.device_id, d.zone) for d in batch),
+        )
+        self._conn.executemany(
+            "INSERT INTO device_capabilities (device_id, capability) VALUES (?, ?)",
+            ((d.device_id, c) for d in batch for c in d.capabilities),
+        )
+
+    def delete(self, device_id: str) -> bool:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM device_capabilities WHERE device_id = ?", (device_id,)
+            )
+            cur = self._conn.execute(
+                "DELETE FROM devices WHERE device_id = ?", (device_id,)
+            )
+            return cur.rowcount > 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM devices").fetchone()[0]
+
+    def get(self, device_id: str) -> Optional[Device]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT zone FROM devices WHERE device_id = ?", (device_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            caps = self._conn.execute(
+                "SELECT capability FROM device_capabilities WHERE device_id = ?",
+                (device_id,),
+            ).fetchall()
+        return Device(
+            device_id=device_id,
+            zone=row[0],
+            capabilities=frozenset(c for (c,) in caps),
+        )
+
+    def iter_devices(self) -> Iterator[Device]:
+        """
+        Stream every device ordered by device_id by merging two ordered
+        cursors (one pass over each table). They read one snapshot on a
+        dedicated connection, so writers are not blocked while the caller
+        consumes the stream. An in-memory database is fetched under the lock.
+        """
+        if self.path == ":memory:":
+            with self._lock:
+                rows = self._conn.execute(_DEVICES_ORDERED).fetchall()
+                caps = self._conn.execute(_CAPABILITIES_ORDERED).fetchall()
+            yield from _merge_capabilities(iter(rows), iter(caps))
+            return
+
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        try:
+            conn.execute("BEGIN")
+            yield from _merge_capabilities(
+                conn.execute(_DEVICES_ORDERED), conn.execute(_CAPABILITIES_ORDERED)
+            )
+        finally:
+            conn.close()
+
+    def load_registry(self) -> DeviceRegistry:
+        return DeviceRegistry.from_devices(self.iter_devices())
+
+    def resolve(
+        self,
+        device_id: str | None = None,
+        zone: str | None = None,
+        capability: str | None = None,
+        exclude: DeviceFilter | None = None,
+    ) -> DeviceMatch | None:
+        """
+        Same rules as DeviceRegistry.resolve, answered from the indexes.
+        """
+        if device_id:
+            d = self.get(device_id)
+            return DeviceMatch(device=d, reason="device_id") if d else None
+
+        sql, args = _candidate_query(zone, capability)
+        if exclude is None:
+            # Two rows are enough to tell "unique" from "ambiguous".
+            sql += " LIMIT 2"
+
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        only_id = unique_id((r[0] for r in rows), exclude)
+        if only_id is None:
+            return None
+
+        d = self.get(only_id)
+        if d is None:  # pragma: no cover - deleted concurrently
+            return None
+        return DeviceMatch(device=d, reason=match_reason(zone, capability))
+
+    def resolve_all(
+        self,
+        zone: str | None = None,
+        capability: str | None = None,
+        exclude: DeviceFilter | None = None,
+    ) -> list[DeviceMatch]:
+        """
+        Same rules as DeviceRegistry.resolve_all.
+        """
+        if not zone and not capability:
+            return []
+        sql, args = _candidate_query(zone, capability)
+        with self._lock:
+            ids = [r[0] for r in self._conn.execute(sql, args).fetchall()]
+        ids.sort()
+
+        reason = match_reason(zone, capability)
+        matches = []
+        for device_id in ids:
+            if exclude is not None and exclude(device_id):
+                continue
+            d = self.get(device_id)
+            if d is not None:
+                matches.append(DeviceMatch(device=d, reason=reason))
+        return matches
+
+
+def _candidate_query(zone: str | None, capability: str | None) -> tuple[str, tuple]:
+    if zone and capability:
+        return (
+            "SELECT d.device_id FROM device_capabilities c "
+            "JOIN devices d ON d.device_id = c.device_id "
+            "WHERE c.capability = ? AND d.zone = ?",
+            (capability, zone),
+        )
+    if zone:
+        return "SELECT device_id FROM devices WHERE zone = ?", (zone,)
+    if capability:
+        return (
+            "SELECT device_id FROM device_capabilities WHERE capability = ?",
+            (capability,),
+        )
+    return "SELECT device_id FROM devices", ()
+
+
+SNAPSHOT_SUFFIXES = (".kvds",)
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+def open_device_store(path: str) -> DeviceLookup:
+    """
+    Open a durable registry by file type:
+    - .kvds               -> MappedDeviceSnapshot (read-only, mapped)
+    - .db/.sqlite/.sqlite3 -> SQLiteDeviceStore
+    """
+    lower = path.lower()
+    if lower.endswith(SNAPSHOT_SUFFIXES):
+        return MappedDeviceSnapshot(path)
+    if lower.endswith(SQLITE_SUFFIXES):
+        return SQLiteDeviceStore(path)
+    raise ValueError(f"Unsupported device store: {path} (use .kvds or .db)")
+
+
+def configure_devices(path: str) -> DeviceLookup:
+    """
+    Route against a durable registry instead of the demo defaults.
+    """
+    store = open_device_store(path)
+    set_device_registry(store)
+    return store
@@ -0,0 +1,154 @@
+"""
+Fan-out execution (v0.15)
+
+Runs one adapter against several routed devices concurrently, bounded by
+ExecutionConfig.fanout_concurrency, and returns one sub-result per device in
+device_id order. Wall time tracks the slowest device, not the sum.
+
+The adapter's declared `timeout_ms` bounds the whole fan-out: devices still
+running at the deadline are reported as ADAPTER_TIMEOUT and the ACK is
+returned without waiting for them.
+
+v0.22: each device call passes its adapter and device circuit breakers; a
+device behind an open breaker is reported as DEVICE_UNAVAILABLE without
+being called, and a call that overran the deadline counts as a failure.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import Any, Dict, List, Sequence
+
+from kivai_sdk.adapters import AdapterContext
+from kivai_sdk.adapters.capabilities import AdapterCapabilities
+from kivai_sdk.adapters.contracts import normalize_adapter_output
+from kivai_sdk.breakers import BreakerRegistry, active_breakers, unavailable_message
+from kivai_sdk.config import ExecutionConfig
+from kivai_sdk.devices import DeviceMatch
+from kivai_sdk.request import IntentRequest
+
+SubResult = Dict[str, Any]
+
+
+def target_failed(device_id: str, code: str, message: str) -> SubResult:
+    return {
+        "device_id": device_id,
+        "status": "failed",
+        "error": {"code": code, "message": message},
+    }
+
+
+def _run_one(
+    adapter: Any,
+    payload: dict,
+    req: IntentRequest,
+    match: DeviceMatch,
+    breakers: BreakerRegistry | None = None,
+    deadline: float | None = None,
+) -> SubResult:
+    device_id = match.device.device_id
+    permit = None
+    if breakers is not None:
+        permit, blocked = breakers.acquire(req.intent or "", device_id)
+        if blocked is not None:
+            return target_failed(
+                device_id, "DEVICE_UNAVAILABLE", unavailable_message(*blocked)
+            )
+
+    try:
+        raw = adapter.execute(payload, AdapterContext(request=req, device=match.device))
+    except Exception as exc:  # one failing device must not sink the batch
+        if permit is not None:
+            permit.finish(failed=True)
+        return target_failed(device_id, "ADAPTER_ERROR", str(exc) or type(exc).__name__)
+
+    res = normalize_adapter_output(raw)
+    if permit is not None:
+        late = deadline is not None and time.monotonic() > deadline
+        permit.finish(None if res.ok else res.error.code, failed=late)
+    if not res.ok:
+        return target_failed(device_id, res.error.code, res.error.message)
+    return {"device_id": device_id, "status": "ok", "result": res.data or {}}
+
+
+def run_fan_out(
+    adapter: Any,
+    payload: dict,
+    req: IntentRequest,
+    matches: Sequence[DeviceMatch],
+    caps: AdapterCapabilities,
+    config: ExecutionConfig,
+) -> List[SubResult]:
+    """
+    Execute `adapter` once per match. Returns sub-results in `matches` order.
+    """
+    breakers = active_breakers() if config.circuit_breakers else None
+    if len(matches) <= 1 or config.fanout_concurrency <= 1:
+        return [_run_one(adapter, payload, req, m, breakers) for m in matches]
+
+    deadline = time.monotonic() + caps.timeout_ms / 1000.0
+    pool = ThreadPoolExecutor(
+        max_workers=min(config.fanout_concurrency, len(matches)),
+        thread_name_prefix="kivai-fanout",
+    )
+    try:
+        futures: Dict[Future, int] = {
+            # Each task runs in a copy of this context: the tenant scope
+            # (v0.33) follows the execution into the pool threads.
+            pool.submit(
+                copy_context().run,
+                _run_one,
+                adapter,
+                payload,
+                req,
+                m,
+                breakers,
+                deadline,
+            ): i
+            for i, m in enumerate(matches)
+        }
+        results: List[SubResult | None] = [None] * len(matches)
+        pending = set(futures)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(
+                pending, timeout=remaining, return_when=FIRST_COMPLETED
+            )
+            for fut in done:
+                results[futures[fut]] = fut.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return [
+        r
+        if r is not None
+        else target_failed(
+            matches[i].device.device_id,
+            "ADAPTER_TIMEOUT",
+            f"No result within {caps.timeout_ms} ms",
+        )
+        for i, r in enumerate(results)
+    ]
+
+
+def summarize(sub_results: Sequence[SubResult]) -> tuple[str, Dict[str, int]]:
+    """
+    Aggregate status for a fan-out ACK:
+
+    - "ok":      every target succeeded
+    - "partial": at least one succeeded and at least one failed
+    - "failed":  no target succeeded
+    """
+    succeeded = sum(1 for r in sub_results if r["status"] == "ok")
+    failed = len(sub_results) - succeeded
+    if not failed:
+        status = "ok"
+    elif succeeded:
+        status = "partial"
+    else:
+        status = "failed"
+    return status, {"total": len(sub_results), "succeeded": succeeded, "failed": failed}
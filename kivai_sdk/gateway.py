@@ -1,9 +1,57 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import json
+import time
+from urllib.parse import quote
 
+from fastapi import FastAPI, Header, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from kivai_sdk.adapters import active_adapter_registry
+from kivai_sdk.breakers import DEVICE, active_breakers
+from kivai_sdk.cluster import active_cluster, normalize_node
+from kivai_sdk.bus import DEVICE_EVENT, DROP, BusEvent, Subscription, active_event_bus
+from kivai_sdk.context import USER, active_context_store
+from kivai_sdk.devices import (
+    active_change_feed,
+    active_device_registry,
+    active_device_shadow,
+    record_change,
+    sync_changes,
+)
+from kivai_sdk.devices.replication import (
+    DEFAULT_BATCH,
+    MAX_WAIT_S,
+    POLL_INTERVAL_S,
+    active_registry_log,
+    active_replica,
+)
+from kivai_sdk.devices.shadow import REPORT
+from kivai_sdk.devices.health import ONLINE, active_health_tracker
+from kivai_sdk.legacy import LegacyCommandError, is_legacy, upgrade_legacy
+from kivai_sdk.metrics import active_metrics
+from kivai_sdk.rules import DeviceEvent, active_rules_engine
+from kivai_sdk.scheduler import active_scheduler, parse_execute_at
+from kivai_sdk.scope import use_tenant
+from kivai_sdk.tenants import TenantError, active_tenant_directory
+from kivai_sdk.socket_gateway import (
+    CODEC_MSGPACK,
+    decode_body,
+    encode_body,
+    execute_correlated,
+    frame_error,
+)
 from kivai_sdk.validator import validate_command
 from kivai_sdk.runtime import execute_intent
 from fastapi import Response
 
+# Upper bound on intents a /v1/stream connection may have executing at once.
+STREAM_MAX_IN_FLIGHT = 64
+# GET /v1/events: per-subscriber queue bound, and idle seconds between
+# keepalive comments.
+SSE_MAX_QUEUE = 4096
+SSE_KEEPALIVE_S = 15.0
+
 
 app = FastAPI(
     title="KIVAI Gateway (v0.1)",
@@ -14,22 +62,750 @@ app = FastAPI(
 
 @app.get("/health")
 def health():
-    return {"status": "ok", "service": "kivai-gateway", "version": "0.1.0"}
+    sync_changes()
+    return {
+        "status": "ok",
+        "service": "kivai-gateway",
+        "version": "0.1.0",
+        "devices": active_health_tracker().counts(),
+        "breakers": active_breakers().counts(),
+    }
+
+
+@app.get("/metrics")
+def metrics():
+    """
+    Gateway counters, summed across workers under `kivai serve --workers`.
+    `adapters` holds isolated adapter pool counters (v0.21), `breakers`
+    the circuit breakers that are not closed (v0.22), `scheduler` the
+    deferred intent counters and firing lateness (v0.23), `context` the
+    follow-up context store size and hit rate (v0.24), `rules` the
+    automation rule counters (v0.25), `bus` the event bus subscribers and
+    drops (v0.26) and `shadow` the device state shadow size and no-op
+    count (v0.27), for the worker that answered. With `--tenants-dir`,
+    `tenants` holds loaded tenants, their estimated bytes and load/eviction
+    counts (v0.33). In a cluster, `cluster` counts intents forwarded to
+    and received from other nodes (v0.34). `replication` holds the registry
+    change log position and, on a replica, how far it has followed (v0.35).
+    """
+    tenants = active_tenant_directory()
+    cluster = active_cluster()
+    replica = active_replica()
+    return {
+        **active_metrics().snapshot(),
+        "adapters": active_adapter_registry().isolation_stats(),
+        "breakers": active_breakers().snapshot(),
+        "scheduler": active_scheduler().stats(),
+        "context": active_context_store().stats(),
+        "rules": active_rules_engine().stats(),
+        "bus": active_event_bus().stats(),
+        "shadow": active_device_shadow().stats(),
+        **({"tenants": tenants.stats()} if tenants is not None else {}),
+        **({"cluster": cluster.stats()} if cluster is not None else {}),
+        "replication": {
+            **active_registry_log().stats(),
+            **({"replica": replica.stats()} if replica is not None else {}),
+        },
+    }
+
+
+def _synced_cluster():
+    # Membership changes received by another worker arrive through the feed.
+    sync_changes()
+    return active_cluster()
+
+
+def _cluster():
+    cluster = _synced_cluster()
+    if cluster is None:
+        raise HTTPException(status_code=404, detail="Not running as a cluster node")
+    return cluster
+
+
+@app.get("/v1/cluster")
+def cluster_info():
+    """
+    This node, the members and the share of devices each owns (v0.34).
+    """
+    return _cluster().describe()
+
+
+@app.put("/v1/cluster/members")
+def set_cluster_members(body: dict):
+    """
+    Replace the membership: {"nodes": ["http://host:port", ...]}. This node
+    is always a member. Send the same list to every node; under
+    `--workers` every worker of this node applies it.
+    """
+    nodes = body.get("nodes")
+    if not isinstance(nodes, list) or not all(isinstance(n, str) for n in nodes):
+        raise HTTPException(status_code=400, detail="nodes must be a list of URLs")
+    cluster = _cluster()
+    try:
+        nodes = [normalize_node(node) for node in nodes]
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    record_change({"op": "members", "nodes": nodes})
+    return cluster.describe()
+
+
+@app.get("/v1/cluster/owner/{key}")
+def cluster_owner(key: str):
+    """
+    The node owning a device id (or tenant id). Any node accepts the
+    device's requests and relays them there.
+    """
+    cluster = _cluster()
+    return {"key": key, "node": cluster.owner(key)}
+
+
+def _tenant_scope(tenant_id: str | None):
+    """
+    Run a device endpoint against the `X-Kivai-Tenant` tenant's health,
+    breakers and shadow (v0.33). Single-tenant gateways ignore the header.
+    """
+    tenants = active_tenant_directory()
+    if not tenant_id or tenants is None:
+        return use_tenant(None)
+    try:
+        return use_tenant(tenants.get(tenant_id))
+    except TenantError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _no_tenant_writes(tenant_id: str | None) -> None:
+    if tenant_id and active_tenant_directory() is not None:
+        raise HTTPException(
+            status_code=409,
+            detail="Tenant registries are read from <tenants-dir>/<tenant>/",
+        )
+
+
+@app.put("/v1/devices/{device_id}")
+def upsert_device(
+    device_id: str,
+    body: dict,
+    x_kivai_tenant: str | None = Header(default=None),
+):
+    """
+    Register or replace a device: {"zone": ..., "capabilities": [...]}.
+    """
+    zone = body.get("zone")
+    capabilities = body.get("capabilities", [])
+    _no_tenant_writes(x_kivai_tenant)
+    if not isinstance(zone, str) or not zone:
+        raise HTTPException(status_code=400, detail="zone must be a non-empty string")
+    if not isinstance(capabilities, list) or not all(
+        isinstance(c, str) and c for c in capabilities
+    ):
+        raise HTTPException(
+            status_code=400, detail="capabilities must be a list of strings"
+        )
+    if not hasattr(active_device_registry(), "upsert"):
+        raise HTTPException(status_code=409, detail="Device registry is read-only")
+    device = {
+        "device_id": device_id,
+        "zone": zone,
+        "capabilities": sorted(set(capabilities)),
+    }
+    record_change({"op": "upsert", "device": device})
+    return device
+
+
+@app.delete("/v1/devices/{device_id}")
+def delete_device(device_id: str, x_kivai_tenant: str | None = Header(default=None)):
+    _no_tenant_writes(x_kivai_tenant)
+    sync_changes()
+    registry = active_device_registry()
+    if not hasattr(registry, "delete"):
+        raise HTTPException(status_code=409, detail="Device registry is read-only")
+    if registry.get(device_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown device: {device_id}")
+    record_change({"op": "delete", "device_id": device_id})
+    return {"device_id": device_id, "deleted": True}
+
+
+def _device_path(device_id: str, suffix: str) -> str:
+    return f"/v1/devices/{quote(device_id, safe='')}/{suffix}"
+
+
+def _relay(node: str, method: str, path: str, body: dict | None, tenant: str | None):
+    try:
+        return active_cluster().relay(node, method, path, body, tenant)
+    except Exception as exc:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Owner node {node} unreachable: {type(exc).__name__}",
+        )
+
+
+def _from_owner(
+    device_id: str,
+    tenant: str | None,
+    forwarded: str | None,
+    method: str,
+    path: str,
+    body: dict | None = None,
+) -> JSONResponse | None:
+    """
+    In a cluster (v0.34), the owner's answer to a device request when the
+    device (or its tenant) belongs to another node; None to serve it here.
+    """
+    cluster = _synced_cluster()
+    if cluster is None or forwarded:
+        return None
+    node = cluster.owner_elsewhere(device_id, tenant or None)
+    if node is None:
+        return None
+    status, content = _relay(node, method, path, body, tenant or None)
+    return JSONResponse(status_code=status, content=content)
+
+
+@app.post("/v1/devices/{device_id}/heartbeat")
+def device_heartbeat(
+    device_id: str,
+    x_kivai_tenant: str | None = Header(default=None),
+    x_kivai_forwarded: str | None = Header(default=None),
+):
+    owner = _from_owner(
+        device_id,
+        x_kivai_tenant,
+        x_kivai_forwarded,
+        "POST",
+        _device_path(device_id, "heartbeat"),
+    )
+    if owner is not None:
+        return owner
+    with _tenant_scope(x_kivai_tenant):
+        record_change({"op": "heartbeat", "device_ids": [device_id]})
+    active_metrics().incr("heartbeats")
+    return {"device_id": device_id, "status": ONLINE}
+
+
+@app.post("/v1/heartbeats")
+def device_heartbeats(
+    body: dict,
+    x_kivai_tenant: str | None = Header(default=None),
+    x_kivai_forwarded: str | None = Header(default=None),
+):
+    """
+    Batch heartbeats: {"device_ids": [...]}. Preferred for large fleets. In a
+    cluster, each owner node receives one batch of its devices.
+    """
+    device_ids = body.get("device_ids")
+    if not isinstance(device_ids, list) or not all(
+        isinstance(d, str) and d for d in device_ids
+    ):
+        raise HTTPException(
+            status_code=400, detail="device_ids must be a list of strings"
+        )
+    tenant = x_kivai_tenant or None
+    cluster = _synced_cluster()
+    local = device_ids
+    if cluster is not None and not x_kivai_forwarded:
+        local, remote = [], {}
+        for device_id in device_ids:
+            node = cluster.owner_elsewhere(device_id, tenant)
+            if node is None:
+                local.append(device_id)
+            else:
+                remote.setdefault(node, []).append(device_id)
+        for node, batch in remote.items():
+            _relay(node, "POST", "/v1/heartbeats", {"device_ids": batch}, tenant)
+    if local:
+        with _tenant_scope(tenant):
+            record_change({"op": "heartbeat", "device_ids": local})
+        active_metrics().incr("heartbeats", len(local))
+    return {"accepted": len(device_ids)}
+
+
+@app.get("/v1/replication/changes")
+async def replication_changes(
+    since: int = 0,
+    epoch: str | None = None,
+    limit: int = DEFAULT_BATCH,
+    wait: float = 0.0,
+):
+    """
+    Registry upserts and deletes after sequence `since` (v0.35), oldest
+    first, waiting up to `wait` seconds for one. 410 means the caller must
+    reload from GET /v1/replication/snapshot.
+
+    The long poll waits on the event loop: each check borrows a threadpool
+    thread for at most POLL_INTERVAL_S, so idle replicas cannot exhaust
+    the pool that executions run on.
+    """
+    log = active_registry_log()
+    limit = max(1, min(limit, DEFAULT_BATCH))
+    deadline = time.monotonic() + min(max(wait, 0.0), MAX_WAIT_S)
+    while True:
+        remaining = max(0.0, deadline - time.monotonic())
+        changes = await run_in_threadpool(
+            log.since,
+            since,
+            epoch,
+            limit,
+            min(remaining, POLL_INTERVAL_S),
+            sync_changes,
+        )
+        if changes or changes is None or remaining <= POLL_INTERVAL_S:
+            break
+    if changes is None:
+        return JSONResponse(
+            status_code=410,
+            content={"epoch": log.epoch, "seq": log.seq, "detail": "Snapshot required"},
+        )
+    return {"epoch": log.epoch, "seq": log.seq, "changes": changes}
+
+
+@app.get("/v1/replication/snapshot")
+def replication_snapshot():
+    """
+    Every device, with the log epoch and sequence number it reflects.
+    """
+    sync_changes()
+    return active_registry_log().snapshot()
+
+
+@app.get("/v1/devices/{device_id}/health")
+def device_health(
+    device_id: str,
+    x_kivai_tenant: str | None = Header(default=None),
+    x_kivai_forwarded: str | None = Header(default=None),
+):
+    owner = _from_owner(
+        device_id,
+        x_kivai_tenant,
+        x_kivai_forwarded,
+        "GET",
+        _device_path(device_id, "health"),
+    )
+    if owner is not None:
+        return owner
+    sync_changes()
+    with _tenant_scope(x_kivai_tenant):
+        return {
+            **active_health_tracker().describe(device_id),
+            "circuit": active_breakers().state(DEVICE, device_id),
+        }
+
+
+@app.get("/v1/devices/{device_id}/state")
+def device_state(
+    device_id: str,
+    x_kivai_tenant: str | None = Header(default=None),
+    x_kivai_forwarded: str | None = Header(default=None),
+):
+    """
+    Last known device state from the shadow (v0.27), without asking the
+    device: {"device_id", "state", "source", "updated_at", "age_s"}.
+    """
+    owner = _from_owner(
+        device_id,
+        x_kivai_tenant,
+        x_kivai_forwarded,
+        "GET",
+        _device_path(device_id, "state"),
+    )
+    if owner is not None:
+        return owner
+    sync_changes()
+    with _tenant_scope(x_kivai_tenant):
+        entry = active_device_shadow().describe(device_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"No state for: {device_id}")
+    return entry
+
+
+@app.post("/v1/devices/{device_id}/state")
+def report_device_state(
+    device_id: str,
+    body: dict,
+    x_kivai_tenant: str | None = Header(default=None),
+    x_kivai_forwarded: str | None = Header(default=None),
+):
+    """
+    State reported by the device: {"state": {...}}, merged into the shadow.
+    """
+    state = body.get("state")
+    if not isinstance(state, dict) or not state:
+        raise HTTPException(status_code=400, detail="state must be a non-empty object")
+    owner = _from_owner(
+        device_id,
+        x_kivai_tenant,
+        x_kivai_forwarded,
+        "POST",
+        _device_path(device_id, "state"),
+        body,
+    )
+    if owner is not None:
+        return owner
+    sync_changes()
+    with _tenant_scope(x_kivai_tenant):
+        if active_device_registry().get(device_id) is None:
+            raise HTTPException(status_code=404, detail=f"Unknown device: {device_id}")
+        record_change(
+            {
+                "op": "state",
+                "device_id": device_id,
+                "state": state,
+                "source": REPORT,
+                "at": time.time(),
+            }
+        )
+        return active_device_shadow().describe(device_id)
+
+
+@app.delete("/v1/context/users/{user_id}")
+def forget_user_context(
+    user_id: str, x_kivai_tenant: str | None = Header(default=None)
+):
+    """
+    Drop the follow-up context remembered for a user (v0.24), in the
+    `X-Kivai-Tenant` tenant's context on a multi-tenant gateway.
+    """
+    with _tenant_scope(x_kivai_tenant):
+        forgotten = active_context_store().forget(USER, user_id)
+    return {"user_id": user_id, "forgotten": forgotten}
+
+
+@app.post("/v1/events")
+def device_events(body: dict, x_kivai_tenant: str | None = Header(default=None)):
+    """
+    Device events for the automation rules (v0.25): one event object, or
+    {"events": [...]}. Returns the intents the matching rules emitted.
+    With `X-Kivai-Tenant`, state reports go to that tenant's shadow and
+    rule actions run as the tenant's intents.
+    """
+    raw_events = body.get("events") if "events" in body else [body]
+    if not isinstance(raw_events, list):
+        raise HTTPException(status_code=400, detail="events must be a list")
+    try:
+        events = [DeviceEvent.from_dict(e) for e in raw_events]
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    scope = _tenant_scope(x_kivai_tenant)
+    bus = active_event_bus()
+    if bus.active:
+        for raw in raw_events:
+            bus.publish(DEVICE_EVENT, raw)
+    with scope:
+        for event in events:
+            # v0.27: events may carry the device's state for the shadow.
+            state = event.data.get("state")
+            if event.device_id is not None and isinstance(state, dict) and state:
+                record_change(
+                    {
+                        "op": "state",
+                        "device_id": event.device_id,
+                        "state": state,
+                        "source": REPORT,
+                        "at": event.at.timestamp() if event.at else time.time(),
+                    }
+                )
+        engine = active_rules_engine()
+        fired = [result for event in events for result in engine.handle(event)]
+    return {"events": len(events), "fired": fired}
+
+
+def _sse_frame(name: str, data: dict, event_id: int | None = None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _sse_events(sub: Subscription, wake: asyncio.Event):
+    reported = 0
+    try:
+        yield f": subscribed to {','.join(sub.topics)}\n\n"
+        while True:
+            batch = sub.drain(256)
+            if sub.dropped > reported:
+                yield _sse_frame("dropped", {"dropped": sub.dropped - reported})
+                reported = sub.dropped
+            if batch:
+                yield "".join(_sse_event(e) for e in batch)
+                continue
+            if sub.closed:
+                yield _sse_frame("closed", {"reason": sub.close_reason})
+                return
+            wake.clear()
+            if sub.arm():
+                try:
+                    await asyncio.wait_for(wake.wait(), SSE_KEEPALIVE_S)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+    finally:
+        sub.close()
+
+
+def _sse_event(event: BusEvent) -> str:
+    return _sse_frame(event.topic, event.describe(), event.seq)
+
+
+@app.get("/v1/events")
+async def event_stream(topics: str = "*", policy: str = DROP, max_queue: int = 256):
+    """
+    Server-Sent Events from the event bus (v0.26). `topics` is a comma list
+    of filters ("execution.finished,device.*"). When this client falls
+    `max_queue` events behind, `policy=drop` discards its oldest events and
+    sends a `dropped` event with the count; `policy=disconnect` sends
+    `closed` and ends the stream. Events come from the worker that
+    accepted the connection.
+    """
+    if not 1 <= max_queue <= SSE_MAX_QUEUE:
+        raise HTTPException(
+            status_code=400, detail=f"max_queue must be between 1 and {SSE_MAX_QUEUE}"
+        )
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+
+    def notify() -> None:
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:  # loop already closed; the stream is gone
+            pass
+
+    try:
+        sub = active_event_bus().subscribe(
+            topics.split(","), max_queue=max_queue, policy=policy, notify=notify
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return StreamingResponse(
+        _sse_events(sub, wake),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/v1/rules")
+def list_rules():
+    return {"rules": [rule.describe() for rule in active_rules_engine().rules()]}
 
 
 @app.post("/v1/validate")
 def validate_intent(payload: dict):
-    ok, message = validate_command(payload)
+    legacy = is_legacy(payload)
+    if legacy:
+        # Legacy commands (v0.31) are validated as the v1 intent they become.
+        try:
+            payload = upgrade_legacy(payload)
+        except LegacyCommandError as exc:
+            ok, message = False, str(exc)
+        else:
+            ok, message = validate_command(payload)
+    else:
+        ok, message = validate_command(payload)
+    active_metrics().incr("validations")
     if not ok:
+        active_metrics().incr("validations_failed")
         raise HTTPException(status_code=400, detail=message)
+    if legacy:
+        return {"ok": True, "message": message, "legacy": True, "upgraded": payload}
     return {"ok": True, "message": message}
 
 
+def _execute_legacy(payload: dict, tenant: str | None) -> dict:
+    try:
+        upgraded = upgrade_legacy(payload)
+    except LegacyCommandError as exc:
+        ack = frame_error("LEGACY_INVALID", str(exc))
+    else:
+        ack = execute_intent(upgraded, tenant=tenant)
+    ack["legacy"] = True
+    return ack
+
+
 @app.post("/v1/execute")
-def execute(payload: dict, response: Response):
-    ack = execute_intent(payload)
+def execute(
+    payload: dict,
+    response: Response,
+    x_kivai_tenant: str | None = Header(default=None),
+    x_kivai_forwarded: str | None = Header(default=None),
+):
+    """
+    Execute one intent. On a multi-tenant gateway (v0.33), the
+    `X-Kivai-Tenant` header selects the tenant; it must agree with
+    `meta.tenant_id` when both are given. A cluster node (v0.34) forwards
+    intents owned by another node; `X-Kivai-Forwarded` marks intents
+    another node forwarded here, which always run here.
+    """
+    tenant = x_kivai_tenant or None
+    cluster = _synced_cluster()
+    ack = None
+    if cluster is not None:
+        if x_kivai_forwarded:
+            cluster.received()
+        elif not is_legacy(payload):
+            ack = cluster.route(payload, tenant)
+    if ack is not None:
+        # Counted as an intent by the node that ran it.
+        active_metrics().incr("intents_forwarded")
+    else:
+        if is_legacy(payload):
+            ack = _execute_legacy(payload, tenant)
+        else:
+            ack = execute_intent(payload, tenant=tenant)
+        active_metrics().record_ack(ack)
     # Always return ACK in the response body for stable client parsing.
     # Use HTTP status code as a secondary signal only.
-    if ack.get("status") != "ok":
+    # Partially successful fan-outs (v0.15) are 207 Multi-Status.
+    if ack.get("status") == "partial":
+        response.status_code = 207
+    elif ack.get("status") != "ok":
         response.status_code = 400
     return ack
+
+
+def _scheduler():
+    # Forked workers each hold their own in-memory scheduler, so a schedule
+    # could not be looked up or cancelled from the worker that answers next.
+    if active_change_feed() is not None:
+        raise HTTPException(
+            status_code=503,
+            detail="Scheduled intents are not available with kivai serve --workers",
+        )
+    return active_scheduler()
+
+
+@app.post("/v1/schedules", status_code=202)
+def schedule_intent(body: dict):
+    """
+    Run an intent later (v0.23):
+    {"intent": {...}, "execute_at": "2026-02-12T18:00:00Z" | "delay_ms": 90000}.
+    The intent is validated now; its ACK is available from
+    GET /v1/schedules/{schedule_id} once it has fired.
+    """
+    scheduler = _scheduler()
+    payload = body.get("intent")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="intent must be an object")
+    ok, message = validate_command(payload)
+    if not ok:
+        raise HTTPException(status_code=400, detail=message)
+    try:
+        if "delay_ms" in body:
+            delay_ms = body["delay_ms"]
+            if isinstance(delay_ms, bool) or not isinstance(delay_ms, (int, float)):
+                raise ValueError("delay_ms must be a number")
+            entry = scheduler.schedule(payload, delay=delay_ms / 1000.0)
+        else:
+            entry = scheduler.schedule(
+                payload, execute_at=parse_execute_at(body.get("execute_at"))
+            )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    scheduler.start()
+    return entry.describe()
+
+
+@app.get("/v1/schedules/{schedule_id}")
+def get_schedule(schedule_id: str):
+    entry = _scheduler().get(schedule_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Unknown schedule: {schedule_id}")
+    return entry
+
+
+@app.delete("/v1/schedules/{schedule_id}")
+def cancel_schedule(schedule_id: str):
+    if not _scheduler().cancel(schedule_id):
+        raise HTTPException(
+            status_code=404, detail=f"No pending schedule: {schedule_id}"
+        )
+    return {"schedule_id": schedule_id, "cancelled": True}
+
+
+def _stream_message(ack: dict, binary: bool) -> bytes | str:
+    if binary:
+        return encode_body(CODEC_MSGPACK, ack)
+    return json.dumps(ack, ensure_ascii=False)
+
+
+@app.websocket("/v1/stream")
+async def stream(
+    ws: WebSocket,
+    max_in_flight: int = STREAM_MAX_IN_FLIGHT,
+    tenant: str | None = None,
+):
+    """
+    Pipelined intents over one WebSocket (v0.19).
+
+    Each client message is one intent payload: JSON text, or msgpack bytes
+    when msgpack is installed. Each reply is its ACK, in the same encoding,
+    sent as soon as that intent completes; correlate by intent_id (and
+    execution_id). The first message from the server is
+    {"type": "hello", "max_in_flight": N}: at most N intents run at once per
+    connection, and further messages are not read until one finishes.
+    `?tenant=` binds every intent on the connection to that tenant (v0.33).
+    """
+    window = max(1, min(max_in_flight, STREAM_MAX_IN_FLIGHT))
+    await ws.accept()
+    await ws.send_json({"type": "hello", "max_in_flight": window})
+
+    slots = asyncio.Semaphore(window)
+    send_lock = asyncio.Lock()
+    tasks: set = set()
+
+    async def send(message: bytes | str) -> None:
+        async with send_lock:
+            if isinstance(message, bytes):
+                await ws.send_bytes(message)
+            else:
+                await ws.send_text(message)
+
+    async def run(payload: object, binary: bool) -> None:
+        try:
+            try:
+                ack = await run_in_threadpool(
+                    execute_correlated, payload, tenant or None
+                )
+                message = _stream_message(ack, binary)
+            except Exception as exc:
+                # Every intent gets an ACK, or its client window slot leaks.
+                intent_id = (
+                    payload.get("intent_id") if isinstance(payload, dict) else None
+                )
+                ack = frame_error(
+                    "INTERNAL_ERROR",
+                    f"{type(exc).__name__}: {exc}",
+                    intent_id if isinstance(intent_id, str) else None,
+                )
+                message = _stream_message(ack, binary=False)
+            try:
+                await send(message)
+            except Exception:
+                pass  # connection closed while this intent was running
+        finally:
+            slots.release()
+
+    try:
+        while True:
+            await slots.acquire()
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                slots.release()
+                break
+            binary = message.get("bytes") is not None
+            try:
+                if binary:
+                    payload = decode_body(CODEC_MSGPACK, message["bytes"])
+                else:
+                    payload = json.loads(message.get("text") or "")
+            except Exception as exc:
+                slots.release()
+                await send(
+                    _stream_message(
+                        frame_error("FRAME_INVALID", f"Undecodable message: {exc}"),
+                        binary=False,
+                    )
+                )
+                continue
+            task = asyncio.create_task(run(payload, binary))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
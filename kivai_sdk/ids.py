@@ -0,0 +1,86 @@
+"""
+Time-ordered ids (v0.32)
+
+`new_id()` returns UUIDv7 strings (RFC 9562): 48 bits of Unix milliseconds,
+a 12-bit counter and 62 random bits. Ids sort by creation time, and within
+one process they are strictly increasing. The counter starts at a random
+value below 2048 each millisecond; when more than that are drawn in one
+millisecond, the id borrows the next millisecond rather than go backwards.
+
+Random bits come from os.urandom, read in blocks and kept as hex; the block
+is discarded in forked children so pre-forked workers never share it.
+
+Execution ids, generated intent ids and ACK envelopes use these. Audit
+queries by execution id use `id_time_us` to skip segments that end before
+the execution started (kivai_sdk/audit/index.py).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from typing import Optional
+
+_RANDOM_BYTES = 2048
+_VARIANT = "89ab"  # hex digits with the RFC 4122 variant bits (10xx)
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+_hex = ""
+_pos = 0
+
+
+def _random_hex(n: int) -> str:
+    global _hex, _pos
+    if _pos + n > len(_hex):
+        _hex, _pos = os.urandom(_RANDOM_BYTES).hex(), 0
+    _pos += n
+    return _hex[_pos - n : _pos]
+
+
+def _after_fork() -> None:
+    global _hex, _pos
+    _hex, _pos = "", 0
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def new_id() -> str:
+    """
+    A new UUIDv7, greater than every id this process generated before.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int(_random_hex(3), 16) & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms += 1
+                _counter = 0
+        ms, counter, r = _last_ms, _counter, _random_hex(16)
+    h = f"{ms:012x}"
+    variant = _VARIANT[int(r[0], 16) & 3]
+    return f"{h[:8]}-{h[8:]}-7{counter:03x}-{variant}{r[1:4]}-{r[4:]}"
+
+
+def id_time_us(value: str) -> Optional[int]:
+    """
+    Creation time of a UUIDv7 string in epoch microseconds (millisecond
+    precision); None for anything else.
+    """
+    if len(value) != 36 or value[14] != "7":
+        return None
+    try:
+        parsed = uuid.UUID(value)
+    except ValueError:
+        return None
+    if parsed.variant != uuid.RFC_4122:
+        return None
+    return (parsed.int >> 80) * 1000
@@ -1,9 +1,10 @@
 # kivai_sdk/intent_parser.py
 import re
-import uuid
-from datetime import datetime, timezone
 import requests  # used to call the mock device
 
+from kivai_sdk.clock import utc_now_iso
+from kivai_sdk.ids import new_id
+
 
 def send_to_device(intent_payload: dict):
     # mock device server endpoint
@@ -74,7 +75,7 @@ def parse_input(
     confidence = 0.9 if intent != "unknown" and capability != "generic" else 0.5
 
     payload = {
-        "intent_id": str(uuid.uuid4()),
+        "intent_id": new_id(),
         "intent": intent,
         "target": {
             # For v1 parser demo, we use capability+zone targeting.
@@ -83,7 +84,7 @@ def parse_input(
             "zone": zone or "unknown",
         },
         "meta": {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": utc_now_iso(),
             "language": language,
             "confidence": confidence,
             "source": "gateway",
@@ -0,0 +1,138 @@
+"""
+Legacy command translator (v0.31)
+
+Upgrades pre-v1 commands (schema/legacy/kivai-command.schema.json, as sent
+by the mock-devices demos)
+
+    {"command": "set temperature", "object": "thermostat",
+     "location": "living room", "temperature": 21, "trigger": "Kivai"}
+
+to Kivai Intent v1:
+
+    {"intent_id": "...", "intent": "set_temperature",
+     "target": {"capability": "thermostat", "zone": "living_room"},
+     "params": {"value": 21},
+     "meta": {"timestamp": "...", "language": "en", "confidence": 1.0,
+              "source": "legacy", "trigger": "Kivai"}}
+
+The gateway upgrades legacy bodies posted to /v1/execute and /v1/validate
+and marks their ACK `"legacy": true`; `kivai migrate` (kivai_sdk/migrate.py)
+upgrades archives. The result still goes through v1 schema validation: a
+command without a location, for instance, has no routable target and is
+rejected there, not here.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Optional
+
+from kivai_sdk.clock import utc_now_iso
+from kivai_sdk.ids import new_id
+
+# Verbs whose v1 intent is not simply the verb in snake_case.
+COMMAND_INTENTS = {
+    "set temperature": "set_temperature",
+    "play": "play_music",
+    "unlock": "unlock_door",
+    "lock": "lock_door",
+}
+# (verb, object) pairs that name the intent together.
+OBJECT_INTENTS = {
+    ("set", "thermostat"): "set_temperature",
+    ("play", "music"): "play_music",
+}
+OBJECT_CAPABILITIES = {
+    "thermostat": "thermostat",
+    "light": "light",
+    "lights": "light",
+    "speaker": "speaker",
+    "music": "speaker",
+    "door": "lock",
+    "lock": "lock",
+    "motion": "motion",
+    "motion sensor": "motion",
+}
+# Top-level legacy fields carried into params (legacy name -> v1 name).
+PARAM_FIELDS = {
+    "value": "value",
+    "temperature": "value",
+    "unit": "unit",
+    "level": "level",
+    "query": "query",
+}
+
+_SPACES = re.compile(r"[\s\-]+")
+
+
+class LegacyCommandError(ValueError):
+    """
+    The payload looks like a legacy command but cannot be translated.
+    """
+
+
+def is_legacy(payload: Any) -> bool:
+    return (
+        isinstance(payload, dict) and "command" in payload and "intent" not in payload
+    )
+
+
+def _words(value: str) -> str:
+    return _SPACES.sub(" ", value.strip().lower())
+
+
+def _snake(value: str) -> str:
+    return _words(value).replace(" ", "_")
+
+
+def _field(command: Dict[str, Any], key: str) -> str:
+    value = command.get(key)
+    if not isinstance(value, str) or not value.strip():
+        raise LegacyCommandError(f"Legacy command needs a non-empty string {key!r}")
+    return value
+
+
+def upgrade_legacy(command: Dict[str, Any], intent_id: Optional[str] = None) -> dict:
+    """
+    Kivai Intent v1 payload for a legacy command. A fresh intent_id is
+    assigned unless one is given.
+    """
+    verb = _words(_field(command, "command"))
+    obj = _words(_field(command, "object"))
+    intent = (
+        OBJECT_INTENTS.get((verb, obj)) or COMMAND_INTENTS.get(verb) or _snake(verb)
+    )
+
+    if isinstance(command.get("device_id"), str):
+        target: Dict[str, Any] = {"device_id": command["device_id"]}
+    else:
+        target = {"capability": OBJECT_CAPABILITIES.get(obj, _snake(obj))}
+        location = command.get("location")
+        if isinstance(location, str) and location.strip():
+            target["zone"] = _snake(location)
+
+    params = dict(command["params"]) if isinstance(command.get("params"), dict) else {}
+    for legacy_name, name in PARAM_FIELDS.items():
+        if legacy_name in command and name not in params:
+            params[name] = command[legacy_name]
+
+    confidence = command.get("confidence")
+    meta: Dict[str, Any] = {
+        "timestamp": command.get("timestamp") or utc_now_iso(),
+        "language": command.get("language") or "en",
+        "confidence": float(confidence)
+        if isinstance(confidence, (int, float)) and not isinstance(confidence, bool)
+        else 1.0,
+        "source": "legacy",
+    }
+    for key in ("trigger", "user_id"):
+        if isinstance(command.get(key), str):
+            meta[key] = command[key]
+
+    return {
+        "intent_id": intent_id or new_id(),
+        "intent": intent,
+        "target": target,
+        "params": params,
+        "meta": meta,
+    }
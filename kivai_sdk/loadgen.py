@@ -0,0 +1,431 @@
+"""
+Open-loop load generator for the gateway (v0.28)
+
+    kivai loadgen --url http://127.0.0.1:8080 --rate 500 --duration 30 \\
+        --mix echo=40,set_temperature=30,play_music=20,unlock_door=5,invalid=5 \\
+        --out build-a.json
+
+Arrivals are a Poisson process at `rate` intents per second. Every request
+is sent at its scheduled time whether or not earlier ones have answered,
+and its latency is measured from that scheduled time, not from when it
+finally went out. A gateway that stalls therefore shows up as latency
+instead of as a quietly lower send rate (coordinated omission). Requests go
+over a pool of keep-alive connections (httpx.AsyncClient).
+
+Latencies are kept in log-linear histograms (HDR style, within 1%), one for
+the whole run and one per reporting interval. The JSON report holds the
+configuration, a summary, the per-interval percentiles and the full
+histogram, and `--baseline` prints the percentile deltas against an
+earlier report.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+MIX_KINDS = ("echo", "set_temperature", "play_music", "unlock_door", "invalid")
+DEFAULT_MIX = "echo=40,set_temperature=30,play_music=20,unlock_door=5,invalid=5"
+PERCENTILES = (50.0, 90.0, 99.0, 99.9, 99.99)
+REPORT_VERSION = 1
+
+
+class Histogram:
+    """
+    Latency histogram in microseconds. Values below 128 us are exact; above
+    that each power of two is split into 128 sub-buckets, so a value is
+    reported within 1% of what was recorded and memory does not grow with
+    the number of samples.
+    """
+
+    SUB_BITS = 7
+    SUB = 1 << SUB_BITS
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.sum = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    @classmethod
+    def index(cls, value: int) -> int:
+        if value < cls.SUB:
+            return value
+        shift = value.bit_length() - cls.SUB_BITS - 1
+        return cls.SUB + shift * cls.SUB + ((value >> shift) - cls.SUB)
+
+    @classmethod
+    def highest_equivalent(cls, index: int) -> int:
+        if index < cls.SUB:
+            return index
+        shift, sub = divmod(index - cls.SUB, cls.SUB)
+        return ((cls.SUB + sub + 1) << shift) - 1
+
+    def record(self, value_us: float) -> None:
+        value = max(0, int(value_us))
+        i = self.index(value)
+        self.counts[i] = self.counts.get(i, 0) + 1
+        self.total += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram") -> None:
+        for i, n in other.counts.items():
+            self.counts[i] = self.counts.get(i, 0) + n
+        self.total += other.total
+        self.sum += other.sum
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> int:
+        """
+        Value (us) at or below which `q` percent of the samples fall.
+        """
+        if not self.total:
+            return 0
+        rank = max(1, math.ceil(q / 100.0 * self.total))
+        seen = 0
+        for i in sorted(self.counts):
+            seen += self.counts[i]
+            if seen >= rank:
+                return min(self.highest_equivalent(i), self.max)
+        return self.max
+
+    def summary_ms(self) -> Dict[str, float]:
+        out = {f"p{q:g}": round(self.percentile(q) / 1000.0, 3) for q in PERCENTILES}
+        out["max"] = round(self.max / 1000.0, 3)
+        out["mean"] = round(self.sum / self.total / 1000.0, 3) if self.total else 0.0
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "unit": "us",
+            "count": self.total,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "buckets": [[i, self.counts[i]] for i in sorted(self.counts)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Histogram":
+        hist = cls()
+        hist.counts = {int(i): int(n) for i, n in data["buckets"]}
+        hist.total = int(data["count"])
+        hist.sum = int(data["sum"])
+        hist.min = data.get("min")
+        hist.max = int(data["max"])
+        return hist
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    "echo=40,invalid=5" -> {"echo": 40.0, "invalid": 5.0}.
+    """
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        kind, sep, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in MIX_KINDS:
+            raise ValueError(
+                f"Unknown mix entry {kind!r} (choose from {', '.join(MIX_KINDS)})"
+            )
+        try:
+            value = float(weight) if sep else 1.0
+        except ValueError as exc:
+            raise ValueError(f"Invalid weight for {kind}: {weight!r}") from exc
+        if value < 0:
+            raise ValueError(f"Weight for {kind} must be >= 0")
+        mix[kind] = value
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Mix needs at least one entry with a positive weight")
+    return mix
+
+
+def make_payload(kind: str, rng: random.Random) -> dict:
+    """
+    One canonical intent of the given mix kind. Temperatures vary so the
+    device state shadow does not turn the run into no-ops.
+    """
+    payload: Dict[str, Any] = {
+        "intent_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "intent": "echo",
+        "target": {},
+        "params": {},
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "language": "en",
+            "confidence": 1.0,
+            "source": "loadgen",
+        },
+    }
+    if kind == "echo":
+        payload["target"] = {"capability": "speaker", "zone": "living_room"}
+        payload["params"] = {"message": "loadgen"}
+    elif kind == "set_temperature":
+        payload["intent"] = "set_temperature"
+        payload["target"] = {"capability": "thermostat", "zone": "living_room"}
+        payload["params"] = {"value": round(rng.uniform(16.0, 26.0), 1), "unit": "C"}
+    elif kind == "play_music":
+        payload["intent"] = "play_music"
+        payload["target"] = {"capability": "speaker", "zone": "living_room"}
+        payload["params"] = {"query": rng.choice(("jazz", "ambient", "news"))}
+    elif kind == "unlock_door":
+        payload["intent"] = "unlock_door"
+        payload["target"] = {"device_id": "door-front-01"}
+        payload["auth"] = {"required_role": "owner", "token": "loadgen-token"}
+    elif kind == "invalid":
+        # Confidence outside 0..1: rejected by schema validation.
+        payload["intent"] = "set_temperature"
+        payload["target"] = {"capability": "thermostat", "zone": "living_room"}
+        payload["params"] = {"value": 21.0}
+        payload["meta"]["confidence"] = 1.5
+    else:
+        raise ValueError(f"Unknown mix kind: {kind!r}")
+    return payload
+
+
+@dataclass(frozen=True)
+class LoadConfig:
+    url: str = "http://127.0.0.1:8080"
+    rate: float = 100.0
+    duration: float = 10.0
+    mix: Dict[str, float] = field(default_factory=lambda: parse_mix(DEFAULT_MIX))
+    connections: int = 64
+    max_in_flight: int = 4096
+    interval: float = 1.0
+    timeout: float = 10.0
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0 or self.duration <= 0 or self.interval <= 0:
+            raise ValueError("rate, duration and interval must be > 0")
+        if self.connections < 1 or self.max_in_flight < 1:
+            raise ValueError("connections and max_in_flight must be >= 1")
+
+
+def _outcome(status_code: int, body: Any) -> str:
+    if isinstance(body, dict) and body.get("status") in ("ok", "partial"):
+        return str(body["status"])
+    if isinstance(body, dict) and body.get("status") == "failed":
+        return "failed:" + str((body.get("error") or {}).get("code") or "UNKNOWN")
+    return f"http_{status_code}"
+
+
+class LoadReport:
+    """
+    Outcomes and latency histograms of one run, overall and per interval.
+    """
+
+    def __init__(self, config: LoadConfig) -> None:
+        self.config = config
+        self.latency = Histogram()
+        self.service = Histogram()
+        self.outcomes: Counter = Counter()
+        self.sent: Counter = Counter()
+        self.send_window = 0.0
+        self.elapsed = 0.0
+        self._intervals: Dict[int, Tuple[Histogram, Counter]] = {}
+
+    def _interval(self, offset: float) -> Tuple[Histogram, Counter]:
+        key = int(offset // self.config.interval)
+        slot = self._intervals.get(key)
+        if slot is None:
+            slot = self._intervals[key] = (Histogram(), Counter())
+        return slot
+
+    def record(
+        self,
+        offset: float,
+        outcome: str,
+        latency_us: Optional[float] = None,
+        service_us: Optional[float] = None,
+    ) -> None:
+        hist, outcomes = self._interval(offset)
+        outcomes[outcome] += 1
+        self.outcomes[outcome] += 1
+        if latency_us is not None:
+            hist.record(latency_us)
+            self.latency.record(latency_us)
+        if service_us is not None:
+            self.service.record(service_us)
+
+    def summary(self) -> Dict[str, Any]:
+        sent = sum(self.sent.values())
+        errors = sum(n for k, n in self.outcomes.items() if k not in ("ok", "partial"))
+        return {
+            "sent": sent,
+            "by_kind": dict(sorted(self.sent.items())),
+            "completed": self.latency.total,
+            "errors": errors,
+            "target_rate": self.config.rate,
+            "achieved_rate": (
+                round(sent / self.send_window, 1) if self.send_window else 0.0
+            ),
+            "elapsed_s": round(self.elapsed, 3),
+            "outcomes": dict(sorted(self.outcomes.items())),
+            "latency_ms": self.latency.summary_ms(),
+            "service_ms": self.service.summary_ms(),
+        }
+
+    def intervals(self) -> List[Dict[str, Any]]:
+        rows = []
+        width = self.config.interval
+        for key in sorted(self._intervals):
+            hist, outcomes = self._intervals[key]
+            count = sum(outcomes.values())
+            rows.append(
+                {
+                    "t": round(key * width, 3),
+                    "sent": count,
+                    "rate": round(count / width, 1),
+                    "errors": sum(
+                        n for k, n in outcomes.items() if k not in ("ok", "partial")
+                    ),
+                    "p50_ms": round(hist.percentile(50) / 1000.0, 3),
+                    "p99_ms": round(hist.percentile(99) / 1000.0, 3),
+                    "max_ms": round(hist.max / 1000.0, 3),
+                }
+            )
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": REPORT_VERSION,
+            "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "config": asdict(self.config),
+            "summary": self.summary(),
+            "intervals": self.intervals(),
+            "histogram": self.latency.to_dict(),
+        }
+
+    def format_text(self) -> str:
+        s = self.summary()
+        lines = [
+            f"{s['sent']} intents in {self.send_window:.1f} s "
+            f"(target {s['target_rate']:g}/s, achieved {s['achieved_rate']:g}/s), "
+            f"{s['errors']} not ok",
+            "   t(s)   sent   rate  errors   p50(ms)   p99(ms)   max(ms)",
+        ]
+        for row in self.intervals():
+            lines.append(
+                f"{row['t']:7.1f} {row['sent']:6d} {row['rate']:6.0f} {row['errors']:7d}"
+                f" {row['p50_ms']:9.2f} {row['p99_ms']:9.2f} {row['max_ms']:9.2f}"
+            )
+        lines.append("latency (from scheduled send): " + _format_ms(s["latency_ms"]))
+        lines.append("service time (from actual send): " + _format_ms(s["service_ms"]))
+        lines.append(
+            "outcomes: " + ", ".join(f"{k}={n}" for k, n in s["outcomes"].items())
+        )
+        return "\n".join(lines)
+
+
+def _format_ms(values: Dict[str, float]) -> str:
+    return "  ".join(f"{k}={v:.2f}ms" for k, v in values.items())
+
+
+def compare_reports(base: Dict[str, Any], new: Dict[str, Any]) -> str:
+    """
+    Side-by-side latency percentiles and throughput of two saved reports.
+    """
+    old_s, new_s = base["summary"], new["summary"]
+    rows: List[Tuple[str, float, float]] = [
+        ("achieved/s", old_s["achieved_rate"], new_s["achieved_rate"]),
+        ("errors", old_s["errors"], new_s["errors"]),
+    ]
+    rows += [
+        (f"{k} ms", old_s["latency_ms"][k], v)
+        for k, v in new_s["latency_ms"].items()
+        if k in old_s["latency_ms"]
+    ]
+    lines = ["               baseline    current     change"]
+    for name, old, cur in rows:
+        change = f"{(cur - old) / old * 100:+.1f}%" if old else "n/a"
+        lines.append(f"{name:<12} {old:11.3f} {cur:10.3f} {change:>10}")
+    return "\n".join(lines)
+
+
+async def _send(
+    client: Any,
+    payload: dict,
+    intended: float,
+    offset: float,
+    report: LoadReport,
+) -> None:
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        response = await client.post("/v1/execute", json=payload)
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        outcome = _outcome(response.status_code, body)
+    except httpx.HTTPError as exc:
+        report.record(offset, f"error:{type(exc).__name__}")
+        return
+    done = loop.time()
+    report.record(offset, outcome, (done - intended) * 1e6, (done - started) * 1e6)
+
+
+async def run_load(config: LoadConfig, transport: Any = None) -> LoadReport:
+    """
+    Run one open-loop load test. `transport` is passed to httpx (tests use
+    an ASGI transport to drive the gateway in-process).
+    """
+    import httpx
+
+    rng = random.Random(config.seed)
+    kinds = list(config.mix)
+    weights = [config.mix[k] for k in kinds]
+    report = LoadReport(config)
+    limits = httpx.Limits(
+        max_connections=config.connections,
+        max_keepalive_connections=config.connections,
+    )
+    async with httpx.AsyncClient(
+        base_url=config.url,
+        limits=limits,
+        timeout=config.timeout,
+        transport=transport,
+    ) as client:
+        loop = asyncio.get_running_loop()
+        tasks: set = set()
+        start = loop.time()
+        offset = rng.expovariate(config.rate)
+        while offset < config.duration:
+            kind = rng.choices(kinds, weights)[0]
+            payload = make_payload(kind, rng)
+            await asyncio.sleep(max(0.0, start + offset - loop.time()))
+            report.sent[kind] += 1
+            if len(tasks) >= config.max_in_flight:
+                # The client itself is saturated; count it rather than wait.
+                report.record(offset, "skipped")
+            else:
+                task = asyncio.create_task(
+                    _send(client, payload, start + offset, offset, report)
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            offset += rng.expovariate(config.rate)
+        # Falls behind `duration` when the generator itself cannot keep up.
+        report.send_window = loop.time() - start
+        if tasks:
+            await asyncio.gather(*tasks)
+        report.elapsed = loop.time() - start
+    return report
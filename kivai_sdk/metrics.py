@@ -0,0 +1,105 @@
+"""
+Gateway metrics shared across worker processes (v0.20)
+
+Counters live in an anonymous shared memory map with one slot per worker.
+The map is created before `kivai serve --workers N` forks, so every worker
+writes its own slot without cross-process locking and any worker can read
+the whole map to report fleet-wide totals. A single-process gateway uses the
+same structure with one slot.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import threading
+from typing import Dict, List, Optional
+
+COUNTERS = (
+    "intents",
+    "intents_ok",
+    "intents_partial",
+    "intents_failed",
+    "intents_no_op",
+    "intents_legacy",
+    "intents_forwarded",
+    "validations",
+    "validations_failed",
+    "heartbeats",
+)
+
+_SLOT = struct.Struct(f"<{len(COUNTERS)}Q")
+_INDEX = {name: i for i, name in enumerate(COUNTERS)}
+
+
+class SharedMetrics:
+    """
+    Monotonic u64 counters, one slot per worker.
+
+    Call `bind(slot)` in each worker after fork; increments go to the bound
+    slot (slot 0 until then). Threads of one worker share a lock; workers
+    never contend with each other.
+    """
+
+    def __init__(self, n_slots: int = 1) -> None:
+        if n_slots < 1:
+            raise ValueError("SharedMetrics requires at least one slot")
+        self.n_slots = n_slots
+        self._mm = mmap.mmap(-1, n_slots * _SLOT.size)  # MAP_SHARED | MAP_ANONYMOUS
+        self._slot = 0
+        self._lock = threading.Lock()
+
+    def bind(self, slot: int) -> None:
+        if not 0 <= slot < self.n_slots:
+            raise ValueError(
+                f"Metrics slot {slot} out of range (0..{self.n_slots - 1})"
+            )
+        self._slot = slot
+        self._lock = threading.Lock()  # a lock copied across fork may be held
+
+    def incr(self, name: str, n: int = 1) -> None:
+        offset = self._slot * _SLOT.size + _INDEX[name] * 8
+        with self._lock:
+            (value,) = struct.unpack_from("<Q", self._mm, offset)
+            struct.pack_into("<Q", self._mm, offset, value + n)
+
+    def record_ack(self, ack: dict) -> None:
+        self.incr("intents")
+        status = ack.get("status")
+        if status in ("ok", "partial", "failed"):
+            self.incr(f"intents_{status}")
+        if ack.get("no_op"):
+            self.incr("intents_no_op")
+        if ack.get("legacy"):
+            self.incr("intents_legacy")
+
+    def slot_values(self, slot: int) -> Dict[str, int]:
+        return dict(zip(COUNTERS, _SLOT.unpack_from(self._mm, slot * _SLOT.size)))
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        {"workers": N, "totals": {...}, "per_worker": [{...}, ...]}
+        """
+        per_worker: List[Dict[str, int]] = [
+            self.slot_values(i) for i in range(self.n_slots)
+        ]
+        totals = {name: sum(w[name] for w in per_worker) for name in COUNTERS}
+        return {"workers": self.n_slots, "totals": totals, "per_worker": per_worker}
+
+
+_ACTIVE_METRICS: Optional[SharedMetrics] = None
+
+
+def active_metrics() -> SharedMetrics:
+    global _ACTIVE_METRICS
+    if _ACTIVE_METRICS is None:
+        _ACTIVE_METRICS = SharedMetrics()
+    return _ACTIVE_METRICS
+
+
+def set_metrics(metrics: SharedMetrics | None) -> None:
+    """
+    Replace the gateway metrics (None restores a fresh single-slot default).
+    """
+    global _ACTIVE_METRICS
+    _ACTIVE_METRICS = metrics
@@ -0,0 +1,174 @@
+"""
+Bulk legacy migration (v0.31)
+
+`kivai migrate` streams a JSONL archive of commands through the legacy
+translator (kivai_sdk/legacy.py) and the v1 validator:
+
+- legacy commands are upgraded, validated and written to the output;
+- records that already are v1 intents are validated and copied unchanged;
+- anything else (bad JSON, untranslatable or invalid after upgrading) goes
+  to the rejects file as {"line": n, "error": "...", "record": "<raw line>"}.
+
+The input is read in chunks of `chunk_size` lines which worker processes
+translate; at most two chunks per worker are in flight and results are
+written in input order as they complete, so memory stays flat whatever the
+archive size. Upgraded intents get a deterministic intent_id (a UUIDv5 of
+the line number and text), so re-running a migration gives the same output.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import BinaryIO, Deque, Iterator, List, Optional, Tuple
+
+from kivai_sdk.legacy import LegacyCommandError, is_legacy, upgrade_legacy
+from kivai_sdk.validator import validate_command
+
+DEFAULT_CHUNK_SIZE = 1000
+MIGRATE_NAMESPACE = uuid.UUID("5b0f3c52-7d1e-4c57-9a8e-4b1d6a0c2f31")
+
+MIGRATED, VALID, REJECTED = "migrated", "valid", "rejected"
+
+_Line = Tuple[int, bytes]
+_Result = Tuple[str, bytes]
+
+
+def _reject(line_no: int, line: bytes, error: str) -> _Result:
+    record = {
+        "line": line_no,
+        "error": error,
+        "record": line.decode("utf-8", "replace"),
+    }
+    return REJECTED, (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def translate_line(line_no: int, line: bytes) -> _Result:
+    """
+    (MIGRATED | VALID, output line) or (REJECTED, rejects line) for one
+    archive line, without its trailing newline.
+    """
+    try:
+        payload = json.loads(line)
+    except ValueError as exc:
+        return _reject(line_no, line, f"Invalid JSON: {exc}")
+    if not is_legacy(payload):
+        ok, message = validate_command(payload)
+        if not ok:
+            return _reject(line_no, line, message)
+        return VALID, line + b"\n"
+    intent_id = str(uuid.uuid5(MIGRATE_NAMESPACE, f"{line_no}:{line.hex()}"))
+    try:
+        upgraded = upgrade_legacy(payload, intent_id=intent_id)
+    except LegacyCommandError as exc:
+        return _reject(line_no, line, str(exc))
+    ok, message = validate_command(upgraded)
+    if not ok:
+        return _reject(line_no, line, message)
+    out = json.dumps(upgraded, separators=(",", ":"), ensure_ascii=False)
+    return MIGRATED, (out + "\n").encode("utf-8")
+
+
+def translate_chunk(chunk: List[_Line]) -> List[_Result]:
+    return [translate_line(line_no, line) for line_no, line in chunk]
+
+
+def _chunks(src: BinaryIO, chunk_size: int) -> Iterator[List[_Line]]:
+    chunk: List[_Line] = []
+    for line_no, raw in enumerate(src, 1):
+        line = raw.strip()
+        if not line:
+            continue
+        chunk.append((line_no, line))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@dataclass
+class MigrateReport:
+    records: int = 0
+    migrated: int = 0
+    valid: int = 0
+    rejected: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def records_per_s(self) -> float:
+        return self.records / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "records_per_s": round(self.records_per_s, 1)}
+
+    def format_text(self) -> str:
+        return (
+            f"{self.records} records in {self.elapsed_s:.2f}s"
+            f" ({self.records_per_s:,.0f} records/s):"
+            f" {self.migrated} migrated, {self.valid} already v1,"
+            f" {self.rejected} rejected"
+        )
+
+
+def migrate_stream(
+    src: BinaryIO,
+    out: BinaryIO,
+    rejects: Optional[BinaryIO] = None,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> MigrateReport:
+    """
+    Migrate the JSONL archive `src` into `out`, rejects into `rejects`
+    (dropped if None). workers=1 translates in this process.
+    """
+    report = MigrateReport()
+    t0 = time.perf_counter()
+
+    def write(results: List[_Result]) -> None:
+        for kind, data in results:
+            report.records += 1
+            if kind == REJECTED:
+                report.rejected += 1
+                if rejects is not None:
+                    rejects.write(data)
+                continue
+            if kind == MIGRATED:
+                report.migrated += 1
+            else:
+                report.valid += 1
+            out.write(data)
+
+    if workers <= 1:
+        for chunk in _chunks(src, chunk_size):
+            write(translate_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: Deque[Future] = deque()
+            for chunk in _chunks(src, chunk_size):
+                if len(pending) >= workers * 2:
+                    write(pending.popleft().result())
+                pending.append(pool.submit(translate_chunk, chunk))
+            while pending:
+                write(pending.popleft().result())
+
+    report.elapsed_s = time.perf_counter() - t0
+    return report
+
+
+def migrate_file(
+    path: str,
+    out_path: str,
+    rejects_path: Optional[str] = None,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> MigrateReport:
+    with open(path, "rb") as src, open(out_path, "wb") as out:
+        if rejects_path is None:
+            return migrate_stream(src, out, None, workers, chunk_size)
+        with open(rejects_path, "wb") as rejects:
+            return migrate_stream(src, out, rejects, workers, chunk_size)
@@ -0,0 +1,157 @@
+"""
+Typed intent request (v0.12)
+
+A compact, read-only view of an intent payload, parsed once per execution and
+passed through policy, routing and adapters. Every stage reads pre-extracted
+fields instead of repeating `payload.get(...)` / `isinstance(...)` checks.
+
+`raw` is the original payload dict (not a copy) for backwards compatibility
+with code that still expects a dict.
+"""
+
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+# Shared read-only empty mapping for absent params (no per-request allocation).
+EMPTY_PARAMS: Mapping[str, Any] = MappingProxyType({})
+
+_NO_TARGET: tuple[None, None, None] = (None, None, None)
+
+
+class IntentRequest:
+    """
+    Pre-extracted intent fields:
+
+    - intent: canonical intent name (None if missing/not a string)
+    - intent_id: payload intent_id, stringified (None if missing)
+    - target: (device_id, zone, capability); each None when absent
+    - params: params object (read-only empty mapping when absent)
+    - auth: auth object or None
+    - meta: meta object or None
+    - raw: the payload dict this request was built from
+    """
+
+    __slots__ = ("raw", "intent", "intent_id", "target", "params", "auth", "meta")
+
+    def __init__(
+        self,
+        raw: dict,
+        intent: Optional[str],
+        intent_id: Optional[str],
+        target: tuple[Optional[str], Optional[str], Optional[str]],
+        params: Mapping[str, Any],
+        auth: Optional[dict],
+        meta: Optional[dict],
+    ) -> None:
+        self.raw = raw
+        self.intent = intent
+        self.intent_id = intent_id
+        self.target = target
+        self.params = params
+        self.auth = auth
+        self.meta = meta
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "IntentRequest":
+        get = payload.get
+
+        target = get("target")
+        if isinstance(target, dict):
+            device_id = target.get("device_id")
+            zone = target.get("zone")
+            capability = target.get("capability")
+            target_tuple = (
+                device_id if device_id and isinstance(device_id, str) else None,
+                zone if zone and isinstance(zone, str) else None,
+                capability if capability and isinstance(capability, str) else None,
+            )
+        else:
+            target_tuple = _NO_TARGET
+
+        intent = get("intent")
+        intent_id = get("intent_id")
+        params = get("params")
+        auth = get("auth")
+        meta = get("meta")
+
+        return cls(
+            payload,
+            intent if intent and isinstance(intent, str) else None,
+            str(intent_id) if intent_id else None,
+            target_tuple,
+            params if isinstance(params, dict) else EMPTY_PARAMS,
+            auth if isinstance(auth, dict) else None,
+            meta if isinstance(meta, dict) else None,
+        )
+
+    @classmethod
+    def coerce(cls, payload: "dict | IntentRequest") -> "IntentRequest":
+        if isinstance(payload, IntentRequest):
+            return payload
+        return cls.from_payload(payload)
+
+    @property
+    def device_id(self) -> Optional[str]:
+        device_id = self.target[0]
+        return device_id if device_id and device_id.strip() else None
+
+    @property
+    def zone(self) -> Optional[str]:
+        return self.target[1]
+
+    @property
+    def capability(self) -> Optional[str]:
+        return self.target[2]
+
+    @property
+    def fan_out(self) -> bool:
+        """
+        True when target.select is "all" (v0.15): address every matching device.
+        """
+        target = self.raw.get("target")
+        return isinstance(target, dict) and target.get("select") == "all"
+
+    def __reduce__(self) -> tuple:
+        # Pickled for isolated adapters (v0.21). EMPTY_PARAMS (a mappingproxy)
+        # does not pickle; it is restored on the other side.
+        params = None if self.params is EMPTY_PARAMS else self.params
+        return (
+            _unpickle_request,
+            (
+                self.raw,
+                self.intent,
+                self.intent_id,
+                self.target,
+                params,
+                self.auth,
+                self.meta,
+            ),
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"IntentRequest(intent={self.intent!r}, intent_id={self.intent_id!r}, "
+            f"target={self.target!r})"
+        )
+
+
+def _unpickle_request(
+    raw: dict,
+    intent: Optional[str],
+    intent_id: Optional[str],
+    target: tuple[Optional[str], Optional[str], Optional[str]],
+    params: Optional[Mapping[str, Any]],
+    auth: Optional[dict],
+    meta: Optional[dict],
+) -> IntentRequest:
+    return IntentRequest(
+        raw,
+        intent,
+        intent_id,
+        target,
+        EMPTY_PARAMS if params is None else params,
+        auth,
+        meta,
+    )
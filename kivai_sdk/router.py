@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from kivai_sdk.devices import DeviceMatch, default_device_registry
+from kivai_sdk.devices import DeviceMatch, active_device_registry
+from kivai_sdk.devices.health import active_health_tracker
+from kivai_sdk.request import IntentRequest
 
 _INTENT_DEFAULT_CAPABILITY = {
     "set_temperature": "thermostat",
@@ -10,21 +12,93 @@ _INTENT_DEFAULT_CAPABILITY = {
 }
 
 
-def route_target(payload: dict) -> DeviceMatch | None:
+def route_target(payload: "dict | IntentRequest") -> DeviceMatch | None:
     """
     v0.5 routing aligned to schema:
 
     target:
       - device_id
       - capability + zone
+
+    v0.14: offline devices are never returned (see resolve_route).
+    """
+    match, _ = resolve_route(payload)
+    return match
+
+
+def resolve_route(
+    payload: "dict | IntentRequest",
+) -> tuple[DeviceMatch | None, str | None]:
+    """
+    Health-aware routing. Returns (match, error_code):
+
+    - direct device_id target that is offline -> (None, "DEVICE_OFFLINE")
+    - zone/capability targets skip offline devices; if every candidate is
+      offline (one or several) -> (None, "DEVICE_OFFLINE")
+    - otherwise (match or None, None)
     """
-    target = payload.get("target") if isinstance(payload.get("target"), dict) else {}
-    device_id = target.get("device_id")
-    zone = target.get("zone")
-    capability = target.get("capability")
+    req = IntentRequest.coerce(payload)
+    device_id, zone, capability = req.target
 
     if capability is None:
-        capability = _INTENT_DEFAULT_CAPABILITY.get(payload.get("intent"))
+        capability = _INTENT_DEFAULT_CAPABILITY.get(req.intent)
+
+    reg = active_device_registry()
+    health = active_health_tracker()
+    health.tick()
+
+    if device_id:
+        if health.is_offline(device_id):
+            return None, "DEVICE_OFFLINE"
+        return reg.resolve(device_id=device_id), None
+
+    if not health.offline_count:
+        return reg.resolve(zone=zone, capability=capability), None
+
+    match = reg.resolve(zone=zone, capability=capability, exclude=health.is_offline)
+    if match is not None:
+        return match, None
+
+    # Nothing routable: fail fast if that is because every candidate is
+    # offline, rather than because nothing (or nothing unique) matched.
+    candidates = reg.resolve_all(zone=zone, capability=capability)
+    if candidates and all(health.is_offline(m.device.device_id) for m in candidates):
+        return None, "DEVICE_OFFLINE"
+    return None, None
+
+
+def resolve_routes(
+    payload: "dict | IntentRequest",
+) -> tuple[list[DeviceMatch], list[DeviceMatch]]:
+    """
+    Fan-out routing (v0.15, target.select == "all").
+
+    Returns (routable, offline): every device matching the target, ordered by
+    device_id and split by health. A device_id target yields at most one match.
+    """
+    req = IntentRequest.coerce(payload)
+    device_id, zone, capability = req.target
+
+    if capability is None:
+        capability = _INTENT_DEFAULT_CAPABILITY.get(req.intent)
+
+    reg = active_device_registry()
+    health = active_health_tracker()
+    health.tick()
+
+    if device_id:
+        match = reg.resolve(device_id=device_id)
+        matches = [match] if match is not None else []
+    else:
+        matches = reg.resolve_all(zone=zone, capability=capability)
+
+    if not health.offline_count:
+        return matches, []
 
-    reg = default_device_registry()
-    return reg.resolve(device_id=device_id, zone=zone, capability=capability)
+    routable: list[DeviceMatch] = []
+    offline: list[DeviceMatch] = []
+    for match in matches:
+        (offline if health.is_offline(match.device.device_id) else routable).append(
+            match
+        )
+    return routable, offline
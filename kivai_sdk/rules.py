@@ -0,0 +1,376 @@
+"""
+Automation rules driven by device events (v0.25)
+
+A device event is a small dict:
+
+    {"type": "motion", "device_id": "kitchen-motion-01", "zone": "kitchen",
+     "timestamp": "2026-02-12T19:30:00-05:00", "data": {...}}
+
+A rule matches on the event type and optionally its zone, its device and a
+time-of-day window, and emits one Kivai intent into the runtime:
+
+    {"rule_id": "kitchen-motion-light", "event": "motion", "zone": "kitchen",
+     "window": ["18:00", "06:00"], "cooldown_s": 60,
+     "intent": {"intent": "turn_on",
+                "target": {"capability": "light", "zone": "{zone}"}}}
+
+String values of the intent template that are exactly "{type}", "{zone}" or
+"{device_id}" are replaced by the event's value. The window is inclusive of
+its start, exclusive of its end, may wrap midnight, and is compared with the
+wall-clock time of the event's timestamp (the gateway's local time when the
+event has none). `cooldown_s` suppresses repeat firings of a rule for the
+same device.
+
+Rules are indexed by (type, zone, device_id), with None standing for "any",
+so an event is matched with four dict lookups whatever the number of rules;
+only the window and cooldown are checked per candidate.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, time as dtime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from kivai_sdk.clock import utc_now_iso
+from kivai_sdk.ids import new_id
+from kivai_sdk.scope import current_tenant
+
+EVENT_FIELDS = ("type", "zone", "device_id")
+
+IndexKey = Tuple[str, Optional[str], Optional[str]]
+
+
+def _parse_clock(value: str) -> dtime:
+    try:
+        return dtime.fromisoformat(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid time of day: {value!r} (expected HH:MM)") from exc
+
+
+@dataclass(frozen=True)
+class DeviceEvent:
+    type: str
+    device_id: Optional[str] = None
+    zone: Optional[str] = None
+    at: Optional[datetime] = None
+    data: Dict[str, Any] = field(default_factory=dict, compare=False)
+
+    @classmethod
+    def from_dict(cls, raw: Any) -> "DeviceEvent":
+        if not isinstance(raw, dict):
+            raise ValueError("event must be an object")
+        kind = raw.get("type")
+        if not isinstance(kind, str) or not kind:
+            raise ValueError("event.type must be a non-empty string")
+        for name in ("device_id", "zone"):
+            value = raw.get(name)
+            if value is not None and (not isinstance(value, str) or not value):
+                raise ValueError(f"event.{name} must be a non-empty string")
+        at = None
+        if raw.get("timestamp") is not None:
+            try:
+                at = datetime.fromisoformat(raw["timestamp"])
+            except (TypeError, ValueError) as exc:
+                raise ValueError("event.timestamp must be ISO 8601") from exc
+        data = raw.get("data")
+        return cls(
+            kind,
+            raw.get("device_id"),
+            raw.get("zone"),
+            at,
+            data if isinstance(data, dict) else {},
+        )
+
+    def value(self, name: str) -> Optional[str]:
+        return getattr(self, name)
+
+    def time_of_day(self) -> dtime:
+        at = self.at or datetime.now()
+        return at.time().replace(tzinfo=None)
+
+
+@dataclass
+class Rule:
+    rule_id: str
+    event: str
+    intent: Dict[str, Any]
+    zone: Optional[str] = None
+    device_id: Optional[str] = None
+    window: Optional[Tuple[dtime, dtime]] = None
+    cooldown_s: float = 0.0
+    # Paths inside `intent` whose value is an event field placeholder.
+    _slots: List[Tuple[Tuple[Any, ...], str]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if not self.rule_id or not self.event:
+            raise ValueError("Rule requires rule_id and event")
+        if not isinstance(self.intent, dict) or not isinstance(
+            self.intent.get("intent"), str
+        ):
+            raise ValueError(f"Rule {self.rule_id}: intent.intent must be a string")
+        if not isinstance(self.intent.get("target", {}), dict):
+            raise ValueError(f"Rule {self.rule_id}: intent.target must be an object")
+        for name in ("zone", "device_id"):
+            value = getattr(self, name)
+            if value is not None and (not isinstance(value, str) or not value):
+                raise ValueError(f"Rule {self.rule_id}: {name} must be a string")
+        self._slots = list(_placeholders(self.intent, ()))
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "Rule":
+        window = raw.get("window")
+        if window is not None:
+            if not isinstance(window, (list, tuple)) or len(window) != 2:
+                raise ValueError(
+                    f"Rule {raw.get('rule_id')}: window must be [start, end]"
+                )
+            window = (_parse_clock(window[0]), _parse_clock(window[1]))
+        return cls(
+            rule_id=str(raw.get("rule_id") or ""),
+            event=str(raw.get("event") or ""),
+            intent=raw.get("intent"),  # type: ignore[arg-type]
+            zone=raw.get("zone"),
+            device_id=raw.get("device_id"),
+            window=window,
+            cooldown_s=float(raw.get("cooldown_s", 0.0)),
+        )
+
+    def describe(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"rule_id": self.rule_id, "event": self.event}
+        if self.zone is not None:
+            out["zone"] = self.zone
+        if self.device_id is not None:
+            out["device_id"] = self.device_id
+        if self.window is not None:
+            out["window"] = [t.isoformat("minutes") for t in self.window]
+        if self.cooldown_s:
+            out["cooldown_s"] = self.cooldown_s
+        out["intent"] = self.intent
+        return out
+
+    @property
+    def key(self) -> IndexKey:
+        return (self.event, self.zone, self.device_id)
+
+    def in_window(self, now: dtime) -> bool:
+        if self.window is None:
+            return True
+        start, end = self.window
+        if start <= end:
+            return start <= now < end
+        return now >= start or now < end  # wraps midnight
+
+    def build_payload(self, event: DeviceEvent) -> Dict[str, Any]:
+        payload = copy.deepcopy(self.intent)
+        for path, name in self._slots:
+            node = payload
+            for step in path[:-1]:
+                node = node[step]
+            node[path[-1]] = event.value(name)
+        payload["intent_id"] = new_id()
+        payload.setdefault("target", {})
+        payload.setdefault("params", {})
+        meta = payload.setdefault("meta", {})
+        meta.setdefault(
+            "timestamp",
+            utc_now_iso(),
+        )
+        meta.setdefault("language", "en")
+        meta.setdefault("confidence", 1.0)
+        meta.setdefault("source", f"rule:{self.rule_id}")
+        return payload
+
+
+def _placeholders(node: Any, path: Tuple[Any, ...]):
+    if isinstance(node, dict):
+        items: Iterable[Tuple[Any, Any]] = node.items()
+    elif isinstance(node, list):
+        items = enumerate(node)
+    else:
+        return
+    for key, value in items:
+        if isinstance(value, str) and value[:1] == "{" and value[-1:] == "}":
+            name = value[1:-1]
+            if name in EVENT_FIELDS:
+                yield (*path, key), name
+        else:
+            yield from _placeholders(value, (*path, key))
+
+
+def _execute_and_record(payload: dict) -> dict:
+    from kivai_sdk.runtime import execute_and_record  # deferred: runtime is heavy
+
+    # Events reported for a tenant (v0.33) fire that tenant's intents.
+    tenant = current_tenant()
+    return execute_and_record(payload, tenant.tenant_id if tenant else None)
+
+
+class RulesEngine:
+    """
+    Indexed rule set. `match` is pure; `handle` also applies cooldowns and
+    executes the emitted intents (through `execute`, the runtime by default).
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[Rule] = (),
+        execute: Callable[[dict], dict] = _execute_and_record,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._execute = execute
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._index: Dict[IndexKey, List[Rule]] = {}
+        self._by_id: Dict[str, Rule] = {}
+        self._last_fired: Dict[Tuple[str, Optional[str]], float] = {}
+        self._counts = {"events": 0, "matched": 0, "emitted": 0, "failed": 0}
+        for rule in rules:
+            self.add(rule)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def add(self, rule: Rule) -> None:
+        """
+        Add or replace (by rule_id) a rule.
+        """
+        with self._lock:
+            if rule.rule_id in self._by_id:
+                self._unindex(self._by_id[rule.rule_id])
+            self._by_id[rule.rule_id] = rule
+            self._index.setdefault(rule.key, []).append(rule)
+
+    def _unindex(self, rule: Rule) -> None:
+        bucket = self._index[rule.key]
+        bucket.remove(rule)
+        if not bucket:
+            del self._index[rule.key]
+
+    def remove(self, rule_id: str) -> bool:
+        with self._lock:
+            rule = self._by_id.pop(rule_id, None)
+            if rule is None:
+                return False
+            self._unindex(rule)
+            return True
+
+    def get(self, rule_id: str) -> Optional[Rule]:
+        return self._by_id.get(rule_id)
+
+    def rules(self) -> List[Rule]:
+        return sorted(self._by_id.values(), key=lambda r: r.rule_id)
+
+    def match(self, event: DeviceEvent) -> List[Rule]:
+        """
+        Rules whose type, zone, device and window accept `event`.
+        """
+        index = self._index
+        kind, zone, device_id = event.type, event.zone, event.device_id
+        candidates: List[Rule] = []
+        for key in (
+            (kind, None, None),
+            (kind, zone, None),
+            (kind, None, device_id),
+            (kind, zone, device_id),
+        ):
+            bucket = index.get(key)
+            if bucket:
+                candidates.extend(bucket)
+        if zone is None or device_id is None:
+            # (kind, None, x) and (kind, x, None) collapse onto the same keys.
+            candidates = list({id(r): r for r in candidates}.values())
+        if not candidates:
+            return candidates
+        now = event.time_of_day()
+        return [r for r in candidates if r.in_window(now)]
+
+    def handle(self, event: DeviceEvent) -> List[Dict[str, Any]]:
+        """
+        Match `event` and execute one intent per matching rule that is not
+        cooling down. Returns {"rule_id", "ack"} per emitted intent
+        ({"rule_id", "error"} if executing it raised).
+        """
+        matched = self.match(event)
+        fired: List[Rule] = []
+        with self._lock:
+            self._counts["events"] += 1
+            self._counts["matched"] += len(matched)
+            now = self._clock()
+            for rule in matched:
+                if rule.cooldown_s > 0:
+                    key = (rule.rule_id, event.device_id)
+                    last = self._last_fired.get(key)
+                    if last is not None and now - last < rule.cooldown_s:
+                        continue
+                    self._last_fired[key] = now
+                fired.append(rule)
+
+        results: List[Dict[str, Any]] = []
+        failed = 0
+        for rule in fired:
+            try:
+                ack = self._execute(rule.build_payload(event))
+            except Exception as exc:  # one broken action must not drop the rest
+                results.append({"rule_id": rule.rule_id, "error": str(exc)})
+                failed += 1
+                continue
+            results.append({"rule_id": rule.rule_id, "ack": ack})
+            failed += ack.get("status") == "failed"
+        with self._lock:
+            self._counts["emitted"] += len(results)
+            self._counts["failed"] += failed
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"rules": len(self._by_id), **self._counts}
+
+
+def load_rules(path: str) -> List[Rule]:
+    """
+    Rules from a JSON file: a list of rule objects or {"rules": [...]}.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("rules")
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: expected a list of rules")
+    rules = [Rule.from_dict(item) for item in data]
+    seen = set()
+    for rule in rules:
+        if rule.rule_id in seen:
+            raise ValueError(f"{path}: duplicate rule_id {rule.rule_id!r}")
+        seen.add(rule.rule_id)
+    return rules
+
+
+_ACTIVE_ENGINE: Optional[RulesEngine] = None
+
+
+def active_rules_engine() -> RulesEngine:
+    global _ACTIVE_ENGINE
+    if _ACTIVE_ENGINE is None:
+        _ACTIVE_ENGINE = RulesEngine()
+    return _ACTIVE_ENGINE
+
+
+def set_rules_engine(engine: RulesEngine | None) -> None:
+    """
+    Replace the runtime rules engine (None restores an empty one).
+    """
+    global _ACTIVE_ENGINE
+    _ACTIVE_ENGINE = engine
+
+
+def configure_rules(path: str) -> RulesEngine:
+    engine = RulesEngine(load_rules(path))
+    set_rules_engine(engine)
+    return engine
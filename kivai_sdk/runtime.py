@@ -1,42 +1,45 @@
 import json
-import uuid
-from datetime import datetime, timezone
+import time
 from typing import Any
 
-from kivai_sdk.adapters import AdapterContext, default_registry
+from kivai_sdk.adapters import AdapterContext, active_adapter_registry
 from kivai_sdk.adapters.capabilities import AdapterCapabilities
-from kivai_sdk.adapters.contracts import normalize_adapter_output
-from kivai_sdk.audit import DEFAULT_AUDIT_LOGGER, AuditLogger, make_event
+from kivai_sdk.adapters.contracts import AdapterResult, normalize_adapter_output
+from kivai_sdk.breakers import active_breakers, unavailable_message
+from kivai_sdk.bus import EXECUTION_FINISHED, EXECUTION_STARTED, active_event_bus
+from kivai_sdk.audit import AuditLogger, active_audit_logger, make_event
 from kivai_sdk.config import DEFAULT_EXECUTION_CONFIG, ExecutionConfig
-from kivai_sdk.router import route_target
+from kivai_sdk.clock import utc_now_iso
+from kivai_sdk.context import active_context_store
+from kivai_sdk.devices import (
+    DeviceMatch,
+    active_device_shadow,
+    record_change,
+    sync_changes,
+)
+from kivai_sdk.devices.shadow import ADAPTER as SHADOW_ADAPTER
+from kivai_sdk.metrics import active_metrics
+from kivai_sdk.fanout import run_fan_out, summarize, target_failed
+from kivai_sdk.ids import new_id
+from kivai_sdk.request import IntentRequest
+from kivai_sdk.router import resolve_route, resolve_routes
+from kivai_sdk.scope import use_tenant
 from kivai_sdk.security import evaluate_authorization
+from kivai_sdk.tenants import TenantError, active_tenant_directory, tenant_of
 from kivai_sdk.validator import validate_command
 
 
-def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-
-
-def _get_target_device_id(payload: dict) -> str | None:
-    target = payload.get("target")
-    if isinstance(target, dict):
-        device_id = target.get("device_id")
-        if isinstance(device_id, str) and device_id.strip():
-            return device_id
-    return None
-
-
-def _make_ack_base(payload: dict, execution_id: str) -> dict:
+def _make_ack_base(req: IntentRequest, execution_id: str) -> dict:
     """
     Stable ACK envelope. Mirrors key routing fields for auditability.
     """
     return {
         "execution_id": execution_id,
-        "intent_id": str(payload.get("intent_id") or uuid.uuid4()),
-        "timestamp": _utc_now_iso(),
+        "intent_id": req.intent_id or new_id(),
+        "timestamp": utc_now_iso(),
         "status": "ok",
-        "intent": payload.get("intent"),
-        "device_id": _get_target_device_id(payload),
+        "intent": req.intent,
+        "device_id": req.device_id,
     }
 
 
@@ -46,24 +49,38 @@ def _error_ack(base: dict, code: str, message: str) -> dict:
     return base
 
 
+def _fail(ack: dict, audit: AuditLogger, code: str, message: str) -> dict:
+    audit.emit(
+        make_event(
+            ack["execution_id"],
+            "execute.end",
+            {"status": "failed", "error_code": code},
+        )
+    )
+    return _error_ack(ack, code, message)
+
+
 def _success_ack(base: dict, result: dict) -> dict:
     base["status"] = "ok"
     base["result"] = result
     return base
 
 
-def _apply_route_if_available(ack: dict, payload: dict) -> None:
-    match = route_target(payload)
+def _apply_route_if_available(
+    ack: dict, req: IntentRequest
+) -> tuple[DeviceMatch | None, str | None]:
+    match, error_code = resolve_route(req)
     if match is None:
-        return
+        return None, error_code
     ack["route"] = {
         "device_id": match.device.device_id,
         "zone": match.device.zone,
-        "capabilities": sorted(list(match.device.capabilities)),
+        "capabilities": sorted(match.device.capabilities),
         "reason": match.reason,
     }
     if not ack.get("device_id"):
         ack["device_id"] = match.device.device_id
+    return match, None
 
 
 def _ensure_meta(payload: dict) -> None:
@@ -74,7 +91,7 @@ def _ensure_meta(payload: dict) -> None:
     meta = payload.get("meta")
     if not isinstance(meta, dict):
         payload["meta"] = {
-            "timestamp": _utc_now_iso(),
+            "timestamp": utc_now_iso(),
             "language": "en",
             "confidence": float(
                 payload.get("confidence")
@@ -85,7 +102,7 @@ def _ensure_meta(payload: dict) -> None:
         }
         return
 
-    meta.setdefault("timestamp", _utc_now_iso())
+    meta.setdefault("timestamp", utc_now_iso())
     meta.setdefault("language", "en")
     if "confidence" not in meta:
         meta["confidence"] = float(
@@ -100,7 +117,7 @@ def _ensure_intent_id(payload: dict) -> None:
         not isinstance(payload.get("intent_id"), str)
         or len(payload.get("intent_id", "")) < 8
     ):
-        payload["intent_id"] = str(uuid.uuid4())
+        payload["intent_id"] = new_id()
 
 
 def _ensure_target(payload: dict) -> None:
@@ -116,7 +133,9 @@ def _ensure_params(payload: dict) -> None:
         payload["params"] = {}
 
 
-def _adapter_capabilities(adapter: object, intent: str) -> AdapterCapabilities | None:
+def _adapter_capabilities(
+    adapter: object, intent: str | None
+) -> AdapterCapabilities | None:
     """
     v0.9 strict: adapters must declare AdapterCapabilities via .capabilities.
     """
@@ -137,61 +156,221 @@ def _adapter_capabilities(adapter: object, intent: str) -> AdapterCapabilities |
     return None
 
 
+def _sole(capabilities: frozenset) -> str:
+    return next(iter(capabilities)) if len(capabilities) == 1 else ""
+
+
 def _enforce_capability_match(
-    ack: dict, caps: AdapterCapabilities
+    match: DeviceMatch | None, caps: AdapterCapabilities
 ) -> tuple[bool, str | None]:
     """
     Strict: if routing produced a route, route must satisfy adapter required_capabilities.
     """
-    route = ack.get("route") if isinstance(ack.get("route"), dict) else None
-    if not route:
+    if match is None:
         return True, None
 
-    route_caps = route.get("capabilities")
-    if not isinstance(route_caps, list):
+    if not caps.required_capabilities <= match.device.capabilities:
         return False, "ADAPTER_CAPABILITY_MISMATCH"
 
-    route_set = {c for c in route_caps if isinstance(c, str)}
-    required = set(caps.required_capabilities)
+    return True, None
 
-    if not required.issubset(route_set):
-        return False, "ADAPTER_CAPABILITY_MISMATCH"
 
-    return True, None
+def _desired_state(adapter: object, payload: dict, ctx: AdapterContext) -> dict | None:
+    """
+    v0.27 opt-in: the device state an adapter's `desired_state` hook says
+    this intent asks for, or None.
+    """
+    hook = getattr(adapter, "desired_state", None)
+    if hook is None:
+        return None
+    try:
+        desired = hook(payload, ctx)
+    except Exception:
+        return None
+    return desired if isinstance(desired, dict) and desired else None
 
 
-def _authorize_with_role_baseline(
-    payload: dict, required_role: str | None
-) -> tuple[bool, str | None]:
+def _no_op_result(
+    adapter: object, payload: dict, ctx: AdapterContext, desired: dict
+) -> AdapterResult:
+    """
+    The result of a call skipped by the shadow: the adapter's `no_op_result`
+    hook, so clients see the adapter's usual result shape, or else
+    {"no_op": True, "state": desired}.
+    """
+    hook = getattr(adapter, "no_op_result", None)
+    if hook is not None:
+        try:
+            res = normalize_adapter_output(hook(payload, ctx))
+        except Exception:
+            res = None
+        if res is not None and res.ok:
+            return res
+    return AdapterResult.success({"no_op": True, "state": desired})
+
+
+def _record_state(device_id: str, desired: dict | None, data: dict | None) -> None:
     """
-    Evaluate authorization with an internal baseline role requirement (without mutating payload).
+    Write the state a successful call left the device in to the shadow:
+    the desired state, overlaid with any `state` the adapter returned.
     """
-    if not required_role:
-        return evaluate_authorization(payload)
-    shadow = {**payload, "_auth_required_role": required_role}
-    return evaluate_authorization(shadow)
+    state = dict(desired or {})
+    reported = data.get("state") if data else None
+    if isinstance(reported, dict):
+        state.update(reported)
+    if state:
+        record_change(
+            {
+                "op": "state",
+                "device_id": device_id,
+                "state": state,
+                "source": SHADOW_ADAPTER,
+                "at": time.time(),
+            }
+        )
+
+
+def _execute_fan_out(
+    ack: dict,
+    payload: dict,
+    req: IntentRequest,
+    adapter: object,
+    caps: AdapterCapabilities,
+    config: ExecutionConfig,
+    audit: AuditLogger,
+) -> dict:
+    """
+    v0.15 fan-out (target.select == "all"): one adapter call per matching
+    device, aggregated into a single ACK with per-device `targets`.
+    """
+    execution_id = ack["execution_id"]
+    routable, offline = resolve_routes(req)
+    total = len(routable) + len(offline)
+    if not total:
+        return _fail(ack, audit, "TARGET_NOT_FOUND", "No device matches target")
+    if total > config.fanout_max_targets:
+        return _fail(
+            ack,
+            audit,
+            "FANOUT_TOO_LARGE",
+            f"{total} devices match target; limit is {config.fanout_max_targets}",
+        )
+
+    ack["route"] = {
+        "select": "all",
+        "reason": (routable or offline)[0].reason,
+        "device_ids": sorted(m.device.device_id for m in (*routable, *offline)),
+    }
+    audit.emit(make_event(execution_id, "route.resolved", ack["route"]))
+
+    targets = [
+        target_failed(m.device.device_id, "DEVICE_OFFLINE", "Target device is offline")
+        for m in offline
+    ]
+    runnable = []
+    for m in routable:
+        if caps.required_capabilities <= m.device.capabilities:
+            runnable.append(m)
+        else:
+            targets.append(
+                target_failed(
+                    m.device.device_id,
+                    "ADAPTER_CAPABILITY_MISMATCH",
+                    "Adapter capability requirements not satisfied by routed device",
+                )
+            )
+    targets.extend(run_fan_out(adapter, payload, req, runnable, caps, config))
+    targets.sort(key=lambda t: t["device_id"])
+
+    status, summary = summarize(targets)
+    ack["status"] = status
+    ack["result"] = summary
+    ack["targets"] = targets
+    if status == "partial":
+        ack["error"] = {
+            "code": "PARTIAL_FAILURE",
+            "message": f"{summary['failed']} of {summary['total']} targets failed",
+        }
+    elif status == "failed":
+        codes = {t["error"]["code"] for t in targets}
+        ack["error"] = {
+            "code": codes.pop() if len(codes) == 1 else "ALL_TARGETS_FAILED",
+            "message": f"All {summary['total']} targets failed",
+        }
+
+    end = {"status": status, **summary}
+    if "error" in ack:
+        end["error_code"] = ack["error"]["code"]
+    audit.emit(make_event(execution_id, "execute.end", end))
+    return ack
 
 
 def execute_intent(
     payload: dict,
     config: ExecutionConfig = DEFAULT_EXECUTION_CONFIG,
-    audit: AuditLogger = DEFAULT_AUDIT_LOGGER,
+    audit: AuditLogger | None = None,
+    tenant: str | None = None,
 ) -> dict:
     """
     v0.9 execution pipeline (strict adapter capabilities)
     - Adds execution_id for traceability
     - Supports strict mode (no normalization)
     - Enforces adapter-declared auth baseline and capability requirements deterministically
+    - v0.12: payload is parsed once into an IntentRequest shared by every stage
+    - v0.15: target.select == "all" fans out to every matching device
+    - v0.20: applies registry changes published by other gateway workers
+    - v0.24: incomplete targets are filled from recent user/zone context
+    - v0.26: publishes execution.started/finished to the event bus
+    - v0.27: opted-in adapters are skipped (`no_op`) when the device state
+      shadow already holds the desired state
+    - v0.29: `audit` defaults to the active audit logger (`kivai serve
+      --audit-dir`); failed executions record their error code
+    - v0.33: with a tenant directory configured, runs against the state of
+      `tenant` (the connection's) or `meta.tenant_id`
     """
-    execution_id = str(uuid.uuid4())
-
-    audit.emit(
-        make_event(
-            execution_id,
-            "execute.start",
-            {"strict": bool(config.strict), "intent": payload.get("intent")},
-        )
+    execution_id = new_id()
+    if audit is None:
+        audit = active_audit_logger()
+    bus = active_event_bus()
+    if not bus.active:
+        return _execute(payload, config, audit, execution_id, tenant)
+
+    bus.publish(
+        EXECUTION_STARTED,
+        {
+            "execution_id": execution_id,
+            "intent_id": payload.get("intent_id"),
+            "intent": payload.get("intent"),
+        },
+    )
+    finished = {"execution_id": execution_id, "intent": payload.get("intent")}
+    try:
+        ack = _execute(payload, config, audit, execution_id, tenant)
+    except Exception:
+        bus.publish(EXECUTION_FINISHED, {**finished, "status": "error"})
+        raise
+    error = ack.get("error")
+    bus.publish(
+        EXECUTION_FINISHED,
+        {
+            **finished,
+            "intent_id": ack.get("intent_id"),
+            "status": ack.get("status"),
+            "device_id": ack.get("device_id"),
+            "error_code": error.get("code") if error else None,
+        },
     )
+    return ack
+
+
+def _execute(
+    payload: dict,
+    config: ExecutionConfig,
+    audit: AuditLogger,
+    execution_id: str,
+    tenant: str | None,
+) -> dict:
+    sync_changes()
 
     # Dev-mode normalization only
     if not config.strict:
@@ -200,127 +379,197 @@ def execute_intent(
         _ensure_target(payload)
         _ensure_params(payload)
 
-    ack = _make_ack_base(payload, execution_id)
+    audit.emit(
+        make_event(
+            execution_id,
+            "execute.start",
+            {
+                "strict": bool(config.strict),
+                "intent": payload.get("intent"),
+                "intent_id": payload.get("intent_id"),
+            },
+        )
+    )
+
+    # v0.33: resolve the tenant and run the rest against its state.
+    tenants = active_tenant_directory()
+    if tenants is None:
+        return _execute_scoped(payload, config, audit, execution_id)
+    try:
+        tenant_id = tenant_of(payload, tenant)
+        scope = tenants.get(tenant_id) if tenant_id is not None else None
+    except TenantError as exc:
+        ack = _make_ack_base(IntentRequest.from_payload(payload), execution_id)
+        return _fail(ack, audit, exc.code, str(exc))
+    with use_tenant(scope):
+        ack = _execute_scoped(payload, config, audit, execution_id)
+    if scope is not None:
+        ack["tenant_id"] = scope.tenant_id
+    return ack
+
+
+def _execute_scoped(
+    payload: dict, config: ExecutionConfig, audit: AuditLogger, execution_id: str
+) -> dict:
     intent = payload.get("intent")
+    intent = intent if intent and isinstance(intent, str) else None
+    registry = active_adapter_registry()
+    adapter = registry.resolve(intent)
+    caps = _adapter_capabilities(adapter, intent) if adapter is not None else None
+
+    # Context may only fill a target with a device the adapter can drive.
+    context = active_context_store() if config.context else None
+    filled = None
+    if context is not None and caps is not None:
+        filled = context.fill_target(payload, caps.required_capabilities)
+
+    req = IntentRequest.from_payload(payload)
+    ack = _make_ack_base(req, execution_id)
+    if filled is not None:
+        ack["context"] = filled
+        audit.emit(make_event(execution_id, "context.applied", filled))
 
-    registry = default_registry()
-    adapter = registry.resolve(intent if isinstance(intent, str) else None)
     if adapter is None:
-        audit.emit(make_event(execution_id, "execute.end", {"status": "failed"}))
-        return _error_ack(ack, "INTENT_UNSUPPORTED", f"Unsupported intent: {intent}")
+        return _fail(
+            ack,
+            audit,
+            "INTENT_UNSUPPORTED",
+            f"Unsupported intent: {payload.get('intent')}",
+        )
 
-    caps = _adapter_capabilities(adapter, str(intent))
     if caps is None:
-        audit.emit(make_event(execution_id, "execute.end", {"status": "failed"}))
-        return _error_ack(
+        return _fail(
             ack,
+            audit,
             "ADAPTER_CAPABILITIES_MISSING",
             "Adapter does not declare AdapterCapabilities",
         )
 
     # Enforce adapter security baseline BEFORE schema validation to avoid SCHEMA_INVALID masking auth.
     if caps.requires_auth:
-        authorized, error_code = _authorize_with_role_baseline(
-            payload, caps.required_role
-        )
-        audit.emit(
-            make_event(
-                execution_id,
-                "auth.evaluated",
-                {
-                    "authorized": bool(authorized),
-                    "error_code": error_code,
-                    "intent": intent,
-                    "required_role": caps.required_role,
-                },
-            )
-        )
-        if not authorized:
-            audit.emit(make_event(execution_id, "execute.end", {"status": "failed"}))
-            return _error_ack(
-                ack,
-                error_code or "AUTH_REQUIRED",
-                "Authorization failed",
-            )
+        authorized, error_code = evaluate_authorization(req, caps.required_role)
+        auth_data = {
+            "authorized": bool(authorized),
+            "error_code": error_code,
+            "intent": intent,
+            "required_role": caps.required_role,
+        }
     else:
         # Normal policy evaluation for intents without adapter auth baseline
-        authorized, error_code = evaluate_authorization(payload)
-        audit.emit(
-            make_event(
-                execution_id,
-                "auth.evaluated",
-                {
-                    "authorized": bool(authorized),
-                    "error_code": error_code,
-                    "intent": intent,
-                },
-            )
+        authorized, error_code = evaluate_authorization(req)
+        auth_data = {
+            "authorized": bool(authorized),
+            "error_code": error_code,
+            "intent": intent,
+        }
+    audit.emit(make_event(execution_id, "auth.evaluated", auth_data))
+    if not authorized:
+        return _fail(
+            ack,
+            audit,
+            error_code or "AUTH_REQUIRED",
+            "Authorization failed",
         )
-        if not authorized:
-            audit.emit(make_event(execution_id, "execute.end", {"status": "failed"}))
-            return _error_ack(
-                ack,
-                error_code or "AUTH_REQUIRED",
-                "Authorization failed",
-            )
 
+    # Schema validation for all non-echo intents.
     # Echo is kept outside schema validation by design.
-    if intent == "echo":
-        _apply_route_if_available(ack, payload)
-        if "route" in ack:
-            audit.emit(make_event(execution_id, "route.resolved", ack["route"]))
-
-        ok_caps, cap_err = _enforce_capability_match(ack, caps)
-        if not ok_caps:
-            audit.emit(make_event(execution_id, "execute.end", {"status": "failed"}))
-            return _error_ack(
-                ack,
-                cap_err or "ADAPTER_CAPABILITY_MISMATCH",
-                "Adapter capability requirements not satisfied by routed device",
-            )
-
-        ctx = AdapterContext()
-        raw = adapter.execute(payload, ctx)
-        res = normalize_adapter_output(raw)
-
-        if not res.ok:
-            audit.emit(make_event(execution_id, "execute.end", {"status": "failed"}))
-            return _error_ack(ack, res.error.code, res.error.message)
-
-        audit.emit(make_event(execution_id, "execute.end", {"status": "ok"}))
-        return _success_ack(ack, res.data or {})
-
-    # Schema validation for all non-echo intents
-    ok, message = validate_command(payload)
-    audit.emit(make_event(execution_id, "schema.validated", {"ok": bool(ok)}))
-    if not ok:
-        audit.emit(make_event(execution_id, "execute.end", {"status": "failed"}))
-        return _error_ack(ack, "SCHEMA_INVALID", message)
-
-    _apply_route_if_available(ack, payload)
-    if "route" in ack:
+    if intent != "echo":
+        ok, message = validate_command(payload)
+        audit.emit(make_event(execution_id, "schema.validated", {"ok": bool(ok)}))
+        if not ok:
+            return _fail(ack, audit, "SCHEMA_INVALID", message)
+
+    if req.fan_out:
+        return _execute_fan_out(ack, payload, req, adapter, caps, config, audit)
+
+    match, route_err = _apply_route_if_available(ack, req)
+    if route_err is not None:
+        return _fail(ack, audit, route_err, "Target device is offline")
+    if match is not None:
         audit.emit(make_event(execution_id, "route.resolved", ack["route"]))
 
-    ok_caps, cap_err = _enforce_capability_match(ack, caps)
+    ok_caps, cap_err = _enforce_capability_match(match, caps)
     if not ok_caps:
-        audit.emit(make_event(execution_id, "execute.end", {"status": "failed"}))
-        return _error_ack(
+        return _fail(
             ack,
+            audit,
             cap_err or "ADAPTER_CAPABILITY_MISMATCH",
             "Adapter capability requirements not satisfied by routed device",
         )
 
-    ctx = AdapterContext()
-    raw = adapter.execute(payload, ctx)
-    res = normalize_adapter_output(raw)
+    ctx = AdapterContext(
+        request=req, device=match.device if match is not None else None
+    )
+
+    # v0.27: an opted-in adapter whose desired state the device shadow
+    # already holds is not called at all.
+    desired = _desired_state(adapter, payload, ctx) if match is not None else None
+    if (
+        desired is not None
+        and config.shadow_no_op
+        and active_device_shadow().matches(
+            match.device.device_id, desired, config.shadow_max_age_s
+        )
+    ):
+        ack["no_op"] = True
+        audit.emit(
+            make_event(
+                execution_id, "shadow.no_op", {"device_id": match.device.device_id}
+            )
+        )
+        res = _no_op_result(adapter, payload, ctx, desired)
+    else:
+        # v0.22: fail fast while the adapter's or the device's breaker is open.
+        permit = None
+        if config.circuit_breakers:
+            permit, blocked = active_breakers().acquire(
+                intent, match.device.device_id if match is not None else None
+            )
+            if blocked is not None:
+                return _fail(
+                    ack, audit, "DEVICE_UNAVAILABLE", unavailable_message(*blocked)
+                )
+
+        try:
+            raw = adapter.execute(payload, ctx)
+        except Exception:
+            if permit is not None:
+                permit.finish(failed=True)
+            raise
+        res = normalize_adapter_output(raw)
+        if permit is not None:
+            permit.finish(None if res.ok else res.error.code)
 
-    if not res.ok:
-        audit.emit(make_event(execution_id, "execute.end", {"status": "failed"}))
-        return _error_ack(ack, res.error.code, res.error.message)
+        if not res.ok:
+            return _fail(ack, audit, res.error.code, res.error.message)
+        if match is not None:
+            _record_state(match.device.device_id, desired, res.data)
+
+    if context is not None and match is not None:
+        device = match.device
+        context.remember(
+            {
+                "device_id": device.device_id,
+                "zone": device.zone,
+                "capability": req.capability or _sole(caps.required_capabilities),
+            },
+            intent,
+            req.meta.get("user_id") if req.meta is not None else None,
+        )
 
     audit.emit(make_event(execution_id, "execute.end", {"status": "ok"}))
     return _success_ack(ack, res.data or {})
 
 
+def execute_and_record(payload: dict, tenant: str | None = None) -> dict:
+    """
+    execute_intent plus gateway metrics, for intents the gateway originates
+    itself (scheduled intents, rule actions), optionally for `tenant`.
+    """
+    ack = execute_intent(payload, tenant=tenant)
+    active_metrics().record_ack(ack)
+    return ack
+
+
 def pretty_json(data: Any) -> str:
     return json.dumps(data, indent=2, ensure_ascii=False, sort_keys=False)
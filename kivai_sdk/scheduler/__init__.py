@@ -0,0 +1,23 @@
+from .service import (
+    Scheduler,
+    active_scheduler,
+    configure_scheduler,
+    new_schedule_id,
+    parse_execute_at,
+    set_scheduler,
+)
+from .store import MemoryScheduleStore, ScheduledIntent, SQLiteScheduleStore
+from .wheel import HierarchicalTimingWheel
+
+__all__ = [
+    "Scheduler",
+    "active_scheduler",
+    "configure_scheduler",
+    "new_schedule_id",
+    "parse_execute_at",
+    "set_scheduler",
+    "MemoryScheduleStore",
+    "ScheduledIntent",
+    "SQLiteScheduleStore",
+    "HierarchicalTimingWheel",
+]
@@ -0,0 +1,314 @@
+"""
+Deferred intent execution (v0.23)
+
+`Scheduler.schedule(payload, execute_at=..., delay=...)` files an intent to
+run later. A timer thread advances a hierarchical timing wheel and hands due
+intents to a small thread pool, so a slow adapter never holds up the next
+deadline. Every fired intent is executed through the normal runtime and its
+ACK gains a `schedule` block reporting how late it actually started:
+
+    "schedule": {"schedule_id": ..., "execute_at": ..., "fired_at": ...,
+                 "late_ms": 3.1}
+
+Entries are removed from the store once their intent has run, so an intent
+interrupted by a crash runs again after restart (at-least-once). Intents
+whose time passed while the gateway was down fire as soon as it starts.
+"""
+
+from __future__ import annotations
+
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Tuple, Union
+
+from .store import MemoryScheduleStore, ScheduledIntent, SQLiteScheduleStore, iso_utc
+from .wheel import HierarchicalTimingWheel
+
+ScheduleStore = Union[MemoryScheduleStore, SQLiteScheduleStore]
+
+
+def new_schedule_id() -> str:
+    return "sch-" + secrets.token_hex(8)
+
+
+def parse_execute_at(value: Any) -> float:
+    """
+    ISO 8601 timestamp (naive means UTC) or Unix seconds -> Unix seconds.
+    """
+    if isinstance(value, bool):
+        raise ValueError("execute_at must be an ISO 8601 string or Unix seconds")
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            dt = datetime.fromisoformat(value)
+        except ValueError as exc:
+            raise ValueError(f"Invalid execute_at: {value!r}") from exc
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    raise ValueError("execute_at must be an ISO 8601 string or Unix seconds")
+
+
+def _execute_and_record(payload: dict) -> dict:
+    from kivai_sdk.runtime import execute_and_record  # deferred: runtime is heavy
+
+    return execute_and_record(payload)
+
+
+def _percentile(ordered: list, q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Scheduler:
+    """
+    Timing wheel + store + firing pool.
+
+    `workers=0` fires synchronously inside `run_due()` (no threads), which
+    together with an injected `clock` makes the scheduler deterministic for
+    tests. `start()` runs the timer thread and the pool.
+    """
+
+    def __init__(
+        self,
+        store: Optional[ScheduleStore] = None,
+        tick: float = 0.01,
+        workers: int = 4,
+        clock: Callable[[], float] = time.time,
+        execute: Callable[[dict], dict] = _execute_and_record,
+        keep_results: int = 1024,
+    ) -> None:
+        self.store = store if store is not None else MemoryScheduleStore()
+        self.workers = workers
+        self._clock = clock
+        self._execute = execute
+        self._cond = threading.Condition()
+        self._wheel = HierarchicalTimingWheel(tick, now=clock())
+        for schedule_id, execute_at in self.store.iter_schedule():
+            self._wheel.schedule(schedule_id, execute_at)
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._keep_results = keep_results
+        self._late_ms: Deque[float] = deque(maxlen=4096)
+        self._counts = {"scheduled": 0, "fired": 0, "cancelled": 0, "errors": 0}
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._stopping = False
+
+    # -- scheduling -------------------------------------------------------
+
+    def _resolve_time(
+        self, execute_at: Optional[float], delay: Optional[float]
+    ) -> float:
+        if (execute_at is None) == (delay is None):
+            raise ValueError("Give exactly one of execute_at or delay")
+        if delay is not None:
+            if delay < 0:
+                raise ValueError("delay must be >= 0")
+            return self._clock() + delay
+        return float(execute_at)  # type: ignore[arg-type]
+
+    def schedule(
+        self,
+        payload: dict,
+        execute_at: Optional[float] = None,
+        delay: Optional[float] = None,
+        schedule_id: Optional[str] = None,
+    ) -> ScheduledIntent:
+        """
+        File `payload` to run at `execute_at` (Unix seconds) or after `delay`
+        seconds. The payload is validated when it fires, not here.
+        """
+        at = self._resolve_time(execute_at, delay)
+        entry = ScheduledIntent(
+            schedule_id or new_schedule_id(), at, payload, self._clock()
+        )
+        self.schedule_many((entry,))
+        return entry
+
+    def schedule_many(self, entries: Iterable[ScheduledIntent]) -> int:
+        """
+        Bulk path: one store transaction for all entries.
+        """
+        entries = list(entries)
+        horizon = self._clock() + self._wheel.horizon
+        if any(e.execute_at > horizon for e in entries):
+            raise ValueError("execute_at is beyond the scheduler horizon")
+        self.store.add_many(entries)
+        with self._cond:
+            for entry in entries:
+                self._wheel.schedule(entry.schedule_id, entry.execute_at)
+            self._counts["scheduled"] += len(entries)
+            self._cond.notify()
+        return len(entries)
+
+    def cancel(self, schedule_id: str) -> bool:
+        """
+        Cancel a pending intent. False if unknown or already firing.
+        """
+        with self._cond:
+            if not self._wheel.cancel(schedule_id):
+                return False
+            self._counts["cancelled"] += 1
+        self.store.delete(schedule_id)
+        return True
+
+    def get(self, schedule_id: str) -> Optional[Dict[str, Any]]:
+        """
+        A pending entry, or the outcome of a recently fired one.
+        """
+        with self._cond:
+            result = self._results.get(schedule_id)
+        if result is not None:
+            return result
+        entry = self.store.get(schedule_id)
+        return entry.describe() if entry is not None else None
+
+    def __len__(self) -> int:
+        return len(self._wheel)
+
+    # -- firing -----------------------------------------------------------
+
+    def _fire(self, schedule_id: str, execute_at: float) -> None:
+        fired_at = self._clock()
+        entry = self.store.get(schedule_id)
+        if entry is None:
+            return
+        late_ms = round(max(0.0, fired_at - execute_at) * 1000.0, 3)
+        timing = {
+            "schedule_id": schedule_id,
+            "execute_at": iso_utc(execute_at),
+            "fired_at": iso_utc(fired_at),
+            "late_ms": late_ms,
+        }
+        try:
+            ack = self._execute(entry.payload)
+            ack["schedule"] = timing
+            result = {**timing, "status": "fired", "ack": ack}
+            error = False
+        except Exception as exc:  # a broken adapter must not kill the timer
+            result = {**timing, "status": "error", "error": str(exc)}
+            error = True
+        self.store.delete(schedule_id)
+        with self._cond:
+            self._results[schedule_id] = result
+            while len(self._results) > self._keep_results:
+                self._results.popitem(last=False)
+            self._late_ms.append(late_ms)
+            self._counts["fired"] += 1
+            self._counts["errors"] += error
+
+    def _dispatch(self, due: Iterable[Tuple[str, float]]) -> None:
+        for schedule_id, execute_at in due:
+            if self._pool is not None:
+                self._pool.submit(self._fire, schedule_id, execute_at)
+            else:
+                self._fire(schedule_id, execute_at)
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """
+        Fire everything due by `now`. Returns the number dispatched.
+        """
+        with self._cond:
+            due = self._wheel.advance(self._clock() if now is None else now)
+        self._dispatch(due)
+        return len(due)
+
+    def _run(self) -> None:
+        with self._cond:
+            while not self._stopping:
+                due = self._wheel.advance(self._clock())
+                if due:
+                    self._dispatch(due)
+                wake = self._wheel.next_event()
+                timeout = None if wake is None else max(0.0, wake - self._clock())
+                self._cond.wait(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "Scheduler":
+        with self._cond:
+            if self.running:
+                return self
+            self._stopping = False
+            if self.workers > 0:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="kivai-scheduled"
+                )
+            self._thread = threading.Thread(
+                target=self._run, name="kivai-scheduler", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the timer and wait for intents already firing. Pending entries
+        stay in the store.
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+            thread, pool = self._thread, self._pool
+            self._thread = self._pool = None
+        if thread is not None:
+            thread.join()
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def close(self) -> None:
+        self.stop()
+        self.store.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            late = sorted(self._late_ms)
+            out: Dict[str, Any] = {
+                "running": self.running,
+                "pending": len(self._wheel),
+                **self._counts,
+            }
+        out["late_ms"] = (
+            {
+                "p50": _percentile(late, 0.50),
+                "p99": _percentile(late, 0.99),
+                "max": late[-1],
+            }
+            if late
+            else None
+        )
+        return out
+
+
+_ACTIVE_SCHEDULER: Optional[Scheduler] = None
+
+
+def active_scheduler() -> Scheduler:
+    global _ACTIVE_SCHEDULER
+    if _ACTIVE_SCHEDULER is None:
+        _ACTIVE_SCHEDULER = Scheduler()
+    return _ACTIVE_SCHEDULER
+
+
+def set_scheduler(scheduler: Scheduler | None) -> None:
+    """
+    Replace the runtime scheduler (None restores a fresh in-memory one).
+    The previous scheduler is not stopped.
+    """
+    global _ACTIVE_SCHEDULER
+    _ACTIVE_SCHEDULER = scheduler
+
+
+def configure_scheduler(path: str) -> Scheduler:
+    """
+    Persist scheduled intents in the SQLite file at `path` and start firing,
+    including intents that came due while the gateway was down.
+    """
+    scheduler = Scheduler(SQLiteScheduleStore(path))
+    set_scheduler(scheduler)
+    return scheduler.start()
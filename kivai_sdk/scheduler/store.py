@@ -0,0 +1,161 @@
+"""
+Scheduled intent storage (v0.23)
+
+The scheduler keeps only (schedule_id, execute_at) in its timing wheel;
+payloads live in a store and are read back when an entry fires. The SQLite
+store makes pending intents survive restarts, and keeps millions of them
+off the Python heap. The memory store is the default for tests and demos.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scheduled_intents (
+    schedule_id TEXT PRIMARY KEY,
+    execute_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    payload TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def iso_utc(ts: float) -> str:
+    return (
+        datetime.fromtimestamp(ts, timezone.utc)
+        .isoformat(timespec="milliseconds")
+        .replace("+00:00", "Z")
+    )
+
+
+@dataclass(frozen=True)
+class ScheduledIntent:
+    schedule_id: str
+    execute_at: float  # Unix time
+    payload: Dict[str, Any] = field(repr=False)
+    created_at: float = 0.0
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "schedule_id": self.schedule_id,
+            "status": "pending",
+            "execute_at": iso_utc(self.execute_at),
+            "created_at": iso_utc(self.created_at),
+            "intent_id": self.payload.get("intent_id"),
+            "intent": self.payload.get("intent"),
+        }
+
+
+class MemoryScheduleStore:
+    """
+    Non-durable store: pending intents are lost when the process exits.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, ScheduledIntent] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add_many(self, entries: Iterable[ScheduledIntent]) -> int:
+        entries = list(entries)
+        for entry in entries:
+            if entry.schedule_id in self._entries:
+                raise ValueError(f"Duplicate schedule_id: {entry.schedule_id}")
+        for entry in entries:
+            self._entries[entry.schedule_id] = entry
+        return len(entries)
+
+    def get(self, schedule_id: str) -> Optional[ScheduledIntent]:
+        return self._entries.get(schedule_id)
+
+    def delete(self, schedule_id: str) -> bool:
+        return self._entries.pop(schedule_id, None) is not None
+
+    def iter_schedule(self) -> Iterator[Tuple[str, float]]:
+        for entry in list(self._entries.values()):
+            yield entry.schedule_id, entry.execute_at
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteScheduleStore:
+    """
+    Durable store. One transaction per `add_many` call; the connection is
+    shared across threads behind a lock.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM scheduled_intents"
+            ).fetchone()[0]
+
+    def add_many(self, entries: Iterable[ScheduledIntent]) -> int:
+        rows = [
+            (
+                e.schedule_id,
+                e.execute_at,
+                e.created_at,
+                json.dumps(e.payload, separators=(",", ":")),
+            )
+            for e in entries
+        ]
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT INTO scheduled_intents "
+                    "(schedule_id, execute_at, created_at, payload) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.IntegrityError as exc:
+            raise ValueError(f"Duplicate schedule_id: {exc}") from exc
+        return len(rows)
+
+    def get(self, schedule_id: str) -> Optional[ScheduledIntent]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT execute_at, created_at, payload FROM scheduled_intents "
+                "WHERE schedule_id = ?",
+                (schedule_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return ScheduledIntent(schedule_id, row[0], json.loads(row[2]), row[1])
+
+    def delete(self, schedule_id: str) -> bool:
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "DELETE FROM scheduled_intents WHERE schedule_id = ?", (schedule_id,)
+            )
+            return cur.rowcount > 0
+
+    def iter_schedule(self) -> Iterator[Tuple[str, float]]:
+        """
+        (schedule_id, execute_at) of every pending intent, without payloads.
+        """
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT schedule_id, execute_at FROM scheduled_intents"
+            )
+            while rows := cur.fetchmany(10000):
+                yield from rows
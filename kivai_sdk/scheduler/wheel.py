@@ -0,0 +1,181 @@
+"""
+Hierarchical timing wheel (v0.23)
+
+`levels` wheels of 2**slot_bits slots each. Level 0 slots are one `tick`
+wide; each level up is 2**slot_bits times coarser. An entry is filed on the
+lowest level whose span covers its distance from now, in the slot given by
+its absolute due tick, so insert and cancel are O(1) dict operations. When a
+lower wheel wraps, the matching slot one level up is cascaded: its entries
+move down to finer slots. With the defaults (10 ms ticks, 8 bits, 5 levels)
+the horizon is about 348 years.
+
+Idle stretches are skipped: while level 0 is empty the cursor jumps straight
+to the next cascade of the lowest non-empty level, so advancing across hours
+with nothing due costs a handful of steps.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+
+class HierarchicalTimingWheel:
+    """
+    Deadlines (seconds, any epoch) keyed by string. Not thread-safe.
+
+    Each pending entry costs one dict slot in its wheel slot plus one in the
+    key index; no per-entry objects beyond the key and its deadline.
+    """
+
+    def __init__(
+        self,
+        tick: float = 0.01,
+        slot_bits: int = 8,
+        levels: int = 5,
+        now: float = 0.0,
+    ) -> None:
+        if tick <= 0 or slot_bits < 1 or levels < 1:
+            raise ValueError(
+                "HierarchicalTimingWheel requires tick > 0, bits/levels >= 1"
+            )
+        self.tick = tick
+        self.levels = levels
+        self._bits = slot_bits
+        self._mask = (1 << slot_bits) - 1
+        self._wheels: List[List[Dict[str, float]]] = [
+            [{} for _ in range(1 << slot_bits)] for _ in range(levels)
+        ]
+        self._level_of: Dict[int, int] = {
+            id(slot): level
+            for level, wheel in enumerate(self._wheels)
+            for slot in wheel
+        }
+        self._counts = [0] * levels
+        self._ready: Dict[str, float] = {}  # due at or before the cursor
+        self._where: Dict[str, Dict[str, float]] = {}
+        self._now = int(now / tick)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._where
+
+    @property
+    def horizon(self) -> float:
+        """
+        Longest delay (seconds) the wheel accepts.
+        """
+        return ((1 << (self._bits * self.levels)) - 1) * self.tick
+
+    def _due_tick(self, deadline: float) -> int:
+        # Guard against 1.0 / 0.01 == 100.00000000000001 costing a whole tick.
+        return math.ceil(deadline / self.tick - 1e-9)
+
+    def _place(self, key: str, deadline: float, due: int) -> None:
+        delta = due - self._now
+        if delta <= 0:
+            slot = self._ready
+        else:
+            bits = self._bits
+            level = 0
+            while delta >> (bits * (level + 1)):
+                level += 1
+            if level >= self.levels:
+                raise ValueError(
+                    f"Deadline beyond the wheel horizon ({self.horizon:.0f}s)"
+                )
+            slot = self._wheels[level][(due >> (bits * level)) & self._mask]
+            self._counts[level] += 1
+        slot[key] = deadline
+        self._where[key] = slot
+
+    def schedule(self, key: str, deadline: float) -> None:
+        """
+        File `key` to expire at `deadline`, replacing any pending entry.
+        """
+        if key in self._where:
+            self.cancel(key)
+        self._place(key, deadline, self._due_tick(deadline))
+
+    def cancel(self, key: str) -> bool:
+        slot = self._where.pop(key, None)
+        if slot is None:
+            return False
+        del slot[key]
+        level = self._level_of.get(id(slot))
+        if level is not None:
+            self._counts[level] -= 1
+        return True
+
+    def _cascade(self, level: int, index: int) -> None:
+        slot = self._wheels[level][index]
+        if not slot:
+            return
+        entries = list(slot.items())
+        slot.clear()
+        self._counts[level] -= len(entries)
+        for key, deadline in entries:
+            self._place(key, deadline, self._due_tick(deadline))
+
+    def advance(self, now: float) -> List[Tuple[str, float]]:
+        """
+        Move the cursor to `now`; return (key, deadline) for every entry whose
+        deadline has passed, earliest first.
+        """
+        target = int(now / self.tick)
+        bits, mask, counts = self._bits, self._mask, self._counts
+        expired: List[Tuple[str, float]] = []
+        while self._now < target:
+            if not counts[0]:
+                level = next((i for i in range(1, self.levels) if counts[i]), None)
+                if level is None:
+                    self._now = target
+                    break
+                # Nothing can expire before the next cascade of `level`.
+                boundary = ((self._now >> (bits * level)) + 1) << (bits * level)
+                if boundary > target:
+                    self._now = target
+                    break
+                self._now = boundary - 1
+            t = self._now = self._now + 1
+            for level in range(self.levels - 1, 0, -1):
+                if not t & ((1 << (bits * level)) - 1):
+                    self._cascade(level, (t >> (bits * level)) & mask)
+            slot = self._wheels[0][t & mask]
+            if slot:
+                counts[0] -= len(slot)
+                expired.extend(slot.items())
+                slot.clear()
+        if self._ready:
+            expired.extend(self._ready.items())
+            self._ready.clear()
+        if not expired:
+            return expired
+        where = self._where
+        for key, _ in expired:
+            del where[key]
+        expired.sort(key=lambda entry: entry[1])
+        return expired
+
+    def next_event(self) -> Optional[float]:
+        """
+        Earliest time at which `advance` may return something, or None when
+        the wheel is empty. Exact for level 0; a cascade time otherwise.
+        """
+        if self._ready:
+            return self._now * self.tick
+        bits, mask = self._bits, self._mask
+        candidates = []
+        if self._counts[0]:
+            step = 1
+            while not self._wheels[0][(self._now + step) & mask]:
+                step += 1
+            candidates.append(self._now + step)
+        for level in range(1, self.levels):
+            if self._counts[level]:
+                # A cascade may move an entry into a level 0 slot before that.
+                candidates.append(((self._now >> (bits * level)) + 1) << (bits * level))
+                break
+        return min(candidates) * self.tick if candidates else None
@@ -0,0 +1,35 @@
+"""
+Execution scope (v0.33)
+
+The tenant an execution runs for, held in a ContextVar so that the
+process-wide accessors (`active_device_registry`, `active_adapter_registry`,
+`active_device_shadow`, `active_context_store` and the policy lookup) can
+return that tenant's state without threading it through every call.
+
+This module imports nothing from the SDK, so every one of those modules can
+depend on it. Tenants themselves live in kivai_sdk/tenants.py.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+_TENANT: ContextVar[Optional[Any]] = ContextVar("kivai_tenant", default=None)
+
+
+def current_tenant() -> Optional[Any]:
+    """
+    The Tenant bound to this execution, or None outside any tenant.
+    """
+    return _TENANT.get()
+
+
+@contextmanager
+def use_tenant(tenant: Optional[Any]) -> Iterator[None]:
+    token = _TENANT.set(tenant)
+    try:
+        yield
+    finally:
+        _TENANT.reset(token)
@@ -2,8 +2,22 @@ from .policy import (
     evaluate_authorization as evaluate_authorization,
     required_role_for_intent as required_role_for_intent,
 )
+from .policy_store import (
+    CompiledPolicy as CompiledPolicy,
+    PolicyStore as PolicyStore,
+    compile_policy as compile_policy,
+    configure_policy as configure_policy,
+    default_policy_store as default_policy_store,
+    load_policy as load_policy,
+)
 
 __all__ = [
     "evaluate_authorization",
     "required_role_for_intent",
+    "CompiledPolicy",
+    "PolicyStore",
+    "compile_policy",
+    "configure_policy",
+    "default_policy_store",
+    "load_policy",
 ]
@@ -1,58 +1,78 @@
 """
-Policy Engine (v0.6)
+Policy Engine (v0.11)
 
 Responsible for:
 - Determining if an intent requires authorization
-- Validating auth proof presence and role alignment
+- Validating auth proof presence and role alignment (hierarchical roles)
 - Returning deterministic decision
 
 Does NOT:
 - Validate schema
 - Execute adapters
 - Perform routing
+
+The intent → role mapping is data-driven (security/policy.json by default) and
+compiled into bitmask tables; see security/policy_store.py.
 """
 
 from typing import Optional, Tuple
 
+from kivai_sdk.request import IntentRequest
+from kivai_sdk.scope import current_tenant
+from kivai_sdk.security.policy_store import PolicyStore, default_policy_store
 from kivai_sdk.security.roles import Role
 
 
-# Baseline intent → required role mapping
-_INTENT_ROLE_POLICY: dict[str, Role] = {
-    "unlock_door": "owner",
-    # extend here in future versions
-}
+def _policy_store() -> PolicyStore:
+    # v0.33: a tenant with its own policy.json is authorized against it.
+    tenant = current_tenant()
+    if tenant is not None and tenant.policy is not None:
+        return tenant.policy
+    return default_policy_store()
 
 
 def required_role_for_intent(intent: str) -> Optional[Role]:
-    return _INTENT_ROLE_POLICY.get(intent)
+    return _policy_store().current().required_role(intent)
 
 
-def evaluate_authorization(payload: dict) -> Tuple[bool, Optional[str]]:
+def evaluate_authorization(
+    payload: "dict | IntentRequest", required_role: Optional[str] = None
+) -> Tuple[bool, Optional[str]]:
     """
     Returns:
         (authorized: bool, error_code: Optional[str])
+
+    `required_role` is an adapter baseline enforced in addition to the intent
+    policy. Dict payloads may still carry it as `_auth_required_role`.
     """
-    intent = payload.get("intent")
-    required_role = required_role_for_intent(intent)
+    if not isinstance(payload, IntentRequest):
+        required_role = required_role or payload.get("_auth_required_role")
+        payload = IntentRequest.from_payload(payload)
+
+    policy = _policy_store().current()
+    required = policy.required_mask(payload.intent)
+    baseline = policy.role_mask(required_role) if required_role else 0
 
     # If no role required → always allowed
-    if required_role is None:
+    if not required and not baseline:
         return True, None
 
-    auth = payload.get("auth")
+    auth = payload.auth
 
-    if not isinstance(auth, dict):
+    if auth is None:
         return False, "AUTH_REQUIRED"
 
     token = auth.get("token")
-    role = auth.get("required_role")
 
     if not isinstance(token, str) or not token.strip():
         return False, "AUTH_REQUIRED"
 
-    if role != required_role:
+    granted = policy.granted_mask(auth.get("required_role"))
+
+    if required and not granted & required:
+        return False, "AUTH_FORBIDDEN"
+    if baseline and not granted & baseline:
         return False, "AUTH_FORBIDDEN"
 
-    # v0.6 baseline does not verify token cryptographically yet
+    # Baseline does not verify token cryptographically yet
     return True, None
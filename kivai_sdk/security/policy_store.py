@@ -0,0 +1,231 @@
+"""
+Data-driven role policy (v0.11)
+
+Responsible for:
+- Loading the intent → role policy from a JSON file
+- Compiling role inheritance into bitmask tables at load time
+- Reloading atomically when the file changes (request path never blocks)
+
+Policy file shape:
+
+    {
+      "version": 1,
+      "roles": {"owner": {"inherits": ["admin"]}, "admin": {"inherits": []}},
+      "intents": {"unlock_door": "owner", "set_alarm": ["admin", "service"]}
+    }
+
+An intent may list several roles (any-of). A role satisfies a requirement if it
+is that role or inherits it, directly or transitively.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+
+def default_policy_path() -> str:
+    return os.path.join(os.path.dirname(__file__), "policy.json")
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    """
+    Immutable bitmask form of a policy document.
+
+    - role_bits: role -> its own bit
+    - granted: role -> mask of every role it satisfies (itself + inherited)
+    - required: intent -> mask of roles accepted for the intent
+    - intent_roles: intent -> declared role names (first one is canonical)
+    """
+
+    role_bits: Mapping[str, int]
+    granted: Mapping[str, int]
+    required: Mapping[str, int]
+    intent_roles: Mapping[str, tuple[str, ...]]
+
+    @property
+    def unknown_role_mask(self) -> int:
+        # A bit no role is ever granted: unknown requirements can never be met.
+        return 1 << len(self.role_bits)
+
+    def required_mask(self, intent: Any) -> int:
+        if not isinstance(intent, str):
+            return 0
+        return self.required.get(intent, 0)
+
+    def role_mask(self, role: Any) -> int:
+        if not isinstance(role, str):
+            return self.unknown_role_mask
+        return self.role_bits.get(role, self.unknown_role_mask)
+
+    def granted_mask(self, role: Any) -> int:
+        if not isinstance(role, str):
+            return 0
+        return self.granted.get(role, 0)
+
+    def required_role(self, intent: Any) -> Optional[str]:
+        if not isinstance(intent, str):
+            return None
+        roles = self.intent_roles.get(intent)
+        return roles[0] if roles else None
+
+
+def compile_policy(doc: Any) -> CompiledPolicy:
+    """
+    Compile a policy document. Raises ValueError on malformed input,
+    unknown role references and inheritance cycles.
+    """
+    if not isinstance(doc, dict):
+        raise ValueError("Policy document must be a JSON object")
+
+    roles = doc.get("roles")
+    if not isinstance(roles, dict) or not roles:
+        raise ValueError("Policy 'roles' must be a non-empty object")
+
+    parents: dict[str, tuple[str, ...]] = {}
+    for name, spec in roles.items():
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("Policy role names must be non-empty strings")
+        inherits = spec.get("inherits", []) if isinstance(spec, dict) else None
+        if not isinstance(inherits, list) or not all(
+            isinstance(r, str) for r in inherits
+        ):
+            raise ValueError(f"Policy role '{name}' must declare 'inherits' as a list")
+        for r in inherits:
+            if r not in roles:
+                raise ValueError(f"Policy role '{name}' inherits unknown role '{r}'")
+        parents[name] = tuple(inherits)
+
+    role_bits = {name: 1 << i for i, name in enumerate(parents)}
+
+    granted: dict[str, int] = {}
+
+    def resolve(name: str, visiting: tuple[str, ...]) -> int:
+        if name in granted:
+            return granted[name]
+        if name in visiting:
+            raise ValueError(f"Policy role inheritance cycle at '{name}'")
+        mask = role_bits[name]
+        for parent in parents[name]:
+            mask |= resolve(parent, visiting + (name,))
+        granted[name] = mask
+        return mask
+
+    for name in parents:
+        resolve(name, ())
+
+    intents = doc.get("intents", {})
+    if not isinstance(intents, dict):
+        raise ValueError("Policy 'intents' must be an object")
+
+    required: dict[str, int] = {}
+    intent_roles: dict[str, tuple[str, ...]] = {}
+    for intent, spec in intents.items():
+        names = (spec,) if isinstance(spec, str) else spec
+        if not isinstance(names, (list, tuple)) or not names:
+            raise ValueError(f"Policy intent '{intent}' must name at least one role")
+        mask = 0
+        for r in names:
+            if r not in role_bits:
+                raise ValueError(
+                    f"Policy intent '{intent}' requires unknown role '{r}'"
+                )
+            mask |= role_bits[r]
+        required[intent] = mask
+        intent_roles[intent] = tuple(names)
+
+    return CompiledPolicy(
+        role_bits=role_bits,
+        granted=granted,
+        required=required,
+        intent_roles=intent_roles,
+    )
+
+
+def load_policy(path: str) -> CompiledPolicy:
+    with open(path, "r", encoding="utf-8") as file:
+        return compile_policy(json.load(file))
+
+
+def _file_stamp(path: str) -> tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class PolicyStore:
+    """
+    Holds the active CompiledPolicy and swaps it when the file changes.
+
+    The request path only reads a reference. At most once per `check_interval`
+    one caller stats the file; if it changed, the new policy is compiled off to
+    the side and published with a single assignment. Concurrent callers never
+    wait on that work: they keep reading the previous policy.
+
+    A file that fails to load keeps the last good policy active (`last_error`).
+    """
+
+    def __init__(self, path: str, check_interval: float = 1.0) -> None:
+        self.path = path
+        self.check_interval = check_interval
+        self.last_error: Optional[str] = None
+        self._reload_lock = threading.Lock()
+        self._stamp = _file_stamp(path)
+        self._policy = load_policy(path)
+        self._next_check = time.monotonic() + check_interval
+
+    def current(self) -> CompiledPolicy:
+        if time.monotonic() >= self._next_check and self._reload_lock.acquire(
+            blocking=False
+        ):
+            try:
+                self._next_check = time.monotonic() + self.check_interval
+                self._reload_if_changed()
+            finally:
+                self._reload_lock.release()
+        return self._policy
+
+    def reload(self) -> bool:
+        """
+        Force a check now. Returns True if a new policy was published.
+        """
+        with self._reload_lock:
+            return self._reload_if_changed()
+
+    def _reload_if_changed(self) -> bool:
+        try:
+            stamp = _file_stamp(self.path)
+            if stamp == self._stamp:
+                return False
+            policy = load_policy(self.path)
+        except (OSError, ValueError) as e:
+            self.last_error = str(e)
+            return False
+
+        self._policy = policy
+        self._stamp = stamp
+        self.last_error = None
+        return True
+
+
+_DEFAULT_STORE: Optional[PolicyStore] = None
+
+
+def default_policy_store() -> PolicyStore:
+    global _DEFAULT_STORE
+    if _DEFAULT_STORE is None:
+        _DEFAULT_STORE = PolicyStore(default_policy_path())
+    return _DEFAULT_STORE
+
+
+def configure_policy(path: str, check_interval: float = 1.0) -> PolicyStore:
+    """
+    Point the runtime at a policy file. Raises if the initial load fails.
+    """
+    global _DEFAULT_STORE
+    _DEFAULT_STORE = PolicyStore(path, check_interval=check_interval)
+    return _DEFAULT_STORE
@@ -15,7 +15,8 @@ Role = Literal[
     "service",
 ]
 
+# Role inheritance (owner ⊇ admin ⊇ user) lives in the policy file
+# (security/policy.json), compiled by security/policy_store.py (v0.11).
+#
 # Future:
-# - hierarchical roles
-# - role inheritance
 # - dynamic policy backends
@@ -0,0 +1,322 @@
+"""
+Framed Unix-socket gateway (v0.18)
+
+A second gateway listener for producers on the same hub. It skips HTTP: each
+request is one length-prefixed frame holding an intent payload, and each
+response is one frame holding its ACK. It runs the same `execute_intent` as
+the HTTP gateway, in the same process when started with `kivai serve --uds`.
+
+Frame layout:
+
+    u8  codec   b"m" msgpack | b"j" JSON (UTF-8)
+    u32 length  body size in bytes, big-endian
+    ...         body
+
+msgpack is used when installed (`pip install kivai_sdk[msgpack]`); JSON always
+works. The server answers in the codec of the request.
+
+Requests are pipelined: a client may send many frames without waiting, and
+the server executes them concurrently and answers in completion order.
+Responses are matched to requests by `intent_id`, so every request must
+carry a string intent_id of at least 8 characters. A frame that cannot be
+decoded, or lacks a usable intent_id, is answered with a failed ACK whose
+intent_id is null.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from kivai_sdk.ids import new_id
+
+try:
+    import msgpack  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    msgpack = None
+
+CODEC_MSGPACK = b"m"
+CODEC_JSON = b"j"
+
+_HEADER = struct.Struct(">cI")
+MAX_FRAME_BYTES = 1 << 20
+
+
+def default_codec() -> bytes:
+    return CODEC_MSGPACK if msgpack is not None else CODEC_JSON
+
+
+def encode_body(codec: bytes, obj: Any) -> bytes:
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack codec requested but msgpack is not installed")
+        return msgpack.packb(obj, use_bin_type=True)
+    if codec == CODEC_JSON:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+    raise ValueError(f"Unknown codec: {codec!r}")
+
+
+def decode_body(codec: bytes, body: bytes) -> Any:
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack codec requested but msgpack is not installed")
+        return msgpack.unpackb(body, raw=False)
+    if codec == CODEC_JSON:
+        return json.loads(body)
+    raise ValueError(f"Unknown codec: {codec!r}")
+
+
+def encode_frame(codec: bytes, obj: Any) -> bytes:
+    body = encode_body(codec, obj)
+    return _HEADER.pack(codec, len(body)) + body
+
+
+def frame_error(code: str, message: str, intent_id: Optional[str] = None) -> dict:
+    """
+    Failed ACK for a message that never reached the runtime.
+    """
+    return {
+        "intent_id": intent_id,
+        "status": "failed",
+        "error": {"code": code, "message": message},
+    }
+
+
+def execute_correlated(payload: Any, tenant: Optional[str] = None) -> dict:
+    """
+    execute_intent for pipelined transports: the payload must carry its own
+    intent_id, since the runtime would otherwise assign one the client cannot
+    match. `tenant` is the connection's tenant (v0.33). In a cluster, intents
+    owned by another node are forwarded to it (v0.34).
+    """
+    from kivai_sdk.cluster import active_cluster
+    from kivai_sdk.metrics import active_metrics
+    from kivai_sdk.runtime import execute_intent
+
+    intent_id = payload.get("intent_id") if isinstance(payload, dict) else None
+    if not isinstance(intent_id, str) or len(intent_id) < 8:
+        return frame_error(
+            "INTENT_ID_REQUIRED",
+            "Pipelined requests need a string intent_id (8+ chars) to match responses",
+        )
+    cluster = active_cluster()
+    if cluster is not None:
+        forwarded = cluster.route(payload, tenant)
+        if forwarded is not None:
+            active_metrics().incr("intents_forwarded")
+            return forwarded
+    ack = execute_intent(payload, tenant=tenant)
+    active_metrics().record_ack(ack)
+    return ack
+
+
+def _serve_frame(codec: bytes, body: bytes) -> bytes:
+    """
+    Decode, execute and encode one request (runs on a worker thread). Every
+    request gets a reply frame, so a pipelined client never waits on an ACK
+    that was lost to an exception.
+    """
+    reply_codec = codec if codec in (CODEC_MSGPACK, CODEC_JSON) else CODEC_JSON
+    try:
+        payload = decode_body(codec, body)
+    except Exception as exc:
+        return encode_frame(
+            CODEC_JSON, frame_error("FRAME_INVALID", f"Undecodable frame: {exc}")
+        )
+    try:
+        return encode_frame(reply_codec, execute_correlated(payload))
+    except Exception as exc:
+        intent_id = payload.get("intent_id") if isinstance(payload, dict) else None
+        return encode_frame(
+            CODEC_JSON,
+            frame_error(
+                "INTERNAL_ERROR",
+                f"{type(exc).__name__}: {exc}",
+                intent_id if isinstance(intent_id, str) else None,
+            ),
+        )
+
+
+async def _handle_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    executor: ThreadPoolExecutor,
+    max_in_flight: int,
+) -> None:
+    loop = asyncio.get_running_loop()
+    in_flight = asyncio.Semaphore(max_in_flight)
+    tasks: set = set()
+
+    async def run(codec: bytes, body: bytes) -> None:
+        try:
+            frame = await loop.run_in_executor(executor, _serve_frame, codec, body)
+            try:
+                writer.write(frame)
+                await writer.drain()
+            except (ConnectionError, RuntimeError):
+                pass  # client went away
+        finally:
+            in_flight.release()
+
+    try:
+        while True:
+            codec, length = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+            if length > MAX_FRAME_BYTES:
+                writer.write(
+                    encode_frame(
+                        CODEC_JSON,
+                        frame_error(
+                            "FRAME_TOO_LARGE", f"Frame exceeds {MAX_FRAME_BYTES} bytes"
+                        ),
+                    )
+                )
+                break  # cannot resynchronize without reading the body
+            body = await reader.readexactly(length)
+            await in_flight.acquire()  # backpressure: stop reading when saturated
+            task = loop.create_task(run(codec, body))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        writer.close()
+
+
+async def start_socket_gateway(
+    path: str, max_in_flight: int = 256, workers: int = 16
+) -> asyncio.AbstractServer:
+    """
+    Start listening on `path` in the running event loop. Each connection may
+    have up to `max_in_flight` requests executing; `workers` threads run the
+    runtime (shared by all connections). A stale socket file is replaced.
+    """
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(path)
+        else:
+            raise RuntimeError(f"Something is already listening on {path}")
+        finally:
+            probe.close()
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kivai-uds")
+
+    async def on_connect(r: asyncio.StreamReader, w: asyncio.StreamWriter) -> None:
+        await _handle_connection(r, w, executor, max_in_flight)
+
+    server = await asyncio.start_unix_server(on_connect, path=path)
+    os.chmod(path, 0o600)
+    return server
+
+
+def serve_socket_gateway(path: str, **kwargs: Any) -> None:
+    """
+    Run only the socket listener, in the foreground.
+    """
+
+    async def main() -> None:
+        server = await start_socket_gateway(path, **kwargs)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+class FramedClient:
+    """
+    Blocking client for the socket gateway.
+
+    `send` and `recv` can be interleaved freely for pipelining; `execute_many`
+    keeps up to `window` requests in flight and matches ACKs by intent_id.
+    """
+
+    def __init__(
+        self, path: str, codec: Optional[bytes] = None, timeout: float = 30.0
+    ) -> None:
+        self.codec = codec or default_codec()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(path)
+        self._reader = self._sock.makefile("rb")
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self) -> "FramedClient":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def send(self, payload: dict) -> str:
+        """
+        Queue one intent (an intent_id is assigned if missing). Returns it.
+        """
+        return self.send_many((payload,))[0]
+
+    def send_many(self, payloads: Iterable[dict]) -> List[str]:
+        ids = []
+        frames = []
+        for payload in payloads:
+            intent_id = payload.get("intent_id")
+            if not isinstance(intent_id, str) or len(intent_id) < 8:
+                intent_id = payload["intent_id"] = new_id()
+            ids.append(intent_id)
+            frames.append(encode_frame(self.codec, payload))
+        self._sock.sendall(b"".join(frames))
+        return ids
+
+    def recv(self) -> dict:
+        header = self._reader.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ConnectionError("Socket gateway closed the connection")
+        codec, length = _HEADER.unpack(header)
+        return decode_body(codec, self._reader.read(length))
+
+    def execute(self, payload: dict) -> dict:
+        self.send(payload)
+        return self.recv()
+
+    def execute_many(
+        self, payloads: Iterable[dict], window: int = 64
+    ) -> Dict[str, dict]:
+        """
+        Pipelined execution. Returns ACKs keyed by intent_id.
+        """
+        acks: Dict[str, dict] = {}
+        pending = 0
+        batch: List[dict] = []
+        for payload in payloads:
+            batch.append(payload)
+            if pending + len(batch) >= window:
+                pending += len(self.send_many(batch))
+                batch = []
+                while pending >= window:
+                    ack = self.recv()
+                    acks[ack.get("intent_id")] = ack
+                    pending -= 1
+        if batch:
+            pending += len(self.send_many(batch))
+        while pending:
+            ack = self.recv()
+            acks[ack.get("intent_id")] = ack
+            pending -= 1
+        return acks
@@ -0,0 +1,300 @@
+"""
+Multi-tenant runtime state (v0.33)
+
+One gateway can serve many homes or sites. With `kivai serve --tenants-dir
+DIR`, every execution that names a tenant (`meta.tenant_id`, the
+`X-Kivai-Tenant` header or `/v1/stream?tenant=`) runs against that
+tenant's own state:
+
+    DIR/<tenant_id>/devices.db     device registry (.db or .kvds; optional)
+    DIR/<tenant_id>/policy.json    role policy (optional; default: global)
+    DIR/<tenant_id>/tenant.json    {"intents": [...]} adapter allowlist
+                                   (optional; default: every adapter)
+
+A tenant is loaded on first use: its devices are read into an in-memory
+DeviceRegistry and the store is closed again, so idle tenants hold no file
+handles. It also gets its own device state shadow, follow-up context,
+heartbeat health tracker and device circuit breakers, so homes that reuse
+device ids (`thermostat-01`) never see each other's status. The device
+endpoints (heartbeats, health and state reports, rule events) and the
+context endpoint take the same `X-Kivai-Tenant` header.
+
+Loaded tenants are kept in LRU order; once their estimated size (devices,
+shadow, health and context, re-estimated on use) exceeds `memory_budget`
+bytes (or there are more than `max_tenants`), the least recently used are
+dropped and reload from disk when next addressed.
+
+Executions without a tenant use the process-wide state as before.
+Adapter circuit breakers stay process-wide: an adapter outage is not
+specific to one home.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from kivai_sdk.adapters.registry import process_adapter_registry
+from kivai_sdk.adapters.base import KivaiAdapter
+from kivai_sdk.context import ContextStore
+from kivai_sdk.devices import (
+    DeviceRegistry,
+    DeviceShadow,
+    HealthTracker,
+    open_device_store,
+)
+from kivai_sdk.security.policy_store import PolicyStore
+
+TENANT_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
+DEVICE_FILES = ("devices.db", "devices.sqlite", "devices.sqlite3", "devices.kvds")
+
+# Estimated resident size of a loaded tenant (benchmarks/bench_tenants.py
+# measures ~3.3 KiB when loaded, before its shadow and context fill), plus
+# each device with its zone and capability index entries (~720 B), each
+# device state shadow entry (~330 B with a small state) and each device the
+# health tracker has heard from (~180 B). Follow-up context is counted at
+# its own live estimate.
+TENANT_BYTES = 4 * 1024
+DEVICE_BYTES = 800
+SHADOW_ENTRY_BYTES = 384
+HEALTH_ENTRY_BYTES = 192
+TENANT_CONTEXT_BYTES = 64 * 1024
+# A tenant's few devices need far fewer timing wheel slots than a fleet.
+TENANT_HEALTH_SLOTS = 64
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+
+class TenantError(LookupError):
+    """
+    The execution names a tenant that cannot be used. `code` is the ACK
+    error code (TENANT_UNKNOWN or TENANT_MISMATCH).
+    """
+
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class TenantAdapters:
+    """
+    The process adapter registry restricted to a tenant's allowlist.
+    Adapters are shared, not loaded per tenant.
+    """
+
+    def __init__(self, intents: FrozenSet[str]) -> None:
+        self.intents = intents
+
+    def resolve(self, intent: str | None) -> KivaiAdapter | None:
+        if intent not in self.intents:
+            return None
+        return process_adapter_registry().resolve(intent)
+
+    def describe(self) -> List[Dict[str, Any]]:
+        return [
+            item
+            for item in process_adapter_registry().describe()
+            if item["intent"] in self.intents
+        ]
+
+
+@dataclass
+class Tenant:
+    tenant_id: str
+    devices: DeviceRegistry
+    policy: Optional[PolicyStore] = None
+    adapters: Optional[TenantAdapters] = None
+    shadow: DeviceShadow = field(default_factory=DeviceShadow)
+    context: ContextStore = field(
+        default_factory=lambda: ContextStore(max_bytes=TENANT_CONTEXT_BYTES)
+    )
+    health: HealthTracker = field(
+        default_factory=lambda: HealthTracker(n_slots=TENANT_HEALTH_SLOTS)
+    )
+
+    @property
+    def cost(self) -> int:
+        """
+        Estimated resident bytes, including state that grows with use.
+        """
+        return (
+            TENANT_BYTES
+            + len(self.devices) * DEVICE_BYTES
+            + len(self.shadow) * SHADOW_ENTRY_BYTES
+            + len(self.health) * HEALTH_ENTRY_BYTES
+            + self.context.bytes
+        )
+
+
+def load_tenant(root: str, tenant_id: str) -> Tenant:
+    """
+    Read a tenant from `root/<tenant_id>/`. Raises TenantError if there is
+    no such tenant.
+    """
+    if not TENANT_ID.match(tenant_id):
+        raise TenantError("TENANT_UNKNOWN", f"Invalid tenant id: {tenant_id!r}")
+    home = os.path.join(root, tenant_id)
+    if not os.path.isdir(home):
+        raise TenantError("TENANT_UNKNOWN", f"Unknown tenant: {tenant_id}")
+
+    devices = DeviceRegistry.empty()
+    for name in DEVICE_FILES:
+        path = os.path.join(home, name)
+        if os.path.exists(path):
+            store = open_device_store(path)
+            try:
+                devices = store.load_registry()
+            finally:
+                store.close()
+            break
+
+    policy_path = os.path.join(home, "policy.json")
+    policy = PolicyStore(policy_path) if os.path.exists(policy_path) else None
+
+    adapters = None
+    config_path = os.path.join(home, "tenant.json")
+    if os.path.exists(config_path):
+        with open(config_path, encoding="utf-8") as f:
+            config = json.load(f)
+        intents = config.get("intents")
+        if intents is not None:
+            adapters = TenantAdapters(frozenset(intents))
+
+    return Tenant(tenant_id, devices, policy, adapters)
+
+
+class TenantDirectory:
+    """
+    Lazily loaded tenants under `root`, LRU-evicted to `memory_budget`
+    estimated bytes and at most `max_tenants` loaded. A tenant's size is
+    re-estimated each time it is used, as its shadow, health and context
+    grow. Thread-safe; a tenant is loaded outside the lock, so a cold load
+    never blocks executions for warm tenants.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        max_tenants: Optional[int] = None,
+    ) -> None:
+        if memory_budget <= 0 or (max_tenants is not None and max_tenants <= 0):
+            raise ValueError("memory_budget and max_tenants must be positive")
+        self.root = root
+        self.memory_budget = memory_budget
+        self.max_tenants = max_tenants
+        self._lock = threading.Lock()
+        self._loaded: "OrderedDict[str, Tenant]" = OrderedDict()
+        self._costs: Dict[str, int] = {}
+        self._bytes = 0
+        self._counts = {"hits": 0, "loads": 0, "evictions": 0}
+
+    def get(self, tenant_id: str) -> Tenant:
+        with self._lock:
+            tenant = self._loaded.get(tenant_id)
+            if tenant is not None:
+                self._loaded.move_to_end(tenant_id)
+                self._counts["hits"] += 1
+                self._account(tenant)
+                self._evict()
+                return tenant
+
+        tenant = load_tenant(self.root, tenant_id)
+
+        with self._lock:
+            raced = self._loaded.get(tenant_id)
+            if raced is not None:
+                self._loaded.move_to_end(tenant_id)
+                return raced
+            self._loaded[tenant_id] = tenant
+            self._account(tenant)
+            self._counts["loads"] += 1
+            self._evict()
+        return tenant
+
+    def peek(self, tenant_id: str) -> Optional[Tenant]:
+        """
+        The tenant if it is loaded; never loads or reorders.
+        """
+        return self._loaded.get(tenant_id)
+
+    def _account(self, tenant: Tenant) -> None:
+        cost = tenant.cost
+        self._bytes += cost - self._costs.get(tenant.tenant_id, 0)
+        self._costs[tenant.tenant_id] = cost
+
+    def _evict(self) -> None:
+        # The newest tenant always stays, even if it alone exceeds the budget.
+        while len(self._loaded) > 1 and (
+            self._bytes > self.memory_budget
+            or (self.max_tenants is not None and len(self._loaded) > self.max_tenants)
+        ):
+            tenant_id, _ = self._loaded.popitem(last=False)
+            self._bytes -= self._costs.pop(tenant_id)
+            self._counts["evictions"] += 1
+
+    def evict(self, tenant_id: str) -> bool:
+        """
+        Drop a loaded tenant (e.g. after its files changed).
+        """
+        with self._lock:
+            if self._loaded.pop(tenant_id, None) is None:
+                return False
+            self._bytes -= self._costs.pop(tenant_id)
+            return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "loaded": len(self._loaded),
+                "bytes": self._bytes,
+                "memory_budget": self.memory_budget,
+                **self._counts,
+            }
+
+
+def tenant_of(payload: dict, connection: Optional[str] = None) -> Optional[str]:
+    """
+    The tenant an execution is for: the connection's (header, stream query)
+    or `meta.tenant_id`. Raises TenantError if both are given and differ.
+    """
+    meta = payload.get("meta")
+    named = meta.get("tenant_id") if isinstance(meta, dict) else None
+    if not isinstance(named, str) or not named:
+        return connection
+    if connection is not None and connection != named:
+        raise TenantError(
+            "TENANT_MISMATCH",
+            f"meta.tenant_id {named!r} does not match the connection's tenant",
+        )
+    return named
+
+
+_ACTIVE_TENANTS: Optional[TenantDirectory] = None
+
+
+def active_tenant_directory() -> Optional[TenantDirectory]:
+    """
+    The tenant directory, or None when the gateway is single-tenant.
+    """
+    return _ACTIVE_TENANTS
+
+
+def set_tenant_directory(directory: TenantDirectory | None) -> None:
+    global _ACTIVE_TENANTS
+    _ACTIVE_TENANTS = directory
+
+
+def configure_tenants(root: str, **kwargs: Any) -> TenantDirectory:
+    """
+    Serve tenants from directories under `root`.
+    """
+    if not os.path.isdir(root):
+        raise ValueError(f"Tenants directory not found: {root}")
+    directory = TenantDirectory(root, **kwargs)
+    set_tenant_directory(directory)
+    return directory
@@ -2,10 +2,9 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 from typing import Any
 
-from jsonschema import ValidationError, validate
-
 try:
     # Python 3.9+
     from importlib import resources as importlib_resources
@@ -58,6 +57,36 @@ def load_schema(schema_path: str | None = None) -> dict[str, Any]:
         return json.load(file)
 
 
+_VALIDATORS: dict[str | None, Any] = {}
+_VALIDATORS_LOCK = threading.Lock()
+
+
+def compiled_validator(schema_path: str | None = None) -> Any:
+    """
+    jsonschema validator for `schema_path`, built once per process (v0.17).
+
+    jsonschema is imported here rather than at module import, so CLI commands
+    that never validate do not pay for it. The schema itself is checked once,
+    when the validator is first built.
+    """
+    # Cached under None too, so the default schema path (an importlib
+    # resources lookup) is not resolved on every call (v0.31).
+    validator = _VALIDATORS.get(schema_path)
+    if validator is not None:
+        return validator
+
+    with _VALIDATORS_LOCK:
+        validator = _VALIDATORS.get(schema_path)
+        if validator is None:
+            from jsonschema.validators import validator_for
+
+            schema = load_schema(schema_path)
+            cls = validator_for(schema)
+            cls.check_schema(schema)
+            validator = _VALIDATORS[schema_path] = cls(schema)
+    return validator
+
+
 def validate_command(
     payload: dict[str, Any], schema_path: str | None = None
 ) -> tuple[bool, str]:
@@ -71,10 +100,14 @@ def validate_command(
     Legacy schemas can still be validated by passing schema_path explicitly.
     """
     try:
-        schema = load_schema(schema_path)
-        validate(instance=payload, schema=schema)
-        return True, "✅ Payload is valid!"
+        validator = compiled_validator(schema_path)
     except FileNotFoundError:
         return False, "❌ Validation failed: schema file not found"
-    except ValidationError as e:
-        return False, f"❌ Validation failed: {e.message}"
+
+    from jsonschema.exceptions import best_match
+
+    # Same error selection as jsonschema.validate().
+    error = best_match(validator.iter_errors(payload))
+    if error is not None:
+        return False, f"❌ Validation failed: {error.message}"
+    return True, "✅ Payload is valid!"
@@ -0,0 +1,272 @@
+"""
+Pre-forked gateway workers (v0.20)
+
+`kivai serve --workers N` loads everything once in a supervisor process
+(schema validator, adapter registry and adapters, policy, device registry,
+gateway app), binds the listening socket, then forks N workers that accept
+on it. Warm state is inherited copy-on-write; `gc.freeze()` before forking
+keeps the collector from touching those pages, so they stay shared.
+
+Per-worker state that must agree across workers goes through shared memory
+created before the fork:
+
+- metrics: kivai_sdk/metrics.py (one counter slot per worker)
+- registry changes: kivai_sdk/devices/feed.py (device upserts, deletes,
+  heartbeats and cluster membership received by one worker are replayed by
+  the others)
+
+With `--replicate-from URL` (v0.35) worker 0 pulls the other gateway's
+registry changes and publishes them to the feed like any local write.
+
+With `--tenants-dir` (v0.33) each worker loads tenants lazily on its own,
+within its own memory budget; tenant shadow updates are replayed only by
+workers that have that tenant loaded.
+
+The supervisor restarts workers that die and forwards SIGINT/SIGTERM to
+them for a graceful shutdown. POSIX only.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+# A worker that keeps dying this fast is not restarted (avoids a fork loop).
+MIN_WORKER_LIFETIME = 1.0
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    # An explicit proto lets asyncio enable TCP_NODELAY on accepted sockets.
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _prepare_shared_state(
+    workers: int,
+    feed_dir: str,
+    devices: Optional[str],
+    rules: Optional[str],
+    audit_dir: Optional[str] = None,
+    audit_format: str = "jsonl",
+    tenants_dir: Optional[str] = None,
+    tenant_options: Optional[Dict[str, Any]] = None,
+    cluster: Optional[Dict[str, Any]] = None,
+    replicate_from: Optional[str] = None,
+) -> None:
+    from kivai_sdk.daemon import warm_up
+    from kivai_sdk.devices import (
+        ChangeFeed,
+        SQLiteDeviceStore,
+        active_device_registry,
+        active_registry_log,
+        configure_devices,
+        set_change_feed,
+    )
+    from kivai_sdk.metrics import SharedMetrics, set_metrics
+
+    if devices:
+        configure_devices(devices)
+    if rules:
+        from kivai_sdk.rules import configure_rules
+
+        configure_rules(rules)
+    if audit_dir:
+        from kivai_sdk.audit import configure_audit
+
+        # Segments are opened lazily, so each worker writes its own files.
+        configure_audit(audit_dir, audit_format)
+    if tenants_dir:
+        from kivai_sdk.tenants import configure_tenants
+
+        # Nothing is loaded yet: each worker loads the tenants it serves.
+        configure_tenants(tenants_dir, **(tenant_options or {}))
+    if cluster:
+        from kivai_sdk.cluster import configure_cluster
+
+        # Each worker opens its own connections to the other nodes.
+        configure_cluster(**cluster)
+    if replicate_from:
+        from kivai_sdk.devices import configure_replica
+
+        # Started by worker 0 only; its writes reach the others via the feed.
+        configure_replica(replicate_from)
+    # Isolated adapter pools are started by each worker after the fork.
+    warm_up(start_isolated=False)
+    import kivai_sdk.gateway  # noqa: F401  (app and routes built once)
+
+    # SQLite connections must not cross fork(); workers reopen the file.
+    registry = active_device_registry()
+    if isinstance(registry, SQLiteDeviceStore):
+        registry.close()
+
+    # Created before forking: every worker logs the same changes in feed
+    # order under one epoch, so any of them can serve replication requests.
+    active_registry_log()
+    set_metrics(SharedMetrics(workers))
+    set_change_feed(ChangeFeed(os.path.join(feed_dir, "changes.jsonl")))
+
+
+def _run_worker(slot: int, sock: socket.socket, log_level: str) -> None:
+    """
+    Body of a forked worker. Never returns.
+    """
+    status = 1
+    try:
+        # uvicorn installs its own handlers while serving; until then (and
+        # after) the supervisor's signal is the only one that matters.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+        import asyncio
+
+        import uvicorn
+
+        from kivai_sdk.devices import (
+            SQLiteDeviceStore,
+            active_change_feed,
+            active_device_registry,
+            active_replica,
+            configure_devices,
+        )
+        from kivai_sdk.gateway import app
+        from kivai_sdk.metrics import active_metrics
+
+        active_metrics().bind(slot)
+        feed = active_change_feed()
+        if feed is not None:
+            feed.reopen()
+        registry = active_device_registry()
+        if isinstance(registry, SQLiteDeviceStore):
+            configure_devices(registry.path)
+        replica = active_replica()
+        if replica is not None and slot == 0:
+            replica.start()
+        from kivai_sdk.adapters import active_adapter_registry
+
+        active_adapter_registry().start_isolated()
+
+        server = uvicorn.Server(uvicorn.Config(app, log_level=log_level))
+        asyncio.run(server.serve(sockets=[sock]))
+        status = 0
+        from kivai_sdk.audit import active_audit_logger
+
+        # os._exit skips atexit: index this worker's last audit segment now.
+        active_audit_logger().close()
+    except BaseException:  # pragma: no cover - reported, then the worker exits
+        import traceback
+
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(status)
+
+
+def serve_workers(
+    host: str,
+    port: int,
+    workers: int,
+    devices: Optional[str] = None,
+    rules: Optional[str] = None,
+    log_level: str = "info",
+    audit_dir: Optional[str] = None,
+    audit_format: str = "jsonl",
+    tenants_dir: Optional[str] = None,
+    tenant_options: Optional[Dict[str, Any]] = None,
+    cluster: Optional[Dict[str, Any]] = None,
+    replicate_from: Optional[str] = None,
+) -> int:
+    """
+    Run the HTTP gateway in `workers` pre-forked processes until SIGINT or
+    SIGTERM. Returns the process exit code.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    if not hasattr(os, "fork"):
+        raise RuntimeError("--workers requires a POSIX platform (os.fork)")
+
+    feed_dir = tempfile.mkdtemp(prefix="kivai-workers-")
+    sock = _bind(host, port)
+    children: Dict[int, tuple[int, float]] = {}  # pid -> (slot, started)
+    stopping = False
+
+    def spawn(slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(slot, sock, log_level)
+        children[pid] = (slot, time.monotonic())
+
+    def stop(signum: int, frame: object) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    old_handlers = {
+        sig: signal.signal(sig, stop) for sig in (signal.SIGINT, signal.SIGTERM)
+    }
+    try:
+        _prepare_shared_state(
+            workers,
+            feed_dir,
+            devices,
+            rules,
+            audit_dir,
+            audit_format,
+            tenants_dir,
+            tenant_options,
+            cluster,
+            replicate_from,
+        )
+        gc.collect()
+        gc.freeze()
+        for slot in range(workers):
+            spawn(slot)
+        print(
+            f"kivai: {workers} workers serving on http://{host}:{port} "
+            f"(supervisor pid {os.getpid()})",
+            file=sys.stderr,
+        )
+
+        exit_code = 0
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:  # pragma: no cover - PEP 475 retries
+                continue
+            slot, started = children.pop(pid)
+            if stopping:
+                continue
+            if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                print(f"kivai: worker {slot} failed at startup", file=sys.stderr)
+                exit_code = 1
+                stop(signal.SIGTERM, None)
+                continue
+            print(
+                f"kivai: worker {slot} exited ({status}); restarting", file=sys.stderr
+            )
+            spawn(slot)
+        return exit_code
+    finally:
+        for sig, handler in old_handlers.items():
+            signal.signal(sig, handler)
+        gc.unfreeze()
+        sock.close()
+        shutil.rmtree(feed_dir, ignore_errors=True)
@@ -12,9 +12,14 @@ setup(
         "kivai_sdk": [
             "schema/*.json",
             "schema/legacy/*.json",
+            "security/*.json",
         ],
     },
     install_requires=["jsonschema"],
+    extras_require={
+        # Compact binary frames for the Unix-socket gateway (JSON otherwise).
+        "msgpack": ["msgpack>=1.0"],
+    },
     entry_points={
         "console_scripts": [
             "kivai=kivai_sdk.cli:main",
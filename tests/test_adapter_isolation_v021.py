@@ -0,0 +1,177 @@
+import os
+import time
+import unittest
+from unittest import mock
+
+from kivai_sdk.adapters import (
+    AdapterContext,
+    AdapterResult,
+    AdapterSpec,
+    IsolatedAdapter,
+    IsolationLimits,
+    default_registry,
+    set_adapter_registry,
+)
+from kivai_sdk.adapters.capabilities import AdapterCapabilities
+from kivai_sdk.request import IntentRequest
+from kivai_sdk.runtime import execute_intent
+
+_LEAK = []
+
+
+class _TestAdapter:
+    intent = "isolated_test"
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(
+            intent=self.intent, required_capabilities=frozenset(), timeout_ms=1500
+        )
+
+    def execute(self, payload, ctx):
+        req = ctx.request
+        action = req.params.get("action", "pid")
+        if action == "sleep":
+            time.sleep(30)
+        elif action == "crash":
+            os._exit(3)
+        elif action == "raise":
+            raise RuntimeError("adapter bug")
+        elif action == "leak":
+            _LEAK.append(bytearray(96 * 1024 * 1024))
+        return {"pid": os.getpid(), "intent_id": req.intent_id}
+
+
+def _spec(**kwargs) -> AdapterSpec:
+    return AdapterSpec(
+        intent="isolated_test",
+        target=f"{__name__}:_TestAdapter",
+        isolated=True,
+        timeout_ms=kwargs.pop("timeout_ms", 1500),
+        **kwargs,
+    )
+
+
+def _call(adapter: IsolatedAdapter, action: str = "pid", i: int = 0):
+    payload = {"intent_id": f"iso-{i:04d}", "params": {"action": action}}
+    return adapter.execute(
+        payload, AdapterContext(request=IntentRequest.from_payload(payload))
+    )
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "process pools are exercised on POSIX")
+class TestAdapterIsolationV021(unittest.TestCase):
+    def setUp(self):
+        self.adapters = []
+
+    def tearDown(self):
+        for adapter in self.adapters:
+            adapter.pool.close()
+        set_adapter_registry(None)
+
+    def _adapter(self, **limits) -> IsolatedAdapter:
+        adapter = IsolatedAdapter(_spec(), IsolationLimits(pool_size=1, **limits))
+        self.adapters.append(adapter)
+        return adapter
+
+    def test_runs_in_worker_process_with_parsed_request(self):
+        adapter = self._adapter()
+        out = _call(adapter, i=7)
+        self.assertNotEqual(out["pid"], os.getpid())
+        self.assertEqual(out["intent_id"], "iso-0007")
+        self.assertEqual(_call(adapter)["pid"], out["pid"])  # warm worker reused
+
+    def test_timeout_kills_and_replaces_worker(self):
+        adapter = self._adapter()
+        first = _call(adapter)["pid"]
+
+        t0 = time.monotonic()
+        res = _call(adapter, "sleep")
+        self.assertLess(time.monotonic() - t0, 5)
+        self.assertIsInstance(res, AdapterResult)
+        self.assertEqual(res.error.code, "ADAPTER_TIMEOUT")
+
+        self.assertNotEqual(_call(adapter)["pid"], first)
+        stats = adapter.pool.stats()
+        self.assertEqual((stats["timeouts"], stats["workers"]), (1, 1))
+
+    def test_crash_and_exception(self):
+        adapter = self._adapter()
+        self.assertEqual(_call(adapter, "crash").error.code, "ADAPTER_CRASHED")
+        res = _call(adapter, "raise")
+        self.assertEqual(
+            (res.error.code, res.error.message), ("ADAPTER_ERROR", "adapter bug")
+        )
+        self.assertIn("pid", _call(adapter))
+        stats = adapter.pool.stats()
+        self.assertEqual((stats["crashes"], stats["errors"]), (1, 1))
+
+    def test_recycles_after_max_calls_and_memory_ceiling(self):
+        adapter = self._adapter(max_calls=2)
+        pids = [_call(adapter)["pid"] for _ in range(4)]
+        self.assertEqual(pids[0], pids[1])
+        self.assertNotEqual(pids[1], pids[2])
+        self.assertEqual(pids[2], pids[3])
+
+        leaky = self._adapter(max_rss_mb=80)
+        before = _call(leaky)["pid"]
+        self.assertEqual(_call(leaky, "leak")["pid"], before)
+        self.assertNotEqual(_call(leaky)["pid"], before)
+        self.assertEqual(leaky.pool.stats()["recycled"], 1)
+
+    def test_runtime_and_registry_opt_in(self):
+        reg = default_registry(discover=False, isolate=["echo"])
+        set_adapter_registry(reg)
+        payload = {
+            "intent_id": "iso-echo-0001",
+            "intent": "echo",
+            "target": {"capability": "speaker", "zone": "living_room"},
+            "params": {"message": "hi"},
+        }
+        ack = execute_intent(payload)
+        adapter = reg.resolve("echo")
+        self.adapters.append(adapter)
+        self.assertIsInstance(adapter, IsolatedAdapter)
+        self.assertEqual((ack["status"], ack["result"]["echo"]), ("ok", "hi"))
+
+        echo = next(item for item in reg.describe() if item["intent"] == "echo")
+        self.assertTrue(echo["isolated"])
+        self.assertEqual(echo["isolation"]["calls"], 1)
+        self.assertEqual(list(reg.isolation_stats()), ["echo"])
+        self.assertNotIsInstance(reg.resolve("set_temperature"), IsolatedAdapter)
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "process pools are exercised on POSIX")
+class TestIsolationStartupV021(unittest.TestCase):
+    def tearDown(self):
+        set_adapter_registry(None)
+
+    def test_start_isolated_prewarms_pools(self):
+        reg = default_registry(discover=False, isolate=["echo"])
+        reg.start_isolated()
+        adapter = reg.resolve("echo")
+        try:
+            stats = reg.isolation_stats()["echo"]
+            self.assertEqual((stats["workers"], stats["calls"]), (2, 0))
+            self.assertEqual(stats["started"], 2)
+        finally:
+            adapter.pool.close()
+
+    def test_failed_replacements_are_respawned(self):
+        adapter = IsolatedAdapter(_spec(), IsolationLimits(pool_size=1))
+        try:
+            adapter.pool.start()
+            with mock.patch.object(
+                adapter.pool, "_spawn", side_effect=RuntimeError("no fork")
+            ):
+                self.assertEqual(_call(adapter, "crash").error.code, "ADAPTER_CRASHED")
+                deadline = time.monotonic() + 5
+                while adapter.pool.stats()["workers"] and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                self.assertEqual(adapter.pool.stats()["workers"], 0)
+                res = _call(adapter)
+                self.assertEqual(res.error.code, "ADAPTER_ERROR")
+            self.assertIn("pid", _call(adapter))
+            self.assertEqual(adapter.pool.stats()["workers"], 1)
+        finally:
+            adapter.pool.close()
@@ -0,0 +1,180 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+from kivai_sdk.adapters import (
+    BUILTIN_ADAPTER_SPECS,
+    AdapterRegistry,
+    AdapterSpec,
+    default_registry,
+)
+
+_BUILTIN_MODULES = (
+    "[m for m in sys.modules if m.startswith('kivai_sdk.adapters.builtin.')]"
+)
+
+
+def _run(code: str, pythonpath: str | None = None) -> str:
+    env = dict(os.environ)
+    if pythonpath:
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (pythonpath, env.get("PYTHONPATH")) if p
+        )
+    out = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return out.stdout
+
+
+def _write_plugin(root: str) -> None:
+    """
+    A minimal installed distribution publishing two adapter specs, one valid
+    and one whose implementation fails to import.
+    """
+    pkg = os.path.join(root, "acme_kivai")
+    os.makedirs(pkg)
+    with open(os.path.join(pkg, "__init__.py"), "w") as f:
+        f.write("")
+    with open(os.path.join(pkg, "specs.py"), "w") as f:
+        f.write(
+            textwrap.dedent(
+                """
+                from kivai_sdk.adapters import AdapterSpec
+
+                SPECS = [
+                    AdapterSpec(
+                        intent="set_color",
+                        target="acme_kivai.light:SetColorAdapter",
+                        required_capabilities=frozenset({"light"}),
+                    ),
+                    AdapterSpec(intent="broken", target="acme_kivai.missing:Nope"),
+                    AdapterSpec(intent="echo", target="acme_kivai.light:SetColorAdapter"),
+                ]
+                """
+            )
+        )
+    with open(os.path.join(pkg, "light.py"), "w") as f:
+        f.write(
+            textwrap.dedent(
+                """
+                class SetColorAdapter:
+                    intent = "set_color"
+
+                    def execute(self, payload, ctx):
+                        return {"ok": True, "device": ctx.device.device_id}
+                """
+            )
+        )
+    dist = os.path.join(root, "acme_kivai-1.0.dist-info")
+    os.makedirs(dist)
+    with open(os.path.join(dist, "METADATA"), "w") as f:
+        f.write("Metadata-Version: 2.1\nName: acme-kivai\nVersion: 1.0\n")
+    with open(os.path.join(dist, "entry_points.txt"), "w") as f:
+        f.write("[kivai.adapters]\nacme = acme_kivai.specs:SPECS\n")
+
+
+class TestAdapterPluginsV016(unittest.TestCase):
+    def test_builtin_specs_match_adapter_declarations(self):
+        for spec in BUILTIN_ADAPTER_SPECS:
+            with self.subTest(intent=spec.intent):
+                self.assertEqual(spec.load().capabilities, spec.capabilities())
+
+    def test_resolve_imports_on_first_use(self):
+        reg = default_registry(discover=False)
+        self.assertFalse(reg.is_loaded("play_music"))
+        adapter = reg.resolve("play_music")
+        self.assertEqual(adapter.intent, "play_music")
+        self.assertTrue(reg.is_loaded("play_music"))
+        self.assertIs(reg.resolve("play_music"), adapter)
+
+    def test_failed_import_is_recorded(self):
+        reg = AdapterRegistry.empty()
+        reg.register_spec(AdapterSpec(intent="x", target="kivai_sdk.nope:Adapter"))
+        self.assertIsNone(reg.resolve("x"))
+        self.assertEqual(len(reg.errors), 1)
+        self.assertIsNone(reg.resolve("x"))
+        self.assertEqual(len(reg.errors), 1)
+
+    def test_spec_validation(self):
+        with self.assertRaises(ValueError):
+            AdapterSpec(intent="x", target="no_colon")
+        with self.assertRaises(ValueError):
+            AdapterSpec(intent="x", target="m:C", requires_auth=True)
+
+    def test_spec_must_match_adapter_capabilities(self):
+        spec = AdapterSpec(
+            intent="unlock_door",
+            target="kivai_sdk.adapters.builtin.lock:UnlockDoorAdapter",
+            required_capabilities=frozenset({"lock"}),
+        )
+        with self.assertRaisesRegex(ValueError, "requires_auth, required_role"):
+            spec.load()
+        reg = AdapterRegistry.empty()
+        reg.register_spec(spec)
+        self.assertIsNone(reg.resolve("unlock_door"))
+        self.assertIn("differ from its spec", reg.errors[0])
+
+    def test_list_adapters_imports_no_adapter(self):
+        out = _run(
+            f"""
+            import contextlib, io, json, sys
+            from kivai_sdk.cli import main
+            buf = io.StringIO()
+            with contextlib.redirect_stdout(buf):
+                main(["list", "adapters"])
+            print(json.dumps({{"listed": json.loads(buf.getvalue()),
+                              "imported": {_BUILTIN_MODULES}}}))
+            """
+        )
+        data = json.loads(out)
+        self.assertEqual(data["imported"], [])
+        intents = [a["intent"] for a in data["listed"]["adapters"]]
+        self.assertEqual(
+            intents, ["echo", "play_music", "set_temperature", "unlock_door"]
+        )
+
+    def test_entry_point_plugin_discovery(self):
+        with tempfile.TemporaryDirectory() as root:
+            _write_plugin(root)
+            out = _run(
+                """
+                import json, sys
+                from kivai_sdk.adapters import default_registry
+                from kivai_sdk.adapters.base import AdapterContext
+                from kivai_sdk.devices import Device
+
+                reg = default_registry()
+                listed = {a["intent"]: a for a in reg.describe()}
+                before = "acme_kivai.light" in sys.modules
+                adapter = reg.resolve("set_color")
+                ctx = AdapterContext(device=Device("light-1", "hall"))
+                print(json.dumps({
+                    "listed": listed,
+                    "imported_before_resolve": before,
+                    "result": adapter.execute({}, ctx),
+                    "broken": reg.resolve("broken") is None,
+                    "echo": type(reg.resolve("echo")).__name__,
+                    "errors": reg.errors,
+                }))
+                """,
+                pythonpath=root,
+            )
+        data = json.loads(out)
+        self.assertFalse(data["imported_before_resolve"])
+        self.assertEqual(data["listed"]["set_color"]["source"], "acme-kivai")
+        self.assertEqual(
+            data["listed"]["set_color"]["required_capabilities"], ["light"]
+        )
+        self.assertEqual(data["result"], {"ok": True, "device": "light-1"})
+        self.assertTrue(data["broken"])
+        # Plugins cannot shadow builtin intents.
+        self.assertEqual(data["echo"], "EchoAdapter")
+        self.assertEqual(len(data["errors"]), 2)
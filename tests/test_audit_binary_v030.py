@@ -0,0 +1,124 @@
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from kivai_sdk.audit import (
+    AuditEvent,
+    AuditLogger,
+    AuditQuery,
+    BinaryAuditLogger,
+    JsonlAuditLogger,
+    SegmentedAuditLogger,
+    query_audit,
+    read_segment,
+    segments,
+)
+from kivai_sdk.cli import main as cli_main
+from kivai_sdk.devices import set_device_shadow
+from kivai_sdk.loadgen import make_payload
+from kivai_sdk.runtime import execute_intent
+
+
+class _Tee(AuditLogger):
+    def __init__(self, *loggers):
+        self.loggers = loggers
+
+    def emit(self, evt):
+        for logger in self.loggers:
+            logger.emit(evt)
+
+
+class TestBinaryAuditV030(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix="kivai-audit-bin-test-")
+
+    def tearDown(self):
+        set_device_shadow(None)
+        shutil.rmtree(self.dir)
+
+    def test_runtime_trail_decodes_to_the_jsonl_records(self):
+        jdir, bdir = os.path.join(self.dir, "j"), os.path.join(self.dir, "b")
+        jsonl, binary = JsonlAuditLogger(jdir), BinaryAuditLogger(bdir)
+        rng = random.Random(3)
+        acks = []
+        for kind in ("echo", "set_temperature", "play_music", "unlock_door") * 5:
+            acks.append(
+                execute_intent(make_payload(kind, rng), audit=_Tee(jsonl, binary))
+            )
+        jsonl.close()
+        binary.close()
+
+        expected = list(query_audit(jdir, AuditQuery()))
+        (path,) = segments(bdir, (".kvau",))
+        self.assertEqual(list(read_segment(path)), expected)
+        self.assertLess(os.path.getsize(path) * 4, os.path.getsize(segments(jdir)[0]))
+
+        wanted = AuditQuery(execution_id=acks[7]["execution_id"])
+        self.assertEqual(
+            list(query_audit(bdir, wanted)), list(query_audit(jdir, wanted))
+        )
+
+    def test_segment_hooks_are_required(self):
+        class Partial(SegmentedAuditLogger):
+            SUFFIX = ".x"
+
+            def _begin(self):
+                pass
+
+        with self.assertRaises(TypeError):
+            Partial(self.dir)
+
+    def test_values_and_open_segment(self):
+        logger = BinaryAuditLogger(self.dir)
+        data = {
+            "n": -12345678901234,
+            "x": 0.1,
+            "ok": False,
+            "none": None,
+            "nested": {"list": [1, "two", [3.5, True]], "ünï": "çödé"},
+            "long": "m" * 500,
+            "ids": ("a", "b"),
+        }
+        logger.emit(AuditEvent("2026-02-12T00:00:00Z", "not-a-uuid", "custom", data))
+        logger.emit(
+            AuditEvent(
+                "2026-02-12T00:00:01.000250Z",
+                "6f1c3c9e-8c4b-4d5e-9f0a-1b2c3d4e5f60",
+                "execute.end",
+                {"status": "ok"},
+            )
+        )
+        # Still open: everything up to the last execute.end is on disk.
+        logger.emit(AuditEvent("2026-02-12T00:00:02Z", "later", "custom", {}))
+        records = list(read_segment(logger.path))
+        self.assertEqual(len(records), 2)
+        first, second = records
+        self.assertEqual(first["data"], {**data, "ids": ["a", "b"]})
+        self.assertEqual(first["ts"], "2026-02-12T00:00:00Z")
+        self.assertEqual(second["ts"], "2026-02-12T00:00:01.000250Z")
+        self.assertEqual(second["execution_id"], "6f1c3c9e-8c4b-4d5e-9f0a-1b2c3d4e5f60")
+        logger.close()
+        self.assertEqual(len(list(read_segment(segments(self.dir, (".kvau",))[0]))), 3)
+
+    def test_export_cli(self):
+        logger = BinaryAuditLogger(self.dir)
+        logger.emit(AuditEvent("2026-02-12T00:00:00Z", "ex-1", "execute.start", {}))
+        logger.close()
+        target = os.path.join(self.dir, "export.jsonl")
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(
+                cli_main(["audit", "export", self.dir, "--out", target]), 0
+            )
+        self.assertIn("Exported 1 records", out.getvalue())
+        with open(target, encoding="utf-8") as f:
+            (line,) = f.read().splitlines()
+        self.assertEqual(json.loads(line)["execution_id"], "ex-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+from contextlib import redirect_stdout
+
+from kivai_sdk.audit import (
+    AuditEvent,
+    AuditQuery,
+    JsonlAuditLogger,
+    build_index,
+    parse_ts_us,
+    query_audit,
+    segments,
+    set_audit_logger,
+)
+from kivai_sdk.cli import main as cli_main
+from kivai_sdk.devices import set_device_shadow
+from kivai_sdk.runtime import execute_intent
+
+
+def _intent(value, confidence: float = 1.0) -> dict:
+    return {
+        "intent_id": str(uuid.uuid4()),
+        "intent": "set_temperature",
+        "target": {"capability": "thermostat", "zone": "living_room"},
+        "params": {"value": value},
+        "meta": {
+            "timestamp": "2026-02-12T00:00:00Z",
+            "language": "en",
+            "confidence": confidence,
+        },
+    }
+
+
+def _event(second: int, execution_id: str, event: str, **data) -> AuditEvent:
+    return AuditEvent(f"2026-02-12T00:00:{second:02d}Z", execution_id, event, data)
+
+
+class TestAuditLogV029(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix="kivai-audit-test-")
+
+    def tearDown(self):
+        set_audit_logger(None)
+        set_device_shadow(None)
+        shutil.rmtree(self.dir)
+
+    def test_runtime_trail_is_indexed_by_ids_and_error_code(self):
+        logger = JsonlAuditLogger(self.dir, max_segment_bytes=4096, block_records=4)
+        set_audit_logger(logger)
+        runs = []
+        for i in range(12):
+            payload = _intent(18 + i, confidence=2.0 if i % 4 == 0 else 1.0)
+            runs.append((payload["intent_id"], execute_intent(payload)))
+        logger.close()
+        self.assertGreater(len(segments(self.dir)), 1)
+
+        intent_id, ack = runs[5]
+        trail = list(query_audit(self.dir, AuditQuery(intent_id=intent_id)))
+        self.assertEqual(trail[0]["event"], "execute.start")
+        self.assertEqual(trail[-1]["event"], "execute.end")
+        self.assertTrue(all(r["execution_id"] == ack["execution_id"] for r in trail))
+        self.assertTrue(all(r["intent"] == "set_temperature" for r in trail))
+        self.assertEqual(
+            trail,
+            list(query_audit(self.dir, AuditQuery(execution_id=ack["execution_id"]))),
+        )
+
+        failed = list(
+            query_audit(
+                self.dir, AuditQuery(event="execute.end", error_code="SCHEMA_INVALID")
+            )
+        )
+        self.assertEqual(
+            [r["execution_id"] for r in failed],
+            [ack["execution_id"] for _, ack in runs[::4]],
+        )
+        self.assertEqual(
+            len(list(query_audit(self.dir, AuditQuery(event="execute.end"), limit=5))),
+            5,
+        )
+
+    def test_time_range_and_unindexed_tail(self):
+        logger = JsonlAuditLogger(self.dir, block_records=2)
+        for second in range(10):
+            logger.emit(_event(second, f"ex-{second}", "execute.start", intent="echo"))
+        logger.close()
+        # A second segment that is still being written has no index yet.
+        tail = JsonlAuditLogger(self.dir)
+        tail.emit(_event(20, "ex-20", "execute.start", intent="echo"))
+        tail.emit(_event(20, "ex-20", "execute.end", status="ok"))
+        tail.flush()
+
+        window = AuditQuery(
+            since=parse_ts_us("2026-02-12T00:00:03Z"),
+            until=parse_ts_us("2026-02-12T00:00:06+00:00"),
+        )
+        self.assertEqual(
+            [r["execution_id"] for r in query_audit(self.dir, window)],
+            ["ex-3", "ex-4", "ex-5"],
+        )
+        self.assertEqual(
+            len(list(query_audit(self.dir, AuditQuery(execution_id="ex-20")))), 2
+        )
+
+        # Indexing the open segment covers what is there; later writes are
+        # still found by the tail scan.
+        build_index(tail.path)
+        tail.emit(_event(21, "ex-21", "execute.start", intent="echo"))
+        tail.flush()
+        self.assertEqual(
+            [
+                r["execution_id"]
+                for r in query_audit(
+                    self.dir, AuditQuery(since=parse_ts_us("2026-02-12T00:00:20Z"))
+                )
+            ],
+            ["ex-20", "ex-20", "ex-21"],
+        )
+        tail.close()
+
+    def test_cli_query_and_index(self):
+        logger = JsonlAuditLogger(self.dir)
+        logger.emit(_event(1, "ex-1", "execute.start", intent="unlock_door"))
+        logger.emit(
+            _event(
+                1, "ex-1", "execute.end", status="failed", error_code="AUTH_REQUIRED"
+            )
+        )
+        logger.close()
+        for name in os.listdir(self.dir):
+            if name.endswith(".idx"):
+                os.unlink(os.path.join(self.dir, name))
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertEqual(cli_main(["audit", "index", self.dir]), 0)
+        self.assertIn("Indexed 2 records", out.getvalue())
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = cli_main(
+                [
+                    "audit",
+                    "query",
+                    self.dir,
+                    "--intent",
+                    "unlock_door",
+                    "--error-code",
+                    "AUTH_REQUIRED",
+                ]
+            )
+        self.assertEqual(code, 0)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r["event"] for r in records], ["execute.end"])
+
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(
+                cli_main(["audit", "query", self.dir, "--execution-id", "nope"]), 1
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
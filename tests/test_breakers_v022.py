@@ -0,0 +1,187 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from kivai_sdk.adapters import AdapterRegistry, AdapterResult, set_adapter_registry
+from kivai_sdk.adapters.capabilities import AdapterCapabilities
+from kivai_sdk.breakers import (
+    CLOSED,
+    DEVICE,
+    HALF_OPEN,
+    OPEN,
+    BreakerConfig,
+    BreakerRegistry,
+    CircuitBreaker,
+    set_breakers,
+)
+from kivai_sdk.devices import Device, DeviceRegistry, set_device_registry
+from kivai_sdk.gateway import app
+from kivai_sdk.runtime import execute_intent
+
+
+class ToggleAdapter:
+    intent = "toggle"
+
+    def __init__(self):
+        self.dead = set()
+        self.calls = {}
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(
+            intent="toggle", required_capabilities=frozenset({"relay"})
+        )
+
+    def execute(self, payload, ctx):
+        device_id = ctx.device.device_id
+        self.calls[device_id] = self.calls.get(device_id, 0) + 1
+        if device_id in self.dead:
+            return AdapterResult.failure("DEVICE_TIMEOUT", "no answer")
+        if ctx.request.params.get("bad"):
+            return AdapterResult.failure("PARAMS_INVALID", "bad params")
+        return {"toggled": device_id}
+
+
+def _toggle(device_id: str | None = None, select: str | None = None, **params):
+    target = {"capability": "relay", "zone": "lab"}
+    if device_id:
+        target = {"device_id": device_id}
+    if select:
+        target["select"] = select
+    return {
+        "intent_id": "breaker-test-0001",
+        "intent": "toggle",
+        "target": target,
+        "params": params,
+        "meta": {
+            "timestamp": "2026-02-12T00:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+        },
+    }
+
+
+class TestCircuitBreakerV022(unittest.TestCase):
+    def setUp(self):
+        self.now = [0.0]
+        self.config = BreakerConfig(window=4, min_calls=4, open_seconds=10)
+
+    def _breaker(self, **overrides) -> CircuitBreaker:
+        config = BreakerConfig(**{**self.config.__dict__, **overrides})
+        return CircuitBreaker(config, clock=lambda: self.now[0])
+
+    def test_opens_on_failure_rate_then_recovers_through_half_open(self):
+        b = self._breaker()
+        for ok in (True, False, True, False):
+            self.assertTrue(b.acquire())
+            b.record(ok, 1.0)
+        self.assertEqual(b.state, OPEN)
+        self.assertFalse(b.acquire())
+        self.assertAlmostEqual(b.retry_in(), 10.0)
+
+        self.now[0] = 10.0
+        self.assertEqual(b.state, HALF_OPEN)
+        self.assertTrue(b.acquire())
+        self.assertFalse(b.acquire())  # one probe at a time
+        b.record(False, 1.0)
+        self.assertEqual(b.state, OPEN)
+
+        self.now[0] = 20.0
+        self.assertTrue(b.acquire())
+        b.record(True, 1.0)
+        self.assertEqual(b.state, CLOSED)
+        self.assertEqual(b.describe()["calls"], 0)
+
+    def test_slow_calls_and_cancelled_probe(self):
+        b = self._breaker(slow_call_ms=100, slow_call_rate=0.75)
+        for elapsed in (150, 150, 10, 150):
+            b.acquire()
+            b.record(True, elapsed)
+        self.assertEqual(b.state, OPEN)
+
+        self.now[0] = 10.0
+        self.assertTrue(b.acquire())
+        b.cancel()
+        self.assertTrue(b.acquire())
+
+
+class TestRuntimeBreakersV022(unittest.TestCase):
+    def setUp(self):
+        self.now = [0.0]
+        set_breakers(
+            BreakerRegistry(
+                BreakerConfig(window=4, min_calls=4, open_seconds=30),
+                clock=lambda: self.now[0],
+            )
+        )
+        set_device_registry(
+            DeviceRegistry.from_devices(
+                Device(d, "lab", frozenset({"relay"})) for d in ("relay-a", "relay-b")
+            )
+        )
+        self.adapter = ToggleAdapter()
+        reg = AdapterRegistry.empty()
+        reg.register(self.adapter)
+        set_adapter_registry(reg)
+
+    def tearDown(self):
+        set_breakers(None)
+        set_device_registry(None)
+        set_adapter_registry(None)
+
+    def test_open_device_circuit_fails_fast(self):
+        self.adapter.dead.add("relay-a")
+        for _ in range(4):
+            ack = execute_intent(_toggle("relay-a"))
+            self.assertEqual(ack["error"]["code"], "DEVICE_TIMEOUT")
+
+        ack = execute_intent(_toggle("relay-a"))
+        self.assertEqual(ack["error"]["code"], "DEVICE_UNAVAILABLE")
+        self.assertEqual(self.adapter.calls["relay-a"], 4)
+
+        # The adapter breaker stays closed: other devices keep working.
+        self.assertEqual(execute_intent(_toggle("relay-b"))["status"], "ok")
+
+        # Half-open probe after the cooldown; success closes the circuit.
+        self.adapter.dead.clear()
+        self.now[0] = 30.0
+        self.assertEqual(execute_intent(_toggle("relay-a"))["status"], "ok")
+        self.assertEqual(execute_intent(_toggle("relay-a"))["status"], "ok")
+
+    def test_client_errors_do_not_trip(self):
+        for _ in range(6):
+            ack = execute_intent(_toggle("relay-a", bad=True))
+            self.assertEqual(ack["error"]["code"], "PARAMS_INVALID")
+        self.assertEqual(execute_intent(_toggle("relay-a"))["status"], "ok")
+
+    def test_fan_out_skips_open_device(self):
+        self.adapter.dead.add("relay-a")
+        for _ in range(4):
+            execute_intent(_toggle(select="all"))
+
+        ack = execute_intent(_toggle(select="all"))
+        self.assertEqual(ack["status"], "partial")
+        codes = {t["device_id"]: t.get("error", {}).get("code") for t in ack["targets"]}
+        self.assertEqual(codes, {"relay-a": "DEVICE_UNAVAILABLE", "relay-b": None})
+        self.assertEqual(self.adapter.calls["relay-a"], 4)
+
+    def test_breaker_state_on_health_and_metrics(self):
+        self.adapter.dead.add("relay-a")
+        for _ in range(4):
+            execute_intent(_toggle("relay-a"))
+
+        client = TestClient(app)
+        self.assertEqual(
+            client.get("/health").json()["breakers"], {"open": 1, "half_open": 0}
+        )
+        self.assertEqual(
+            client.get("/v1/devices/relay-a/health").json()["circuit"], OPEN
+        )
+        self.assertEqual(
+            client.get("/v1/devices/relay-b/health").json()["circuit"], CLOSED
+        )
+        tripped = client.get("/metrics").json()["breakers"]["tripped"]
+        self.assertEqual(
+            [(t["kind"], t["key"], t["state"]) for t in tripped],
+            [(DEVICE, "relay-a", OPEN)],
+        )
@@ -0,0 +1,113 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from kivai_sdk.cli import main
+from kivai_sdk.daemon import DaemonClient, DaemonUnavailable
+from kivai_sdk.devices import Device, write_snapshot
+from kivai_sdk.validator import compiled_validator, validate_command
+
+
+def _payload(device_id: str) -> dict:
+    return {
+        "intent_id": "test-intent-12345678",
+        "intent": "set_temperature",
+        "target": {"device_id": device_id},
+        "params": {"value": 21},
+        "meta": {
+            "timestamp": "2026-02-12T00:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+        },
+    }
+
+
+def _run_cli(*argv: str) -> tuple[int, dict | str]:
+    out = io.StringIO()
+    with redirect_stdout(out):
+        rc = main(list(argv))
+    text = out.getvalue()
+    try:
+        return rc, json.loads(text)
+    except ValueError:
+        return rc, text.strip()
+
+
+class TestCLIDaemonV017(unittest.TestCase):
+    def test_validator_is_compiled_once(self):
+        self.assertIs(compiled_validator(), compiled_validator())
+        ok, message = validate_command({"intent": "echo"})
+        self.assertFalse(ok)
+        self.assertIn("required property", message)
+
+    def test_cli_import_is_lazy(self):
+        code = (
+            "import sys, kivai_sdk, kivai_sdk.cli; "
+            "print([m for m in ('jsonschema', 'kivai_sdk.runtime', "
+            "'kivai_sdk.validator', 'fastapi') if m in sys.modules])"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(out.stdout.strip(), "[]")
+
+    def test_forwards_to_daemon_and_falls_back(self):
+        with tempfile.TemporaryDirectory() as td:
+            sock = os.path.join(td, "kivai.sock")
+            snap = os.path.join(td, "devices.kvds")
+            write_snapshot(
+                [Device("daemon-thermo", "den", frozenset({"thermostat"}))], snap
+            )
+            payload_path = os.path.join(td, "intent.json")
+            with open(payload_path, "w", encoding="utf-8") as f:
+                json.dump(_payload("daemon-thermo"), f)
+
+            with mock.patch.dict(os.environ, {"KIVAI_DAEMON_SOCKET": sock}):
+                # No daemon yet: in-process, against the demo registry.
+                rc, ack = _run_cli("execute", payload_path)
+                self.assertEqual(rc, 0)
+                self.assertNotIn("route", ack)
+
+                daemon = subprocess.Popen(
+                    [sys.executable, "-m", "kivai_sdk.cli", "daemon"]
+                    + ["--socket", sock, "--devices", snap],
+                    stdout=subprocess.DEVNULL,
+                )
+                self.addCleanup(daemon.kill)
+                deadline = time.monotonic() + 20
+                while True:
+                    try:
+                        DaemonClient(sock).close()
+                        break
+                    except DaemonUnavailable:
+                        self.assertLess(time.monotonic(), deadline)
+                        time.sleep(0.05)
+
+                # Forwarded: the daemon routes against its own device store.
+                rc, ack = _run_cli("execute", payload_path)
+                self.assertEqual(rc, 0)
+                self.assertEqual(ack["route"]["zone"], "den")
+
+                rc, message = _run_cli("validate", payload_path)
+                self.assertEqual((rc, message), (0, "✅ Payload is valid!"))
+
+                rc, ack = _run_cli("execute", "--no-daemon", payload_path)
+                self.assertNotIn("route", ack)
+
+                rc, status = _run_cli("daemon", "--status")
+                self.assertEqual((rc, status["pid"]), (0, daemon.pid))
+
+                rc, _ = _run_cli("daemon", "--stop")
+                self.assertEqual(rc, 0)
+                self.assertEqual(daemon.wait(timeout=10), 0)
+                self.assertFalse(os.path.exists(sock))
+
+                with redirect_stdout(io.StringIO()), mock.patch("sys.stderr"):
+                    self.assertEqual(main(["daemon", "--status"]), 1)
@@ -0,0 +1,227 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import unittest
+from collections import Counter
+
+import requests
+
+from kivai_sdk.cluster import HashRing, routing_key
+from kivai_sdk.devices import Device, DeviceRegistry, set_device_registry
+
+KEYS = [f"device-{i:05d}" for i in range(20_000)]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _music(device_id: str) -> dict:
+    return {
+        "intent_id": f"cluster-{device_id}",
+        "intent": "play_music",
+        "target": {"device_id": device_id},
+        "params": {"query": "jazz"},
+        "meta": {
+            "timestamp": "2026-02-12T00:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+            "source": "test",
+        },
+    }
+
+
+class TestHashRingV034(unittest.TestCase):
+    def test_balance_and_minimal_movement(self):
+        nodes = [f"http://10.0.0.{i}:8080" for i in range(1, 5)]
+        ring = HashRing(nodes)
+        owners = {key: ring.owner(key) for key in KEYS}
+        self.assertEqual(owners, {key: HashRing(nodes).owner(key) for key in KEYS})
+        counts = Counter(owners.values())
+        self.assertEqual(set(counts), set(nodes))
+        self.assertLess(max(counts.values()) / (len(KEYS) / 4), 1.3)
+        self.assertAlmostEqual(sum(ring.shares().values()), 1.0)
+
+        # Adding a fifth node only moves keys onto it, about 1/5 of them.
+        grown = HashRing(nodes + ["http://10.0.0.5:8080"])
+        moved = [key for key in KEYS if grown.owner(key) != owners[key]]
+        self.assertTrue(all(grown.owner(k) == "http://10.0.0.5:8080" for k in moved))
+        self.assertLess(abs(len(moved) / len(KEYS) - 0.2), 0.06)
+
+        # Removing a node only moves that node's keys.
+        shrunk = HashRing(nodes[1:])
+        moved = [key for key in KEYS if shrunk.owner(key) != owners[key]]
+        self.assertEqual(len(moved), counts[nodes[0]])
+
+    def test_routing_key(self):
+        set_device_registry(
+            DeviceRegistry.from_devices(
+                [Device("spk-1", "attic", frozenset({"speaker"}))]
+            )
+        )
+        try:
+            payload = _music("spk-9")
+            self.assertEqual(routing_key(payload), "spk-9")
+            self.assertEqual(routing_key(payload, tenant="home-1"), "home-1")
+            payload["target"] = {"zone": "attic", "capability": "speaker"}
+            self.assertEqual(routing_key(payload), "spk-1")
+            payload["target"]["zone"] = "cellar"
+            self.assertIsNone(routing_key(payload))
+            payload["target"] = {"capability": "speaker", "select": "all"}
+            self.assertIsNone(routing_key(payload))
+        finally:
+            set_device_registry(None)
+
+
+class _Node:
+    def __init__(self, nodes: list, *extra: str) -> None:
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.nodes = nodes
+        self.extra = extra
+        self.proc = None
+
+    def start(self) -> None:
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "kivai_sdk.cli", "serve", "--port", str(self.port)]
+            + ["--cluster-self", self.url, "--cluster-nodes", ",".join(self.nodes)]
+            + list(self.extra),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def wait_ready(self) -> None:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                requests.get(f"{self.url}/health", timeout=1)
+                return
+            except requests.ConnectionError:
+                if time.monotonic() > deadline:
+                    raise AssertionError(f"{self.url} did not start")
+                time.sleep(0.1)
+
+    def stop(self) -> int:
+        if self.proc.poll() is None:
+            self.proc.send_signal(signal.SIGTERM)
+        return self.proc.wait(timeout=20)
+
+
+@unittest.skipUnless(os.name == "posix", "spawns local gateways")
+class TestClusterNodesV034(unittest.TestCase):
+    def test_intents_are_forwarded_to_the_owner(self):
+        urls: list = []
+        a, b = _Node(urls), _Node(urls)
+        urls.extend([a.url, b.url])
+        ring = HashRing(urls)
+        devices = [f"speaker-{i:02d}" for i in range(16)]
+        try:
+            a.start()
+            b.start()
+            a.wait_ready()
+            b.wait_ready()
+            for node in (a, b):
+                for device_id in devices:
+                    requests.put(
+                        f"{node.url}/v1/devices/{device_id}",
+                        json={"zone": "attic", "capabilities": ["speaker"]},
+                    ).raise_for_status()
+            self.assertEqual(
+                requests.get(f"{a.url}/v1/cluster").json()["nodes"], sorted(urls)
+            )
+
+            session = requests.Session()
+            for device_id in devices:
+                ack = session.post(f"{a.url}/v1/execute", json=_music(device_id)).json()
+                self.assertEqual(ack["status"], "ok", ack)
+                self.assertEqual(ack["route"]["device_id"], device_id)
+                owner = ring.owner(device_id)
+                self.assertEqual(
+                    ack.get("forwarded_to"), None if owner == a.url else owner
+                )
+                owner_reply = session.get(f"{a.url}/v1/cluster/owner/{device_id}")
+                self.assertEqual(owner_reply.json()["node"], owner)
+
+            on_b = sum(ring.owner(d) == b.url for d in devices)
+            self.assertGreater(on_b, 0)
+            metrics_a = session.get(f"{a.url}/metrics").json()
+            metrics_b = session.get(f"{b.url}/metrics").json()
+            self.assertEqual(metrics_a["totals"]["intents_forwarded"], on_b)
+            self.assertEqual(metrics_a["totals"]["intents"], len(devices) - on_b)
+            self.assertEqual(metrics_b["cluster"]["received"], on_b)
+            self.assertEqual(metrics_b["totals"]["intents"], on_b)
+
+            # Device requests sent to a reach the owner's health and shadow.
+            on_b_device = next(d for d in devices if ring.owner(d) == b.url)
+            on_a_device = next(d for d in devices if ring.owner(d) == a.url)
+            session.post(
+                f"{a.url}/v1/devices/{on_b_device}/heartbeat"
+            ).raise_for_status()
+            health = session.get(f"{b.url}/v1/devices/{on_b_device}/health").json()
+            self.assertEqual(health["status"], "online")
+            report = session.post(
+                f"{a.url}/v1/devices/{on_b_device}/state",
+                json={"state": {"volume": 7}},
+            )
+            self.assertEqual(report.status_code, 200)
+            state = session.get(f"{b.url}/v1/devices/{on_b_device}/state").json()
+            self.assertEqual(state["state"]["volume"], 7)
+            via_a = session.get(f"{a.url}/v1/devices/{on_b_device}/state").json()
+            self.assertEqual(via_a["state"]["volume"], 7)
+            batch = session.post(
+                f"{b.url}/v1/heartbeats",
+                json={"device_ids": [on_a_device, on_b_device]},
+            ).json()
+            self.assertEqual(batch["accepted"], 2)
+            health = session.get(f"{a.url}/v1/devices/{on_a_device}/health").json()
+            self.assertEqual(health["status"], "online")
+            self.assertEqual(
+                session.get(f"{a.url}/metrics").json()["cluster"]["relayed"], 3
+            )
+
+            # Once b is gone its devices fail fast; after it leaves the
+            # membership they run on a.
+            b.stop()
+            moved = next(d for d in devices if ring.owner(d) == b.url)
+            ack = session.post(f"{a.url}/v1/execute", json=_music(moved)).json()
+            self.assertEqual(ack["error"]["code"], "NODE_UNAVAILABLE")
+            session.put(
+                f"{a.url}/v1/cluster/members", json={"nodes": [a.url]}
+            ).raise_for_status()
+            ack = session.post(f"{a.url}/v1/execute", json=_music(moved)).json()
+            self.assertEqual(ack["status"], "ok")
+            self.assertNotIn("forwarded_to", ack)
+        finally:
+            for node in (a, b):
+                if node.proc is not None:
+                    node.stop()
+
+    def test_membership_reaches_every_worker(self):
+        peer = f"http://127.0.0.1:{_free_port()}"
+        node = _Node([peer], "--workers", "3")
+        node.start()
+        try:
+            node.wait_ready()
+            self.assertEqual(
+                len(requests.get(f"{node.url}/v1/cluster").json()["nodes"]), 2
+            )
+            requests.put(
+                f"{node.url}/v1/cluster/members", json={"nodes": [node.url]}
+            ).raise_for_status()
+            # A new connection per request lands on any of the workers.
+            for _ in range(12):
+                info = requests.get(
+                    f"{node.url}/v1/cluster", headers={"Connection": "close"}
+                ).json()
+                self.assertEqual(info["nodes"], [node.url])
+        finally:
+            node.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
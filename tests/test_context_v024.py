@@ -0,0 +1,185 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from kivai_sdk.config import ExecutionConfig
+from kivai_sdk.context import USER, ZONE, ContextStore, set_context_store
+from kivai_sdk.devices import Device, DeviceRegistry, set_device_registry
+from kivai_sdk.gateway import app
+from kivai_sdk.runtime import execute_intent
+
+
+def _intent(intent: str, target: dict, user_id: str | None = None, **params) -> dict:
+    meta = {"timestamp": "2026-02-12T00:00:00Z", "language": "en", "confidence": 1.0}
+    if user_id:
+        meta["user_id"] = user_id
+    return {
+        "intent_id": "context-test-0001",
+        "intent": intent,
+        "target": target,
+        "params": params,
+        "meta": meta,
+    }
+
+
+class TestContextStoreV024(unittest.TestCase):
+    def setUp(self):
+        self.now = [0.0]
+
+    def _store(self, **kwargs) -> ContextStore:
+        return ContextStore(clock=lambda: self.now[0], **kwargs)
+
+    def test_ttl_expiry_and_hit_rate(self):
+        store = self._store(ttl=60)
+        store.put(USER, "ana", {"device_id": "lamp-1", "zone": "hall"})
+        store.put(USER, "ben", {"zone": "hall"}, ttl=5)
+        self.now[0] = 10
+        self.assertEqual(store.get(USER, "ana").target["device_id"], "lamp-1")
+        self.assertIsNone(store.get(USER, "ben"))
+        self.assertIsNone(store.get(ZONE, "hall"))
+
+        stats = store.stats()
+        self.assertEqual((stats["entries"], stats["expirations"]), (1, 1))
+        self.assertEqual(
+            (stats["hits"], stats["misses"], stats["hit_rate"]), (1, 2, 0.3333)
+        )
+
+    def test_lru_eviction_under_memory_cap(self):
+        store = self._store(max_bytes=3 * 260)
+        for user in ("u1", "u2", "u3"):
+            store.put(USER, user, {"zone": "hall"})
+        store.get(USER, "u1")  # u2 is now least recently used
+        store.put(USER, "u4", {"zone": "hall"})
+        self.assertIsNone(store.get(USER, "u2"))
+        self.assertIsNotNone(store.get(USER, "u1"))
+        self.assertEqual(store.stats()["evictions"], 1)
+        self.assertLessEqual(store.stats()["bytes"], 3 * 260)
+
+    def test_fill_target_rules(self):
+        store = self._store()
+        store.remember(
+            {"device_id": "spk-1", "zone": "den", "capability": "speaker"},
+            "play_music",
+            "ana",
+        )
+        complete = _intent("x", {"capability": "light", "zone": "den"}, "ana")
+        self.assertIsNone(store.fill_target(complete))
+
+        p = _intent("volume_up", {}, "ana")
+        self.assertEqual(
+            store.fill_target(p),
+            {"source": USER, "filled": ["device_id", "zone", "capability"]},
+        )
+        self.assertEqual(p["target"]["device_id"], "spk-1")
+
+        p = _intent("volume_up", {"zone": "den"}, "ben")
+        self.assertEqual(store.fill_target(p)["source"], ZONE)
+
+        p = _intent("lights_off", {"capability": "light"}, "ana")
+        self.assertEqual(store.fill_target(p), {"source": USER, "filled": ["zone"]})
+        self.assertEqual(p["target"], {"capability": "light", "zone": "den"})
+
+        self.assertIsNone(store.fill_target(_intent("x", {"zone": "attic"}, "ben")))
+
+
+class TestRuntimeContextV024(unittest.TestCase):
+    def setUp(self):
+        set_context_store(ContextStore())
+
+    def tearDown(self):
+        set_context_store(None)
+
+    def test_follow_ups_route_from_context(self):
+        first = execute_intent(
+            _intent(
+                "play_music",
+                {"capability": "speaker", "zone": "living_room"},
+                "ana",
+                query="jazz",
+            )
+        )
+        self.assertEqual(first["status"], "ok")
+        self.assertNotIn("context", first)
+
+        ack = execute_intent(_intent("play_music", {}, "ana", query="blues"))
+        self.assertEqual(ack["status"], "ok", ack)
+        self.assertEqual(ack["route"]["device_id"], "speaker-living-02")
+        self.assertEqual(ack["context"]["source"], USER)
+
+        ack = execute_intent(
+            _intent("set_temperature", {"capability": "thermostat"}, "ana", value=21)
+        )
+        self.assertEqual(ack["status"], "ok", ack)
+        self.assertEqual(ack["route"]["device_id"], "thermostat-living-01")
+        self.assertEqual(ack["context"], {"source": USER, "filled": ["zone"]})
+
+        client = TestClient(app)
+        self.assertEqual(client.get("/metrics").json()["context"]["hits"], 2)
+        r = client.delete("/v1/context/users/ana")
+        self.assertEqual(r.json(), {"user_id": "ana", "forgotten": True})
+
+        ack = execute_intent(_intent("play_music", {}, "ana", query="soul"))
+        self.assertEqual(ack["error"]["code"], "SCHEMA_INVALID")
+
+    def test_incompatible_context_is_not_borrowed(self):
+        execute_intent(
+            _intent(
+                "play_music",
+                {"capability": "speaker", "zone": "living_room"},
+                "ana",
+                query="jazz",
+            )
+        )
+        for target in ({}, {"zone": "living_room"}):
+            payload = _intent("set_temperature", target, "ana", value=21)
+            ack = execute_intent(payload)
+            self.assertNotIn("context", ack)
+            self.assertNotIn("device_id", payload["target"])
+            self.assertNotEqual(
+                ack.get("error", {}).get("code"), "ADAPTER_CAPABILITY_MISMATCH"
+            )
+
+        store = ContextStore()
+        store.put(USER, "ana", {"zone": "den"})
+        self.assertIsNone(store.fill_target(_intent("x", {"zone": "den"}, "ana")))
+        store.remember({"device_id": "spk-1", "zone": "den"}, "play_music", "ana")
+        p = _intent("volume_up", {"zone": "den"}, "ana")
+        self.assertIsNone(store.fill_target(p, frozenset({"speaker"})))
+
+    def test_multi_capability_adapters_borrow_by_device(self):
+        set_device_registry(
+            DeviceRegistry.from_devices(
+                [Device("tv-1", "den", frozenset({"speaker", "display"}))]
+            )
+        )
+        self.addCleanup(set_device_registry, None)
+        store = ContextStore()
+        store.remember(
+            {"device_id": "tv-1", "zone": "den", "capability": "speaker"},
+            "play_music",
+            "ana",
+        )
+        p = _intent("play_video", {}, "ana")
+        filled = store.fill_target(p, frozenset({"speaker", "display"}))
+        self.assertEqual(filled["filled"], ["device_id", "zone", "capability"])
+        self.assertEqual(p["target"]["device_id"], "tv-1")
+        p = _intent("lights_show", {}, "ana")
+        self.assertIsNone(store.fill_target(p, frozenset({"speaker", "light"})))
+
+        # Without a device, only the remembered capability counts.
+        store.put(USER, "ben", {"zone": "den", "capability": "speaker"})
+        p = _intent("play_music", {}, "ben")
+        self.assertIsNotNone(store.fill_target(p, frozenset({"speaker"})))
+        p = _intent("play_video", {}, "ben")
+        self.assertIsNone(store.fill_target(p, frozenset({"speaker", "display"})))
+
+    def test_disabled_by_config(self):
+        execute_intent(
+            _intent(
+                "play_music", {"capability": "speaker", "zone": "living_room"}, "ana"
+            )
+        )
+        ack = execute_intent(
+            _intent("play_music", {}, "ana"), config=ExecutionConfig(context=False)
+        )
+        self.assertEqual(ack["error"]["code"], "SCHEMA_INVALID")
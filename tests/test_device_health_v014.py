@@ -0,0 +1,158 @@
+import unittest
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from kivai_sdk.devices import Device, DeviceRegistry, set_device_registry
+from kivai_sdk.devices.health import (
+    DEGRADED,
+    OFFLINE,
+    ONLINE,
+    HealthTracker,
+    set_health_tracker,
+)
+from kivai_sdk.gateway import app
+from kivai_sdk.router import resolve_route
+from kivai_sdk.runtime import execute_intent
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def canonical_payload(intent: str, target: dict, params: dict | None = None) -> dict:
+    return {
+        "intent_id": str(uuid.uuid4()),
+        "intent": intent,
+        "target": target,
+        "params": params or {},
+        "meta": {"timestamp": _utc_now_iso(), "language": "en", "confidence": 1.0},
+    }
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDeviceHealthV014(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.tracker = HealthTracker(
+            degraded_after=10, offline_after=30, tick=1, n_slots=8, clock=self.clock
+        )
+        set_health_tracker(self.tracker)
+        set_device_registry(
+            DeviceRegistry.from_devices(
+                [
+                    Device("speaker-a", "living_room", frozenset({"speaker"})),
+                    Device("speaker-b", "living_room", frozenset({"speaker"})),
+                    Device("thermo-1", "living_room", frozenset({"thermostat"})),
+                ]
+            )
+        )
+
+    def tearDown(self):
+        set_health_tracker(None)
+        set_device_registry(None)
+
+    def test_status_transitions(self):
+        changes = []
+        self.tracker.add_listener(lambda *c: changes.append(c))
+
+        self.tracker.heartbeat("thermo-1")
+        self.assertEqual(self.tracker.status("thermo-1"), ONLINE)
+
+        self.clock.now += 11
+        self.assertEqual(self.tracker.status("thermo-1"), DEGRADED)
+
+        self.clock.now += 20
+        self.assertEqual(self.tracker.status("thermo-1"), OFFLINE)
+
+        self.tracker.heartbeat("thermo-1")
+        self.assertEqual(self.tracker.status("thermo-1"), ONLINE)
+        self.assertEqual([c[2] for c in changes], [ONLINE, DEGRADED, OFFLINE, ONLINE])
+        self.assertIsNone(self.tracker.status("never-seen"))
+
+    def test_regular_heartbeats_stay_online(self):
+        for _ in range(20):
+            self.tracker.heartbeat("thermo-1")
+            self.clock.now += 5
+        self.assertEqual(self.tracker.status("thermo-1"), ONLINE)
+
+    def test_deadlines_beyond_one_wheel_revolution(self):
+        # 8 slots x 1s tick: both thresholds lie several revolutions out.
+        self.tracker.heartbeat("thermo-1")
+        self.clock.now += 9
+        self.assertEqual(self.tracker.status("thermo-1"), ONLINE)
+        self.clock.now += 100
+        self.assertEqual(self.tracker.status("thermo-1"), OFFLINE)
+        self.assertEqual(self.tracker.counts()[OFFLINE], 1)
+
+    def test_resolve_skips_offline_devices(self):
+        self.tracker.heartbeat("speaker-a")
+        self.tracker.heartbeat("speaker-b")
+        self.clock.now += 25
+        self.tracker.heartbeat("speaker-a")
+        self.clock.now += 10  # speaker-b offline, speaker-a online
+
+        match, err = resolve_route(
+            {"intent": "play_music", "target": {"zone": "living_room"}}
+        )
+        self.assertIsNone(err)
+        self.assertEqual(match.device.device_id, "speaker-a")
+
+    def test_offline_target_fails_fast(self):
+        self.tracker.heartbeat("thermo-1")
+        self.clock.now += 31
+
+        for target in (
+            {"device_id": "thermo-1"},
+            {"zone": "living_room", "capability": "thermostat"},
+        ):
+            with self.subTest(target=target):
+                ack = execute_intent(
+                    canonical_payload("set_temperature", target, {"value": 21})
+                )
+                self.assertEqual(ack["status"], "failed")
+                self.assertEqual(ack["error"]["code"], "DEVICE_OFFLINE")
+
+    def test_every_ambiguous_candidate_offline_fails_fast(self):
+        self.tracker.heartbeat("speaker-a")
+        self.tracker.heartbeat("speaker-b")
+        self.clock.now += 31
+
+        match, err = resolve_route(
+            {"intent": "play_music", "target": {"zone": "living_room"}}
+        )
+        self.assertIsNone(match)
+        self.assertEqual(err, "DEVICE_OFFLINE")
+
+        # Speakers never heard from are not offline: the two stay ambiguous.
+        set_health_tracker(HealthTracker(clock=self.clock))
+        match, err = resolve_route(
+            {"intent": "play_music", "target": {"zone": "living_room"}}
+        )
+        self.assertEqual((match, err), (None, None))
+
+        match, err = resolve_route(
+            {"intent": "play_music", "target": {"zone": "attic"}}
+        )
+        self.assertEqual((match, err), (None, None))
+
+    def test_gateway_heartbeat_endpoints(self):
+        client = TestClient(app)
+        r = client.post("/v1/devices/thermo-1/heartbeat")
+        self.assertEqual(r.json(), {"device_id": "thermo-1", "status": ONLINE})
+
+        r = client.post("/v1/heartbeats", json={"device_ids": ["speaker-a", "x"]})
+        self.assertEqual(r.json(), {"accepted": 2})
+
+        self.clock.now += 12
+        r = client.get("/v1/devices/thermo-1/health")
+        self.assertEqual(r.json()["status"], DEGRADED)
+        self.assertEqual(client.get("/health").json()["devices"][DEGRADED], 3)
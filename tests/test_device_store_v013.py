@@ -0,0 +1,172 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from kivai_sdk.cli import main
+from kivai_sdk.devices import (
+    Device,
+    DeviceRegistry,
+    MappedDeviceSnapshot,
+    SQLiteDeviceStore,
+    configure_devices,
+    set_device_registry,
+    write_snapshot,
+)
+from kivai_sdk.devices.io import iter_devices_csv, iter_devices_jsonl
+from kivai_sdk.router import route_target
+
+
+def _fleet():
+    return [
+        Device("thermo-1", "living_room", frozenset({"thermostat"})),
+        Device("light-1", "living_room", frozenset({"light"})),
+        Device("light-2", "living_room", frozenset({"light"})),
+        Device("light-3", "kitchen", frozenset({"light", "speaker"})),
+        Device("lock-1", "front_door", frozenset({"lock"})),
+    ]
+
+
+LOOKUPS = [
+    {"device_id": "light-3"},
+    {"device_id": "missing"},
+    {"zone": "living_room", "capability": "thermostat"},
+    {"zone": "living_room", "capability": "light"},
+    {"zone": "kitchen", "capability": "speaker"},
+    {"zone": "kitchen"},
+    {"zone": "living_room"},
+    {"capability": "lock"},
+    {"capability": "light"},
+    {"zone": "attic", "capability": "light"},
+    {"capability": "unknown"},
+    {},
+]
+
+
+class TestDeviceStoreV013(unittest.TestCase):
+    def setUp(self):
+        self._td = tempfile.TemporaryDirectory()
+        self.dir = self._td.name
+
+    def tearDown(self):
+        set_device_registry(None)
+        self._td.cleanup()
+
+    def _backends(self):
+        db = SQLiteDeviceStore(os.path.join(self.dir, "devices.db"))
+        db.upsert_many(_fleet())
+        snap_path = os.path.join(self.dir, "devices.kvds")
+        write_snapshot(_fleet(), snap_path)
+        snap = MappedDeviceSnapshot(snap_path)
+        self.addCleanup(db.close)
+        self.addCleanup(snap.close)
+        return DeviceRegistry.from_devices(_fleet()), db, snap
+
+    def test_resolve_semantics_match_in_memory_registry(self):
+        mem, db, snap = self._backends()
+        for lookup in LOOKUPS:
+            expected = mem.resolve(**lookup)
+            for backend in (db, snap):
+                with self.subTest(backend=type(backend).__name__, lookup=lookup):
+                    self.assertEqual(backend.resolve(**lookup), expected)
+
+    def test_round_trip_and_reload(self):
+        _, db, snap = self._backends()
+        self.assertEqual(len(db), 5)
+        self.assertEqual(len(snap), 5)
+        self.assertEqual(
+            sorted(db.iter_devices(), key=lambda d: d.device_id),
+            sorted(snap.iter_devices(), key=lambda d: d.device_id),
+        )
+
+        db.close()
+        reopened = SQLiteDeviceStore(os.path.join(self.dir, "devices.db"))
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.get("light-3"), _fleet()[3])
+        self.assertEqual(len(reopened.load_registry()), 5)
+
+    def test_iter_devices_streams_a_snapshot(self):
+        _, db, _ = self._backends()
+        stream = db.iter_devices()
+        first = next(stream)
+        # The store stays writable mid-stream; the stream keeps its snapshot.
+        db.upsert(Device("zz-new", "attic", frozenset({"light"})))
+        self.assertTrue(db.delete("thermo-1"))
+        rest = list(stream)
+        self.assertEqual(
+            [first.device_id] + [d.device_id for d in rest],
+            sorted(d.device_id for d in _fleet()),
+        )
+        self.assertEqual(rest[-1], _fleet()[0])  # deleted after the stream began
+
+        memory = SQLiteDeviceStore(":memory:")
+        self.addCleanup(memory.close)
+        memory.upsert_many(_fleet())
+        self.assertEqual(
+            list(memory.iter_devices()), sorted(_fleet(), key=lambda d: d.device_id)
+        )
+
+    def test_upsert_replaces_and_delete_unindexes(self):
+        mem, db, _ = self._backends()
+        moved = Device("light-2", "kitchen", frozenset({"light"}))
+        for backend in (mem, db):
+            backend.upsert(moved)
+            self.assertEqual(
+                backend.resolve(
+                    zone="living_room", capability="light"
+                ).device.device_id,
+                "light-1",
+            )
+            self.assertTrue(backend.delete("light-1"))
+            self.assertIsNone(backend.resolve(zone="living_room", capability="light"))
+            self.assertFalse(backend.delete("light-1"))
+
+    def test_import_readers(self):
+        jsonl = io.StringIO(
+            '{"device_id": "a", "zone": "z", "capabilities": ["light"]}\n\n'
+            '{"device_id": "b", "zone": "z", "capabilities": []}\n'
+        )
+        self.assertEqual([d.device_id for d in iter_devices_jsonl(jsonl)], ["a", "b"])
+
+        csv_data = io.StringIO(
+            "device_id,zone,capabilities\nc,kitchen,light;speaker\nd,hall,\n"
+        )
+        devices = list(iter_devices_csv(csv_data))
+        self.assertEqual(devices[0].capabilities, frozenset({"light", "speaker"}))
+        self.assertEqual(devices[1].capabilities, frozenset())
+
+        with self.assertRaises(ValueError) as cm:
+            list(iter_devices_jsonl(io.StringIO('{"zone": "z"}\n')))
+        self.assertIn("line 1", str(cm.exception))
+
+    def test_cli_import_and_route_from_snapshot(self):
+        src = os.path.join(self.dir, "fleet.jsonl")
+        with open(src, "w", encoding="utf-8") as f:
+            for d in _fleet():
+                f.write(
+                    json.dumps(
+                        {
+                            "device_id": d.device_id,
+                            "zone": d.zone,
+                            "capabilities": sorted(d.capabilities),
+                        }
+                    )
+                    + "\n"
+                )
+        db = os.path.join(self.dir, "cli.db")
+        snap = os.path.join(self.dir, "cli.kvds")
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            rc = main(["devices", "import", src, "--db", db, "--snapshot", snap])
+        self.assertEqual(rc, 0)
+        self.assertEqual(json.loads(out.getvalue())["imported"], 5)
+
+        store = configure_devices(snap)
+        self.addCleanup(store.close)
+        match = route_target(
+            {"intent": "echo", "target": {"zone": "front_door", "capability": "lock"}}
+        )
+        self.assertEqual(match.device.device_id, "lock-1")
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import unittest
+
+from fastapi.testclient import TestClient
+
+from kivai_sdk.bus import DISCONNECT, DROP, EventBus, active_event_bus, set_event_bus
+from kivai_sdk.devices import record_change, set_device_registry, set_health_tracker
+from kivai_sdk.gateway import app, event_stream
+from kivai_sdk.runtime import execute_intent
+
+
+def _echo() -> dict:
+    return {
+        "intent_id": "bus-test-0001",
+        "intent": "echo",
+        "target": {},
+        "params": {"text": "hi"},
+        "meta": {"timestamp": "2026-02-12T00:00:00Z", "language": "en"},
+    }
+
+
+def _frames(chunk: str) -> list:
+    out = []
+    for block in chunk.strip().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.splitlines() if ": " in line
+        )
+        if "event" in fields:
+            out.append((fields["event"], json.loads(fields["data"])))
+    return out
+
+
+class TestEventBusV026(unittest.TestCase):
+    def setUp(self):
+        self.bus = EventBus(max_queue=4)
+        set_event_bus(self.bus)
+
+    def tearDown(self):
+        set_event_bus(None)
+        set_device_registry(None)
+        set_health_tracker(None)
+
+    def test_topic_filters(self):
+        exact = self.bus.subscribe(["execution.finished"])
+        prefix = self.bus.subscribe(["device.*"])
+        everything = self.bus.subscribe()
+        self.bus.publish("execution.started", {"n": 1})
+        self.bus.publish("execution.finished", {"n": 2})
+        self.bus.publish("device.status", {"n": 3})
+        self.assertEqual([e.data["n"] for e in exact.drain()], [2])
+        self.assertEqual([e.data["n"] for e in prefix.drain()], [3])
+        self.assertEqual([e.seq for e in everything.drain()], [1, 2, 3])
+        with self.assertRaises(ValueError):
+            self.bus.subscribe(["device*"])
+
+    def test_slow_consumer_policies(self):
+        dropping = self.bus.subscribe(policy=DROP)
+        leaving = self.bus.subscribe(policy=DISCONNECT)
+        for n in range(6):
+            self.bus.publish("device.event", {"n": n})
+        self.assertEqual([e.data["n"] for e in dropping.drain()], [2, 3, 4, 5])
+        self.assertEqual(dropping.dropped, 2)
+        self.assertTrue(leaving.closed)
+        self.assertEqual(leaving.close_reason, "slow consumer")
+        stats = self.bus.stats()
+        self.assertEqual((stats["subscribers"], stats["disconnected"]), (1, 1))
+
+    def test_runtime_and_registry_publish(self):
+        sub = self.bus.subscribe(max_queue=64)
+        ack = execute_intent(_echo())
+        record_change(
+            {
+                "op": "upsert",
+                "device": {"device_id": "lamp-9", "zone": "hall", "capabilities": []},
+            }
+        )
+        record_change({"op": "heartbeat", "device_ids": ["lamp-9"]})
+        events = [(e.topic, e.data) for e in sub.wait(timeout=1)]
+        self.assertEqual(
+            [topic for topic, _ in events],
+            [
+                "execution.started",
+                "execution.finished",
+                "device.upserted",
+                "device.status",
+            ],
+        )
+        finished = events[1][1]
+        self.assertEqual(finished["execution_id"], ack["execution_id"])
+        self.assertEqual((finished["status"], finished["error_code"]), ("ok", None))
+        self.assertEqual(
+            events[3][1], {"device_id": "lamp-9", "old": "unknown", "new": "online"}
+        )
+
+    def test_large_fan_out_is_deferred_in_order(self):
+        bus = EventBus(max_queue=16, inline_fanout=2)
+        subs = [bus.subscribe(["device.*"]) for _ in range(3)]
+        for n in range(10):
+            self.assertEqual(bus.publish("device.event", {"n": n}), 3)
+        self.assertTrue(bus.flush(timeout=5))
+        for sub in subs:
+            self.assertEqual([e.data["n"] for e in sub.drain()], list(range(10)))
+        self.assertEqual(bus.stats()["deferred"], 10)
+
+    def test_publish_without_subscribers_is_free(self):
+        self.assertFalse(self.bus.active)
+        self.assertEqual(self.bus.publish("device.event", {}), 0)
+        self.assertEqual(self.bus.stats()["published"], 0)
+
+
+class TestEventStreamV026(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        set_event_bus(EventBus())
+
+    def tearDown(self):
+        set_event_bus(None)
+
+    async def test_sse_stream(self):
+        response = await event_stream(topics="execution.finished", max_queue=2)
+        self.assertEqual(response.media_type, "text/event-stream")
+        body = response.body_iterator
+        self.assertTrue((await body.__anext__()).startswith(": subscribed"))
+
+        pending = asyncio.ensure_future(body.__anext__())
+        await asyncio.to_thread(execute_intent, _echo())
+        [(name, data)] = _frames(await asyncio.wait_for(pending, 5))
+        self.assertEqual((name, data["status"]), ("execution.finished", "ok"))
+
+        for _ in range(3):  # overflow the 2-event queue while not reading
+            await asyncio.to_thread(execute_intent, _echo())
+        frames = _frames(await body.__anext__())
+        frames += _frames(await body.__anext__())
+        self.assertEqual(frames[0], ("dropped", {"dropped": 1}))
+        self.assertEqual([name for name, _ in frames[1:]], ["execution.finished"] * 2)
+
+        await body.aclose()
+        self.assertEqual(active_event_bus().stats()["subscribers"], 0)
+
+    def test_rejects_bad_parameters(self):
+        client = TestClient(app)
+        self.assertEqual(client.get("/v1/events?topics=a*").status_code, 400)
+        self.assertEqual(client.get("/v1/events?policy=block").status_code, 400)
+        self.assertEqual(client.get("/v1/events?max_queue=0").status_code, 400)
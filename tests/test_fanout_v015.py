@@ -0,0 +1,226 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from kivai_sdk.adapters.capabilities import AdapterCapabilities
+from kivai_sdk.config import ExecutionConfig
+from kivai_sdk.devices import (
+    Device,
+    DeviceMatch,
+    DeviceRegistry,
+    MappedDeviceSnapshot,
+    SQLiteDeviceStore,
+    set_device_registry,
+    write_snapshot,
+)
+from kivai_sdk.devices.health import HealthTracker, set_health_tracker
+from kivai_sdk.fanout import run_fan_out
+from kivai_sdk.gateway import app
+from kivai_sdk.request import IntentRequest
+from kivai_sdk.runtime import execute_intent
+from kivai_sdk.validator import validate_command
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def canonical_payload(intent: str, target: dict, params: dict | None = None) -> dict:
+    return {
+        "intent_id": str(uuid.uuid4()),
+        "intent": intent,
+        "target": target,
+        "params": params or {},
+        "meta": {"timestamp": _utc_now_iso(), "language": "en", "confidence": 1.0},
+    }
+
+
+def _fleet():
+    return [
+        Device("speaker-c", "living_room", frozenset({"speaker"})),
+        Device("speaker-a", "living_room", frozenset({"speaker"})),
+        Device("speaker-b", "living_room", frozenset({"speaker"})),
+        Device("speaker-k", "kitchen", frozenset({"speaker"})),
+        Device("thermo-1", "living_room", frozenset({"thermostat"})),
+    ]
+
+
+ALL_SPEAKERS = {"zone": "living_room", "capability": "speaker", "select": "all"}
+
+
+class SlowAdapter:
+    intent = "slow"
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def execute(self, payload, ctx):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delays[ctx.device.device_id])
+        with self._lock:
+            self.active -= 1
+        if ctx.device.device_id == "boom":
+            raise RuntimeError("device exploded")
+        return {"ok": True, "device": ctx.device.device_id}
+
+
+def _matches(*ids):
+    return [DeviceMatch(Device(i, "z", frozenset()), "zone") for i in ids]
+
+
+class TestFanOutV015(unittest.TestCase):
+    def setUp(self):
+        set_device_registry(DeviceRegistry.from_devices(_fleet()))
+
+    def tearDown(self):
+        set_device_registry(None)
+        set_health_tracker(None)
+
+    def test_resolve_all_matches_across_backends(self):
+        with tempfile.TemporaryDirectory() as d:
+            snap_path = os.path.join(d, "devices.kvds")
+            write_snapshot(_fleet(), snap_path)
+            with (
+                SQLiteDeviceStore(os.path.join(d, "devices.db")) as db,
+                MappedDeviceSnapshot(snap_path) as snap,
+            ):
+                db.upsert_many(_fleet())
+                mem = DeviceRegistry.from_devices(_fleet())
+                for lookup in (
+                    {"zone": "living_room", "capability": "speaker"},
+                    {"zone": "living_room"},
+                    {"capability": "speaker", "exclude": lambda i: i == "speaker-b"},
+                    {"zone": "attic"},
+                    {},
+                ):
+                    expected = mem.resolve_all(**lookup)
+                    for backend in (db, snap):
+                        with self.subTest(backend=type(backend).__name__, **lookup):
+                            self.assertEqual(backend.resolve_all(**lookup), expected)
+
+        ids = [m.device.device_id for m in mem.resolve_all(capability="speaker")]
+        self.assertEqual(ids, ["speaker-a", "speaker-b", "speaker-c", "speaker-k"])
+        self.assertEqual(mem.resolve_all(), [])
+
+    def test_schema_accepts_select(self):
+        ok, _ = validate_command(canonical_payload("play_music", ALL_SPEAKERS))
+        self.assertTrue(ok)
+        bad = dict(ALL_SPEAKERS, select="many")
+        ok, _ = validate_command(canonical_payload("play_music", bad))
+        self.assertFalse(ok)
+
+    def test_fan_out_all_succeed(self):
+        ack = execute_intent(
+            canonical_payload("play_music", ALL_SPEAKERS, {"query": "jazz"})
+        )
+        self.assertEqual(ack["status"], "ok")
+        self.assertNotIn("error", ack)
+        self.assertEqual(ack["result"], {"total": 3, "succeeded": 3, "failed": 0})
+        self.assertEqual(
+            [t["device_id"] for t in ack["targets"]],
+            ["speaker-a", "speaker-b", "speaker-c"],
+        )
+        self.assertEqual(ack["targets"][0]["result"]["query"], "jazz")
+        self.assertEqual(ack["route"]["select"], "all")
+
+    def test_single_select_stays_ambiguous(self):
+        target = {"zone": "living_room", "capability": "speaker"}
+        ack = execute_intent(canonical_payload("play_music", target))
+        self.assertNotIn("targets", ack)
+        self.assertNotIn("route", ack)
+
+    def test_partial_failure_with_offline_device(self):
+        clock = [0.0]
+        tracker = HealthTracker(
+            degraded_after=1, offline_after=2, tick=0.5, clock=lambda: clock[0]
+        )
+        set_health_tracker(tracker)
+        tracker.heartbeat("speaker-b")
+        clock[0] = 10.0
+
+        ack = execute_intent(canonical_payload("play_music", ALL_SPEAKERS))
+        self.assertEqual(ack["status"], "partial")
+        self.assertEqual(ack["error"]["code"], "PARTIAL_FAILURE")
+        self.assertEqual(ack["result"], {"total": 3, "succeeded": 2, "failed": 1})
+        by_id = {t["device_id"]: t for t in ack["targets"]}
+        self.assertEqual(by_id["speaker-b"]["error"]["code"], "DEVICE_OFFLINE")
+        self.assertEqual(by_id["speaker-a"]["status"], "ok")
+
+        r = TestClient(app).post(
+            "/v1/execute", json=canonical_payload("play_music", ALL_SPEAKERS)
+        )
+        self.assertEqual(r.status_code, 207)
+
+    def test_all_failed_and_no_match(self):
+        ack = execute_intent(
+            canonical_payload("play_music", ALL_SPEAKERS, {"query": 42})
+        )
+        self.assertEqual(ack["status"], "failed")
+        self.assertEqual(ack["error"]["code"], "BAD_REQUEST")
+
+        target = {"zone": "attic", "capability": "speaker", "select": "all"}
+        ack = execute_intent(canonical_payload("play_music", target))
+        self.assertEqual(ack["error"]["code"], "TARGET_NOT_FOUND")
+
+        ack = execute_intent(
+            canonical_payload("play_music", ALL_SPEAKERS),
+            config=ExecutionConfig(fanout_max_targets=2),
+        )
+        self.assertEqual(ack["error"]["code"], "FANOUT_TOO_LARGE")
+
+    def test_concurrency_is_bounded_and_latency_tracks_slowest(self):
+        ids = [f"d{i}" for i in range(6)]
+        adapter = SlowAdapter({i: 0.1 for i in ids})
+        caps = AdapterCapabilities(intent="slow", required_capabilities=frozenset())
+        req = IntentRequest.from_payload({"intent": "slow"})
+
+        t0 = time.perf_counter()
+        results = run_fan_out(
+            adapter,
+            {},
+            req,
+            _matches(*ids),
+            caps,
+            ExecutionConfig(fanout_concurrency=6),
+        )
+        elapsed = time.perf_counter() - t0
+        self.assertTrue(all(r["status"] == "ok" for r in results))
+        self.assertLess(elapsed, 0.45)
+
+        adapter = SlowAdapter({i: 0.02 for i in ids})
+        run_fan_out(
+            adapter,
+            {},
+            req,
+            _matches(*ids),
+            caps,
+            ExecutionConfig(fanout_concurrency=2),
+        )
+        self.assertLessEqual(adapter.peak, 2)
+
+    def test_errors_and_timeouts_are_per_device(self):
+        adapter = SlowAdapter({"fast": 0.0, "boom": 0.0, "hung": 1.0})
+        caps = AdapterCapabilities(
+            intent="slow", required_capabilities=frozenset(), timeout_ms=200
+        )
+        req = IntentRequest.from_payload({"intent": "slow"})
+
+        t0 = time.perf_counter()
+        results = run_fan_out(
+            adapter, {}, req, _matches("fast", "boom", "hung"), caps, ExecutionConfig()
+        )
+        self.assertLess(time.perf_counter() - t0, 0.8)
+        self.assertEqual([r["status"] for r in results], ["ok", "failed", "failed"])
+        self.assertEqual(results[1]["error"]["code"], "ADAPTER_ERROR")
+        self.assertEqual(results[2]["error"]["code"], "ADAPTER_TIMEOUT")
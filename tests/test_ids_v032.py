@@ -0,0 +1,96 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from kivai_sdk.audit import (
+    AuditEvent,
+    AuditQuery,
+    JsonlAuditLogger,
+    parse_ts_us,
+    query_audit,
+)
+from kivai_sdk.clock import format_epoch_us, utc_now_iso
+from kivai_sdk.ids import id_time_us, new_id
+from kivai_sdk.runtime import execute_intent
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _echo() -> dict:
+    return {
+        "intent": "echo",
+        "target": {"capability": "speaker", "zone": "living_room"},
+        "params": {"text": "hi"},
+        "meta": {
+            "timestamp": utc_now_iso(),
+            "language": "en",
+            "confidence": 1.0,
+            "source": "test",
+        },
+    }
+
+
+class TestIdsV032(unittest.TestCase):
+    def test_ids_are_uuid7_and_strictly_increasing(self):
+        ids = [new_id() for _ in range(20_000)]
+        self.assertEqual(ids, sorted(set(ids)))
+        parsed = uuid.UUID(ids[-1])
+        self.assertEqual((parsed.version, parsed.variant), (7, uuid.RFC_4122))
+        now_us = int(datetime.now(timezone.utc).timestamp() * 1_000_000)
+        self.assertLess(abs(id_time_us(ids[-1]) - now_us), 5_000_000)
+        self.assertIsNone(id_time_us(str(uuid.uuid4())))
+        self.assertIsNone(id_time_us("not-an-id"))
+
+    def test_forked_children_draw_fresh_random_bits(self):
+        new_id()
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write, new_id()[-12:].encode())
+            os._exit(0)
+        os.close(write)
+        os.waitpid(pid, 0)
+        with os.fdopen(read) as f:
+            child_tail = f.read()
+        self.assertNotEqual(child_tail, new_id()[-12:])
+
+    def test_timestamps_match_isoformat(self):
+        rng = random.Random(5)
+        for _ in range(2000):
+            us = rng.randrange(4_000_000_000_000_000)
+            if rng.random() < 0.2:
+                us -= us % 1_000_000
+            expected = (EPOCH + timedelta(microseconds=us)).isoformat()
+            text = format_epoch_us(us)
+            self.assertEqual(text, expected.replace("+00:00", "Z"))
+            self.assertEqual(parse_ts_us(text), us)
+
+    def test_runtime_ids_and_audit_pruning(self):
+        acks = [execute_intent(_echo()) for _ in range(3)]
+        ids = [ack["execution_id"] for ack in acks]
+        self.assertEqual(ids, sorted(ids))
+        self.assertIsNotNone(id_time_us(acks[0]["intent_id"]))
+
+        tmp = tempfile.mkdtemp(prefix="kivai-ids-test-")
+        try:
+            logger = JsonlAuditLogger(tmp)
+            old = "2020-01-01T00:00:00Z"
+            for eid in (ids[0], "legacy-execution-id"):
+                logger.emit(AuditEvent(old, eid, "execute.end", {}))
+            logger.close()
+            # An event older than its time-ordered id cannot be ours: the
+            # indexed segment is skipped; other ids are still found.
+            wanted = AuditQuery(execution_id=ids[0])
+            self.assertEqual(list(query_audit(tmp, wanted)), [])
+            wanted = AuditQuery(execution_id="legacy-execution-id")
+            self.assertEqual(len(list(query_audit(tmp, wanted))), 1)
+        finally:
+            shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from kivai_sdk.adapters import AdapterContext, default_registry
+from kivai_sdk.request import EMPTY_PARAMS, IntentRequest
+from kivai_sdk.router import route_target
+from kivai_sdk.runtime import execute_intent
+from kivai_sdk.security import evaluate_authorization
+
+
+class TestIntentRequestV012(unittest.TestCase):
+    def test_from_payload_extracts_fields(self):
+        payload = {
+            "intent_id": "test-intent-12345678",
+            "intent": "play_music",
+            "target": {"zone": "living_room", "capability": "speaker"},
+            "params": {"query": "lofi"},
+            "meta": {"language": "en"},
+        }
+        req = IntentRequest.from_payload(payload)
+        self.assertIs(req.raw, payload)
+        self.assertEqual(req.intent, "play_music")
+        self.assertEqual(req.intent_id, "test-intent-12345678")
+        self.assertEqual(req.target, (None, "living_room", "speaker"))
+        self.assertIsNone(req.device_id)
+        self.assertIs(req.params, payload["params"])
+        self.assertIsNone(req.auth)
+        self.assertEqual(req.meta, {"language": "en"})
+
+    def test_malformed_fields_are_normalized(self):
+        req = IntentRequest.from_payload(
+            {"intent": 5, "target": "nope", "params": [], "auth": "x"}
+        )
+        self.assertIsNone(req.intent)
+        self.assertEqual(req.target, (None, None, None))
+        self.assertIs(req.params, EMPTY_PARAMS)
+        self.assertIsNone(req.auth)
+
+    def test_blank_device_id_is_not_a_target(self):
+        req = IntentRequest.from_payload({"target": {"device_id": "  "}})
+        self.assertIsNone(req.device_id)
+
+    def test_slots_only(self):
+        req = IntentRequest.from_payload({})
+        self.assertFalse(hasattr(req, "__dict__"))
+        with self.assertRaises(AttributeError):
+            req.extra = 1
+
+    def test_policy_and_router_accept_request(self):
+        req = IntentRequest.from_payload(
+            {
+                "intent": "unlock_door",
+                "target": {"device_id": "door-front-01"},
+                "auth": {"required_role": "owner", "token": "t"},
+            }
+        )
+        self.assertEqual(evaluate_authorization(req, "owner"), (True, None))
+        self.assertEqual(route_target(req).device.device_id, "door-front-01")
+
+    def test_adapter_prefers_context_request(self):
+        adapter = default_registry().resolve("echo")
+        req = IntentRequest.from_payload({"intent": "echo", "params": {"message": "a"}})
+        out = adapter.execute({}, AdapterContext(request=req))
+        self.assertEqual(out["echo"], "a")
+
+    def test_unlock_door_does_not_mutate_payload(self):
+        payload = {
+            "intent_id": "test-intent-12345678",
+            "intent": "unlock_door",
+            "target": {"device_id": "door-front-01"},
+            "params": {},
+            "auth": {"required_role": "owner", "token": "t"},
+            "meta": {
+                "timestamp": "2026-02-12T00:00:00Z",
+                "language": "en",
+                "confidence": 1.0,
+            },
+        }
+        ack = execute_intent(payload)
+        self.assertEqual(ack["status"], "ok")
+        self.assertNotIn("_auth_required_role", payload)
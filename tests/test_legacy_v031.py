@@ -0,0 +1,138 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from fastapi.testclient import TestClient
+
+from kivai_sdk.cli import main as cli_main
+from kivai_sdk.devices import set_device_shadow
+from kivai_sdk.gateway import app
+from kivai_sdk.legacy import LegacyCommandError, is_legacy, upgrade_legacy
+from kivai_sdk.metrics import set_metrics
+from kivai_sdk.migrate import migrate_stream
+from kivai_sdk.validator import validate_command
+
+THERMOSTAT = {
+    "command": "set temperature",
+    "object": "thermostat",
+    "location": "Living Room",
+    "temperature": 21,
+    "trigger": "Kivai",
+    "timestamp": "2026-02-12T00:00:00Z",
+}
+V1 = {
+    "intent_id": "legacy-test-0001",
+    "intent": "echo",
+    "target": {"capability": "speaker", "zone": "living_room"},
+    "params": {"text": "hi"},
+    "meta": {
+        "timestamp": "2026-02-12T00:00:00Z",
+        "language": "en",
+        "confidence": 0.9,
+        "source": "voice",
+    },
+}
+
+
+class TestLegacyV031(unittest.TestCase):
+    def setUp(self):
+        set_metrics(None)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        set_device_shadow(None)
+        set_metrics(None)
+
+    def test_upgrade(self):
+        upgraded = upgrade_legacy(THERMOSTAT, intent_id="legacy-test-0002")
+        self.assertEqual(upgraded["intent"], "set_temperature")
+        self.assertEqual(
+            upgraded["target"], {"capability": "thermostat", "zone": "living_room"}
+        )
+        self.assertEqual(upgraded["params"], {"value": 21})
+        self.assertEqual(upgraded["meta"]["source"], "legacy")
+        self.assertEqual(upgraded["meta"]["trigger"], "Kivai")
+        self.assertTrue(validate_command(upgraded)[0])
+
+        light = upgrade_legacy(
+            {"command": "turn on", "object": "light", "location": "kitchen"}
+        )
+        self.assertEqual(light["intent"], "turn_on")
+        self.assertEqual(light["target"]["capability"], "light")
+        self.assertTrue(is_legacy(THERMOSTAT))
+        self.assertFalse(is_legacy(V1))
+        with self.assertRaises(LegacyCommandError):
+            upgrade_legacy({"command": "turn on"})
+
+    def test_gateway_detects_legacy(self):
+        r = self.client.post("/v1/execute", json=THERMOSTAT)
+        self.assertEqual(r.status_code, 200, r.text)
+        ack = r.json()
+        self.assertEqual(ack["status"], "ok")
+        self.assertTrue(ack["legacy"])
+
+        r = self.client.post("/v1/execute", json={"command": "turn on"})
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(r.json()["error"]["code"], "LEGACY_INVALID")
+
+        r = self.client.post("/v1/validate", json=THERMOSTAT)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json()["upgraded"]["intent"], "set_temperature")
+
+        totals = self.client.get("/metrics").json()["totals"]
+        self.assertEqual(totals["intents_legacy"], 2)
+
+    def test_migrate(self):
+        lines = [
+            json.dumps(THERMOSTAT),
+            "",
+            json.dumps(V1),
+            "{not json",
+            json.dumps({"command": "turn on", "object": "light"}),
+        ] * 3
+        src = io.BytesIO("\n".join(lines).encode())
+        outputs = []
+        for workers in (1, 2):
+            src.seek(0)
+            out, rejects = io.BytesIO(), io.BytesIO()
+            report = migrate_stream(src, out, rejects, workers=workers, chunk_size=2)
+            self.assertEqual(
+                (report.records, report.migrated, report.valid, report.rejected),
+                (12, 3, 3, 6),
+            )
+            outputs.append(out.getvalue())
+            rejected = [json.loads(x) for x in rejects.getvalue().splitlines()]
+            self.assertEqual([r["line"] for r in rejected][:2], [4, 5])
+            self.assertIn("Invalid JSON", rejected[0]["error"])
+        # Deterministic across runs and worker counts, in input order.
+        self.assertEqual(outputs[0], outputs[1])
+        records = [json.loads(x) for x in outputs[0].splitlines()]
+        self.assertEqual(
+            [r["intent"] for r in records[:2]], ["set_temperature", "echo"]
+        )
+        self.assertNotEqual(records[0]["intent_id"], records[2]["intent_id"])
+
+    def test_migrate_cli(self):
+        tmp = tempfile.mkdtemp(prefix="kivai-migrate-test-")
+        try:
+            src = os.path.join(tmp, "archive.jsonl")
+            with open(src, "w", encoding="utf-8") as f:
+                f.write(json.dumps(THERMOSTAT) + "\n")
+            out = os.path.join(tmp, "v1.jsonl")
+            with redirect_stdout(io.StringIO()) as stdout:
+                code = cli_main(["migrate", src, "--out", out, "--workers", "1"])
+            self.assertEqual(code, 0)
+            self.assertIn("1 migrated", stdout.getvalue())
+            with open(out, encoding="utf-8") as f:
+                (line,) = f.read().splitlines()
+            self.assertTrue(validate_command(json.loads(line))[0])
+        finally:
+            shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import random
+import unittest
+
+import httpx
+
+from kivai_sdk.devices import set_device_shadow
+from kivai_sdk.gateway import app
+from kivai_sdk.loadgen import (
+    Histogram,
+    LoadConfig,
+    compare_reports,
+    make_payload,
+    parse_mix,
+    run_load,
+)
+from kivai_sdk.validator import validate_command
+
+
+class TestHistogramV028(unittest.TestCase):
+    def test_percentiles_within_one_percent(self):
+        hist = Histogram()
+        for value in range(1, 100_001):
+            hist.record(value)
+        self.assertEqual(hist.total, 100_000)
+        self.assertEqual((hist.min, hist.max), (1, 100_000))
+        for q in (50, 90, 99, 99.9):
+            expected = q / 100 * 100_000
+            self.assertLess(abs(hist.percentile(q) - expected) / expected, 0.01)
+        self.assertEqual(hist.percentile(100), 100_000)
+        self.assertEqual(Histogram().percentile(99), 0)
+
+    def test_merge_and_round_trip(self):
+        a, b = Histogram(), Histogram()
+        for value in (5, 500, 50_000):
+            a.record(value)
+        b.record(5_000_000)
+        a.merge(b)
+        copy = Histogram.from_dict(json.loads(json.dumps(a.to_dict())))
+        self.assertEqual(copy.total, 4)
+        self.assertEqual(copy.max, 5_000_000)
+        self.assertEqual(copy.percentile(50), a.percentile(50))
+
+
+class TestLoadgenV028(unittest.TestCase):
+    def tearDown(self):
+        set_device_shadow(None)
+
+    def test_mix_and_payloads(self):
+        self.assertEqual(parse_mix("echo=3, invalid=1"), {"echo": 3.0, "invalid": 1.0})
+        for spec in ("", "echo=0", "bogus=1", "echo=x"):
+            with self.assertRaises(ValueError):
+                parse_mix(spec)
+        rng = random.Random(7)
+        for kind in ("echo", "set_temperature", "play_music", "unlock_door"):
+            ok, message = validate_command(make_payload(kind, rng))
+            self.assertTrue(ok, message)
+        ok, _ = validate_command(make_payload("invalid", rng))
+        self.assertFalse(ok)
+
+    def test_open_loop_run_against_gateway(self):
+        config = LoadConfig(
+            url="http://gateway",
+            rate=200,
+            duration=0.5,
+            mix=parse_mix("echo=1,set_temperature=1,unlock_door=1,invalid=1"),
+            interval=0.25,
+            seed=42,
+        )
+        report = asyncio.run(run_load(config, transport=httpx.ASGITransport(app=app)))
+        data = json.loads(json.dumps(report.to_dict()))
+        summary = data["summary"]
+        self.assertGreater(summary["sent"], 50)
+        self.assertEqual(summary["sent"], sum(summary["by_kind"].values()))
+        self.assertEqual(summary["completed"], summary["sent"])
+        self.assertEqual(
+            summary["outcomes"]["failed:SCHEMA_INVALID"], summary["by_kind"]["invalid"]
+        )
+        self.assertEqual(summary["errors"], summary["by_kind"]["invalid"])
+        self.assertEqual(sum(row["sent"] for row in data["intervals"]), summary["sent"])
+        self.assertLessEqual(summary["service_ms"]["p50"], summary["latency_ms"]["p50"])
+        self.assertEqual(data["histogram"]["count"], summary["completed"])
+        self.assertIn("p99 ms", compare_reports(data, data))
+        self.assertIn("outcomes:", report.format_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
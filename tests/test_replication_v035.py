@@ -0,0 +1,289 @@
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from contextlib import redirect_stderr
+from io import StringIO
+from unittest import mock
+
+import requests
+from fastapi.testclient import TestClient
+
+from kivai_sdk.devices import (
+    Device,
+    DeviceRegistry,
+    RegistryLog,
+    RegistryReplica,
+    active_device_registry,
+    active_registry_log,
+    record_change,
+    set_device_registry,
+    set_registry_log,
+)
+from kivai_sdk.cli import main as cli_main
+from kivai_sdk.devices.replication import POLL_INTERVAL_S
+from kivai_sdk.gateway import app
+
+
+def _upsert(device_id: str, zone: str = "attic") -> dict:
+    return {
+        "op": "upsert",
+        "device": {"device_id": device_id, "zone": zone, "capabilities": ["light"]},
+    }
+
+
+def _devices(registry) -> dict:
+    return {d.device_id: (d.zone, d.capabilities) for d in registry.all()}
+
+
+def _apply_to(registry: DeviceRegistry):
+    def apply(change: dict) -> None:
+        if change["op"] == "upsert":
+            d = change["device"]
+            registry.upsert(
+                Device(d["device_id"], d["zone"], frozenset(d["capabilities"]))
+            )
+        else:
+            registry.delete(change["device_id"])
+
+    return apply
+
+
+class TestRegistryLogV035(unittest.TestCase):
+    def setUp(self):
+        self.log = RegistryLog(capacity=4)
+        set_registry_log(self.log)
+        set_device_registry(DeviceRegistry.empty())
+
+    def tearDown(self):
+        set_registry_log(None)
+        set_device_registry(None)
+
+    def test_sequence_numbers_trimming_and_epochs(self):
+        for i in range(3):
+            record_change(_upsert(f"lamp-{i}"))
+        record_change({"op": "heartbeat", "device_ids": ["lamp-0"]})  # not logged
+        record_change({"op": "delete", "device_id": "lamp-0"})
+        self.assertEqual(self.log.seq, 4)
+        changes = self.log.since(1, self.log.epoch)
+        self.assertEqual([c["seq"] for c in changes], [2, 3, 4])
+        self.assertEqual(changes[-1], {"seq": 4, "op": "delete", "device_id": "lamp-0"})
+        self.assertEqual(self.log.since(4), [])
+        self.assertEqual(len(self.log.since(0, limit=2)), 2)
+
+        record_change(_upsert("lamp-9"))  # seq 1 is no longer retained
+        self.assertIsNone(self.log.since(0))
+        self.assertIsNotNone(self.log.since(1))
+        self.assertIsNone(self.log.since(1, epoch="another-epoch"))
+        self.assertIsNone(self.log.since(99))
+
+        snapshot = self.log.snapshot()
+        self.assertEqual(snapshot["seq"], 5)
+        self.assertEqual(
+            sorted(d["device_id"] for d in snapshot["devices"]),
+            ["lamp-1", "lamp-2", "lamp-9"],
+        )
+
+    def test_waiting_reader_wakes_on_write(self):
+        timer = threading.Timer(0.05, record_change, [_upsert("lamp-late")])
+        timer.start()
+        started = time.monotonic()
+        changes = self.log.since(0, wait=5.0)
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual(changes[0]["device"]["device_id"], "lamp-late")
+        timer.join()
+
+
+class TestReplicaConvergenceV035(unittest.TestCase):
+    def setUp(self):
+        set_registry_log(RegistryLog(capacity=64))
+        set_device_registry(DeviceRegistry.empty())
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        set_registry_log(None)
+        set_device_registry(None)
+
+    def _fetch(self, path: str):
+        response = self.client.get(path)
+        return response.status_code, response.json()
+
+    def test_long_poll_holds_no_thread_for_long(self):
+        log = active_registry_log()
+        with mock.patch.object(log, "since", wraps=log.since) as since:
+            started = time.monotonic()
+            body = self.client.get("/v1/replication/changes?wait=0.3").json()
+            self.assertGreaterEqual(time.monotonic() - started, 0.25)
+            self.assertEqual(body["changes"], [])
+            self.assertGreater(since.call_count, 1)
+            self.assertLessEqual(
+                max(c.args[3] for c in since.call_args_list), POLL_INTERVAL_S
+            )
+
+        timer = threading.Timer(0.1, record_change, [_upsert("lamp-late")])
+        timer.start()
+        started = time.monotonic()
+        body = self.client.get("/v1/replication/changes?wait=5").json()
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual(body["changes"][0]["device"]["device_id"], "lamp-late")
+        timer.join()
+
+    def test_repeated_sync_failures_are_reported_once(self):
+        calls = []
+
+        def fetch(path):
+            calls.append(path)
+            if len(calls) <= 5:
+                raise ConnectionRefusedError("primary down")
+            return self._fetch(path)
+
+        replica = RegistryReplica(fetch, wait=0.0, retry_s=0.001)
+        stderr = StringIO()
+        with redirect_stderr(stderr):
+            replica.start()
+            deadline = time.monotonic() + 5
+            while replica.epoch is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            replica.stop()
+            replica._thread.join(timeout=5)
+        lines = stderr.getvalue().splitlines()
+        self.assertEqual(
+            lines,
+            [
+                "kivai: replication sync failed: ConnectionRefusedError: primary down",
+                "kivai: replication sync recovered",
+            ],
+        )
+        stats = replica.stats()
+        self.assertEqual((stats["errors"], stats["last_error"]), (5, None))
+
+    def test_snapshot_registry_cannot_replicate(self):
+        stderr = StringIO()
+        with redirect_stderr(stderr):
+            code = cli_main(
+                ["serve", "--devices", "devices.kvds", "--replicate-from", "http://p:1"]
+            )
+        self.assertEqual(code, 2)
+        self.assertIn("writable registry", stderr.getvalue())
+
+    def test_replica_converges_under_concurrent_writes(self):
+        copy = DeviceRegistry.from_devices(
+            [Device("stale-1", "garage", frozenset({"lock"}))]
+        )
+        replica = RegistryReplica(
+            self._fetch, apply=_apply_to(copy), registry=copy, batch=16
+        )
+        ids = [f"dev-{i:03d}" for i in range(40)]
+
+        def writer(seed: int) -> None:
+            rng = random.Random(seed)
+            for _ in range(250):
+                device_id = rng.choice(ids)
+                if rng.random() < 0.25:
+                    record_change({"op": "delete", "device_id": device_id})
+                else:
+                    record_change(_upsert(device_id, rng.choice(["attic", "hall"])))
+                time.sleep(0.001)
+
+        writers = [threading.Thread(target=writer, args=(s,)) for s in range(4)]
+        for t in writers:
+            t.start()
+        while any(t.is_alive() for t in writers):
+            replica.sync()
+            time.sleep(0.002)
+        for t in writers:
+            t.join()
+        replica.catch_up()
+
+        self.assertEqual(_devices(copy), _devices(active_device_registry()))
+        self.assertNotIn("stale-1", _devices(copy))
+        stats = replica.stats()
+        self.assertGreaterEqual(stats["snapshots"], 1)
+        self.assertGreater(stats["changes"], 0)
+
+        # Caught up: a follow-up pull moves nothing; the next write is one delta.
+        self.assertEqual(replica.catch_up(), 0)
+        record_change(_upsert("dev-new"))
+        self.assertEqual(replica.catch_up(), 1)
+        self.assertIn("dev-new", _devices(copy))
+
+        # A restarted primary (new epoch) forces a snapshot.
+        set_registry_log(RegistryLog(capacity=64))
+        before = replica.stats()["snapshots"]
+        self.assertEqual(replica.catch_up(), 0)
+        self.assertEqual(replica.stats()["snapshots"], before + 1)
+
+        metrics = self.client.get("/metrics").json()["replication"]
+        self.assertEqual(metrics["epoch"], replica.epoch)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _serve(port: int, *extra: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "kivai_sdk.cli", "serve", "--port", str(port), *extra],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _wait_ready(url: str) -> None:
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            requests.get(f"{url}/health", timeout=1)
+            return
+        except requests.ConnectionError:
+            if time.monotonic() > deadline:
+                raise AssertionError(f"{url} did not start")
+            time.sleep(0.1)
+
+
+@unittest.skipUnless(os.name == "posix", "spawns local gateways")
+class TestReplicateFromV035(unittest.TestCase):
+    def test_replica_gateway_follows_primary(self):
+        primary_port, replica_port = _free_port(), _free_port()
+        primary_url = f"http://127.0.0.1:{primary_port}"
+        replica_url = f"http://127.0.0.1:{replica_port}"
+        procs = [_serve(primary_port)]
+        try:
+            _wait_ready(primary_url)
+            for i in range(5):
+                requests.put(
+                    f"{primary_url}/v1/devices/lamp-{i}",
+                    json={"zone": "attic", "capabilities": ["light"]},
+                ).raise_for_status()
+            procs.append(_serve(replica_port, "--replicate-from", primary_url))
+            _wait_ready(replica_url)
+            requests.delete(f"{primary_url}/v1/devices/lamp-0").raise_for_status()
+
+            expected = requests.get(f"{primary_url}/v1/replication/snapshot").json()
+            deadline = time.monotonic() + 10
+            while True:
+                got = requests.get(f"{replica_url}/v1/replication/snapshot").json()
+                if sorted(got["devices"], key=str) == sorted(
+                    expected["devices"], key=str
+                ):
+                    break
+                self.assertLess(time.monotonic(), deadline, got)
+                time.sleep(0.05)
+            metrics = requests.get(f"{replica_url}/metrics").json()["replication"]
+            self.assertEqual(metrics["replica"]["epoch"], expected["epoch"])
+        finally:
+            for proc in procs:
+                proc.send_signal(signal.SIGTERM)
+            for proc in procs:
+                proc.wait(timeout=20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+import unittest
+
+from kivai_sdk.security import (
+    PolicyStore,
+    compile_policy,
+    evaluate_authorization,
+)
+from kivai_sdk.security import policy_store
+
+
+POLICY_DOC = {
+    "version": 1,
+    "roles": {
+        "owner": {"inherits": ["admin"]},
+        "admin": {"inherits": ["user"]},
+        "user": {"inherits": []},
+        "service": {"inherits": []},
+    },
+    "intents": {
+        "unlock_door": "owner",
+        "set_alarm": "admin",
+        "play_music": ["user", "service"],
+    },
+}
+
+
+class TestRolePolicyV011(unittest.TestCase):
+    def setUp(self):
+        self._td = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._td.name, "policy.json")
+        self._write(POLICY_DOC)
+        self._saved = policy_store._DEFAULT_STORE
+        policy_store._DEFAULT_STORE = PolicyStore(self.path, check_interval=0)
+
+    def tearDown(self):
+        policy_store._DEFAULT_STORE = self._saved
+        self._td.cleanup()
+
+    def _write(self, doc):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(doc, f)
+
+    def _payload(self, intent, role=None, token="t"):
+        payload = {"intent": intent}
+        if role is not None:
+            payload["auth"] = {"required_role": role, "token": token}
+        return payload
+
+    def test_inheritance_compiles_to_masks(self):
+        p = compile_policy(POLICY_DOC)
+        admin_bit = p.role_bits["admin"]
+        self.assertTrue(p.granted["owner"] & admin_bit)
+        self.assertTrue(p.granted["admin"] & admin_bit)
+        self.assertFalse(p.granted["user"] & admin_bit)
+        self.assertFalse(p.granted["service"] & admin_bit)
+
+    def test_owner_satisfies_admin_requirement(self):
+        self.assertEqual(
+            evaluate_authorization(self._payload("set_alarm", "owner")), (True, None)
+        )
+        self.assertEqual(
+            evaluate_authorization(self._payload("set_alarm", "user")),
+            (False, "AUTH_FORBIDDEN"),
+        )
+
+    def test_any_of_roles(self):
+        self.assertEqual(
+            evaluate_authorization(self._payload("play_music", "service")),
+            (True, None),
+        )
+        self.assertEqual(
+            evaluate_authorization(self._payload("play_music", "admin")), (True, None)
+        )
+
+    def test_error_codes_preserved(self):
+        self.assertEqual(
+            evaluate_authorization(self._payload("unlock_door")),
+            (False, "AUTH_REQUIRED"),
+        )
+        self.assertEqual(
+            evaluate_authorization(self._payload("unlock_door", "owner", token=" ")),
+            (False, "AUTH_REQUIRED"),
+        )
+        self.assertEqual(
+            evaluate_authorization(self._payload("unlock_door", "admin")),
+            (False, "AUTH_FORBIDDEN"),
+        )
+        self.assertEqual(evaluate_authorization({"intent": "echo"}), (True, None))
+
+    def test_adapter_baseline_role_enforced(self):
+        payload = self._payload("echo", "user")
+        payload["_auth_required_role"] = "admin"
+        self.assertEqual(evaluate_authorization(payload), (False, "AUTH_FORBIDDEN"))
+        payload["_auth_required_role"] = "not-a-role"
+        self.assertEqual(evaluate_authorization(payload), (False, "AUTH_FORBIDDEN"))
+
+    def test_compile_rejects_cycles_and_unknown_roles(self):
+        with self.assertRaises(ValueError):
+            compile_policy(
+                {"roles": {"a": {"inherits": ["b"]}, "b": {"inherits": ["a"]}}}
+            )
+        with self.assertRaises(ValueError):
+            compile_policy({"roles": {"a": {"inherits": []}}, "intents": {"x": "b"}})
+
+    def test_hot_reload_swaps_policy(self):
+        payload = self._payload("set_alarm", "user")
+        self.assertEqual(evaluate_authorization(payload), (False, "AUTH_FORBIDDEN"))
+
+        doc = json.loads(json.dumps(POLICY_DOC))
+        doc["intents"]["set_alarm"] = "user"
+        doc["intents"]["new_intent"] = "owner"
+        self._write(doc)
+        os.utime(self.path, ns=(1, 1))
+
+        self.assertEqual(evaluate_authorization(payload), (True, None))
+        self.assertEqual(
+            evaluate_authorization(self._payload("new_intent")),
+            (False, "AUTH_REQUIRED"),
+        )
+
+    def test_broken_file_keeps_last_good_policy(self):
+        store = policy_store._DEFAULT_STORE
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        os.utime(self.path, ns=(2, 2))
+
+        self.assertFalse(store.reload())
+        self.assertIsNotNone(store.last_error)
+        self.assertEqual(
+            evaluate_authorization(self._payload("unlock_door", "admin")),
+            (False, "AUTH_FORBIDDEN"),
+        )
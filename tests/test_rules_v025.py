@@ -0,0 +1,167 @@
+import json
+import os
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+
+from kivai_sdk.gateway import app
+from kivai_sdk.rules import (
+    DeviceEvent,
+    Rule,
+    RulesEngine,
+    load_rules,
+    set_rules_engine,
+)
+
+
+def _rule(rule_id: str, **kwargs) -> Rule:
+    raw = {
+        "rule_id": rule_id,
+        "event": "motion",
+        "intent": {
+            "intent": "turn_on",
+            "target": {"capability": "light", "zone": "{zone}"},
+            "params": {"reason": "{type}", "sources": ["{device_id}"]},
+        },
+        **kwargs,
+    }
+    return Rule.from_dict(raw)
+
+
+def _event(**kwargs) -> DeviceEvent:
+    return DeviceEvent.from_dict({"type": "motion", **kwargs})
+
+
+class TestRulesEngineV025(unittest.TestCase):
+    def setUp(self):
+        self.now = [0.0]
+        self.emitted = []
+
+        def execute(payload):
+            self.emitted.append(payload)
+            return {"status": "ok", "intent_id": payload["intent_id"]}
+
+        self.engine = RulesEngine(execute=execute, clock=lambda: self.now[0])
+
+    def test_index_matches_type_zone_and_device(self):
+        self.engine.add(_rule("any-motion"))
+        self.engine.add(_rule("kitchen", zone="kitchen"))
+        self.engine.add(_rule("sensor-7", device_id="pir-7"))
+        self.engine.add(_rule("kitchen-pir-7", zone="kitchen", device_id="pir-7"))
+        self.engine.add(_rule("hall", zone="hall"))
+        for i in range(5000):  # unrelated rules must not matter
+            self.engine.add(_rule(f"noise-{i}", zone=f"zone-{i}"))
+
+        def ids(event):
+            return sorted(r.rule_id for r in self.engine.match(event))
+
+        self.assertEqual(
+            ids(_event(zone="kitchen", device_id="pir-7")),
+            ["any-motion", "kitchen", "kitchen-pir-7", "sensor-7"],
+        )
+        self.assertEqual(ids(_event(zone="kitchen")), ["any-motion", "kitchen"])
+        self.assertEqual(ids(_event()), ["any-motion"])
+        self.assertEqual(ids(DeviceEvent("door_open", zone="kitchen")), [])
+
+        self.assertTrue(self.engine.remove("kitchen"))
+        self.assertFalse(self.engine.remove("kitchen"))
+        self.assertEqual(ids(_event(zone="kitchen")), ["any-motion"])
+
+    def test_time_window_wraps_midnight(self):
+        self.engine.add(_rule("night", window=["22:00", "06:00"]))
+        self.engine.add(_rule("evening", window=["18:00", "22:00"]))
+
+        def ids(ts):
+            event = _event(timestamp=ts)
+            return [r.rule_id for r in self.engine.match(event)]
+
+        self.assertEqual(ids("2026-02-12T23:30:00-05:00"), ["night"])
+        self.assertEqual(ids("2026-02-12T05:59:00Z"), ["night"])
+        self.assertEqual(ids("2026-02-12T06:00:00Z"), [])
+        self.assertEqual(ids("2026-02-12T18:00:00"), ["evening"])
+
+    def test_emits_intents_with_placeholders_and_cooldown(self):
+        self.engine.add(_rule("hall-light", cooldown_s=60))
+        fired = self.engine.handle(_event(zone="hall", device_id="pir-1"))
+        self.assertEqual([f["rule_id"] for f in fired], ["hall-light"])
+        payload = self.emitted[0]
+        self.assertEqual(payload["target"], {"capability": "light", "zone": "hall"})
+        self.assertEqual(payload["params"], {"reason": "motion", "sources": ["pir-1"]})
+        self.assertEqual(payload["meta"]["source"], "rule:hall-light")
+
+        self.now[0] = 30
+        self.assertEqual(self.engine.handle(_event(zone="hall", device_id="pir-1")), [])
+        self.assertEqual(
+            len(self.engine.handle(_event(zone="hall", device_id="pir-2"))), 1
+        )
+        self.now[0] = 61
+        self.assertEqual(
+            len(self.engine.handle(_event(zone="hall", device_id="pir-1"))), 1
+        )
+
+        stats = self.engine.stats()
+        self.assertEqual(
+            (stats["events"], stats["matched"], stats["emitted"]), (4, 4, 3)
+        )
+
+    def test_load_rules_validates(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "rules.json")
+            rule = {"rule_id": "r1", "event": "motion", "intent": {"intent": "x"}}
+            with open(path, "w") as f:
+                json.dump({"rules": [rule]}, f)
+            self.assertEqual([r.rule_id for r in load_rules(path)], ["r1"])
+
+            for bad in ([rule, rule], [{**rule, "window": ["25:00", "01:00"]}]):
+                with open(path, "w") as f:
+                    json.dump(bad, f)
+                with self.assertRaises(ValueError):
+                    load_rules(path)
+        with self.assertRaises(ValueError):
+            DeviceEvent.from_dict({"zone": "hall"})
+
+
+class TestEventsEndpointV025(unittest.TestCase):
+    def setUp(self):
+        rule = Rule.from_dict(
+            {
+                "rule_id": "living-motion-music",
+                "event": "motion",
+                "zone": "living_room",
+                "intent": {
+                    "intent": "play_music",
+                    "target": {"capability": "speaker", "zone": "{zone}"},
+                    "params": {"query": "ambient"},
+                },
+            }
+        )
+        set_rules_engine(RulesEngine([rule]))
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        set_rules_engine(None)
+
+    def test_events_execute_rule_intents(self):
+        r = self.client.post(
+            "/v1/events",
+            json={
+                "events": [
+                    {"type": "motion", "zone": "living_room", "device_id": "pir-1"},
+                    {"type": "motion", "zone": "garage"},
+                ]
+            },
+        )
+        self.assertEqual(r.status_code, 200)
+        body = r.json()
+        self.assertEqual(body["events"], 2)
+        [fired] = body["fired"]
+        self.assertEqual(fired["ack"]["status"], "ok", fired)
+        self.assertEqual(fired["ack"]["route"]["device_id"], "speaker-living-02")
+
+        rules = self.client.get("/v1/rules").json()["rules"]
+        self.assertEqual([r["rule_id"] for r in rules], ["living-motion-music"])
+        self.assertEqual(self.client.get("/metrics").json()["rules"]["emitted"], 1)
+        self.assertEqual(
+            self.client.post("/v1/events", json={"zone": "x"}).status_code, 400
+        )
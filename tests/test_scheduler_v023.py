@@ -0,0 +1,193 @@
+import os
+import tempfile
+import time
+import unittest
+
+from fastapi.testclient import TestClient
+
+from kivai_sdk.devices import ChangeFeed, set_change_feed
+from kivai_sdk.gateway import app
+from kivai_sdk.scheduler import (
+    HierarchicalTimingWheel,
+    Scheduler,
+    SQLiteScheduleStore,
+    set_scheduler,
+)
+
+
+def _music(i: int = 0) -> dict:
+    return {
+        "intent_id": f"scheduled-{i:06d}",
+        "intent": "play_music",
+        "target": {"capability": "speaker", "zone": "living_room"},
+        "params": {"query": "jazz"},
+        "meta": {
+            "timestamp": "2026-02-12T00:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+        },
+    }
+
+
+class TestTimingWheelV023(unittest.TestCase):
+    def test_cascades_across_levels_in_deadline_order(self):
+        # 4 slots per level: level 0 spans 4 ticks, level 2 spans 64.
+        wheel = HierarchicalTimingWheel(tick=1.0, slot_bits=2, levels=4, now=0)
+        deadlines = {"a": 3, "b": 9, "c": 17, "d": 70, "e": 70.5, "f": 200}
+        for key, at in deadlines.items():
+            wheel.schedule(key, at)
+        self.assertTrue(wheel.cancel("c"))
+        self.assertFalse(wheel.cancel("c"))
+
+        self.assertEqual(wheel.advance(2.9), [])
+        self.assertEqual(wheel.advance(9), [("a", 3), ("b", 9)])
+        self.assertEqual(wheel.next_event(), 64.0)  # level 3 cascade
+        self.assertEqual(wheel.advance(70.9), [("d", 70)])
+        self.assertEqual(wheel.advance(1000), [("e", 70.5), ("f", 200)])
+        self.assertEqual((len(wheel), wheel.next_event()), (0, None))
+
+    def test_reschedule_past_deadline_and_horizon(self):
+        wheel = HierarchicalTimingWheel(tick=0.5, slot_bits=2, levels=2, now=10)
+        wheel.schedule("k", 14)
+        wheel.schedule("k", 5)  # replaces; already due
+        self.assertEqual(len(wheel), 1)
+        self.assertEqual(wheel.advance(10), [("k", 5)])
+        with self.assertRaises(ValueError):
+            wheel.schedule("far", 10 + wheel.horizon + 1)
+
+
+class TestSchedulerV023(unittest.TestCase):
+    def setUp(self):
+        self.now = [1000.0]
+        self.executed = []
+        self._td = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self._td.name, "schedules.db")
+
+    def tearDown(self):
+        self._td.cleanup()
+
+    def _scheduler(self, store=None) -> Scheduler:
+        def execute(payload):
+            self.executed.append(payload["intent_id"])
+            return {"intent_id": payload["intent_id"], "status": "ok"}
+
+        return Scheduler(store, workers=0, clock=lambda: self.now[0], execute=execute)
+
+    def test_fires_on_time_and_reports_lateness(self):
+        s = self._scheduler()
+        first = s.schedule(_music(1), delay=5)
+        s.schedule(_music(2), execute_at=1002.0)
+        cancelled = s.schedule(_music(3), delay=1)
+        self.assertTrue(s.cancel(cancelled.schedule_id))
+
+        self.now[0] = 1004.0
+        self.assertEqual(s.run_due(), 1)
+        self.assertEqual(self.executed, ["scheduled-000002"])
+        self.assertEqual(s.get(first.schedule_id)["status"], "pending")
+
+        self.now[0] = 1005.25
+        s.run_due()
+        result = s.get(first.schedule_id)
+        self.assertEqual(result["status"], "fired")
+        self.assertEqual(result["late_ms"], 250.0)
+        self.assertEqual(result["ack"]["schedule"]["schedule_id"], first.schedule_id)
+        self.assertEqual(result["execute_at"], "1970-01-01T00:16:45.000Z")
+
+        stats = s.stats()
+        self.assertEqual(
+            (stats["pending"], stats["fired"], stats["cancelled"]), (0, 2, 1)
+        )
+        self.assertEqual(stats["late_ms"]["max"], 2000.0)
+
+    def test_pending_intents_survive_restart(self):
+        s = self._scheduler(SQLiteScheduleStore(self.db))
+        s.schedule(_music(1), delay=10, schedule_id="sch-early")
+        s.schedule(_music(2), delay=3600, schedule_id="sch-late")
+        with self.assertRaises(ValueError):
+            s.schedule(_music(3), delay=1, schedule_id="sch-late")
+        s.close()
+
+        self.now[0] = 1060.0  # down for a minute
+        s = self._scheduler(SQLiteScheduleStore(self.db))
+        self.assertEqual(len(s), 2)
+        self.assertEqual(s.get("sch-late")["intent_id"], "scheduled-000002")
+        self.assertEqual(s.run_due(), 1)
+        self.assertEqual(s.get("sch-early")["late_ms"], 50000.0)
+        s.close()
+
+        s = self._scheduler(SQLiteScheduleStore(self.db))
+        self.assertEqual(len(s.store), 1)
+        s.close()
+
+
+class TestScheduleEndpointsV023(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+        set_scheduler(self.scheduler)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.scheduler.stop()
+        set_scheduler(None)
+
+    def test_schedule_fire_and_cancel(self):
+        r = self.client.post("/v1/schedules", json={"intent": _music(), "delay_ms": 50})
+        self.assertEqual(r.status_code, 202)
+        schedule_id = r.json()["schedule_id"]
+
+        later = self.client.post(
+            "/v1/schedules",
+            json={"intent": _music(1), "execute_at": "2099-01-01T18:00:00Z"},
+        ).json()
+        self.assertEqual(later["execute_at"], "2099-01-01T18:00:00.000Z")
+        r = self.client.delete(f"/v1/schedules/{later['schedule_id']}")
+        self.assertEqual(
+            r.json(), {"schedule_id": later["schedule_id"], "cancelled": True}
+        )
+
+        deadline = time.monotonic() + 5
+        while True:
+            result = self.client.get(f"/v1/schedules/{schedule_id}").json()
+            if result["status"] != "pending" or time.monotonic() > deadline:
+                break
+            time.sleep(0.02)
+        self.assertEqual(result["status"], "fired")
+        self.assertEqual(result["ack"]["status"], "ok")
+        self.assertGreaterEqual(result["ack"]["schedule"]["late_ms"], 0)
+
+        stats = self.client.get("/metrics").json()["scheduler"]
+        self.assertEqual((stats["fired"], stats["cancelled"]), (1, 1))
+
+    def test_rejects_invalid_requests(self):
+        bad_intent = {**_music(), "intent": ""}
+        for body in (
+            {"intent": bad_intent, "delay_ms": 10},
+            {"intent": _music(), "execute_at": "tomorrow"},
+            {"intent": _music(), "delay_ms": -1},
+            {"delay_ms": 10},
+        ):
+            self.assertEqual(
+                self.client.post("/v1/schedules", json=body).status_code, 400
+            )
+        self.assertEqual(self.client.get("/v1/schedules/sch-missing").status_code, 404)
+        self.assertEqual(
+            self.client.delete("/v1/schedules/sch-missing").status_code, 404
+        )
+
+    def test_unavailable_under_workers(self):
+        with tempfile.TemporaryDirectory() as d:
+            feed = ChangeFeed(os.path.join(d, "changes.jsonl"))
+            set_change_feed(feed)
+            try:
+                for response in (
+                    self.client.post(
+                        "/v1/schedules", json={"intent": _music(), "delay_ms": 10}
+                    ),
+                    self.client.get("/v1/schedules/sch-any"),
+                    self.client.delete("/v1/schedules/sch-any"),
+                ):
+                    self.assertEqual(response.status_code, 503)
+            finally:
+                set_change_feed(None)
+                feed.close()
+        self.assertEqual(self.scheduler.stats()["pending"], 0)
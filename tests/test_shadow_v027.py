@@ -0,0 +1,142 @@
+import time
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from kivai_sdk.config import ExecutionConfig
+from kivai_sdk.devices import DeviceShadow, set_device_shadow
+from kivai_sdk.gateway import app
+from kivai_sdk.metrics import set_metrics
+from kivai_sdk.runtime import execute_intent
+
+THERMOSTAT = "thermostat-living-01"
+
+
+def _intent(intent: str, capability: str, **params) -> dict:
+    return {
+        "intent_id": "shadow-test-0001",
+        "intent": intent,
+        "target": {"capability": capability, "zone": "living_room"},
+        "params": params,
+        "meta": {"timestamp": "2026-02-12T00:00:00Z", "language": "en"},
+    }
+
+
+class TestDeviceShadowV027(unittest.TestCase):
+    def test_merge_and_freshness(self):
+        now = [100.0]
+        shadow = DeviceShadow(clock=lambda: now[0])
+        shadow.update("t1", {"target_temperature": 21.0, "unit": "C"})
+        shadow.update("t1", {"current_temperature": 19.5}, source="report")
+        self.assertEqual(
+            shadow.get("t1").state,
+            {"target_temperature": 21.0, "unit": "C", "current_temperature": 19.5},
+        )
+        self.assertTrue(shadow.matches("t1", {"target_temperature": 21.0}, 60))
+        self.assertFalse(shadow.matches("t1", {"target_temperature": 22.0}, 60))
+        self.assertFalse(shadow.matches("t1", {"mode": "heat"}, 60))
+        now[0] = 200.0
+        self.assertFalse(shadow.matches("t1", {"target_temperature": 21.0}, 60))
+        self.assertEqual(shadow.describe("t1")["age_s"], 100.0)
+        self.assertEqual(shadow.stats(), {"devices": 1, "updates": 2, "no_ops": 1})
+
+
+class TestShadowRuntimeV027(unittest.TestCase):
+    def setUp(self):
+        set_device_shadow(DeviceShadow())
+        set_metrics(None)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        set_device_shadow(None)
+        set_metrics(None)
+
+    def test_repeated_state_is_a_no_op(self):
+        first = execute_intent(_intent("set_temperature", "thermostat", value=21))
+        self.assertEqual(first["result"]["action"], "set_temperature")
+        self.assertNotIn("no_op", first)
+
+        again = self.client.post(
+            "/v1/execute", json=_intent("set_temperature", "thermostat", value=21)
+        ).json()
+        self.assertEqual(again["status"], "ok")
+        self.assertTrue(again["no_op"])
+        # The adapter's no_op_result hook keeps the usual result shape.
+        self.assertEqual(again["result"], first["result"])
+        self.assertEqual(again["route"]["device_id"], THERMOSTAT)
+
+        other = execute_intent(
+            _intent("set_temperature", "thermostat", value=21, unit="F")
+        )
+        self.assertNotIn("no_op", other)
+        forced = execute_intent(
+            _intent("set_temperature", "thermostat", value=21, unit="F"),
+            config=ExecutionConfig(shadow_no_op=False),
+        )
+        self.assertNotIn("no_op", forced)
+
+        # Adapters without desired_state never short-circuit.
+        for _ in range(2):
+            ack = execute_intent(_intent("play_music", "speaker", query="jazz"))
+            self.assertNotIn("no_op", ack)
+
+        metrics = self.client.get("/metrics").json()
+        self.assertEqual(metrics["totals"]["intents_no_op"], 1)
+        self.assertEqual(metrics["shadow"]["no_ops"], 1)
+
+    def test_no_op_without_result_hook_reports_the_state(self):
+        execute_intent(_intent("set_temperature", "thermostat", value=19))
+        with mock.patch(
+            "kivai_sdk.adapters.builtin.thermostat.SetTemperatureAdapter.no_op_result",
+            side_effect=RuntimeError,
+        ):
+            ack = execute_intent(_intent("set_temperature", "thermostat", value=19))
+        self.assertTrue(ack["no_op"])
+        self.assertEqual(
+            ack["result"],
+            {"no_op": True, "state": {"target_temperature": 19.0, "unit": "C"}},
+        )
+
+    def test_stale_shadow_is_not_trusted(self):
+        execute_intent(_intent("set_temperature", "thermostat", value=20))
+        ack = execute_intent(
+            _intent("set_temperature", "thermostat", value=20),
+            config=ExecutionConfig(shadow_max_age_s=0.0),
+        )
+        self.assertNotIn("no_op", ack)
+
+    def test_device_reports_and_read_endpoint(self):
+        self.assertEqual(
+            self.client.get(f"/v1/devices/{THERMOSTAT}/state").status_code, 404
+        )
+        r = self.client.post(
+            f"/v1/devices/{THERMOSTAT}/state",
+            json={"state": {"target_temperature": 23.0, "unit": "C"}},
+        )
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json()["source"], "report")
+
+        ack = execute_intent(_intent("set_temperature", "thermostat", value=23))
+        self.assertTrue(ack["no_op"])
+
+        self.client.post(
+            "/v1/events",
+            json={
+                "type": "state",
+                "device_id": THERMOSTAT,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime()),
+                "data": {"state": {"current_temperature": 21.5}},
+            },
+        )
+        state = self.client.get(f"/v1/devices/{THERMOSTAT}/state").json()
+        self.assertEqual(
+            state["state"],
+            {"target_temperature": 23.0, "unit": "C", "current_temperature": 21.5},
+        )
+        self.assertEqual(
+            self.client.post(
+                "/v1/devices/nope/state", json={"state": {"on": True}}
+            ).status_code,
+            404,
+        )
@@ -0,0 +1,149 @@
+import asyncio
+import os
+import socket
+import struct
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from kivai_sdk.devices import Device, DeviceRegistry, set_device_registry
+from kivai_sdk.socket_gateway import (
+    CODEC_JSON,
+    CODEC_MSGPACK,
+    FramedClient,
+    decode_body,
+    encode_frame,
+    msgpack,
+    start_socket_gateway,
+)
+
+
+def _payload(i: int, intent: str = "echo", **extra) -> dict:
+    payload = {
+        "intent_id": f"uds-test-{i:06d}",
+        "intent": intent,
+        "target": {"capability": "speaker", "zone": "living_room"},
+        "params": {"message": f"m{i}"},
+        "meta": {
+            "timestamp": "2026-02-12T00:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+        },
+    }
+    payload.update(extra)
+    return payload
+
+
+class TestSocketGatewayV018(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._td = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls._td.name, "gw.sock")
+        cls.loop = asyncio.new_event_loop()
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+        cls.server = asyncio.run_coroutine_threadsafe(
+            start_socket_gateway(cls.path, workers=4), cls.loop
+        ).result(timeout=10)
+
+    @classmethod
+    def tearDownClass(cls):
+        async def stop():
+            cls.server.close()
+            await cls.server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(stop(), cls.loop).result(timeout=10)
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join(timeout=10)
+        cls.loop.close()
+        cls._td.cleanup()
+
+    def tearDown(self):
+        set_device_registry(None)
+
+    def _codecs(self):
+        return [CODEC_JSON] + ([CODEC_MSGPACK] if msgpack is not None else [])
+
+    def test_frame_round_trip(self):
+        for codec in self._codecs():
+            with self.subTest(codec=codec):
+                frame = encode_frame(codec, _payload(1))
+                tag, length = struct.unpack(">cI", frame[:5])
+                self.assertEqual((tag, length), (codec, len(frame) - 5))
+                self.assertEqual(decode_body(codec, frame[5:]), _payload(1))
+
+    @unittest.skipIf(msgpack is None, "msgpack not installed")
+    def test_msgpack_frames_are_smaller(self):
+        self.assertLess(
+            len(encode_frame(CODEC_MSGPACK, _payload(1))),
+            len(encode_frame(CODEC_JSON, _payload(1))),
+        )
+
+    def test_pipelined_requests_match_by_intent_id(self):
+        payloads = [_payload(i) for i in range(100)]
+        payloads += [
+            _payload(1000, "unlock_door", target={"device_id": "door-front-01"})
+        ]
+        for codec in self._codecs():
+            with self.subTest(codec=codec), FramedClient(self.path, codec) as client:
+                acks = client.execute_many([dict(p) for p in payloads], window=16)
+                self.assertEqual(len(acks), len(payloads))
+                for p in payloads[:-1]:
+                    ack = acks[p["intent_id"]]
+                    self.assertEqual(ack["status"], "ok")
+                    self.assertEqual(ack["result"]["echo"], p["params"]["message"])
+                self.assertEqual(
+                    acks["uds-test-001000"]["error"]["code"], "AUTH_REQUIRED"
+                )
+
+    def test_execution_errors_still_get_replies(self):
+        payloads = [_payload(i) for i in range(8)]
+        with (
+            mock.patch(
+                "kivai_sdk.socket_gateway.execute_correlated",
+                side_effect=ValueError("boom"),
+            ),
+            FramedClient(self.path, CODEC_JSON) as client,
+        ):
+            acks = client.execute_many([dict(p) for p in payloads], window=4)
+        self.assertEqual(len(acks), len(payloads))
+        for p in payloads:
+            error = acks[p["intent_id"]]["error"]
+            self.assertEqual(error["code"], "INTERNAL_ERROR")
+            self.assertIn("boom", error["message"])
+
+    def test_shares_runtime_state_with_process(self):
+        set_device_registry(
+            DeviceRegistry.from_devices(
+                [Device("uds-speaker", "den", frozenset({"speaker"}))]
+            )
+        )
+        with FramedClient(self.path, CODEC_JSON) as client:
+            ack = client.execute(
+                _payload(7, target={"zone": "den", "capability": "speaker"})
+            )
+        self.assertEqual(ack["route"]["device_id"], "uds-speaker")
+
+    def test_bad_frames_get_error_acks(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(10)
+            s.connect(self.path)
+            reader = s.makefile("rb")
+
+            def reply():
+                codec, length = struct.unpack(">cI", reader.read(5))
+                return decode_body(codec, reader.read(length))
+
+            s.sendall(struct.pack(">cI", CODEC_JSON, 5) + b"{nope")
+            ack = reply()
+            self.assertEqual(ack["error"]["code"], "FRAME_INVALID")
+            self.assertIsNone(ack["intent_id"])
+
+            s.sendall(encode_frame(CODEC_JSON, {"intent": "echo"}))
+            self.assertEqual(reply()["error"]["code"], "INTENT_ID_REQUIRED")
+
+            # The connection survives bad frames.
+            s.sendall(encode_frame(CODEC_JSON, _payload(3)))
+            self.assertEqual(reply()["status"], "ok")
+            reader.close()
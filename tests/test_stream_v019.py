@@ -0,0 +1,121 @@
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from kivai_sdk.adapters import AdapterSpec, default_registry, set_adapter_registry
+from kivai_sdk.adapters.capabilities import AdapterCapabilities
+from kivai_sdk.gateway import app
+from kivai_sdk.socket_gateway import CODEC_MSGPACK, decode_body, encode_body, msgpack
+
+
+def _payload(i: int, intent: str = "echo") -> dict:
+    return {
+        "intent_id": f"ws-test-{i:06d}",
+        "intent": intent,
+        "target": {"capability": "speaker", "zone": "living_room"},
+        "params": {"message": f"m{i}"},
+        "meta": {
+            "timestamp": "2026-02-12T00:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+        },
+    }
+
+
+class SlowAdapter:
+    intent = "slow_echo"
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(
+            intent="slow_echo", required_capabilities=frozenset()
+        )
+
+    def execute(self, payload, ctx):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.02)
+        with cls.lock:
+            cls.active -= 1
+        return {"ok": True}
+
+
+class TestStreamV019(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        set_adapter_registry(None)
+
+    def test_pipelined_acks_correlate(self):
+        with self.client.websocket_connect("/v1/stream") as ws:
+            self.assertEqual(ws.receive_json(), {"type": "hello", "max_in_flight": 64})
+            for i in range(40):
+                ws.send_text(json.dumps(_payload(i)))
+            acks = [ws.receive_json() for _ in range(40)]
+
+        by_id = {a["intent_id"]: a for a in acks}
+        self.assertEqual(set(by_id), {f"ws-test-{i:06d}" for i in range(40)})
+        self.assertEqual(by_id["ws-test-000007"]["result"]["echo"], "m7")
+        self.assertEqual(len({a["execution_id"] for a in acks}), 40)
+
+    def test_flow_control_limits_outstanding_intents(self):
+        reg = default_registry(discover=False)
+        reg.register_spec(
+            AdapterSpec(intent="slow_echo", target=f"{__name__}:SlowAdapter")
+        )
+        set_adapter_registry(reg)
+        SlowAdapter.peak = 0
+
+        with self.client.websocket_connect("/v1/stream?max_in_flight=2") as ws:
+            self.assertEqual(ws.receive_json()["max_in_flight"], 2)
+            for i in range(10):
+                ws.send_text(json.dumps(_payload(i, "slow_echo")))
+            acks = [ws.receive_json() for _ in range(10)]
+
+        self.assertTrue(all(a["status"] == "ok" for a in acks))
+        self.assertLessEqual(SlowAdapter.peak, 2)
+
+        with self.client.websocket_connect("/v1/stream?max_in_flight=9999") as ws:
+            self.assertEqual(ws.receive_json()["max_in_flight"], 64)
+
+    def test_bad_messages(self):
+        with self.client.websocket_connect("/v1/stream") as ws:
+            ws.receive_json()
+            ws.send_text("{not json")
+            self.assertEqual(ws.receive_json()["error"]["code"], "FRAME_INVALID")
+            ws.send_text(json.dumps({"intent": "echo"}))
+            self.assertEqual(ws.receive_json()["error"]["code"], "INTENT_ID_REQUIRED")
+            ws.send_text(json.dumps(_payload(1)))
+            self.assertEqual(ws.receive_json()["status"], "ok")
+
+    def test_execution_errors_still_get_acks(self):
+        with (
+            mock.patch(
+                "kivai_sdk.gateway.execute_correlated",
+                side_effect=ValueError("boom"),
+            ),
+            self.client.websocket_connect("/v1/stream") as ws,
+        ):
+            ws.receive_json()
+            ws.send_text(json.dumps(_payload(2)))
+            ack = ws.receive_json()
+        self.assertEqual(ack["intent_id"], "ws-test-000002")
+        self.assertEqual(ack["error"]["code"], "INTERNAL_ERROR")
+
+    @unittest.skipIf(msgpack is None, "msgpack not installed")
+    def test_msgpack_messages(self):
+        with self.client.websocket_connect("/v1/stream") as ws:
+            ws.receive_json()
+            ws.send_bytes(encode_body(CODEC_MSGPACK, _payload(5)))
+            ack = decode_body(CODEC_MSGPACK, ws.receive_bytes())
+        self.assertEqual((ack["intent_id"], ack["status"]), ("ws-test-000005", "ok"))
@@ -0,0 +1,278 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+
+from kivai_sdk.breakers import (
+    BreakerConfig,
+    BreakerRegistry,
+    active_breakers,
+    set_breakers,
+)
+from kivai_sdk.devices import (
+    Device,
+    SQLiteDeviceStore,
+    active_device_shadow,
+    active_health_tracker,
+)
+from kivai_sdk.devices.feed import apply_change
+from kivai_sdk.gateway import app
+from kivai_sdk.metrics import set_metrics
+from kivai_sdk.rules import Rule, RulesEngine, set_rules_engine
+from kivai_sdk.runtime import execute_intent
+from kivai_sdk.scope import use_tenant
+from kivai_sdk.tenants import (
+    TenantDirectory,
+    active_tenant_directory,
+    configure_tenants,
+    set_tenant_directory,
+)
+
+
+def _intent(intent: str = "set_temperature", tenant_id: str | None = None) -> dict:
+    meta = {
+        "timestamp": "2026-02-12T00:00:00Z",
+        "language": "en",
+        "confidence": 1.0,
+        "source": "test",
+    }
+    if tenant_id is not None:
+        meta["tenant_id"] = tenant_id
+    return {
+        "intent_id": "tenant-test-0001",
+        "intent": intent,
+        "target": {"capability": "thermostat", "zone": "living_room"},
+        "params": {"value": 21},
+        "meta": meta,
+    }
+
+
+def _make_tenant(
+    root: str, tenant_id: str, policy=None, intents=None, device_id=None
+) -> None:
+    home = os.path.join(root, tenant_id)
+    os.makedirs(home)
+    with SQLiteDeviceStore(os.path.join(home, "devices.db")) as store:
+        store.upsert(
+            Device(
+                device_id or f"{tenant_id}-thermo",
+                "living_room",
+                frozenset({"thermostat"}),
+            )
+        )
+    if policy is not None:
+        with open(os.path.join(home, "policy.json"), "w") as f:
+            json.dump(policy, f)
+    if intents is not None:
+        with open(os.path.join(home, "tenant.json"), "w") as f:
+            json.dump({"intents": intents}, f)
+
+
+class TestTenantsV033(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="kivai-tenants-test-")
+        _make_tenant(self.root, "alpha", intents=["echo", "set_temperature"])
+        _make_tenant(
+            self.root,
+            "beta",
+            policy={
+                "version": 1,
+                "roles": {"owner": {"inherits": []}},
+                "intents": {"set_temperature": "owner"},
+            },
+        )
+        configure_tenants(self.root)
+        set_metrics(None)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        set_tenant_directory(None)
+        set_metrics(None)
+        set_breakers(None)
+        set_rules_engine(None)
+        shutil.rmtree(self.root)
+
+    def test_tenants_route_against_their_own_state(self):
+        ack = self.client.post(
+            "/v1/execute", json=_intent(), headers={"X-Kivai-Tenant": "alpha"}
+        ).json()
+        self.assertEqual(ack["status"], "ok")
+        self.assertEqual(ack["tenant_id"], "alpha")
+        self.assertEqual(ack["route"]["device_id"], "alpha-thermo")
+
+        ack = execute_intent(_intent("play_music", tenant_id="alpha"))
+        self.assertEqual(ack["error"]["code"], "INTENT_UNSUPPORTED")
+
+        ack = execute_intent(_intent(tenant_id="beta"))
+        self.assertEqual(ack["error"]["code"], "AUTH_REQUIRED")
+        payload = _intent(tenant_id="beta")
+        payload["auth"] = {"token": "t", "required_role": "owner"}
+        ack = execute_intent(payload)
+        self.assertEqual(ack["route"]["device_id"], "beta-thermo")
+
+        # Untenanted executions keep the process-wide registry and shadow.
+        ack = execute_intent(_intent())
+        self.assertEqual(ack["route"]["device_id"], "thermostat-living-01")
+        self.assertNotIn("tenant_id", ack)
+        self.assertIsNone(active_device_shadow().get("alpha-thermo"))
+        alpha = active_tenant_directory().peek("alpha")
+        self.assertIsNotNone(alpha.shadow.get("alpha-thermo"))
+
+    def test_unknown_and_mismatched_tenants_are_rejected(self):
+        response = self.client.post(
+            "/v1/execute", json=_intent(), headers={"X-Kivai-Tenant": "gamma"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], "TENANT_UNKNOWN")
+        ack = execute_intent(_intent(tenant_id="beta"), tenant="alpha")
+        self.assertEqual(ack["error"]["code"], "TENANT_MISMATCH")
+        ack = execute_intent(_intent(tenant_id="../alpha"))
+        self.assertEqual(ack["error"]["code"], "TENANT_UNKNOWN")
+
+        with self.client.websocket_connect("/v1/stream?tenant=alpha") as ws:
+            ws.receive_json()
+            ws.send_json(_intent())
+            self.assertEqual(ws.receive_json()["tenant_id"], "alpha")
+            ws.send_json(_intent(tenant_id="beta"))
+            self.assertEqual(ws.receive_json()["error"]["code"], "TENANT_MISMATCH")
+
+    def test_health_and_breakers_are_per_tenant(self):
+        for tenant_id in ("gamma", "delta"):
+            _make_tenant(self.root, tenant_id, device_id="thermostat-01")
+        set_breakers(BreakerRegistry(BreakerConfig(window=1, min_calls=1)))
+        headers = {"X-Kivai-Tenant": "gamma"}
+
+        r = self.client.post("/v1/devices/thermostat-01/heartbeat", headers=headers)
+        self.assertEqual(r.status_code, 200)
+        gamma = active_tenant_directory().peek("gamma")
+        self.assertEqual(gamma.health.status("thermostat-01"), "online")
+        self.assertIsNone(active_health_tracker().status("thermostat-01"))
+
+        ack = execute_intent(_intent(tenant_id="gamma"))
+        self.assertEqual(ack["route"]["device_id"], "thermostat-01")
+        with use_tenant(gamma):
+            permit, _ = active_breakers().acquire("set_temperature", "thermostat-01")
+        permit.finish("DEVICE_TIMEOUT")  # a device fault, not an adapter one
+        payload = _intent(tenant_id="gamma")
+        payload["params"]["value"] = 22  # not a shadow no-op
+        ack = execute_intent(payload)
+        self.assertEqual(ack["error"]["code"], "DEVICE_UNAVAILABLE")
+        ack = execute_intent(_intent(tenant_id="delta"))
+        self.assertEqual(ack["status"], "ok", ack)
+
+        health = self.client.get("/v1/devices/thermostat-01/health", headers=headers)
+        self.assertEqual(health.json()["circuit"], "open")
+        health = self.client.get(
+            "/v1/devices/thermostat-01/health", headers={"X-Kivai-Tenant": "delta"}
+        )
+        self.assertEqual(health.json()["circuit"], "closed")
+
+        r = self.client.post(
+            "/v1/devices/thermostat-01/state",
+            json={"state": {"target": 19}},
+            headers={"X-Kivai-Tenant": "delta"},
+        )
+        self.assertEqual(r.json()["state"]["target"], 19)
+        self.assertNotIn("target", gamma.shadow.get("thermostat-01").state)
+
+        r = self.client.post(
+            "/v1/heartbeats",
+            json={"device_ids": ["x"]},
+            headers={"X-Kivai-Tenant": "omega"},
+        )
+        self.assertEqual(r.status_code, 400)
+        r = self.client.put(
+            "/v1/devices/thermostat-01",
+            json={"zone": "hall", "capabilities": ["thermostat"]},
+            headers=headers,
+        )
+        self.assertEqual(r.status_code, 409)
+
+    def test_events_and_context_are_per_tenant(self):
+        rule = {
+            "rule_id": "cold-room",
+            "event": "temperature",
+            "intent": {
+                "intent": "set_temperature",
+                "target": {"capability": "thermostat", "zone": "{zone}"},
+                "params": {"value": 21},
+            },
+        }
+        set_rules_engine(RulesEngine([Rule.from_dict(rule)]))
+        event = {
+            "type": "temperature",
+            "zone": "living_room",
+            "device_id": "alpha-thermo",
+            "data": {"state": {"current": 16}},
+        }
+        headers = {"X-Kivai-Tenant": "alpha"}
+        body = self.client.post("/v1/events", json=event, headers=headers).json()
+        [fired] = body["fired"]
+        self.assertEqual(fired["ack"]["tenant_id"], "alpha")
+        self.assertEqual(fired["ack"]["route"]["device_id"], "alpha-thermo")
+        alpha = active_tenant_directory().peek("alpha")
+        self.assertEqual(alpha.shadow.get("alpha-thermo").state["current"], 16)
+        self.assertIsNone(active_device_shadow().get("alpha-thermo"))
+        r = self.client.post(
+            "/v1/events", json=event, headers={"X-Kivai-Tenant": "omega"}
+        )
+        self.assertEqual(r.status_code, 400)
+
+        alpha.context.put("user", "ana", {"device_id": "alpha-thermo"})
+        r = self.client.delete("/v1/context/users/ana")
+        self.assertFalse(r.json()["forgotten"])
+        r = self.client.delete("/v1/context/users/ana", headers=headers)
+        self.assertTrue(r.json()["forgotten"])
+
+    def test_lazy_loading_and_lru_eviction(self):
+        tenants = TenantDirectory(self.root, max_tenants=1)
+        set_tenant_directory(tenants)
+        self.assertIsNone(tenants.peek("alpha"))
+        execute_intent(_intent(tenant_id="alpha"))
+        execute_intent(_intent(tenant_id="alpha"))
+        execute_intent(_intent("echo", tenant_id="beta"))
+        self.assertIsNone(tenants.peek("alpha"))
+        stats = tenants.stats()
+        self.assertEqual(
+            (stats["loaded"], stats["loads"], stats["hits"], stats["evictions"]),
+            (1, 2, 1, 1),
+        )
+        self.assertEqual(self.client.get("/metrics").json()["tenants"], stats)
+
+        # Shadow updates from other workers reach loaded tenants only.
+        change = {"op": "state", "device_id": "beta-thermo", "state": {"on": True}}
+        apply_change({**change, "tenant": "beta"}, remote=True)
+        apply_change({**change, "device_id": "alpha-thermo", "tenant": "alpha"})
+        self.assertEqual(
+            tenants.peek("beta").shadow.get("beta-thermo").state["on"], True
+        )
+        self.assertIsNone(active_device_shadow().get("beta-thermo"))
+        self.assertIsNone(active_device_shadow().get("alpha-thermo"))
+
+        # Growth is re-accounted when a tenant is next used.
+        budget = TenantDirectory(self.root)
+        alpha = budget.get("alpha")
+        budget.get("beta")
+        loaded = budget.stats()["bytes"]
+        budget.memory_budget = loaded + 1024
+        for i in range(20):
+            alpha.context.put("user", f"user-{i}", {"device_id": f"d-{i:03d}"})
+            alpha.shadow.update(f"d-{i:03d}", {"on": True})
+        self.assertEqual(budget.stats()["bytes"], loaded)
+        budget.get("alpha")
+        stats = budget.stats()
+        self.assertEqual((stats["loaded"], stats["evictions"]), (1, 1))
+        self.assertEqual(stats["bytes"], alpha.cost)
+        self.assertIsNone(budget.peek("beta"))
+
+        small = TenantDirectory(self.root, memory_budget=1)
+        small.get("alpha")
+        small.get("beta")
+        self.assertEqual(small.stats()["loaded"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 import uuid
 from datetime import datetime, timezone
 
+from kivai_sdk.devices import set_device_shadow
 from kivai_sdk.runtime import execute_intent
 
 
@@ -30,6 +31,10 @@ def canonical_payload(
 
 
 class TestV04CoreIntents(unittest.TestCase):
+    def setUp(self):
+        # A thermostat already at the requested value would answer no_op (v0.27).
+        set_device_shadow(None)
+
     def test_set_temperature_routes_and_executes(self):
         payload = canonical_payload(
             "set_temperature",
@@ -0,0 +1,194 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+import requests
+
+from kivai_sdk.devices import (
+    ChangeFeed,
+    DeviceRegistry,
+    HealthTracker,
+    set_device_registry,
+    set_health_tracker,
+)
+from kivai_sdk.metrics import SharedMetrics
+
+
+def _in_child(fn) -> int:
+    """
+    Run fn() in a forked child; return its exit status.
+    """
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            fn()
+            code = 0
+        finally:
+            os._exit(code)
+    return os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+class TestSharedStateV020(unittest.TestCase):
+    def setUp(self):
+        self._td = tempfile.TemporaryDirectory()
+        self.feed_path = os.path.join(self._td.name, "changes.jsonl")
+
+    def tearDown(self):
+        set_device_registry(None)
+        set_health_tracker(None)
+        self._td.cleanup()
+
+    def test_metrics_aggregate_across_processes(self):
+        metrics = SharedMetrics(3)
+
+        def worker():
+            metrics.bind(2)
+            metrics.record_ack({"status": "ok"})
+            metrics.record_ack({"status": "failed"})
+
+        self.assertEqual(_in_child(worker), 0)
+        metrics.record_ack({"status": "partial"})
+
+        snap = metrics.snapshot()
+        self.assertEqual(snap["workers"], 3)
+        self.assertEqual(snap["totals"]["intents"], 3)
+        self.assertEqual([w["intents"] for w in snap["per_worker"]], [1, 0, 2])
+        self.assertEqual(snap["per_worker"][2]["intents_failed"], 1)
+
+    def test_feed_replays_other_workers_changes_in_order(self):
+        seen = []
+        feed = ChangeFeed(
+            self.feed_path, apply=lambda c, remote: seen.append((c, remote))
+        )
+        go_r, go_w = os.pipe()
+
+        def worker():
+            feed.reopen()
+            os.read(go_r, 1)  # wait until the parent has published "a"
+            feed.publish({"op": "heartbeat", "device_ids": ["b"]})
+            # The parent's earlier change is replayed before our own.
+            assert [(c["device_ids"], r) for c, r in seen] == [
+                (["a"], True),
+                (["b"], False),
+            ], seen
+
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                worker()
+                code = 0
+            finally:
+                os._exit(code)
+        feed.publish({"op": "heartbeat", "device_ids": ["a"]})
+        os.write(go_w, b"x")
+        self.assertEqual(os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]), 0)
+        os.close(go_r)
+        os.close(go_w)
+
+        self.assertEqual(feed.poll(), 1)
+        self.assertEqual(feed.poll(), 0)
+        self.assertEqual(
+            [(c["device_ids"], r) for c, r in seen], [(["a"], False), (["b"], True)]
+        )
+
+    def test_feed_updates_registry_and_health(self):
+        registry = DeviceRegistry.empty()
+        tracker = HealthTracker()
+        set_device_registry(registry)
+        set_health_tracker(tracker)
+        feed = ChangeFeed(self.feed_path)
+
+        def worker():
+            feed.reopen()
+            feed.publish(
+                {
+                    "op": "upsert",
+                    "device": {
+                        "device_id": "lamp-01",
+                        "zone": "attic",
+                        "capabilities": ["light"],
+                    },
+                }
+            )
+            feed.publish({"op": "heartbeat", "device_ids": ["lamp-01"]})
+
+        self.assertEqual(_in_child(worker), 0)
+        self.assertIsNone(registry.get("lamp-01"))
+        feed.poll()
+        self.assertEqual(registry.get("lamp-01").zone, "attic")
+        self.assertEqual(tracker.status("lamp-01"), "online")
+
+        feed.publish({"op": "delete", "device_id": "lamp-01"})
+        self.assertIsNone(registry.get("lamp-01"))
+        self.assertIsNone(tracker.status("lamp-01"))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _music(i: int) -> dict:
+    return {
+        "intent_id": f"workers-{i:06d}",
+        "intent": "play_music",
+        "target": {"capability": "speaker", "zone": "attic"},
+        "params": {"query": "jazz"},
+        "meta": {
+            "timestamp": "2026-02-12T00:00:00Z",
+            "language": "en",
+            "confidence": 1.0,
+        },
+    }
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+class TestServeWorkersV020(unittest.TestCase):
+    def test_workers_share_registry_and_metrics(self):
+        port = _free_port()
+        url = f"http://127.0.0.1:{port}"
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "kivai_sdk.cli", "serve"]
+            + ["--port", str(port), "--workers", "2"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    requests.get(f"{url}/health", timeout=1)
+                    break
+                except requests.ConnectionError:
+                    self.assertLess(time.monotonic(), deadline, "gateway did not start")
+                    time.sleep(0.1)
+
+            r = requests.put(
+                f"{url}/v1/devices/speaker-attic-01",
+                json={"zone": "attic", "capabilities": ["speaker"]},
+            )
+            self.assertEqual(r.status_code, 200)
+
+            # Fresh connection per request, so both workers serve some.
+            for i in range(12):
+                ack = requests.post(f"{url}/v1/execute", json=_music(i)).json()
+                self.assertEqual(ack["status"], "ok", ack)
+                self.assertEqual(ack["route"]["device_id"], "speaker-attic-01")
+
+            metrics = requests.get(f"{url}/metrics").json()
+            self.assertEqual(metrics["workers"], 2)
+            self.assertEqual(metrics["totals"]["intents"], 12)
+            self.assertEqual(metrics["totals"]["intents_ok"], 12)
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            code = proc.wait(timeout=20)
+        self.assertEqual(code, 0)